@@ -129,6 +129,30 @@ class TestMemoryUsage(unittest.TestCase):
                 self.assertLess(validate_mem, 2.6 * 1024 ** 2)
                 self.assertLess(lazy_validate_mem, 2.1 * 1024 ** 2)
 
+    def test_generated_instance_memory_usage(self):
+        from xmlschema import XMLSchema
+        from xmlschema.extras.instances import XmlInstanceGenerator
+
+        with tempfile.TemporaryDirectory() as dirname:
+            python_script = pathlib.Path(__file__).parent.joinpath('check_memory.py')
+            xsd_file = pathlib.Path(__file__).parent.absolute().joinpath(
+                'test_cases/examples/collection/collection.xsd'
+            )
+            xml_file = pathlib.Path(dirname).joinpath('collection.xml')
+
+            generator = XmlInstanceGenerator(XMLSchema(xsd_file))
+            generator.write(xml_file, size='1MB', schema_location=xsd_file.as_uri())
+
+            cmd = [sys.executable, python_script, '7', str(xml_file)]
+            output = subprocess.check_output(cmd, text=True)
+            validate_mem = self.get_memory_usage(output)
+
+            cmd = [sys.executable, python_script, '8', str(xml_file)]
+            output = subprocess.check_output(cmd, text=True)
+            lazy_validate_mem = self.get_memory_usage(output)
+
+            self.assertLess(lazy_validate_mem, validate_mem)
+
 
 if __name__ == '__main__':
     from xmlschema.testing import run_xmlschema_tests
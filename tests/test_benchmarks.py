@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""Tests concerning the benchmark suite."""
+import unittest
+import io
+import json
+import pathlib
+import tempfile
+
+from xmlschema import XMLSchema
+from xmlschema.exceptions import XMLSchemaValueError
+from xmlschema.benchmarks import BENCHMARK_SCHEMA, BENCHMARKS, parse_size, \
+    write_document, BenchmarkResult, Regression, run_benchmarks, compare_results, \
+    format_results, format_regressions, SELECTOR_PATHS, run_selector_benchmarks, \
+    format_selector_results
+from xmlschema.testing import run_xmlschema_tests
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.report = run_benchmarks(sizes=['2KB', 4096], rounds=1)
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size(100), 100)
+        self.assertEqual(parse_size('100'), 100)
+        self.assertEqual(parse_size('100B'), 100)
+        self.assertEqual(parse_size('64KB'), 65536)
+        self.assertEqual(parse_size('1.5 mb'), 1572864)
+        self.assertEqual(parse_size('2G'), 2147483648)
+
+        with self.assertRaises(XMLSchemaValueError):
+            parse_size('64 KiB')
+
+    def test_write_document(self):
+        schema = XMLSchema(BENCHMARK_SCHEMA)
+
+        for size in (0, 1000, 20000):
+            fp = io.StringIO()
+            count = write_document(fp, size)
+            xml_data = fp.getvalue()
+            self.assertGreaterEqual(len(xml_data), size)
+            self.assertLess(len(xml_data), size + 400)
+            self.assertEqual(xml_data.count('<record '), count)
+            schema.validate(io.StringIO(xml_data))
+
+        fp = io.StringIO()
+        write_document(fp, 20000)
+        self.assertEqual(fp.getvalue(), xml_data)
+
+    def test_run_benchmarks(self):
+        keys = [BenchmarkResult(**item).key for item in self.report['results']]
+        self.assertEqual(keys[0], 'build[0]')
+        self.assertEqual(len(keys), 1 + 2 * (len(BENCHMARKS) - 1))
+        self.assertIn('validate[2048]', keys)
+        self.assertIn('xpath_find[4096]', keys)
+
+        for item in self.report['results']:
+            self.assertEqual(item['rounds'], 1)
+            self.assertEqual(item['min'], item['median'])
+            self.assertGreater(item['peak_memory'], 0)
+
+        self.assertIn('xmlschema', self.report['metadata'])
+        self.assertEqual(json.loads(json.dumps(self.report)), self.report)
+
+        report = run_benchmarks(sizes=['1KB'], names=['decode'], rounds=2, memory=False)
+        self.assertEqual(len(report['results']), 1)
+        self.assertEqual(report['results'][0]['rounds'], 2)
+        self.assertIsNone(report['results'][0]['peak_memory'])
+
+        with tempfile.TemporaryDirectory() as workdir:
+            run_benchmarks(sizes=['1KB'], names=['validate'], workdir=workdir)
+            self.assertTrue(pathlib.Path(workdir).joinpath('benchmark-1024.xml').is_file())
+
+        with self.assertRaises(XMLSchemaValueError):
+            run_benchmarks(names=['unknown'])
+        with self.assertRaises(XMLSchemaValueError):
+            run_benchmarks(rounds=0)
+
+    def test_compare_results(self):
+        self.assertListEqual(compare_results(self.report, self.report), [])
+
+        current = json.loads(json.dumps(self.report))
+        current['results'][1]['min'] *= 1.5
+        current['results'][2]['peak_memory'] *= 2
+        current['results'][3]['mean'] *= 2
+        del current['results'][4]
+
+        regressions = compare_results(self.report, current)
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(regressions[0].metric, 'min')
+        self.assertAlmostEqual(regressions[0].ratio, 1.5)
+        self.assertEqual(regressions[1].metric, 'peak_memory')
+
+        self.assertEqual(len(compare_results(self.report, current, threshold=0.6)), 1)
+        self.assertEqual(len(compare_results(self.report, current, metrics=['mean'])), 1)
+        self.assertEqual(len(compare_results(current, self.report)), 0)
+
+        with tempfile.TemporaryDirectory() as dirname:
+            baseline_file = pathlib.Path(dirname).joinpath('baseline.json')
+            baseline_file.write_text(json.dumps(self.report))
+            self.assertEqual(len(compare_results(baseline_file, current)), 2)
+
+        with self.assertRaises(XMLSchemaValueError):
+            compare_results(self.report, current, threshold=-1.0)
+        with self.assertRaises(XMLSchemaValueError):
+            compare_results(self.report, current, metrics=['max'])
+
+    def test_format_functions(self):
+        lines = format_results(self.report).split('\n')
+        self.assertTrue(lines[0].startswith('Benchmarks (xmlschema '))
+        self.assertEqual(len(lines), len(self.report['results']) + 2)
+
+        self.assertEqual(format_regressions([]), 'No regressions found')
+        report = format_regressions([Regression('decode[1024]', 'min', 0.5, 1.0)])
+        self.assertIn('decode[1024] min: 0.5 -> 1 (2.00x)', report)
+        self.assertEqual(Regression('build[0]', 'min', 0.0, 1.0).ratio, float('inf'))
+
+    def test_selector_benchmarks(self):
+        rows = run_selector_benchmarks(size='4KB', rounds=1)
+        self.assertListEqual([row['path'] for row in rows], list(SELECTOR_PATHS))
+        self.assertEqual(rows[0]['engine'], 'native')
+        self.assertEqual(rows[3]['engine'], 'walk')
+        self.assertEqual(rows[-1]['engine'], 'xpath')
+
+        for row in rows:
+            for key in ('xpath_iterfind', 'xpath_decode',
+                        'elementpath_iterfind', 'elementpath_decode'):
+                self.assertGreaterEqual(row[key], 0.0)
+
+        lines = format_selector_results(rows).split('\n')
+        self.assertEqual(len(lines), len(rows) + 1)
+        self.assertIn('b:record//b:note', lines[6])
+
+        with self.assertRaises(XMLSchemaValueError):
+            run_selector_benchmarks(rounds=0)
+
+
+if __name__ == '__main__':
+    run_xmlschema_tests('benchmarks')
@@ -13,14 +13,17 @@ import unittest
 from unittest.mock import patch
 import glob
 import io
+import json
 import logging
 import pathlib
 import os
 import platform
 import sys
+import tempfile
 
 import xmlschema
-from xmlschema.cli import get_loglevel, get_converter, validate, xml2json, json2xml
+from xmlschema.cli import get_loglevel, get_converter, validate, xml2json, json2xml, \
+    profile, benchmark
 from xmlschema.testing import run_xmlschema_tests
 
 WORK_DIRECTORY = os.getcwd()
@@ -44,6 +47,16 @@ class TestConsoleScripts(unittest.TestCase):
             with self.assertRaises(SystemExit) as self.ctx:
                 json2xml()
 
+    def run_profile(self, *args):
+        with patch.object(sys, 'argv', ['xmlschema-profile'] + list(args)):
+            with self.assertRaises(SystemExit) as self.ctx:
+                profile()
+
+    def run_benchmark(self, *args):
+        with patch.object(sys, 'argv', ['xmlschema-benchmark'] + list(args)):
+            with self.assertRaises(SystemExit) as self.ctx:
+                benchmark()
+
     def setUp(self):
         vehicles_dir = pathlib.Path(__file__).parent.joinpath('test_cases/examples/vehicles/')
         os.chdir(str(vehicles_dir))
@@ -232,6 +245,57 @@ class TestConsoleScripts(unittest.TestCase):
         self.assertIn("skip vehicles-test.xml: the destination file exists!",
                       mock_out.getvalue())
 
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_profile_command(self, mock_out, mock_err):
+        self.run_profile('vehicles.xsd', '--sources=2')
+        self.assertEqual(mock_err.getvalue(), '')
+        self.assertTrue(mock_out.getvalue().startswith('Schema build profile'))
+        self.assertIn('meta-validation', mock_out.getvalue())
+        self.assertEqual(mock_out.getvalue().count('\nSource '), 2)
+        self.assertEqual('0', str(self.ctx.exception))
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_profile_command_json(self, mock_out, mock_err):
+        self.run_profile('--json', 'vehicles.xsd', 'unknown.xsd')
+        self.assertIn('unknown.xsd', mock_err.getvalue())
+        report = json.loads(mock_out.getvalue())
+        self.assertIn('imports', report['phases'])
+        self.assertEqual('1', str(self.ctx.exception))
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_benchmark_command(self, mock_out, mock_err):
+        with tempfile.TemporaryDirectory() as dirname:
+            results_file = os.path.join(dirname, 'results.json')
+            self.run_benchmark('run', '--sizes', '1KB', '--only', 'validate', 'decode',
+                               '--rounds=1', '-o', results_file)
+            self.assertEqual(mock_err.getvalue(), '')
+            self.assertTrue(mock_out.getvalue().startswith('Benchmarks (xmlschema'))
+            self.assertEqual('0', str(self.ctx.exception))
+
+            with open(results_file) as fp:
+                report = json.load(fp)
+            self.assertEqual(len(report['results']), 2)
+
+            self.run_benchmark('compare', results_file, results_file)
+            self.assertIn('No regressions found', mock_out.getvalue())
+            self.assertEqual('0', str(self.ctx.exception))
+
+            report['results'][0]['min'] *= 2
+            current_file = os.path.join(dirname, 'current.json')
+            with open(current_file, 'w') as fp:
+                json.dump(report, fp)
+
+            self.run_benchmark('compare', '--threshold=0.5', results_file, current_file)
+            self.assertIn('Found 1 regression(s)', mock_out.getvalue())
+            self.assertEqual('1', str(self.ctx.exception))
+
+            self.run_benchmark('compare', results_file, 'unknown.json')
+            self.assertIn('unknown.json', mock_err.getvalue())
+            self.assertEqual('2', str(self.ctx.exception))
+
     @patch('sys.stderr', new_callable=io.StringIO)
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_wrong_xsd_version(self, mock_out, mock_err):
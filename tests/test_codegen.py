@@ -19,13 +19,14 @@ import platform
 import importlib.util
 import tempfile
 from collections import namedtuple
+from decimal import Decimal
 from pathlib import Path
 from textwrap import dedent
 from xml.etree import ElementTree
 
 from elementpath import datatypes
 
-from xmlschema import XMLSchema10, XMLSchema11
+from xmlschema import XMLSchema10, XMLSchema11, XMLSchemaValidationError
 from xmlschema.names import XSD_ANY_TYPE, XSD_STRING, XSD_FLOAT
 
 try:
@@ -37,7 +38,8 @@ except ImportError:
     PythonGenerator = None
     DemoGenerator = None
 else:
-    from xmlschema.extras.codegen import filter_method, AbstractGenerator, PythonGenerator
+    from xmlschema.extras.codegen import filter_method, AbstractGenerator, \
+        PythonGenerator, PythonDecoderBuilder
 
     class DemoGenerator(AbstractGenerator):
         formal_language = 'Demo'
@@ -589,7 +591,7 @@ class TestPythonGenerator(TestAbstractGenerator):
     def test_list_templates(self):
         template_dir = Path(__file__).parent.joinpath('templates')
 
-        templates = {'sample.py.jinja', 'bindings.py.jinja'}
+        templates = {'sample.py.jinja', 'bindings.py.jinja', 'decoder.py.jinja'}
         templates.update(x.name for x in template_dir.glob('filters/*'))
         self.assertSetEqual(set(self.generator.list_templates()), templates)
 
@@ -627,6 +629,171 @@ class TestPythonGenerator(TestAbstractGenerator):
         finally:
             os.chdir(cwd)
 
+    def load_decoder_module(self, schema, dirname):
+        python_module = PythonGenerator(schema).render('decoder.py.jinja')[0]
+        ast_module = ast.parse(python_module)
+        self.assertIsInstance(ast_module, ast.Module)
+
+        module_path = os.path.join(dirname, 'decoder.py')
+        with open(module_path, 'w') as fp:
+            fp.write(python_module)
+
+        spec = importlib.util.spec_from_file_location('decoder', module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_decoder_module(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            module = self.load_decoder_module(self.col_schema, dirname)
+
+        self.assertEqual(module.SCHEMA_CLASS, self.schema_class.__name__)
+        self.assertIn('{http://example.com/ns/collection}collection', module.ROOT_ELEMENTS)
+
+        self.assertEqual(module.decode(self.col_xml_file),
+                         self.col_schema.decode(self.col_xml_file))
+        self.assertIsNone(module._schema)  # decoded by the generated functions
+        self.assertTrue(module.is_valid(self.col_xml_file))
+        self.assertIsNone(module._schema)
+
+        data, errors = module.decode(self.col_xml_file, validation='lax')
+        self.assertEqual(data, self.col_schema.decode(self.col_xml_file))
+        self.assertListEqual(errors, [])
+
+        # Invalid data and other options are processed by the schema
+        xml_file = casepath('examples/collection/collection-1_error.xml')
+        with self.assertRaises(XMLSchemaValidationError):
+            module.decode(xml_file)
+        self.assertIsNotNone(module._schema)
+        self.assertFalse(module.is_valid(xml_file))
+
+        data, errors = module.decode(xml_file, validation='lax')
+        self.assertEqual(len(errors), 1)
+
+        self.assertEqual(module.decode(self.col_xml_file, decimal_type=float),
+                         self.col_schema.decode(self.col_xml_file, decimal_type=float))
+
+    def test_decoder_conformance(self):
+        cases = [
+            ('examples/collection/collection.xsd', 'examples/collection/*.xml'),
+            ('examples/vehicles/vehicles.xsd', 'examples/vehicles/*.xml'),
+            ('features/decoder/simple-types.xsd', 'features/decoder/data*.xml'),
+            ('issues/issue_022/xsd_string.xsd', 'issues/issue_022/*.xml'),
+            ('issues/issue_073/issue_073.xsd', 'issues/issue_073/*.xml'),
+        ]
+        test_cases_dir = Path(casepath(''))
+
+        for xsd_file, pattern in cases:
+            schema = self.schema_class(casepath(xsd_file))
+            with tempfile.TemporaryDirectory() as dirname:
+                module = self.load_decoder_module(schema, dirname)
+
+            for xml_file in sorted(test_cases_dir.glob(pattern)):
+                with self.subTest(xml_file=xml_file.name):
+                    try:
+                        expected, errors = schema.decode(xml_file, validation='lax')
+                    except (ValueError, TypeError, OSError):
+                        continue  # a resource or a schema loading error
+
+                    module._schema = None
+                    data, module_errors = module.decode(xml_file, validation='lax')
+                    self.assertEqual(data, expected)
+                    self.assertEqual(len(module_errors), len(errors))
+
+    def test_decoder_unsupported_components(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element ref="item" maxOccurs="unbounded"/>
+                    <xs:any namespace="##other" processContents="lax" minOccurs="0"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:element name="item">
+                <xs:complexType mixed="true">
+                  <xs:attribute name="id" type="xs:ID"/>
+                </xs:complexType>
+              </xs:element>
+              <xs:element name="code">
+                <xs:simpleType>
+                  <xs:restriction base="xs:string">
+                    <xs:pattern value="[A-Z]{2}\\d+"/>
+                    <xs:maxLength value="6"/>
+                  </xs:restriction>
+                </xs:simpleType>
+              </xs:element>
+            </xs:schema>"""))
+
+        builder = PythonDecoderBuilder(schema)
+        self.assertEqual(repr(builder), f'PythonDecoderBuilder(schema={schema!r})')
+        self.assertListEqual(builder.root_elements, [('code', 'decode_code_element')])
+        self.assertSetEqual(set(builder.unsupported),
+                            {schema.elements['root'], schema.elements['item']})
+        self.assertIn('mixed content', builder.unsupported[schema.elements['item']])
+
+        with tempfile.TemporaryDirectory() as dirname:
+            module = self.load_decoder_module(schema, dirname)
+
+        self.assertEqual(module.decode('<code>AB12</code>'), 'AB12')
+        self.assertIsNone(module._schema)
+        self.assertEqual(module.decode('<root><item id="a">x</item></root>'),
+                         {'item': [{'@id': 'a', '$': 'x'}]})
+        self.assertIsNotNone(module._schema)
+
+        for xml_data in ('<code>ab12</code>', '<code>AB1234567</code>', '<code a="1"/>'):
+            module._schema = None
+            with self.assertRaises(XMLSchemaValidationError):
+                module.decode(xml_data)
+            self.assertIsNotNone(module._schema)
+
+    def test_decoder_id_references(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="a" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:attribute name="id" type="xs:ID"/>
+                        <xs:attribute name="ref" type="xs:IDREF"/>
+                        <xs:attribute name="refs" type="xs:IDREFS"/>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>"""))
+
+        with tempfile.TemporaryDirectory() as dirname:
+            module = self.load_decoder_module(schema, dirname)
+
+        for xml_data in ('<root><a ref="y"/><a id="x"/><a id="y" refs="x y"/></root>',
+                         '<root><a id="x"/><a ref="nope"/></root>',
+                         '<root><a id="x" refs="x nope"/></root>',
+                         '<root><a id="x"/><a id="x"/></root>'):
+            module._schema = None
+            self.assertEqual(module.is_valid(xml_data), schema.is_valid(xml_data))
+
+        module._schema = None
+        xml_data = '<root><a ref="y"/><a id="y"/></root>'
+        self.assertEqual(module.decode(xml_data), schema.decode(xml_data))
+        self.assertIsNone(module._schema)
+
+        xml_data = '<root><a id="x"/><a ref="nope"/></root>'
+        self.assertEqual(module.decode(xml_data), schema.decode(xml_data))
+        self.assertIsNotNone(module._schema)
+
+    def test_decoder_literals(self):
+        self.assertEqual(PythonDecoderBuilder.literal('a'), "'a'")
+        self.assertEqual(PythonDecoderBuilder.literal(1.5), '1.5')
+        self.assertEqual(PythonDecoderBuilder.literal(float('-inf')), "float('-inf')")
+        self.assertEqual(PythonDecoderBuilder.literal(Decimal('1.0')),
+                         "Decimal('1.0')")
+        self.assertEqual(PythonDecoderBuilder.literal([1, True]), '[1, True]')
+        self.assertIsNone(PythonDecoderBuilder.literal(datatypes.Date10(2020, 1, 1)))
+
 
 @unittest.skipIf(jinja2 is None, "jinja2 library is not installed!")
 class TestPythonGenerator11(TestPythonGenerator):
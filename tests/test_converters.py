@@ -8,6 +8,7 @@
 #
 # @author Davide Brunato <brunato@sissa.it>
 #
+import copy
 import unittest
 import warnings
 from pathlib import Path
@@ -28,6 +29,8 @@ from xmlschema.testing import etree_elements_assert_equal, run_xmlschema_tests
 from xmlschema.converters import XMLSchemaConverter, UnorderedConverter, \
     ParkerConverter, BadgerFishConverter, AbderaConverter, JsonMLConverter, \
     ColumnarConverter, GDataConverter
+from xmlschema.converters.base import DecodePlan
+from xmlschema.namespaces import XMLNS_SCOPES_CACHE_SIZE
 from xmlschema.dataobjects import DataElementConverter
 
 
@@ -226,6 +229,66 @@ class TestConverters(unittest.TestCase):
         self.assertEqual(obj.tag, self.col_xml_root.tag)
         self.assertEqual(obj.nsmap, self.col_nsmap)
 
+    def test_decode_plans(self):
+        col_schema = XMLSchema(self.col_xsd_filename)
+        xsd_element = col_schema.elements['collection']
+        xsd_object = xsd_element.type.content[0]
+
+        converter = XMLSchemaConverter(namespaces={'col': self.col_namespace})
+        plan = converter.get_decode_plan(xsd_element)
+        self.assertIsInstance(plan, DecodePlan)
+        self.assertIs(plan.xsd_type, xsd_element.type)
+        self.assertIs(converter.get_decode_plan(xsd_element, xsd_element.type), plan)
+        self.assertTrue(repr(plan).startswith('DecodePlan(xsd_element='))
+
+        self.assertEqual(plan.map_qname(xsd_element.name), 'col:collection')
+        self.assertEqual(plan.names, {xsd_element.name: 'col:collection'})
+        self.assertTrue(plan.is_single(None))
+        self.assertFalse(plan.is_single(xsd_object))
+        self.assertIn(xsd_object, plan.cardinality)
+
+        object_plan = converter.get_decode_plan(xsd_object)
+        self.assertListEqual(list(object_plan.map_attributes([('id', 'b1')])),
+                             [('@id', 'b1')])
+        self.assertEqual(object_plan.attribute_names, {'id': '@id'})
+
+        # A change of the namespace map switches to another set of plans
+        converter['tns'] = 'http://example.test/ns'
+        self.assertIsNot(converter.get_decode_plan(xsd_element), plan)
+        del converter['tns']
+        self.assertIs(converter.get_decode_plan(xsd_element), plan)
+
+        converter = copy.copy(converter)
+        self.assertIsNot(converter.get_decode_plan(xsd_element), plan)
+
+        obj = col_schema.decode(self.col_xml_filename, converter=converter)
+        self.assertEqual(col_schema.decode(self.col_xml_filename), obj)
+
+        # Plans caches are bounded like the caches of namespace scopes
+        for k in range(XMLNS_SCOPES_CACHE_SIZE + 10):
+            converter[f'p{k}'] = f'http://example.test/ns{k}'
+            converter.get_decode_plan(xsd_element)
+            del converter[f'p{k}']
+
+        self.assertLessEqual(len(converter._plan_versions), XMLNS_SCOPES_CACHE_SIZE)
+        self.assertLessEqual(len(converter._plan_contexts), XMLNS_SCOPES_CACHE_SIZE)
+        self.assertEqual(converter.get_decode_plan(xsd_element).map_qname(xsd_element.name),
+                         'col:collection')
+
+    def test_decode_plans_with_custom_mapping(self):
+
+        class UpperCaseConverter(XMLSchemaConverter):
+            __slots__ = ()
+
+            def map_attributes(self, attributes):
+                for name, value in super().map_attributes(attributes):
+                    yield name.upper(), value
+
+        col_schema = XMLSchema(self.col_xsd_filename)
+        obj = col_schema.decode(self.col_xml_filename, converter=UpperCaseConverter)
+        self.assertIn('@ID', obj['object'][0])
+        self.assertNotIn('@id', obj['object'][0])
+
     def test_decode_encode_default_converter(self):
         col_schema = XMLSchema(self.col_xsd_filename)
 
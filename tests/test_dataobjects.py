@@ -10,8 +10,10 @@
 #
 import unittest
 import copy
+import pickle
 import xml.etree.ElementTree as ElementTree
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict
 
 from xmlschema import XMLSchema10, XMLSchema11, fetch_namespaces, etree_tostring, \
@@ -21,7 +23,8 @@ from xmlschema import XMLSchema10, XMLSchema11, fetch_namespaces, etree_tostring
 from xmlschema.validators import XsdAttributeGroup
 from xmlschema.utils.etree import is_etree_element
 from xmlschema.names import XSI_TYPE
-from xmlschema.dataobjects import DataBindingMeta, DataBindingConverter
+from xmlschema.dataobjects import DataBindingMeta, DataBindingConverter, \
+    CompactDataElement, EMPTY_NSMAP
 from xmlschema.testing import etree_elements_assert_equal, run_xmlschema_tests
 
 
@@ -79,6 +82,87 @@ class TestDataElementInterface(unittest.TestCase):
         self.assertEqual(DataElement('foo', value=10.0).text, '10.0')
 
 
+class TestCompactDataElementInterface(unittest.TestCase):
+
+    def test_slots(self):
+        data_element = CompactDataElement('foo', value=10)
+        self.assertIsInstance(data_element, DataElement)
+        self.assertEqual(repr(data_element), "CompactDataElement(tag='foo')")
+        self.assertEqual(data_element.value, 10)
+        self.assertIsNone(data_element.tail)
+        self.assertIsNone(data_element.xmlns)
+        self.assertIsNone(data_element.xsd_element)
+        self.assertIsNone(data_element.xsd_type)
+        self.assertEqual(data_element.__dict__, {})
+
+        data_element.custom = 1  # the instance dictionary is allocated on demand
+        self.assertEqual(data_element.__dict__, {'custom': 1})
+        element = DataElement('foo')
+        element.custom = 1
+        self.assertEqual(element.custom, 1)
+
+    def test_lazy_storages(self):
+        data_element = CompactDataElement('foo')
+        self.assertIsNone(data_element._attrib)
+        self.assertIsNone(data_element.get('a'))
+        self.assertIsNone(data_element._attrib)
+        self.assertEqual(data_element.attrib, {})
+        self.assertEqual(data_element._attrib, {})
+
+        data_element.set('a', 9)
+        self.assertEqual(data_element.get('a'), 9)
+
+        self.assertIsInstance(data_element._children, tuple)
+        self.assertEqual(len(data_element), 0)
+        self.assertEqual(list(data_element), [])
+        with self.assertRaises(IndexError):
+            data_element[0] = CompactDataElement('bar')
+        with self.assertRaises(IndexError):
+            del data_element[0]
+
+        data_element.append(CompactDataElement('bar'))
+        data_element.append(CompactDataElement('baz'))
+        self.assertIsInstance(data_element._children, list)
+        self.assertEqual([e.tag for e in data_element], ['bar', 'baz'])
+        del data_element[0]
+        self.assertEqual([e.tag for e in data_element.iter()], ['foo', 'baz'])
+
+    def test_pickling_and_copying(self):
+        nsmap = {'tns': 'http://xmlschema.test/ns'}
+        data_element = CompactDataElement('foo', value=10, attrib={'a': 1}, nsmap=nsmap)
+        data_element.append(CompactDataElement('bar'))
+        data_element.custom = 'baz'
+
+        for obj in (pickle.loads(pickle.dumps(data_element)), copy.deepcopy(data_element)):
+            self.assertIsInstance(obj, CompactDataElement)
+            self.assertEqual(obj.value, 10)
+            self.assertEqual(obj.attrib, {'a': 1})
+            self.assertEqual(obj.nsmap, nsmap)
+            self.assertIsInstance(obj.nsmap, MappingProxyType)
+            self.assertEqual(obj.custom, 'baz')
+            self.assertEqual([e.tag for e in obj.iter()], ['foo', 'bar'])
+            self.assertIsNone(obj[0]._attrib)
+            self.assertIs(obj[0].nsmap, EMPTY_NSMAP)
+            self.assertIsInstance(obj[0]._children, tuple)
+
+            obj[0].append(CompactDataElement('qux'))
+            self.assertEqual(len(obj[0]), 1)
+            self.assertEqual(len(data_element[0]), 0)
+
+    def test_shared_nsmap(self):
+        self.assertEqual(CompactDataElement('foo').nsmap, {})
+        self.assertIs(CompactDataElement('foo').nsmap, CompactDataElement('bar').nsmap)
+
+        nsmap = {'tns': 'http://xmlschema.test/ns'}
+        data_element = CompactDataElement('foo', nsmap=nsmap)
+        self.assertEqual(data_element.nsmap, nsmap)
+        with self.assertRaises(TypeError):
+            data_element.nsmap['tns0'] = 'http://xmlschema.test/ns0'  # type: ignore
+
+        other = CompactDataElement('bar', nsmap=data_element.nsmap)
+        self.assertIs(other.nsmap, data_element.nsmap)
+
+
 class TestDataObjects(unittest.TestCase):
 
     schema_class = XMLSchema10
@@ -485,6 +569,40 @@ class TestDataObjects(unittest.TestCase):
             converter.element_encode(col_data, col_data[0].xsd_element)
         self.assertEqual("Unmatched tag", str(ec.exception))
 
+    def test_compact_data_elements(self):
+        converter = self.converter(compact=True)
+        self.assertTrue(converter.compact)
+        self.assertIs(converter.data_element_class, CompactDataElement)
+        self.assertTrue(converter.replace().compact)
+
+        self.col_schema.maps.clear_bindings()
+        col_data = self.col_schema.decode(self.col_xml_filename, converter=converter)
+        self.assertIsInstance(col_data, CompactDataElement)
+        self.assertTrue(all(e.nsmap is col_data.nsmap for e in col_data.iter()))
+        self.assertEqual(col_data.nsmap, self.col_nsmap)
+        self.assertEqual(col_data[0].get('id'), 'b0836217462')
+        self.assertIsNone(col_data[0][0]._attrib)
+        self.assertTrue(col_data.is_valid())
+
+        self.col_schema.maps.clear_bindings()
+        expected = self.col_schema.decode(self.col_xml_filename, converter=self.converter)
+        self.assertEqual([(e.tag, e.value, e.attrib) for e in col_data.iter()],
+                         [(e.tag, e.value, e.attrib) for e in expected.iter()])
+
+        root = col_data.encode()
+        etree_elements_assert_equal(root, self.col_xml_root, strict=False)
+        self.col_schema.maps.clear_bindings()
+
+        # Namespace maps are interned per namespace version and by content
+        converter = self.converter(namespaces={'a': 'http://xmlschema.test/a'}, compact=True)
+        nsmap = converter.get_nsmap()
+        self.assertIs(converter.get_nsmap(), nsmap)
+        converter['b'] = 'http://xmlschema.test/b'
+        self.assertEqual(converter.get_nsmap(), {'a': 'http://xmlschema.test/a',
+                                                 'b': 'http://xmlschema.test/b'})
+        del converter['b']
+        self.assertIs(converter.get_nsmap(), nsmap)
+
     def test_decoded_names__issue_314(self):
         xsd_file = self.casepath('issues/issue_314/issue_314.xsd')
         xml_file = self.casepath('issues/issue_314/issue_314.xml')
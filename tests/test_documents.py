@@ -28,6 +28,7 @@ from xmlschema import XMLSchema10, XMLSchema11, XmlDocument, XMLResourceError, \
     XMLSchemaValidationError, XMLSchemaDecodeError, to_json, from_json, validate, \
     XMLSchemaParseError, is_valid, to_dict, to_etree, JsonMLConverter
 
+from xmlschema.exceptions import XMLSchemaTypeError
 from xmlschema.names import XSD_NAMESPACE, XSI_NAMESPACE, XSD_SCHEMA
 from xmlschema.utils.etree import is_etree_element, is_etree_document, is_lxml_element
 from xmlschema.resources import XMLResource
@@ -491,11 +492,44 @@ class TestXmlDocuments(XMLSchemaTestCase):
                 self.assertIs(xml_document.schema, schema)
 
             col_file_path.unlink()
+            xml_document = XmlDocument(self.col_xml_file)
+            xml_document.write(str(col_file_path))
+            expected = col_file_path.read_bytes()
+            self.assertEqual(expected, xml_document.tostring(encoding='us-ascii').encode())
+
+            # A lazy resource is re-read from the source
             xml_document = XmlDocument(self.col_xml_file, lazy=True)
+            xml_document.write(str(col_file_path))
+            self.assertEqual(col_file_path.read_bytes(), expected)
+
+            fp = io.StringIO()
+            xml_document.write(fp, encoding='unicode')
+            self.assertEqual(fp.getvalue(), XmlDocument(self.col_xml_file).tostring())
+
             with self.assertRaises(XMLResourceError) as ctx:
-                xml_document.write(str(col_file_path))
+                xml_document.write(str(col_file_path), method='text')
             self.assertEqual(str(ctx.exception), "cannot serialize a lazy XML resource")
 
+            with self.assertRaises(XMLSchemaTypeError):
+                xml_document.write(None)
+
+    def test_xml_document_write_default_namespace(self):
+        # An unused default namespace is not declared, like with etree_tostring()
+        for lazy in (False, True):
+            xml_document = XmlDocument('<root><child>x</child></root>',
+                                       validation='skip', lazy=lazy)
+            fp = io.StringIO()
+            xml_document.write(fp, encoding='unicode', default_namespace='urn:x')
+            self.assertEqual(fp.getvalue(), '<root><child>x</child></root>')
+
+        menu_xml_file = self.casepath('examples/menù/menù.xml')
+        for lazy in (False, True):
+            xml_document = XmlDocument(menu_xml_file, lazy=lazy)
+            fp = io.StringIO()
+            xml_document.write(fp, encoding='unicode', default_namespace='urn:x')
+            self.assertEqual(fp.getvalue(), XmlDocument(menu_xml_file).tostring())
+            self.assertNotIn('urn:x', fp.getvalue())
+
     def test_xml_document_etree_interface(self):
         xml_document = XmlDocument(self.vh_xml_file)
 
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""Tests concerning the generator of synthetic XML instances."""
+import unittest
+import io
+import pathlib
+import tempfile
+from textwrap import dedent
+from xml.etree import ElementTree
+
+from xmlschema import XMLSchema, XMLSchema11
+from xmlschema.exceptions import XMLSchemaValueError
+from xmlschema.benchmarks import BENCHMARK_SCHEMA, run_benchmarks
+from xmlschema.extras.instances import XmlInstanceGenerator
+from xmlschema.testing import run_xmlschema_tests
+
+
+def casepath(relative_path):
+    return str(pathlib.Path(__file__).parent.joinpath('test_cases', relative_path))
+
+
+class TestXmlInstanceGenerator(unittest.TestCase):
+
+    def check_instances(self, schema, element=None, seeds=range(3), size=None):
+        for seed in seeds:
+            generator = XmlInstanceGenerator(schema, seed=seed)
+            xml_data = generator.tostring(element, size=size)
+            self.assertTrue(schema.is_valid(xml_data), msg=xml_data)
+
+    def test_valid_instances(self):
+        self.check_instances(XMLSchema(BENCHMARK_SCHEMA))
+        self.check_instances(XMLSchema(casepath('examples/collection/collection.xsd')))
+        self.check_instances(XMLSchema(casepath('examples/vehicles/vehicles.xsd')))
+        self.check_instances(XMLSchema(casepath('features/decoder/simple-types.xsd')))
+
+        schema = XMLSchema11(casepath('issues/issue_018/issue_018.xsd'))
+        self.check_instances(schema, seeds=range(5))
+
+    def test_root_element(self):
+        schema = XMLSchema(casepath('examples/vehicles/vehicles.xsd'))
+        generator = XmlInstanceGenerator(schema)
+        self.assertEqual(generator.get_root_element().local_name, 'vehicles')
+        self.assertIs(generator.get_root_element('vh:cars'), schema.elements['cars'])
+        self.assertIs(generator.get_root_element('cars'), schema.elements['cars'])
+
+        with self.assertRaises(XMLSchemaValueError):
+            generator.get_root_element('unknown')
+
+        root = ElementTree.XML(generator.tostring('cars'))
+        self.assertEqual(root.tag, '{http://example.com/vehicles}cars')
+        self.assertTrue(schema.is_valid(ElementTree.tostring(root, encoding='unicode')))
+
+    def test_deterministic_output(self):
+        schema = XMLSchema(casepath('examples/collection/collection.xsd'))
+        generator = XmlInstanceGenerator(schema, seed=7)
+        xml_data = generator.tostring(size=5000)
+        self.assertEqual(generator.tostring(size=5000), xml_data)
+        self.assertEqual(XmlInstanceGenerator(schema, seed=7).tostring(size=5000), xml_data)
+        self.assertNotEqual(XmlInstanceGenerator(schema, seed=8).tostring(size=5000), xml_data)
+
+    def test_target_size(self):
+        schema = XMLSchema(casepath('examples/collection/collection.xsd'))
+        generator = XmlInstanceGenerator(schema)
+
+        for size in (1000, '20KB', 100000):
+            fp = io.StringIO()
+            count = generator.write(fp, size=size)
+            xml_data = fp.getvalue()
+            self.assertGreaterEqual(len(xml_data), 1000 if size == 1000 else 20000)
+            self.assertLess(len(xml_data), 110000)
+            self.assertEqual(len(list(ElementTree.XML(xml_data).iter())), count)
+            self.assertTrue(schema.is_valid(xml_data))
+
+        with tempfile.TemporaryDirectory() as dirname:
+            xml_file = pathlib.Path(dirname).joinpath('collection.xml')
+            xsd_file = pathlib.Path(casepath('examples/collection/collection.xsd'))
+            generator.write(xml_file, size='64KB', schema_location=xsd_file.as_uri())
+            self.assertGreaterEqual(xml_file.stat().st_size, 65536)
+
+            schema.validate(xml_file)
+            root = ElementTree.parse(xml_file).getroot()
+            self.assertIn(xsd_file.as_uri(), root.attrib[
+                '{http://www.w3.org/2001/XMLSchema-instance}schemaLocation'
+            ])
+
+    def test_identity_constraints(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="item" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:attribute name="code" type="xs:byte" use="required"/>
+                        <xs:attribute name="uid" type="xs:ID"/>
+                      </xs:complexType>
+                    </xs:element>
+                    <xs:element name="ref" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:attribute name="code" type="xs:byte"/>
+                        <xs:attribute name="uid" type="xs:IDREF"/>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+                <xs:key name="item_code">
+                  <xs:selector xpath="item"/>
+                  <xs:field xpath="@code"/>
+                </xs:key>
+                <xs:keyref name="ref_code" refer="item_code">
+                  <xs:selector xpath="ref"/>
+                  <xs:field xpath="@code"/>
+                </xs:keyref>
+              </xs:element>
+            </xs:schema>"""))
+
+        generator = XmlInstanceGenerator(schema, max_repeat=20)
+        root = ElementTree.XML(generator.tostring(size=5000))
+        codes = [e.get('code') for e in root.iter('item')]
+        self.assertGreater(len(codes), 100)
+        self.assertEqual(len(codes), len(set(codes)))
+        self.assertTrue(all(e.get('code') in codes for e in root.iter('ref')
+                            if e.get('code') is not None))
+
+        uids = [e.get('uid') for e in root.iter('item') if e.get('uid') is not None]
+        self.assertEqual(len(uids), len(set(uids)))
+        self.assertTrue(all(e.get('uid') in uids for e in root.iter('ref')
+                            if e.get('uid') is not None))
+        self.check_instances(schema, size=2000)
+
+    def test_facets(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:choice maxOccurs="unbounded">
+                    <xs:element name="code">
+                      <xs:simpleType>
+                        <xs:restriction base="xs:string">
+                          <xs:pattern value="[A-Z]{3}-\\d{2,4}(/[a-f]+)?"/>
+                        </xs:restriction>
+                      </xs:simpleType>
+                    </xs:element>
+                    <xs:element name="color">
+                      <xs:simpleType>
+                        <xs:restriction base="xs:token">
+                          <xs:enumeration value="red"/>
+                          <xs:enumeration value="green"/>
+                        </xs:restriction>
+                      </xs:simpleType>
+                    </xs:element>
+                    <xs:element name="amount">
+                      <xs:simpleType>
+                        <xs:restriction base="xs:decimal">
+                          <xs:minExclusive value="10"/>
+                          <xs:maxInclusive value="20"/>
+                          <xs:fractionDigits value="1"/>
+                        </xs:restriction>
+                      </xs:simpleType>
+                    </xs:element>
+                    <xs:element name="dates">
+                      <xs:simpleType>
+                        <xs:list itemType="xs:date"/>
+                      </xs:simpleType>
+                    </xs:element>
+                  </xs:choice>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>"""))
+
+        root = ElementTree.XML(XmlInstanceGenerator(schema).tostring(size=3000))
+        self.assertGreater(len(root), 20)
+        for elem in root:
+            if elem.tag == 'code':
+                self.assertRegex(elem.text, r'^[A-Z]{3}-\d{2,4}(/[a-f]+)?$')
+            elif elem.tag == 'color':
+                self.assertIn(elem.text, ('red', 'green'))
+            elif elem.tag == 'amount':
+                self.assertTrue(10 < float(elem.text) <= 20)
+        self.check_instances(schema, size=3000)
+
+    def test_get_value(self):
+        schema = XMLSchema(BENCHMARK_SCHEMA)
+        generator = XmlInstanceGenerator(schema)
+        for name in ('int', 'date', 'QName', 'base64Binary', 'duration', 'anyURI'):
+            xsd_type = schema.meta_schema.types[name]
+            self.assertTrue(xsd_type.is_valid(generator.get_value(xsd_type)))
+
+    def test_errors(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:simpleType>
+                  <xs:restriction base="xs:string">
+                    <xs:length value="2"/>
+                    <xs:pattern value="a{3}"/>
+                  </xs:restriction>
+                </xs:simpleType>
+              </xs:element>
+              <xs:element name="node" abstract="true"/>
+            </xs:schema>"""))
+
+        generator = XmlInstanceGenerator(schema)
+        with self.assertRaises(XMLSchemaValueError) as ctx:
+            generator.tostring()
+        self.assertIn('cannot generate a valid value', str(ctx.exception))
+
+        with self.assertRaises(XMLSchemaValueError) as ctx:
+            generator.tostring('node')
+        self.assertIn('has no substitutes', str(ctx.exception))
+
+    def test_benchmarks_with_custom_schema(self):
+        report = run_benchmarks(sizes=['4KB'], names=['validate', 'encode', 'xpath_find'],
+                                rounds=1, memory=False,
+                                schema=casepath('examples/collection/collection.xsd'))
+        self.assertEqual(len(report['results']), 3)
+
+
+if __name__ == '__main__':
+    run_xmlschema_tests('synthetic XML instances')
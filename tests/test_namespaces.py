@@ -295,9 +295,8 @@ class TestNamespaceMapper(unittest.TestCase):
         self.assertEqual(mapper._xmlns_contexts[-1].level, 0)
         self.assertIs(mapper._xmlns_contexts[-1].xmlns, xmlns)
         self.assertEqual(mapper._xmlns_contexts[-1].namespaces,
-                         {'': 'http://example.test/foo'})
-        self.assertEqual(mapper._xmlns_contexts[-1].reverse,
-                         {'http://example.test/foo': ''})
+                         (('', 'http://example.test/foo'),))
+        self.assertEqual(mapper._xmlns_contexts[-1].reverse, ())
         self.assertListEqual(xmlns, [('', 'http://example.test/foo')])
 
         xmlns = mapper.set_xmlns_context(resource.root, 0)
@@ -323,6 +322,63 @@ class TestNamespaceMapper(unittest.TestCase):
         self.assertEqual(len(mapper._xmlns_contexts), 0)
         self.assertIsNone(xmlns)
 
+    def test_qname_memos(self):
+        mapper = NamespaceMapper(dict(xs=XSD_NAMESPACE))
+        qname = '{%s}element' % XSD_NAMESPACE
+
+        self.assertEqual(mapper.map_qname(qname), 'xs:element')
+        self.assertEqual(mapper._qnames, {qname: 'xs:element'})
+        self.assertEqual(mapper.unmap_qname('xs:element'), qname)
+        self.assertEqual(mapper._unqnames, {'xs:element': qname})
+
+        version = mapper._ns_version
+        mapper['xsd'] = XSD_NAMESPACE
+        self.assertNotEqual(mapper._ns_version, version)
+        self.assertEqual(mapper._qnames, {})
+        self.assertEqual(mapper.map_qname(qname), 'xsd:element')
+
+        mapper[''] = 'http://example.test/foo'
+        self.assertEqual(mapper.unmap_qname('foo'), '{http://example.test/foo}foo')
+        self.assertEqual(mapper.unmap_qname('foo', name_table=['foo']), 'foo')
+        self.assertNotIn('foo', mapper._qnames)
+
+    def test_stacked_xmlns_scopes(self):
+        xml_data = dedent("""\
+            <root xmlns="http://example.test/foo">
+                <tns:a xmlns:tns="http://example.test/bar"/>
+                <tns:b xmlns:tns="http://example.test/bar"/>
+                <c/>
+            </root>""")
+        resource = XMLResource(xml_data)
+        mapper = NamespaceMapper(source=resource)
+
+        mapper.set_xmlns_context(resource.root, 0)
+        root_version = mapper._ns_version
+        root_namespaces = mapper.namespaces.copy()
+        root_reverse = mapper._reverse.copy()
+
+        mapper.set_xmlns_context(resource.root[0], 1)
+        a_version = mapper._ns_version
+        self.assertNotEqual(a_version, root_version)
+        self.assertEqual(mapper['tns'], 'http://example.test/bar')
+        self.assertEqual(mapper.map_qname('{http://example.test/bar}a'), 'tns:a')
+
+        # Siblings with the same declarations share the version and the memos
+        mapper.set_xmlns_context(resource.root[1], 1)
+        self.assertEqual(len(mapper._xmlns_contexts), 2)
+        self.assertEqual(mapper._ns_version, a_version)
+        self.assertIn('{http://example.test/bar}a', mapper._qnames)
+
+        # Direct updates within a stacked context are reverted with the context
+        mapper['tns'] = 'http://example.test/baz'
+        self.assertNotEqual(mapper._ns_version, a_version)
+
+        mapper.set_xmlns_context(resource.root[2], 1)
+        self.assertEqual(len(mapper._xmlns_contexts), 1)
+        self.assertEqual(mapper._ns_version, root_version)
+        self.assertEqual(mapper.namespaces, root_namespaces)
+        self.assertEqual(list(mapper._reverse.items()), list(root_reverse.items()))
+
     def test_set_context_with_collapsed_xmlns_processing(self):
         resource = XMLResource(io.StringIO(self.xml_data))
 
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import gc
+import json
+import pathlib
+import threading
+
+from xmlschema import XMLSchema10, XMLSchema11, XMLResource
+from xmlschema.exceptions import XMLSchemaRuntimeError
+from xmlschema.profiler import BuildProfiler, PhaseStats, profile_phase, \
+    ComponentStats, DecodeProfiler, get_decode_profiler
+from xmlschema.validators import XsdElement, XsdAssert, ValidationContext
+from xmlschema.testing import XMLSchemaTestCase, run_xmlschema_tests
+
+
+class TestBuildProfiler(XMLSchemaTestCase):
+    cases_dir = pathlib.Path(__file__).absolute().parent.joinpath('test_cases')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vh_xsd_file = cls.casepath('examples/vehicles/vehicles.xsd')
+
+    def test_inactive_profiler(self):
+        with profile_phase('resource') as phase:
+            self.assertIsNone(phase)
+
+    def test_nested_phases(self):
+        with BuildProfiler() as profiler:
+            with profile_phase('outer', 'a.xsd') as outer:
+                self.assertEqual(outer.source, 'a.xsd')
+                for _ in range(3):
+                    with profile_phase('inner') as inner:
+                        self.assertEqual(inner.source, 'a.xsd')
+            with profile_phase('outer', 'b.xsd'):
+                pass
+
+        self.assertEqual(profiler.phases['outer'].count, 2)
+        self.assertEqual(profiler.phases['inner'].count, 3)
+        self.assertEqual(profiler.sources['a.xsd']['inner'].count, 3)
+        self.assertEqual(profiler.sources['b.xsd']['outer'].count, 1)
+        self.assertNotIn('inner', profiler.sources['b.xsd'])
+
+        # Exclusive times are accounted, so total wall time can't exceed the elapsed
+        self.assertLessEqual(sum(s.wall for s in profiler.phases.values()), profiler.elapsed)
+
+        with profile_phase('outer') as phase:
+            self.assertIsNone(phase)
+        self.assertEqual(profiler.phases['outer'].count, 2)
+
+        with profiler:
+            with self.assertRaises(XMLSchemaRuntimeError):
+                with profiler:
+                    pass
+
+    def test_schema_build_profile(self):
+        with BuildProfiler() as profiler:
+            schema = XMLSchema10(self.vh_xsd_file)
+
+        self.assertTrue(schema.built)
+        for name in ('resource', 'meta-validation', 'imports', 'globals-load',
+                     'build', 'build-types', 'build-elements', 'check', 'check-model'):
+            self.assertIn(name, profiler.phases)
+            self.assertIsInstance(profiler.phases[name], PhaseStats)
+
+        self.assertEqual(profiler.phases['resource'].count, 4)
+        self.assertEqual(profiler.phases['meta-validation'].count, 4)
+        self.assertIn(schema.url, profiler.sources)
+        self.assertIn('meta-validation', profiler.sources[schema.url])
+
+        report = profiler.report()
+        self.assertEqual(json.loads(json.dumps(report)), report)
+        self.assertEqual(report['phases']['resource']['count'], 4)
+        self.assertGreater(report['elapsed'], 0.0)
+
+        text = profiler.format_report(max_sources=1)
+        self.assertTrue(text.startswith('Schema build profile'))
+        self.assertEqual(text.count('\nSource '), 1)
+
+        profiler.clear()
+        self.assertEqual(profiler.phases, {})
+        self.assertEqual(profiler.sources, {})
+
+
+class TestDecodeProfiler(XMLSchemaTestCase):
+    cases_dir = pathlib.Path(__file__).absolute().parent.joinpath('test_cases')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vh_xsd_file = cls.casepath('examples/vehicles/vehicles.xsd')
+        cls.vh_xml_file = cls.casepath('examples/vehicles/vehicles.xml')
+        cls.vh_schema = XMLSchema10(cls.vh_xsd_file)
+
+    def test_context_binding(self):
+        raw_decode = XsdElement.__dict__['raw_decode']
+        assert_call = XsdAssert.__dict__['__call__']
+
+        with DecodeProfiler() as profiler:
+            # The component classes are not patched
+            self.assertIs(XsdElement.__dict__['raw_decode'], raw_decode)
+            self.assertIs(XsdAssert.__dict__['__call__'], assert_call)
+            self.assertIs(get_decode_profiler(), profiler)
+            self.assertIs(ValidationContext(XMLResource('<a/>')).profiler, profiler)
+
+            # Validations of other threads are not profiled
+            thread = threading.Thread(target=self.vh_schema.validate,
+                                      args=(self.vh_xml_file,))
+            thread.start()
+            thread.join()
+            self.assertEqual(profiler.stats, {})
+
+            with self.assertRaises(XMLSchemaRuntimeError):
+                with profiler:
+                    pass
+
+        self.assertIsNone(get_decode_profiler())
+        self.assertIsNone(ValidationContext(XMLResource('<a/>')).profiler)
+
+    def test_component_keys(self):
+        with DecodeProfiler() as profiler:
+            for _ in range(2):
+                schema = XMLSchema10(self.vh_xsd_file)
+                schema.validate(self.vh_xml_file)
+                del schema
+                gc.collect()
+
+        # Profiled components are kept alive, so their ids are not reused
+        components = [s for s in profiler.get_components()
+                      if s.component == 'XsdElement(vehicles)']
+        self.assertEqual(len(components), 2)
+        self.assertEqual([s.count for s in components], [1, 1])
+
+    def test_validation_profile(self):
+        with DecodeProfiler() as profiler:
+            self.vh_schema.validate(self.vh_xml_file)
+
+        self.assertGreater(profiler.elapsed, 0.0)
+        paths = {s.path for s in profiler.stats.values()}
+        self.assertIn('/vehicles', paths)
+        self.assertIn('/vehicles/cars/car', paths)
+
+        components = {s.component: s for s in profiler.get_components()}
+        self.assertIsInstance(components['XsdElement(car)'], ComponentStats)
+        self.assertEqual(components['XsdElement(car)'].count, 2)
+        self.assertEqual(components['XsdElement(vehicles)'].count, 1)
+
+        vehicles = components['XsdElement(vehicles)']
+        self.assertLessEqual(vehicles.exclusive, vehicles.cumulative)
+        self.assertLessEqual(sum(s.exclusive for s in profiler.stats.values()),
+                             profiler.elapsed)
+
+        report = profiler.report()
+        self.assertEqual(json.loads(json.dumps(report)), report)
+        self.assertEqual(len(report['components']), len(components))
+
+        text = profiler.format_report(max_items=3)
+        self.assertTrue(text.startswith('Decode profile'))
+        self.assertEqual(len(text.splitlines()), 5)
+        text = profiler.format_report(by_path=True)
+        self.assertIn('XsdElement(car) at /vehicles/cars/car', text)
+
+        profiler.clear()
+        self.assertEqual(profiler.stats, {})
+
+        # Profiling is disabled outside the context
+        self.vh_schema.validate(self.vh_xml_file)
+        self.assertEqual(profiler.stats, {})
+
+    def test_assertions_profile(self):
+        schema = XMLSchema11("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:attribute name="min" type="xs:int"/>
+                  <xs:attribute name="max" type="xs:int"/>
+                  <xs:assert test="@min le @max"/>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>""")
+
+        with DecodeProfiler() as profiler:
+            self.assertTrue(schema.is_valid('<root min="1" max="2"/>'))
+            self.assertFalse(schema.is_valid('<root min="3" max="2"/>'))
+
+        components = {s.component: s for s in profiler.get_components()}
+        self.assertEqual(components['XsdAtomicBuiltin(xs:int)'].count, 4)
+        stats = [s for s in profiler.get_components() if s.component.startswith('XsdAssert')]
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0].count, 2)
+
+
+if __name__ == '__main__':
+    run_xmlschema_tests('profiler')
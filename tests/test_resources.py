@@ -16,21 +16,27 @@ import contextlib
 import copy
 import pathlib
 import platform
+import tempfile
+import time
 import warnings
+from email.message import Message
 from io import StringIO, BytesIO
-from urllib.request import urlopen, build_opener, FileHandler
+from urllib.error import HTTPError
+from urllib.request import urlopen, build_opener, BaseHandler, FileHandler
 from urllib.response import addinfourl
 from urllib.parse import urlsplit, uses_relative
 from pathlib import Path, PurePath, PureWindowsPath
 from xml.etree import ElementTree
 
+from elementpath import build_node_tree, select
+
 try:
     import lxml.etree as lxml_etree
 except ImportError:
     lxml_etree = None
 
 from xmlschema import fetch_namespaces, fetch_resource, fetch_schema, \
-    fetch_schema_locations, XMLResource, XMLResourceError, XMLSchema
+    fetch_schema_locations, XMLResource, XMLResourceError, XMLSchema, ResourceCache
 from xmlschema.names import XSD_NAMESPACE
 from xmlschema.utils.etree import is_etree_element, is_lxml_element
 from xmlschema.testing import SKIP_REMOTE_TESTS, XMLSchemaTestCase, run_xmlschema_tests
@@ -38,6 +44,7 @@ from xmlschema.utils.urls import normalize_url
 from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError, \
     XMLResourceForbidden, XMLResourceBlocked, XMLResourceOSError
 from xmlschema.resources import XMLResourceManager, iterfind_parser
+from xmlschema.xpath import ElementSelector, ElementPathSelector
 from xmlschema.resources.sax import defuse_xml
 
 DRIVE_REGEX = '(/[a-zA-Z]:|/)' if platform.system() == 'Windows' else ''
@@ -622,6 +629,46 @@ class TestResources(XMLSchemaTestCase):
         with self.assertRaises(TypeError):
             XMLResource(self.vh_xml_file, lazy='1')
 
+    def test_xml_resource_xpath_root(self):
+        xml_data = '<a xmlns="http://xmlschema.test/ns">t1<b x="1">t2<c/>t3</b>' \
+                   '<d xmlns:p="http://xmlschema.test/p"><p:e/></d>t4</a>'
+        resource = XMLResource(xml_data)
+        root_node = resource.xpath_root
+        self.assertIs(root_node.value, resource.root)
+        self.assertListEqual(root_node.children, [])
+        self.assertEqual(len(root_node.tree.elements), 1)  # child nodes are not built
+
+        # Nodes have the positions and the namespace maps of a full node tree
+        node_tree = build_node_tree(resource.root, resource.get_nsmap(resource.root))
+        self.assertListEqual(
+            [(node.position, node.value) for node in root_node.iter_descendants()],
+            [(node.position, node.value) for node in node_tree.iter_descendants()]
+        )
+        e_node = resource.get_xpath_node(resource.root[-1][0])
+        self.assertEqual(e_node.value.tag, '{http://xmlschema.test/p}e')
+        self.assertIs(e_node.nsmap, resource.get_nsmap(e_node.value))
+        self.assertEqual(e_node.nsmap['p'], 'http://xmlschema.test/p')
+
+        namespaces = {'': 'http://xmlschema.test/ns'}
+        self.assertListEqual(select(resource.xpath_root, '//c | //b | /a/d', namespaces),
+                             [resource.root[0], resource.root[0][0], resource.root[-1]])
+        self.assertListEqual(resource.findall('b[@x="1"]/c', namespaces),
+                             [resource.root[0][0]])
+
+    def test_xml_resource_get_xpath_node(self):
+        resource = XMLResource('<a><b><c/></b><b><c/></b></a>')
+        elem = resource.root[1][0]
+        xpath_node = resource.get_xpath_node(elem)
+        self.assertIs(xpath_node.value, elem)
+        self.assertIs(xpath_node.parent.parent, resource.xpath_root)
+        self.assertEqual(xpath_node.path, '/Q{}a[1]/Q{}b[2]/Q{}c[1]')
+        self.assertIs(resource.get_xpath_node(elem), xpath_node)
+
+        elem = ElementTree.Element('c')
+        xpath_node = resource.get_xpath_node(elem)
+        self.assertIs(xpath_node.value, elem)
+        self.assertIsNone(xpath_node.parent)
+
     def test_xml_resource_base_url(self):
         resource = XMLResource(self.vh_xml_file)
         base_url = resource.base_url
@@ -730,6 +777,41 @@ class TestResources(XMLSchemaTestCase):
             # With lxml.etree there is no information loss.
             self.assertEqual(resource.tostring(), XML_WITH_NAMESPACES)
 
+    def test_xml_resource_tofile(self):
+        xml_data = '<a:root xmlns:a="http://xmlschema.test/nsa" b="\t1">\n' \
+                   '  <a:elem>\tx &amp; y</a:elem><!-- comment -->\n' \
+                   '  <c xmlns="http://xmlschema.test/nsc"><d />è<e>f</e></c>tail\n' \
+                   '</a:root>'
+        expected = XMLResource(xml_data).tostring()
+
+        for lazy in (False, True):
+            resource = XMLResource(xml_data, lazy=lazy)
+            fp = StringIO()
+            resource.tofile(fp, encoding='unicode')
+            if lazy:
+                self.assertEqual(fp.getvalue(), expected.replace('<!-- comment -->', ''))
+            else:
+                self.assertEqual(fp.getvalue(), expected)
+
+            fp = BytesIO()
+            resource.tofile(fp, spaces_for_tab=None)
+            self.assertIn(b'<a:elem>\tx &amp; y</a:elem>', fp.getvalue())
+            self.assertIn(b'&#232;', fp.getvalue())
+
+            fp = BytesIO()
+            resource.tofile(fp, encoding='utf-8', xml_declaration=True)
+            self.assertTrue(fp.getvalue().startswith(b'<?xml version="1.0" encoding="utf-8"?>'))
+            self.assertIn('è'.encode('utf-8'), fp.getvalue())
+
+        with tempfile.TemporaryDirectory() as dirname:
+            xml_file = pathlib.Path(dirname).joinpath('vehicles.xml')
+            resource = XMLResource(self.vh_xml_file, lazy=True)
+            resource.tofile(xml_file)
+            self.assertEqual(xml_file.read_text(), XMLResource(self.vh_xml_file).tostring())
+
+        with self.assertRaises(XMLSchemaTypeError):
+            resource.tofile(10)
+
     def test_xml_resource_open(self):
         resource = XMLResource(self.vh_xml_file)
         xml_file = resource.open()
@@ -903,6 +985,39 @@ class TestResources(XMLSchemaTestCase):
         ]
         self.assertListEqual(tags, lazy_tags)
 
+        path = 'xs:complexType[@name][3]'
+        elements = [ElementTree.tostring(x) for x in resource.iterfind(path, namespaces)]
+        self.assertEqual(len(elements), 1)
+        lazy_elements = [
+            ElementTree.tostring(x) for x in lazy_resource.iterfind(path, namespaces)
+        ]
+        self.assertListEqual(elements, lazy_elements)
+
+    def test_lazy_resource_iterfind_many_siblings(self):
+        source = '<a>%s</a>' % ''.join(f'<b x="{k % 3}"/>' for k in range(3000))
+        resource = XMLResource(source, lazy=True)
+
+        elements = resource.findall('b[@x="1"]')
+        self.assertEqual(len(elements), 1000)
+        self.assertTrue(all(e.get('x') == '1' for e in elements))
+        self.assertEqual(len(resource.findall('b[@x="2"][500]')), 1)
+        self.assertEqual(len(resource.findall('/a/*[2999]')), 1)
+
+    def test_lazy_resource_iterfind_empty_namespace(self):
+        source = '<r xmlns:p="http://xmlschema.test/ns"><a x="1"/><p:a/><a/></r>'
+        for selector in (ElementSelector, ElementPathSelector):
+            resource = XMLResource(source, selector=selector)
+            lazy_resource = XMLResource(source, lazy=True, selector=selector)
+
+            for path in ('{}a', '{}*', '{}a[@x]', '/r/{}a'):
+                with self.subTest(selector=selector, path=path):
+                    elements = [ElementTree.tostring(e) for e in resource.iterfind(path)]
+                    lazy_elements = [
+                        ElementTree.tostring(e) for e in lazy_resource.iterfind(path)
+                    ]
+                    self.assertListEqual(elements, lazy_elements)
+                    self.assertGreater(len(elements), 0)
+
     def test_xml_resource_find(self):
         root = ElementTree.XML('<a><b1><c1/><c2 x="2"/></b1><b2/></a>')
         resource = XMLResource(root)
@@ -1016,6 +1131,22 @@ class TestResources(XMLSchemaTestCase):
         tags = [e.tag for e in resource.iter()]
         self.assertListEqual(tags, ['a', 'b1', 'b2'])
 
+        parser = iterfind_parser('*[@x]', ancestors=[])
+        resource = XMLResource(source, iterparse=parser)
+        tags = [e.tag for e in resource.iter()]
+        self.assertListEqual(tags, ['a', 'b1', 'c1', 'c2'])
+
+        parser = iterfind_parser('*/*[1]', ancestors=[])  # positions are counted by tag
+        resource = XMLResource(source, iterparse=parser)
+        tags = [e.tag for e in resource.iter()]
+        self.assertListEqual(tags, ['a', 'b1', 'c1', 'c2', 'b2'])
+
+        source = '<a>%s</a>' % ''.join(f'<b x="{k % 3}"/>' for k in range(3000))
+        parser = iterfind_parser('b[@x="1"][2999]', ancestors=[])
+        resource = XMLResource(source, iterparse=parser)
+        self.assertEqual(len(resource.root), 1)
+        self.assertEqual(resource.root[0].get('x'), '1')
+
     def test_xml_resource_nsmap_tracking(self):
         xsd_file = self.casepath('examples/collection/collection4.xsd')
         resource = XMLResource(xsd_file)
@@ -1520,5 +1651,169 @@ class TestResources(XMLSchemaTestCase):
         self.assertIsNot(other._xmlns, resource._xmlns)
 
 
+class FakeHTTPHandler(BaseHandler):
+    """An HTTP handler that serves local files and records the requests."""
+    handler_order = 100
+
+    def __init__(self, files, headers=None):
+        self.files = files
+        self.headers = headers or {}
+        self.requests = []
+
+    def http_open(self, req):
+        self.requests.append(req)
+        headers = Message()
+        for k, v in self.headers.items():
+            headers[k] = v
+
+        etag = self.headers.get('ETag')
+        if etag is not None and req.get_header('If-none-match') == etag:
+            raise HTTPError(req.full_url, 304, 'Not Modified', headers, None)
+
+        with open(self.files[req.full_url], 'rb') as fp:
+            data = fp.read()
+        response = addinfourl(BytesIO(data), headers, req.full_url, 200)
+        response.msg = 'OK'
+        return response
+
+
+class TestResourceCache(XMLSchemaTestCase):
+
+    cases_dir = pathlib.Path(__file__).absolute().parent.joinpath('test_cases')
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self._tmp_dir.name
+        self.url = 'http://xmlschema.test/vehicles.xml'
+        self.handler = FakeHTTPHandler(
+            files={self.url: self.casepath('examples/vehicles/vehicles.xml')},
+            headers={'ETag': '"v1"'}
+        )
+        self.opener = build_opener(self.handler)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_cache_option(self):
+        resource = XMLResource(self.url, opener=self.opener, cache=self.cache_dir)
+        self.assertIsInstance(resource.cache, ResourceCache)
+        self.assertIsNone(XMLResource(self.url, opener=self.opener).cache)
+
+        with self.assertRaises(XMLSchemaTypeError):
+            XMLResource(self.url, opener=self.opener, cache=10)
+
+    def test_cached_resource(self):
+        cache = ResourceCache(self.cache_dir)
+        resource = XMLResource(self.url, opener=self.opener, cache=cache)
+        self.assertEqual(resource.root.tag, '{http://example.com/vehicles}vehicles')
+        self.assertIn(self.url, cache)
+        self.assertEqual(len(self.handler.requests), 1)
+
+        entry = cache.get_entry(self.url)
+        self.assertEqual(entry.etag, '"v1"')
+        self.assertEqual(cache.size, entry.size)
+
+        # No max-age: a conditional request revalidates the entry
+        resource = XMLResource(self.url, opener=self.opener, cache=cache)
+        self.assertEqual(resource.root.tag, '{http://example.com/vehicles}vehicles')
+        self.assertEqual(len(self.handler.requests), 2)
+        self.assertEqual(self.handler.requests[-1].get_header('If-none-match'), '"v1"')
+
+        # A fresh entry is served without accessing the network
+        cache = ResourceCache(self.cache_dir, max_age=3600)
+        XMLResource(self.url, opener=self.opener, cache=cache)
+        XMLResource(self.url, opener=self.opener, cache=cache)
+        self.assertEqual(len(self.handler.requests), 3)
+
+    def test_max_age_header(self):
+        self.handler.headers['Cache-Control'] = 'public, max-age=600'
+        cache = ResourceCache(self.cache_dir)
+        for _ in range(3):
+            XMLResource(self.url, opener=self.opener, cache=cache)
+        self.assertEqual(len(self.handler.requests), 1)
+        self.assertTrue(cache.get_entry(self.url).is_fresh())
+
+        self.handler.headers['Cache-Control'] = 'no-store'
+        cache.clear()
+        XMLResource(self.url, opener=self.opener, cache=cache)
+        self.assertNotIn(self.url, cache)
+
+    def test_offline_mode(self):
+        cache = ResourceCache(self.cache_dir, offline=True)
+        with self.assertRaises(XMLResourceOSError):
+            XMLResource(self.url, opener=self.opener, cache=cache)
+        self.assertEqual(len(self.handler.requests), 0)
+
+        XMLResource(self.url, opener=self.opener, cache=self.cache_dir)
+        resource = XMLResource(self.url, opener=self.opener, cache=cache)
+        self.assertEqual(resource.root.tag, '{http://example.com/vehicles}vehicles')
+        self.assertEqual(len(self.handler.requests), 1)
+
+    def test_fetch_resource(self):
+        cache = ResourceCache(self.cache_dir, offline=True)
+        with self.assertRaises(XMLResourceOSError):
+            fetch_resource(self.url, cache=cache)
+
+        with open(self.casepath('examples/vehicles/vehicles.xml'), 'rb') as fp:
+            cache.store(self.url, fp.read())
+        self.assertEqual(fetch_resource(self.url, cache=cache), self.url)
+        self.assertEqual(fetch_resource('vehicles.xml', 'http://xmlschema.test/',
+                                        cache=cache), self.url)
+
+    def test_eviction(self):
+        cache = ResourceCache(self.cache_dir)
+        cache.store('http://xmlschema.test/a.xml', b'<a/>')
+        cache.store('http://xmlschema.test/b.xml', b'<b>b</b>')
+        cache.store('http://xmlschema.test/c.xml', b'<a/>')  # same content of a.xml
+        self.assertEqual(cache.size, 12)
+
+        cache.evict(8)
+        self.assertNotIn('http://xmlschema.test/a.xml', cache)
+        self.assertNotIn('http://xmlschema.test/b.xml', cache)
+        self.assertIn('http://xmlschema.test/c.xml', cache)
+        self.assertEqual(cache.size, 4)
+
+        cache = ResourceCache(self.cache_dir, max_size=4)
+        with cache.open(self.url, self.opener) as fp:
+            self.assertIn(b'vehicles', fp.read())
+        self.assertNotIn(self.url, cache)
+
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+
+    def test_eviction_of_unreferenced_objects(self):
+        cache = ResourceCache(self.cache_dir)
+        cache.store('http://xmlschema.test/a.xml', b'<a/>')
+
+        # An object written by a concurrent store before its index entry
+        path = pathlib.Path(self.cache_dir).joinpath('objects', 'f' * 64)
+        path.write_bytes(b'<b>b</b>')
+        cache.evict(100)
+        self.assertTrue(path.is_file())
+        self.assertEqual(cache.size, 12)
+
+        mtime = time.time() - cache.orphan_grace_time - 1
+        os.utime(path, (mtime, mtime))
+        cache.evict(100)
+        self.assertFalse(path.is_file())
+        self.assertIn('http://xmlschema.test/a.xml', cache)
+        self.assertEqual(cache.size, 4)
+
+    def test_schema_settings(self):
+        url = 'http://xmlschema.test/collection.xsd'
+        handler = FakeHTTPHandler(
+            files={url: self.casepath('examples/collection/collection.xsd')},
+        )
+        opener = build_opener(handler)
+        schema = XMLSchema(url, opener=opener, cache=self.cache_dir)
+        self.assertIsInstance(schema.maps.settings.cache, ResourceCache)
+        self.assertIn(url, schema.maps.settings.cache)
+
+        cache = ResourceCache(self.cache_dir, offline=True)
+        schema = XMLSchema(url, opener=opener, cache=cache)
+        self.assertEqual(len(handler.requests), 1)
+        self.assertIn('collection', schema.elements)
+
+
 if __name__ == '__main__':
     run_xmlschema_tests('XML resources')
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""Tests concerning the tabular decoder. NumPy and PyArrow are optional dependencies."""
+import unittest
+import array
+from decimal import Decimal
+from pathlib import Path
+from textwrap import dedent
+
+from xmlschema import XMLSchema, XMLResource, XMLSchemaValidationError
+from xmlschema.extras.tabular import Column, ColumnBatch, TabularDecoder
+from xmlschema.testing import run_xmlschema_tests
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def casepath(relative_path):
+    return str(Path(__file__).parent.joinpath('test_cases', relative_path))
+
+
+class TestTabularDecoder(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.col_xsd_file = casepath('examples/collection/collection.xsd')
+        cls.col_xml_file = casepath('examples/collection/collection.xml')
+        cls.col_schema = XMLSchema(cls.col_xsd_file)
+        cls.namespaces = {'col': 'http://example.com/ns/collection'}
+
+    def test_initialization(self):
+        decoder = TabularDecoder(self.col_schema, '/col:collection/object', self.namespaces)
+        self.assertIs(decoder.xsd_element, self.col_schema.elements['collection'][0])
+        self.assertEqual(repr(decoder),
+                         "TabularDecoder(path='/col:collection/object', columns=11)")
+
+        with self.assertRaises(ValueError):
+            TabularDecoder(self.col_schema, 'col:collection/object', self.namespaces)
+        with self.assertRaises(ValueError):
+            TabularDecoder(self.col_schema, '/col:collection/unknown', self.namespaces)
+        with self.assertRaises(ValueError):
+            TabularDecoder(self.col_schema, '/col:collection/object', self.namespaces,
+                           batch_size=0)
+        with self.assertRaises(ValueError):
+            TabularDecoder(self.col_schema, '/col:collection/object', self.namespaces,
+                           backend='pandas')
+
+    def test_column_layout(self):
+        decoder = TabularDecoder(self.col_schema, '/col:collection/object', self.namespaces)
+        self.assertListEqual(decoder.names, [
+            '@id', '@available', 'position', 'title', 'year', 'author/@id',
+            'author/name', 'author/born', 'author/dead', 'author/qualification',
+            'estimation'
+        ])
+        self.assertListEqual(decoder.skipped, ['characters/person'])
+
+        self.assertEqual(decoder.columns[1],
+                         Column('@available', ('@available',), bool))
+        self.assertEqual(decoder.columns[1].typecode, 'b')
+        self.assertEqual(decoder.columns[2].typecode, 'q')
+        self.assertEqual(decoder.columns[5].keys, ('author', '@id'))
+        self.assertIsNone(decoder.columns[3].typecode)
+        self.assertIs(decoder.columns[10].python_type, Decimal)
+
+    def test_column_get_value(self):
+        column = Column('a/b', ('a', 'b', '$'), str)
+        self.assertEqual(column.get_value({'a': {'b': 'foo'}}), 'foo')
+        self.assertEqual(column.get_value({'a': {'b': {'$': 'foo', '@c': 1}}}), 'foo')
+        self.assertIsNone(column.get_value({'a': {'b': {'@c': 1}}}))
+        self.assertIsNone(column.get_value({'a': None}))
+        self.assertIsNone(column.get_value({}))
+
+    def test_iter_batches(self):
+        decoder = TabularDecoder(self.col_schema, '/col:collection/object',
+                                 self.namespaces, batch_size=1)
+        batches = list(decoder.iter_batches(self.col_xml_file))
+        self.assertEqual(len(batches), 2)
+        self.assertIsInstance(batches[0], ColumnBatch)
+        self.assertEqual(batches[0].num_rows, 1)
+        self.assertEqual(batches[0].columns['@available'], array.array('b', [1]))
+        self.assertEqual(batches[1].columns['position'], array.array('q', [2]))
+        self.assertEqual(batches[1].validity['estimation'], bytearray(b'\x00'))
+
+        decoder = TabularDecoder(self.col_schema, '/col:collection/object', self.namespaces)
+        batches = decoder.decode(XMLResource(self.col_xml_file, lazy=True))
+        self.assertEqual(len(batches), 1)
+
+        rows = batches[0].to_pylist()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['@id'], 'b0836217462')
+        self.assertEqual(rows[0]['author/name'], 'Pierre-Auguste Renoir')
+        self.assertEqual(rows[0]['estimation'], Decimal('10000.00'))
+        self.assertEqual(rows[1]['author/@id'], 'JM')
+        self.assertIsNone(rows[1]['estimation'])
+
+    def test_simple_content_rows(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="value" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:simpleContent>
+                          <xs:extension base="xs:double">
+                            <xs:attribute name="unit" type="xs:string"/>
+                          </xs:extension>
+                        </xs:simpleContent>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>"""))
+
+        decoder = TabularDecoder(schema, '/root/value', batch_size=2)
+        self.assertListEqual(decoder.names, ['@unit', 'value'])
+        self.assertEqual(decoder.columns[1].typecode, 'd')
+
+        xml_data = '<root><value unit="m">1.5</value><value>2</value><value/></root>'
+        batches = decoder.decode(xml_data, validation='lax')
+        self.assertEqual([b.num_rows for b in batches], [2, 1])
+        self.assertEqual(batches[0].columns['value'], array.array('d', [1.5, 2.0]))
+        self.assertEqual(batches[0].validity['@unit'], bytearray(b'\x01\x00'))
+        self.assertEqual(batches[1].validity['value'], bytearray(b'\x00'))
+        self.assertGreater(len(decoder.errors), 0)
+        for err in decoder.errors:
+            self.assertIsInstance(err, XMLSchemaValidationError)
+
+        with self.assertRaises(XMLSchemaValidationError):
+            decoder.decode(xml_data)
+
+    def test_overflowing_integers(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="value" type="xs:integer" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>"""))
+
+        decoder = TabularDecoder(schema, '/root/value')
+        xml_data = f'<root><value>1</value><value>{2 ** 80}</value></root>'
+        batch = decoder.decode(xml_data)[0]
+        self.assertEqual(batch.columns['value'], [1, 2 ** 80])
+
+    @unittest.skipIf(numpy is None, "NumPy library is not installed")
+    def test_numpy_backend(self):
+        decoder = TabularDecoder(self.col_schema, '/col:collection/object',
+                                 self.namespaces, backend='numpy')
+        arrays = decoder.decode(self.col_xml_file)[0]
+        self.assertEqual(arrays['position'].dtype, numpy.int64)
+        self.assertEqual(arrays['@available'].dtype, numpy.bool_)
+        self.assertListEqual(arrays['position'].tolist(), [1, 2])
+        self.assertIsInstance(arrays['estimation'], numpy.ma.MaskedArray)
+
+    @unittest.skipIf(pyarrow is None, "PyArrow library is not installed")
+    def test_arrow_backend(self):
+        decoder = TabularDecoder(self.col_schema, '/col:collection/object',
+                                 self.namespaces, backend='arrow')
+        record_batch = decoder.decode(self.col_xml_file)[0]
+        self.assertIsInstance(record_batch, pyarrow.RecordBatch)
+        self.assertEqual(record_batch.num_rows, 2)
+        self.assertEqual(record_batch.schema.field('position').type, pyarrow.int64())
+        self.assertEqual(record_batch.column('estimation').null_count, 1)
+
+
+if __name__ == '__main__':
+    run_xmlschema_tests('tabular decoder')
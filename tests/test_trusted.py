@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import json
+import pathlib
+import tempfile
+from unittest.mock import patch
+
+from xmlschema import XMLSchema10, XMLResource, TrustedSources
+from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError
+from xmlschema.profiler import BuildProfiler
+from xmlschema.settings import SchemaSettings
+from xmlschema.trusted import DigestResource
+from xmlschema.testing import XMLSchemaTestCase, run_xmlschema_tests
+from xmlschema.validators import XMLSchemaParseError
+
+
+class TestTrustedSources(XMLSchemaTestCase):
+    cases_dir = pathlib.Path(__file__).absolute().parent.joinpath('test_cases')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vh_xsd_file = cls.casepath('examples/vehicles/vehicles.xsd')
+        cls.col_xsd_file = cls.casepath('examples/collection/collection.xsd')
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manifest = pathlib.Path(self.tmp_dir.name).joinpath('manifest.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_initialization(self):
+        trusted_sources = TrustedSources()
+        self.assertEqual(trusted_sources.patterns, [])
+        self.assertIsNone(trusted_sources.manifest)
+        self.assertFalse(trusted_sources.record)
+        self.assertTrue(repr(trusted_sources).startswith('TrustedSources('))
+
+        with self.assertRaises(XMLSchemaTypeError):
+            TrustedSources(patterns='*.xsd')
+
+        self.manifest.write_text('{"version": 1}')
+        with self.assertRaises(XMLSchemaValueError):
+            TrustedSources(manifest=self.manifest)
+
+        settings = SchemaSettings(trusted_sources=str(self.manifest.with_name('new.json')))
+        self.assertIsInstance(settings.trusted_sources, TrustedSources)
+        with self.assertRaises(XMLSchemaTypeError):
+            SchemaSettings(trusted_sources=['*.xsd'])
+
+    def test_location_patterns(self):
+        trusted_sources = TrustedSources(patterns=['*/vehicles/*.xsd'])
+        self.assertTrue(trusted_sources.match_url(pathlib.Path(self.vh_xsd_file).as_uri()))
+        self.assertFalse(trusted_sources.match_url(None))
+
+        with patch.object(XMLSchema10.meta_schema.__class__, 'iter_errors') as mock:
+            schema = XMLSchema10(self.vh_xsd_file, trusted_sources=trusted_sources)
+            self.assertFalse(mock.called)
+
+        self.assertTrue(schema.built)
+        report = trusted_sources.report()
+        self.assertEqual(report['skipped'], 4)
+        self.assertEqual(report['time_saved'], 0.0)
+
+        with patch.object(XMLSchema10.meta_schema.__class__, 'iter_errors') as mock:
+            XMLSchema10(self.col_xsd_file, trusted_sources=trusted_sources)
+            self.assertTrue(mock.called)
+        self.assertEqual(trusted_sources.report()['skipped'], 4)
+
+    def test_content_digests(self):
+        resource = XMLResource(self.vh_xsd_file)
+        digest = TrustedSources.get_digest(resource)
+        self.assertEqual(len(digest), 64)
+        self.assertEqual(TrustedSources.get_digest(XMLResource(resource.get_text())), digest)
+
+        trusted_sources = TrustedSources(digests=[digest.upper()])
+        self.assertTrue(trusted_sources.is_trusted(resource))
+        self.assertFalse(trusted_sources.is_trusted(XMLResource(self.col_xsd_file)))
+        self.assertEqual(trusted_sources.skipped, [resource.url])
+
+    def test_digests_of_loaded_data(self):
+        digest = TrustedSources.get_digest(XMLResource(self.vh_xsd_file))
+        trusted_sources = TrustedSources(digests=[digest])
+
+        with patch.object(XMLResource, 'open', autospec=True,
+                          side_effect=XMLResource.open) as mock:
+            schema = XMLSchema10(self.vh_xsd_file, trusted_sources=trusted_sources)
+
+        self.assertIsInstance(schema.source, DigestResource)
+        self.assertEqual(schema.source.digest, digest)
+        self.assertEqual(mock.call_count, 4)  # each source is opened only once
+        self.assertEqual(trusted_sources.skipped, [schema.url])
+
+        resource = DigestResource(XMLResource(self.vh_xsd_file).root)
+        self.assertIsNone(resource.digest)
+        self.assertEqual(TrustedSources.get_digest(resource),
+                         TrustedSources.get_digest(XMLResource(resource.get_text())))
+
+    def test_manifest_recording(self):
+        trusted_sources = TrustedSources(manifest=self.manifest, record=True)
+        with BuildProfiler() as profiler:
+            schema = XMLSchema10(self.vh_xsd_file, trusted_sources=trusted_sources)
+
+        self.assertEqual(len(trusted_sources.entries), 4)
+        self.assertEqual(trusted_sources.report()['skipped'], 0)
+        self.assertEqual(profiler.phases['meta-validation'].count, 4)
+
+        data = json.loads(self.manifest.read_text())
+        self.assertEqual(data['version'], 1)
+        self.assertIn(schema.url, [v['url'] for v in data['sources'].values()])
+
+        with BuildProfiler() as profiler:
+            schema = XMLSchema10(self.vh_xsd_file, trusted_sources=str(self.manifest))
+        self.assertTrue(schema.built)
+        self.assertNotIn('meta-validation', profiler.phases)
+
+        trusted_sources = TrustedSources(manifest=self.manifest)
+        XMLSchema10(self.vh_xsd_file, trusted_sources=trusted_sources)
+        report = trusted_sources.report()
+        self.assertEqual(report['skipped'], 4)
+        self.assertIn(schema.url, report['sources'])
+        self.assertGreater(report['time_saved'], 0.0)
+
+        with self.assertRaises(XMLSchemaValueError):
+            TrustedSources().save()
+
+    def test_invalid_sources_are_not_recorded(self):
+        trusted_sources = TrustedSources(record=True)
+        schema_src = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:element name="root" type="xs:string" minOccurs="1"/>
+        </xs:schema>"""
+
+        with self.assertRaises(XMLSchemaParseError):
+            XMLSchema10(schema_src, trusted_sources=trusted_sources)
+        self.assertEqual(trusted_sources.entries, {})
+
+        schema = XMLSchema10(schema_src, validation='lax', trusted_sources=trusted_sources)
+        self.assertGreater(len(schema.all_errors), 0)
+        self.assertEqual(trusted_sources.entries, {})
+
+
+if __name__ == '__main__':
+    run_xmlschema_tests('trusted sources')
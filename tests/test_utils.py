@@ -9,6 +9,7 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 """Tests on internal helper functions"""
+import io
 import sys
 import unittest
 import decimal
@@ -26,7 +27,8 @@ from xmlschema import XMLSchema, XMLSchemaParseError
 from xmlschema.names import XSD_NAMESPACE, XSI_NAMESPACE, XSD_SCHEMA, \
     XSD_ELEMENT, XSD_SIMPLE_TYPE, XSD_ANNOTATION, XSI_TYPE
 from xmlschema.utils.etree import prune_etree, etree_get_ancestors, etree_getpath, \
-    iter_schema_location_hints, etree_tostring
+    iter_schema_location_hints, etree_tostring, escape_cdata, escape_attrib, \
+    XmlStreamWriter
 from xmlschema.utils.qnames import get_namespace, get_qname, local_name, \
     get_prefixed_qname, get_extended_qname, update_namespaces
 from xmlschema.utils.logger import set_logging_level, logged, format_xmlschema_stack, \
@@ -618,6 +620,69 @@ class TestUtils(unittest.TestCase):
                    '</root>'
         self.assertEqual(etree_tostring(root, namespaces), expected)
 
+    def test_xml_stream_writer(self):
+        self.assertEqual(escape_cdata('a < b & c > d "e"'), 'a &lt; b &amp; c &gt; d "e"')
+        self.assertEqual(escape_attrib('"a"\t\n\r<'), '&quot;a&quot;&#09;&#10;&#13;&lt;')
+
+        root = ElementTree.XML(XML_WITH_NAMESPACES)
+        namespaces = {
+            'pxa': "http://xpath.test/nsa",
+            'pxb': "http://xpath.test/nsb"
+        }
+        fp = io.StringIO()
+        writer = XmlStreamWriter(fp, namespaces)
+        self.assertIsNone(writer.current)
+        writer.write_element(root)
+        self.assertEqual(fp.getvalue(), '')
+        writer.close()
+        self.assertEqual(fp.getvalue(), etree_tostring(root, namespaces))
+
+        # Write in parts an element with children in a namespace not in the map
+        root = ElementTree.XML('<pxa:root xmlns:pxa="http://xpath.test/nsa">\n'
+                               '  <pfx:elem xmlns:pfx="http://xpath.test/unregistered"/>'
+                               '</pxa:root>')
+        fp = io.StringIO()
+        writer = XmlStreamWriter(fp, {'pxa': "http://xpath.test/nsa"}, buffer_size=1)
+        writer.start(root, root.text)
+        self.assertIs(writer.current, root)
+        writer.write_element(root[0])
+        writer.write_text('\n')
+        writer.write_element(root[0])
+        writer.end()
+        self.assertIs(writer.last_closed, root)
+        self.assertEqual(fp.getvalue(),
+                         '<pxa:root xmlns:pxa="http://xpath.test/nsa">\n'
+                         '  <ns0:elem xmlns:ns0="http://xpath.test/unregistered" />\n'
+                         '<ns0:elem xmlns:ns0="http://xpath.test/unregistered" /></pxa:root>')
+
+        fp = io.BytesIO()
+        writer = XmlStreamWriter(fp, encoding='ascii', xml_declaration=True)
+        elem = ElementTree.Element('element', attrib={'a': 'è'})
+        elem.text = 'à'
+        writer.write_element(elem)
+        writer.close()
+        self.assertEqual(fp.getvalue(), b'<?xml version="1.0" encoding="ascii"?>\n'
+                                        b'<element a="&#232;">&#224;</element>')
+
+        # Text and binary file objects, comments and tabs
+        root = ElementTree.XML('<root>\tà<!--c--><?pi x?></root>',
+                               ElementTree.XMLParser(
+                                   target=ElementTree.TreeBuilder(insert_comments=True,
+                                                                  insert_pis=True)))
+        fp = io.StringIO()
+        writer = XmlStreamWriter(fp, encoding='us-ascii', spaces_for_tab=2)
+        writer.write_element(root)
+        writer.close()
+        self.assertEqual(fp.getvalue(), '<root>  &#224;<!--c--><?pi x?></root>')
+        self.assertEqual(fp.getvalue(), etree_tostring(root, spaces_for_tab=2)
+                         .replace('à', '&#224;'))
+
+        fp = io.BytesIO()
+        writer = XmlStreamWriter(fp)
+        writer.write_element(root)
+        writer.close()
+        self.assertEqual(fp.getvalue(), '<root>\tà<!--c--><?pi x?></root>'.encode('utf-8'))
+
     @unittest.skipIf(lxml_etree is None, 'lxml is not installed ...')
     def test_etree_tostring_with_lxml_element(self):
         elem = lxml_etree.Element('element')
@@ -17,9 +17,12 @@ from xml.etree import ElementTree
 
 from elementpath import XPath1Parser, XPath2Parser, Selector, LazyElementNode
 
-from xmlschema import XMLSchema10, XMLSchema11
+from xmlschema import XMLSchema10, XMLSchema11, XMLResource
+from xmlschema.exceptions import XMLSchemaValueError
 from xmlschema.names import XSD_NAMESPACE
-from xmlschema.xpath import XMLSchemaProxy, XPathElement, split_path, ElementSelector
+from xmlschema.xpath import XMLSchemaProxy, XPathElement, split_path, \
+    ElementSelector, ElementPathSelector, CompiledXPath
+from xmlschema.xpath.mixin import parse_path
 from xmlschema.validators import XsdAtomic, XsdAtomicRestriction
 
 CASES_DIR = os.path.join(os.path.dirname(__file__), 'test_cases/')
@@ -302,6 +305,33 @@ class XMLSchemaXPathTest(unittest.TestCase):
         self.assertIsNotNone(bike)
         self.assertListEqual(list(self.xs1.iterfind("/(vh:vehicles/*/*)")), [car, bike])
 
+    def test_parsed_paths_cache(self):
+        schema = self.schema_class(os.path.join(CASES_DIR, "examples/vehicles/vehicles.xsd"))
+        cars = schema.elements['vehicles'].type.content[0]
+        cache_info = schema.maps.cache._caches[parse_path.__wrapped__].cache_info
+
+        self.assertEqual(schema.find("vh:vehicles/vh:cars"), cars)
+        self.assertEqual(cache_info().misses, 1)
+        self.assertEqual(schema.find("vh:vehicles/vh:cars"), cars)
+        self.assertListEqual(schema.findall("vh:vehicles/vh:cars"), [cars])
+        self.assertListEqual(list(schema.iterfind("vh:vehicles/vh:cars")), [cars])
+        self.assertEqual(cache_info().hits, 3)
+
+        # Tokens are shared between the components of the same global maps
+        self.assertIs(schema.find("vh:cars"), schema.elements['cars'])
+        self.assertEqual(cache_info().misses, 2)
+        self.assertIs(schema.elements['vehicles'].find("vh:cars"), cars)
+        self.assertEqual(cache_info().hits, 4)
+
+        # The namespace map is part of the key
+        namespaces = {'vh': 'http://example.com/vehicles'}
+        self.assertEqual(schema.find("vh:vehicles/vh:cars", namespaces), cars)
+        self.assertIsNone(schema.find("vh:vehicles/vh:cars", {'vh': 'unknown'}))
+        self.assertEqual(cache_info().misses, 4)
+
+        schema.maps.clear()
+        self.assertEqual(cache_info().currsize, 0)
+
     def test_iter(self):
         xsd_element = self.xs1.elements['vehicles']
         descendants = list(xsd_element.iter())
@@ -434,6 +464,201 @@ class XPathSelectorsTest(unittest.TestCase):
         selector = ElementSelector('*')
         self.assertEqual(list(selector.parts), ['*'])
 
+    def test_split_path_names_with_digits(self):
+        namespaces = {'': 'foo'}
+        self.assertEqual(list(split_path('a/b2', namespaces)), ['{foo}a', '/', '{foo}b2'])
+
+    def test_selector_steps(self):
+        namespaces = {'p': 'bar'}
+        self.assertEqual(ElementSelector('a/b2').steps,
+                         (('*', ()), ('a', ()), ('b2', ())))
+        self.assertEqual(ElementSelector('/a/p:b[@x][2]', namespaces).steps,
+                         (('a', ()), ('{bar}b', (('x', None), 2))))
+        self.assertEqual(ElementSelector('{bar}*[@p:x="1"]', namespaces).steps,
+                         (('*', ()), ('{bar}*', (('{bar}x', '1'),))))
+        self.assertEqual(ElementPathSelector('/a/b').steps, (('*', ()), ('b', ())))
+        self.assertEqual(ElementSelector('{}a/{}*[@{}x]').steps,
+                         (('*', ()), ('a', ()), ('{}*', (('x', None),))))
+
+        for path in ('//b', 'a//b', 'a/b/.', 'a/b/..', 'b[last()]', 'b[c]', 'b[@*]',
+                     'a[1]/b', 'b[2][@x]', 'b[0]', '/a[1]', 'p:*', 'b[@x=2]'):
+            selector = ElementSelector(path, namespaces)
+            self.assertIsNone(selector.steps, msg=path)
+            self.assertIsNone(selector.get_stream_filter(), msg=path)
+
+    def test_selector_stream_filter(self):
+        root = ElementTree.XML('<A><B x="1"/><C/><B/><B x="1"/><B x="2"/><B x="1"/></A>')
+        for path in ('B', 'B[2]', '*[2]', 'B[@x]', 'B[@x="1"]', 'B[@x="1"][2]',
+                     '*[@x][3]', '/A/*', '/A/C[1]', '/D/B'):
+            for cls in (ElementSelector, ElementPathSelector):
+                selector = cls(path)
+                stream_filter = selector.get_stream_filter()
+                self.assertIsNotNone(stream_filter, msg=path)
+
+                result = [e for e in root if stream_filter(root, e, [root])]
+                self.assertListEqual(result, selector.select(root), msg=(path, cls))
+
+        stream_filter = ElementSelector('B[2]').get_stream_filter()
+        with self.assertRaises(ValueError):
+            stream_filter(root, root[0], None)
+
+    def test_selector_engines(self):
+        namespaces = {'p': 'bar'}
+        for path in ('b', 'a/b', 'a[@x]/b', '/a/p:b', 'a//b', 'b//c', '//b[@x="1"]',
+                     '/a//b', 'a/b//c', '/a[@x]//c'):
+            self.assertEqual(ElementSelector(path, namespaces).engine, 'native', msg=path)
+
+        for path in ('*', 'a/*', '{bar}*', 'b[2]', '/a/b[@x][1]', '*/*[3]'):
+            self.assertEqual(ElementSelector(path, namespaces).engine, 'walk', msg=path)
+
+        for path in ('.', 'a//b/c', '//a/b', 'a//b//c', 'a//*', 'a//b[2]', 'a[1]/b',
+                     'b[c]', 'b[last()]', 'a/b/..'):
+            self.assertEqual(ElementSelector(path, namespaces).engine, 'xpath', msg=path)
+
+        self.assertEqual(ElementPathSelector('b[2]').engine, 'native')
+
+        root = ElementTree.XML(
+            '<a x="1"><b x="1"><c/><b><c/></b><c/><!-- comment --><b x="1"/></b><c x="2"/>'
+            '<b x="2"><b><b x="1"/><c/></b></b><!-- comment --><b/></a>'
+        )
+        for path in ('b', 'b/b', 'b[@x]', 'b[@x="1"]/b', '/a/b/c', '/b/c', '*', '*/*',
+                     'b[2]', 'b[@x][1]', '*/*[2]', '/a/*[3]', '/a', 'a//b', 'b//b',
+                     '//b', '//a', '//b[@x="1"]', '/a//c', '/b//c', 'b/b//c'):
+            selector = ElementSelector(path)
+            result = Selector(path).select(root)
+            self.assertListEqual(selector.select(root), [e for e in root.iter() if e in result],
+                                 msg=(path, selector.engine))
+
+        resource = XMLResource(root)
+        self.assertListEqual(resource.findall('b//b'),
+                             [root[0][1], root[0][3], root[2][0], root[2][0][0]])
+
+
+class CompiledXPathTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schema = XMLSchema10("""
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+          <xs:element name="items">
+            <xs:complexType>
+              <xs:sequence>
+                <xs:element name="item" maxOccurs="unbounded">
+                  <xs:complexType>
+                    <xs:sequence>
+                      <xs:element name="qty" type="xs:int"/>
+                      <xs:element name="date" type="xs:date"/>
+                      <xs:element name="tags" type="tagsType"/>
+                    </xs:sequence>
+                    <xs:attribute name="id" type="xs:positiveInteger"/>
+                    <xs:attribute name="status" type="xs:string"/>
+                  </xs:complexType>
+                </xs:element>
+              </xs:sequence>
+            </xs:complexType>
+          </xs:element>
+          <xs:simpleType name="tagsType">
+            <xs:list itemType="xs:NCName"/>
+          </xs:simpleType>
+        </xs:schema>""")
+
+        cls.xml_data = '<items>%s</items>' % ''.join(
+            f'<item id="{k}" status="{"closed" if k % 2 else "open"}">'
+            f'<qty>{k * 10}</qty><date>2020-01-0{k}</date><tags>a b{k}</tags></item>'
+            for k in range(1, 6)
+        )
+
+    def test_compile_xpath(self):
+        query = self.schema.compile_xpath('/items/item/qty')
+        self.assertIsInstance(query, CompiledXPath)
+        self.assertIs(query.schema, self.schema)
+        self.assertEqual(query.expression, '/items/item/qty')
+        self.assertEqual(repr(query), "CompiledXPath(expression='/items/item/qty')")
+
+        self.assertRaises(SyntaxError, self.schema.compile_xpath, '/items/item[')
+
+    def test_typed_values(self):
+        query = self.schema.compile_xpath('/items/item/qty')
+        self.assertListEqual(query.select_values(self.xml_data), [10, 20, 30, 40, 50])
+        self.assertListEqual([e.text for e in query.select(self.xml_data)],
+                             ['10', '20', '30', '40', '50'])
+
+        query = self.schema.compile_xpath('/items/item[@status="closed"]/@id')
+        self.assertListEqual(query.select(self.xml_data), ['1', '3', '5'])
+        self.assertListEqual(query.select_values(self.xml_data), [1, 3, 5])
+
+        query = self.schema.compile_xpath('/items/item/tags')
+        self.assertListEqual(query.select_values(self.xml_data)[:4], ['a', 'b1', 'a', 'b2'])
+
+        query = self.schema.compile_xpath('sum(/items/item/qty)')
+        self.assertListEqual(query.select(self.xml_data), [150])
+
+        query = self.schema.compile_xpath('/items/item[qty gt 25]/date')
+        values = query.select_values(XMLResource(self.xml_data))
+        self.assertListEqual([str(v) for v in values],
+                             ['2020-01-03', '2020-01-04', '2020-01-05'])
+
+    def test_lazy_resources(self):
+        for path in ('/items/item/qty', '/items/*/date', '/items/item//tags',
+                     '/items/item[@status="closed"]/@id', '/items/item[qty gt 25]',
+                     '/items/item[@id][not(@status = "open")]/qty'):
+            query = self.schema.compile_xpath(path)
+            self.assertTrue(query.is_streamable(), msg=path)
+
+            resource = XMLResource(self.xml_data)
+            lazy_resource = XMLResource(self.xml_data, lazy=True)
+            if path.endswith(']'):
+                self.assertListEqual(
+                    [e.get('id') for e in query.iter_select(lazy_resource)],
+                    [e.get('id') for e in query.iter_select(resource)], msg=path
+                )
+            else:
+                self.assertListEqual(query.select_values(lazy_resource),
+                                     query.select_values(resource), msg=path)
+
+        for path in ('sum(/items/item/qty)', 'items/item/qty', '//item/qty',
+                     '/items/item[2]/qty', '/items/item[last()]/qty', '/items'):
+            query = self.schema.compile_xpath(path)
+            self.assertFalse(query.is_streamable(), msg=path)
+
+            lazy_resource = XMLResource(self.xml_data, lazy=True)
+            with self.assertRaises(XMLSchemaValueError):
+                query.select(lazy_resource)
+
+        query = self.schema.compile_xpath('/items/item/qty')
+        self.assertTrue(query.is_streamable(lazy_depth=2))
+        self.assertFalse(query.is_streamable(lazy_depth=3))
+
+        lazy_resource = XMLResource(self.xml_data, lazy=2)
+        self.assertListEqual(query.select_values(lazy_resource), [10, 20, 30, 40, 50])
+
+    def test_lazy_resources_predicates(self):
+        schema = XMLSchema10("""
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+          <xs:element name="r"/>
+        </xs:schema>""")
+        xml_data = '<r k="2"><c a="1"><d/></c><c a="2"/><c a="3"/></r>'
+
+        for path in ('/r/c[@a = 2]', '/r/c[not(@a = 2)]', '/r/c[exists(child::d)]',
+                     '/r/c[self::c/@a = 3]', '/r/c[exists(./d)]'):
+            query = schema.compile_xpath(path)
+            self.assertTrue(query.is_streamable(), msg=path)
+            self.assertListEqual(
+                [e.get('a') for e in query.select(XMLResource(xml_data, lazy=True))],
+                [e.get('a') for e in query.select(XMLResource(xml_data))], msg=path
+            )
+
+        for path in ('/r/c[following-sibling::c/@a = 3]', '/r/c[../@k = @a]',
+                     '/r/c[count(../c) = 3]', '/r/c[preceding::c]', '/r/c[parent::r]',
+                     '/r/c[ancestor::r/@k = 2]', '/r/c[/r/@k = @a]', '/r/c[.//d]',
+                     '/r/c[exists(root(.))]', '/r/c[@a = 1 or ../@k]'):
+            query = schema.compile_xpath(path)
+            self.assertFalse(query.is_streamable(), msg=path)
+            self.assertGreater(len(query.select(XMLResource(xml_data))), 0, msg=path)
+
+            with self.assertRaises(XMLSchemaValueError):
+                query.select(XMLResource(xml_data, lazy=True))
+
 
 if __name__ == '__main__':
     from xmlschema.testing import run_xmlschema_tests
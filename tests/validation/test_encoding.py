@@ -9,6 +9,7 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import decimal
+import io
 import pathlib
 import unittest
 from textwrap import dedent
@@ -670,6 +671,63 @@ class TestEncoding(XsdValidatorTestCase):
             )
         )
 
+    def test_encode_to_stream(self):
+        filename = self.casepath('examples/collection/collection.xml')
+        obj = self.col_schema.decode(filename)
+        namespaces = {'col': 'http://example.com/ns/collection',
+                      'xsi': 'http://www.w3.org/2001/XMLSchema-instance'}
+
+        for indent in (4, 0, 1):
+            fp = io.StringIO()
+            self.assertListEqual(self.col_schema.encode_to_stream(obj, fp, indent=indent), [])
+            elem = self.col_schema.encode(obj, indent=indent)
+            self.assertEqual(fp.getvalue(), etree_tostring(elem, namespaces=namespaces))
+
+        fp = io.BytesIO()
+        self.col_schema.encode_to_stream(obj, fp, encoding='utf-8', xml_declaration=True,
+                                         buffer_size=16, flush=True)
+        self.assertTrue(fp.getvalue().startswith(
+            b'<?xml version="1.0" encoding="utf-8"?>\n<col:collection xmlns:col='
+        ))
+
+        obj['object'][0]['position'] = 'first'
+        with self.assertRaises(XMLSchemaValidationError):
+            self.col_schema.encode_to_stream(obj, io.StringIO())
+
+        fp = io.StringIO()
+        errors = self.col_schema.encode_to_stream(obj, fp, validation='lax')
+        self.assertEqual(len(errors), 1)
+        self.assertIn('<position />', fp.getvalue())
+
+    def test_encode_mixed_content_to_stream(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType mixed="true">
+                  <xs:sequence>
+                    <xs:element name="node" maxOccurs="unbounded">
+                      <xs:complexType mixed="true">
+                        <xs:sequence>
+                          <xs:element name="leaf" type="xs:string" minOccurs="0"/>
+                        </xs:sequence>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>"""))
+
+        xml_data = '<root>1<node>a<leaf>&lt;b&gt;</leaf>c</node>2</root>'
+        obj = schema.decode(xml_data, cdata_prefix='#')
+        for kwargs in ({'cdata_prefix': '#'}, {'cdata_prefix': '#', 'preserve_mixed': True}):
+            fp = io.StringIO()
+            schema.encode_to_stream(obj, fp, **kwargs)
+            self.assertEqual(fp.getvalue(), etree_tostring(schema.encode(obj, **kwargs)))
+
+        fp = io.StringIO()
+        schema.encode_to_stream(obj, fp, cdata_prefix='#', preserve_mixed=True)
+        self.assertEqual(fp.getvalue(), xml_data)
+
     @unittest.skipIf(lxml_etree is None, "The lxml library is not available.")
     def test_lxml_encode(self):
         """Test encode with etree_element_class=lxml.etree.Element"""
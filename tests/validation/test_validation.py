@@ -24,7 +24,7 @@ import xmlschema
 from xmlschema import XMLSchema10, XMLSchemaValidationError, XMLSchemaStopValidation, \
     XMLSchemaChildrenValidationError
 
-from xmlschema.validators import XMLSchema11, ValidationContext
+from xmlschema.validators import XMLSchema11, ValidationContext, IdRegistry
 from xmlschema.testing import XsdValidatorTestCase
 from xmlschema import DataElement, XMLResource
 from xmlschema.converters import XMLSchemaConverter, JsonMLConverter
@@ -83,6 +83,63 @@ class TestValidationContext(unittest.TestCase):
         self.assertIsInstance(converter, XMLSchemaConverter)
         self.assertNotIsInstance(converter, JsonMLConverter)
 
+    def test_id_registry(self):
+        registry = IdRegistry()
+        self.assertEqual(repr(registry), 'IdRegistry(<0 IDs>, <0 pending IDREFs>)')
+
+        registry.add_idref('b')
+        registry.add_idref('c')
+        registry.add_idref('b')
+        self.assertTrue(registry.add_id('a'))
+        self.assertTrue(registry.add_id('b'))
+        self.assertFalse(registry.add_id('a'))
+        registry.add_idref('a')
+        self.assertEqual(len(registry), 2)
+        self.assertIn('a', registry)
+        self.assertNotIn('c', registry)
+        self.assertListEqual(list(registry.pending), ['c'])
+        self.assertGreater(registry.memory_usage, 0)
+
+        registry = IdRegistry(spill_threshold=2)
+        registry.add_idref('z')
+        for k in range(5):
+            self.assertTrue(registry.add_id(f'id{k}'))
+        self.assertEqual(registry.spilled, 3)
+        self.assertSetEqual(registry.ids, {'id3', 'id4'})
+        self.assertEqual(len(registry), 5)
+        self.assertIn('id0', registry)
+        self.assertFalse(registry.add_id('id1'))
+        registry.add_idref('id2')
+        self.assertListEqual(list(registry.pending), ['z'])
+        self.assertSetEqual(set(registry), {f'id{k}' for k in range(5)})
+
+        other = registry.copy()
+        self.assertIsNone(other._db)
+        self.assertTrue(other.add_id('z'))
+        self.assertEqual(len(other), 6)
+        self.assertEqual(len(registry), 5)
+        self.assertNotIn('z', registry)
+        self.assertListEqual(list(registry.pending), ['z'])
+
+        # The IDs on disk are shared, the IDs spilled after the copy are not
+        self.assertIn('id0', other)
+        for k in range(5, 8):
+            self.assertTrue(registry.add_id(f'id{k}'))
+            self.assertTrue(other.add_id(f'x{k}'))
+        self.assertEqual(registry.spilled, 6)
+        self.assertEqual(other.spilled, 9)
+        self.assertNotIn('id5', other)
+        self.assertNotIn('x5', registry)
+        self.assertTrue(other.add_id('id5'))
+        self.assertSetEqual(set(other), {f'id{k}' for k in range(6)} |
+                            {'z', 'x5', 'x6', 'x7'})
+
+        registry.clear()
+        self.assertEqual(len(registry), 0)
+        self.assertNotIn('id0', registry)
+        self.assertEqual(len(other), 10)
+        self.assertIn('id0', other)
+
     def test_validation_error(self):
         elem = ElementTree.XML('<foo/>')
         context = ValidationContext(source=XMLResource(elem))
@@ -707,6 +764,46 @@ class TestValidation(XsdValidatorTestCase):
         subresource = resource.subresource(resource.root[0])
         self.assertIsNone(schema.validate(subresource))
 
+    def test_id_and_idref_values(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="item" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:attribute name="id" type="xs:ID"/>
+                        <xs:attribute name="ref" type="xs:IDREF"/>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>"""))
+
+        xml_data = '<root><item ref="i3"/><item id="i1"/><item id="i3" ref="i1"/></root>'
+        self.assertIsNone(schema.validate(xml_data))
+
+        xml_data = '<root><item ref="x"/><item id="i1" ref="y"/>' \
+                   '<item id="i1" ref="x"/></root>'
+        reasons = [e.reason for e in schema.iter_errors(xml_data)]
+        self.assertListEqual(reasons, [
+            "attribute id='i1': duplicated xs:ID value 'i1'",
+            "IDREF 'x' not found in XML document",
+            "IDREF 'y' not found in XML document",
+        ])
+
+        spill_schema = self.schema_class(schema.source.text, id_spill_threshold=1)
+        resource = XMLResource(xml_data, lazy=True)
+        self.assertListEqual([e.reason for e in spill_schema.iter_errors(resource)], reasons)
+
+        xml_data = '<root>%s<item ref="i0"/></root>' % \
+                   ''.join(f'<item id="i{k}" ref="i{k + 1}"/>' for k in range(10))
+        self.assertFalse(spill_schema.is_valid(xml_data))
+        errors = list(spill_schema.iter_errors(xml_data))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].reason, "IDREF 'i10' not found in XML document")
+
 
 class TestValidation11(TestValidation):
     schema_class = XMLSchema11
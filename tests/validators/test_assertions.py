@@ -157,6 +157,82 @@ class TestXsdAssert(XsdValidatorTestCase):
         self.assertFalse(schema.is_valid('<root><child>11</child></root>'))
         self.assertFalse(schema.is_valid('<root><child>ten</child></root>'))
 
+    def test_dependencies(self):
+        schema = self.schema_class(dedent("""\
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:complexType name="rangeType">
+                <xs:simpleContent>
+                    <xs:extension base="xs:int">
+                        <xs:attribute name="min" type="xs:int"/>
+                        <xs:attribute name="max" type="xs:int"/>
+                        <xs:assert test="@min le @max"/>
+                        <xs:assert test="$value ge @min and @max lt 10000"/>
+                        <xs:assert test="$value castable as xs:short"/>
+                        <xs:assert test="true() and 1 + 1 eq 2"/>
+                        <xs:assert test="string-length() gt 0"/>
+                        <xs:assert test="count(..) eq 0"/>
+                        <xs:assert test="@* = 9"/>
+                    </xs:extension>
+                </xs:simpleContent>
+            </xs:complexType>
+            <xs:element name="root" type="rangeType"/>
+        </xs:schema>
+        """))
+
+        assertions = schema.types['rangeType'].assertions
+        self.assertEqual(len(assertions), 7)
+        self.assertEqual(assertions[0].dependencies, {'attributes'})
+        self.assertEqual(assertions[1].dependencies, {'attributes', 'value'})
+        self.assertEqual(assertions[2].dependencies, {'value'})
+        self.assertEqual(assertions[3].dependencies, set())
+        self.assertEqual(assertions[4].dependencies, {'subtree'})
+        self.assertEqual(assertions[5].dependencies, {'subtree'})
+        self.assertEqual(assertions[6].dependencies, {'attributes'})
+
+        self.assertTrue(schema.is_valid('<root min="9" max="10">9</root>'))
+        self.assertFalse(schema.is_valid('<root min="10" max="9">9</root>'))
+        self.assertFalse(schema.is_valid('<root min="9" max="10">40000</root>'))
+        self.assertFalse(schema.is_valid('<root min="9" max="100000">9</root>'))
+
+    def test_assertions_without_subtree(self):
+        schema = self.schema_class(dedent("""\
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:complexType name="rangeType">
+                <xs:sequence>
+                    <xs:element name="child" type="xs:int" minOccurs="0"/>
+                </xs:sequence>
+                <xs:attribute name="min" type="xs:int"/>
+                <xs:attribute name="max" type="xs:int"/>
+                <xs:assert test="@min le @max"/>
+                <xs:assert test="1 lt 2"/>
+            </xs:complexType>
+            <xs:element name="root">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="range" type="rangeType" maxOccurs="unbounded"/>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+        </xs:schema>
+        """))
+
+        # Typed comparison of attributes: with untyped values '9' > '10'
+        self.assertTrue(schema.is_valid(
+            '<root><range min="9" max="10"><child>1</child></range>'
+            '<range min="1" max="1"/></root>'
+        ))
+        errors = list(schema.iter_errors(
+            '<root><range min="9" max="10"/><range min="3" max="2"/></root>'
+        ))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].path, '/root/range[2]')
+        self.assertIs(errors[0].elem, errors[0].obj)
+        self.assertEqual(len(errors[0].elem), 0)
+
+        assertion = schema.types['rangeType'].assertions[1]
+        self.assertEqual(assertion.dependencies, set())
+        self.assertTrue(assertion._static_result)
+
 
 if __name__ == '__main__':
     from xmlschema.testing import run_xmlschema_tests
@@ -9,6 +9,9 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import pathlib
+from xml.etree import ElementTree
+
+from elementpath import XPathContext
 
 from xmlschema import XMLSchemaParseError
 from xmlschema.validators import XMLSchema11
@@ -113,6 +116,89 @@ class TestXsd11Elements(TestXsdElements):
 
     schema_class = XMLSchema11
 
+    def test_compiled_alternative_tests(self):
+        schema = self.schema_class("""
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+                xmlns:tns="http://xmlschema.test/ns">
+            <xs:element name="elem" type="xs:anyType">
+                <xs:alternative test="@a = 'x'" type="xs:string"/>
+                <xs:alternative test="'y' eq @a" type="xs:int"/>
+                <xs:alternative test="@tns:b and not(@c)" type="xs:float"/>
+                <xs:alternative test="(@b != '1' or @c ne '') and true()" type="xs:date"/>
+                <xs:alternative test="@a = 1" type="xs:double"/>
+                <xs:alternative test="@a = 'x'" type="xs:decimal"/>
+                <xs:alternative test="false() or @a = 'z'" type="xs:boolean"/>
+                <xs:alternative test="string-length(@c) = 2" type="xs:boolean"/>
+            </xs:element>
+        </xs:schema>""")
+
+        xsd_element = schema.elements['elem']
+        alternatives = xsd_element.alternatives
+        self.assertEqual(alternatives[0].dispatch_key, ('a', 'x'))
+        self.assertEqual(alternatives[1].dispatch_key, ('a', 'y'))
+        self.assertIsNone(alternatives[2].dispatch_key)
+        self.assertEqual([alt.attributes_test is None for alt in alternatives],
+                         [False, False, False, False, True, False, False, True])
+
+        table = xsd_element.alternatives_table
+        self.assertEqual(len(table), 7)
+        self.assertEqual(table[0], ('a', {'x': alternatives[0].type,
+                                          'y': alternatives[1].type}))
+        self.assertIs(table[1], alternatives[2])
+        self.assertEqual(table[4], ('a', {'x': alternatives[5].type}))
+
+        b_name = '{http://xmlschema.test/ns}b'
+        samples = [{}, {'a': 'x'}, {'a': 'y'}, {'a': '1'}, {'a': 'z'}, {b_name: '1'},
+                   {'b': '1'}, {'b': '2'}, {'c': ''}, {'c': 'ab'}, {b_name: '', 'c': ''},
+                   {'a': ' x'}, {'b': '1', 'c': '1'}]
+
+        for attrib in samples:
+            elem = ElementTree.Element('elem', attrib)
+            for alt in alternatives:
+                if alt.attributes_test is not None:
+                    result = alt.token.boolean_value(
+                        list(alt.token.select(XPathContext(elem)))
+                    )
+                    self.assertEqual(alt.test(elem), result, msg=(alt, attrib))
+
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem', {'a': 'y'})).local_name, 'int')
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem', {'a': '1.0'})).local_name, 'double')
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem', {'a': 'z', 'b': '1'})).local_name, 'boolean')
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem', {'c': '12', 'b': '1'})).local_name, 'date')
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem', {'b': '1'})).local_name, 'anyType')
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem'), inherited={'a': 'x'}).local_name, 'string')
+
+    def test_compiled_alternative_tests_with_empty_sequences(self):
+        schema = self.schema_class("""
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:element name="elem" type="xs:anyType">
+                <xs:alternative test="()" type="xs:int"/>
+                <xs:alternative test="@a = 'x' or ()" type="xs:string"/>
+                <xs:alternative test="not(())" type="xs:float"/>
+            </xs:element>
+        </xs:schema>""")
+
+        alternatives = schema.elements['elem'].alternatives
+        self.assertTrue(all(alt.attributes_test is not None for alt in alternatives))
+
+        for attrib in ({}, {'a': 'x'}, {'a': 'y'}):
+            elem = ElementTree.Element('elem', attrib)
+            for alt in alternatives:
+                result = alt.token.boolean_value(list(alt.token.select(XPathContext(elem))))
+                self.assertEqual(alt.test(elem), result, msg=(alt, attrib))
+
+        xsd_element = schema.elements['elem']
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem', {'a': 'x'})).local_name, 'string')
+        self.assertEqual(xsd_element.get_alternative_type(
+            ElementTree.Element('elem')).local_name, 'float')
+
 
 if __name__ == '__main__':
     from xmlschema.testing import run_xmlschema_tests
@@ -10,10 +10,13 @@
 #
 import pathlib
 import xml.etree.ElementTree as ElementTree
+from collections import Counter
+from decimal import Decimal
 
-from xmlschema import XMLSchemaParseError, XMLSchemaValidationError
+from xmlschema import XMLSchemaParseError, XMLSchemaValidationError, XMLResource
 from xmlschema.validators import XMLSchema11
-from xmlschema.validators.identities import IdentityCounter, KeyrefCounter, FieldValueSelector
+from xmlschema.validators.identities import IdentityCounter, KeyrefCounter, \
+    FieldValueSelector, SpilledCounter
 from xmlschema.testing import XsdValidatorTestCase
 
 
@@ -375,6 +378,340 @@ class TestXsdIdentities(XsdValidatorTestCase):
         self.assertIn("value ('3',) not found", str(errors[1]))
         self.assertIn("(2 times)", str(errors[1]))
 
+    def test_keyref_to_inner_key_scopes(self):
+        # The key values of the inner scopes are propagated to the keyref scope,
+        # excluding the values that are in more than one of the inner scopes.
+        schema = self.get_schema("""
+            <xs:element name="doc">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="section" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:sequence>
+                        <xs:element name="item" minOccurs="0" maxOccurs="unbounded">
+                          <xs:complexType>
+                            <xs:attribute name="id" type="xs:string"/>
+                          </xs:complexType>
+                        </xs:element>
+                      </xs:sequence>
+                    </xs:complexType>
+                    <xs:key name="k">
+                      <xs:selector xpath="item"/>
+                      <xs:field xpath="@id"/>
+                    </xs:key>
+                  </xs:element>
+                  <xs:element name="ref" minOccurs="0" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:attribute name="to" type="xs:string"/>
+                    </xs:complexType>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:keyref name="kr" refer="k">
+                <xs:selector xpath="ref"/>
+                <xs:field xpath="@to"/>
+              </xs:keyref>
+            </xs:element>""")
+
+        for lazy in (False, True):
+            xml_data = '<doc><section><item id="a"/></section>' \
+                       '<section><item id="b"/></section><ref to="a"/><ref to="b"/></doc>'
+            self.assertTrue(schema.is_valid(XMLResource(xml_data, lazy=lazy)))
+
+            xml_data = '<doc><section><item id="a"/></section>' \
+                       '<section><item id="b"/></section><ref to="c"/></doc>'
+            errors = list(schema.iter_errors(XMLResource(xml_data, lazy=lazy)))
+            self.assertEqual(len(errors), 1)
+            self.assertIn("value ('c',) not found", str(errors[0]))
+
+            xml_data = '<doc><section><item id="x"/></section>' \
+                       '<section><item id="x"/></section><ref to="x"/></doc>'
+            errors = list(schema.iter_errors(XMLResource(xml_data, lazy=lazy)))
+            self.assertEqual(len(errors), 1)
+            self.assertIn("value ('x',) not found", str(errors[0]))
+
+    def test_spilled_counter(self):
+        counter = SpilledCounter(Counter({('1',): 1, (2,): 3}))
+        self.assertEqual(repr(counter), 'SpilledCounter(<2 values>)')
+        self.assertEqual(len(counter), 2)
+        self.assertIn(('1',), counter)
+        self.assertIn((Decimal('2.0'),), counter)  # matched by equality
+        self.assertNotIn(('2',), counter)
+        self.assertNotIn([2], counter)
+
+        self.assertEqual(counter.add(('1',)), 2)
+        self.assertEqual(counter.add(((1, 2), float)), 1)
+        self.assertEqual(counter[(2,)], 3)
+        with self.assertRaises(KeyError):
+            _ = counter[('3',)]
+
+        counter.update(Counter({(2,): 2, ('3',): 1}))
+        self.assertEqual(dict(counter.items()),
+                         {('1',): 2, (2,): 5, ((1, 2), float): 1, ('3',): 1})
+
+        self.assertEqual(counter.pop((2,)), 5)
+        self.assertIsNone(counter.pop((2,), None))
+        del counter[('3',)]
+        self.assertListEqual(list(counter), [('1',), ((1, 2), float)])
+
+        counter[('1',)] = 1
+        self.assertEqual(counter[('1',)], 1)
+        counter.clear()
+        self.assertEqual(len(counter), 0)
+        counter.close()
+
+    def test_identity_counter_spill(self):
+        schema = self.get_schema("""
+            <xs:element name="primary_key" type="xs:string">
+              <xs:key name="key1">
+                <xs:selector xpath="."/>
+                <xs:field xpath="."/>
+              </xs:key>
+            </xs:element>""", identity_spill_threshold=2)
+
+        elem = ElementTree.XML('<primary_key>3</primary_key>')
+        counter = IdentityCounter(schema.identities['key1'], elem)
+        self.assertIsNone(counter.increase(('1',)))
+        self.assertIsNone(counter.increase(('2',)))
+        self.assertIsInstance(counter.counter, Counter)
+        self.assertIsNone(counter.increase(('3',)))
+        self.assertIsInstance(counter.counter, SpilledCounter)
+
+        with self.assertRaises(ValueError) as ctx:
+            counter.increase(('2',))
+        self.assertIn("duplicated value ('2',)", str(ctx.exception))
+
+        other = IdentityCounter(schema.identities['key1'], elem)
+        other.increase(('4',))
+        counter.merge(other)
+        self.assertEqual(dict(counter.counter.items()),
+                         {('1',): 1, ('2',): 2, ('3',): 1, ('4',): 1})
+
+        counter.reset(elem)
+        self.assertEqual(counter.counter, Counter())
+
+    def test_incremental_keyrefs(self):
+        source = """
+            <xs:element name="root">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="item" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:attribute name="id" type="xs:int"/>
+                      <xs:attribute name="ref" type="xs:int"/>
+                    </xs:complexType>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:key name="key1">
+                <xs:selector xpath="item"/>
+                <xs:field xpath="@id"/>
+              </xs:key>
+              <xs:keyref name="keyref1" refer="key1">
+                <xs:selector xpath="item"/>
+                <xs:field xpath="@ref"/>
+              </xs:keyref>
+            </xs:element>"""
+
+        schema = self.get_schema(source, incremental_keyrefs=True)
+        elem = ElementTree.XML('<root/>')
+        key_counter = IdentityCounter(schema.identities['key1'], elem)
+        keyref_counter = KeyrefCounter(schema.identities['keyref1'], elem)
+        identities = {schema.identities['key1']: key_counter,
+                      schema.identities['keyref1']: keyref_counter}
+
+        key_counter.increase((1,), identities)
+        keyref_counter.increase((1,), identities)
+        keyref_counter.increase((2,), identities)
+        keyref_counter.increase((3,), identities)
+        self.assertEqual(keyref_counter.counter, Counter({(2,): 1, (3,): 1}))
+        key_counter.increase((3,), identities)
+        self.assertEqual(keyref_counter.counter, Counter({(2,): 1}))
+
+        xml_data = '<root>{}</root>'.format(''.join(
+            f'<item id="{k}" ref="{(k + 5) % 100 if k % 30 else k + 100}"/>'
+            for k in range(100)
+        ))
+        default_schema = self.get_schema(source)
+        spill_schema = self.get_schema(source, incremental_keyrefs=True,
+                                       identity_spill_threshold=10)
+        for lazy in (False, True):
+            expected = [e.reason for e in default_schema.iter_errors(
+                XMLResource(xml_data, lazy=lazy)
+            )]
+            self.assertEqual(len(expected), 4)
+            self.assertIn('value (190,) not found', expected[-1])
+
+            for incremental_schema in (schema, spill_schema):
+                errors = incremental_schema.iter_errors(XMLResource(xml_data, lazy=lazy))
+                self.assertListEqual([e.reason for e in errors], expected)
+
+    def test_incremental_keyrefs_scopes(self):
+        # The incremental resolution must not change the validation result
+        schema = self.get_schema("""
+            <xs:element name="section">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="item" minOccurs="0" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:attribute name="id" type="xs:string"/>
+                    </xs:complexType>
+                  </xs:element>
+                  <xs:element name="ref" minOccurs="0" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:attribute name="to" type="xs:string"/>
+                    </xs:complexType>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:key name="k">
+                <xs:selector xpath="item"/>
+                <xs:field xpath="@id"/>
+              </xs:key>
+            </xs:element>
+            <xs:element name="doc">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element ref="section" maxOccurs="unbounded"/>
+                  <xs:element name="refs" minOccurs="0">
+                    <xs:complexType>
+                      <xs:sequence>
+                        <xs:element name="ref" minOccurs="0" maxOccurs="unbounded">
+                          <xs:complexType>
+                            <xs:attribute name="to" type="xs:string"/>
+                          </xs:complexType>
+                        </xs:element>
+                        <xs:element ref="section" minOccurs="0"/>
+                      </xs:sequence>
+                    </xs:complexType>
+                    <xs:keyref name="kr2" refer="k">
+                      <xs:selector xpath="ref"/>
+                      <xs:field xpath="@to"/>
+                    </xs:keyref>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:keyref name="kr" refer="k">
+                <xs:selector xpath="section/ref"/>
+                <xs:field xpath="@to"/>
+              </xs:keyref>
+            </xs:element>""")
+        incremental_schema = self.get_schema(schema.source.text, incremental_keyrefs=True)
+
+        for xml_data, valid in [
+            ('<doc><section><item id="a"/><ref to="a"/></section>'
+             '<section><item id="b"/></section></doc>', True),
+            ('<doc><section><ref to="b"/></section>'
+             '<section><item id="b"/></section></doc>', True),
+            ('<doc><section><item id="a"/></section>'
+             '<section><ref to="c"/></section></doc>', False),
+            ('<doc><section><item id="a"/></section>'
+             '<refs><ref to="a"/><section><item id="b"/></section></refs></doc>', False),
+            ('<doc><section><item id="a"/></section>'
+             '<refs><ref to="b"/><section><item id="b"/></section></refs></doc>', True),
+            ('<doc><section><item id="a"/></section><section><item id="a"/></section>'
+             '<section><ref to="a"/></section></doc>', False),
+        ]:
+            for lazy in (False, True):
+                expected = [e.reason for e in schema.iter_errors(
+                    XMLResource(xml_data, lazy=lazy)
+                )]
+                self.assertEqual(not expected, valid, msg=xml_data)
+
+                errors = incremental_schema.iter_errors(XMLResource(xml_data, lazy=lazy))
+                self.assertListEqual([e.reason for e in errors], expected, msg=xml_data)
+
+    def test_compiled_paths(self):
+        schema = self.check_schema("""
+            <xs:element name="root">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:any processContents="lax" maxOccurs="unbounded"/>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:unique name="unique1">
+                <xs:selector xpath=".//a | child::b/./xs:* "/>
+                <xs:field xpath="c/@xs:d|@*"/>
+              </xs:unique>
+            </xs:element>""")
+
+        selector = schema.identities['unique1'].selector
+        self.assertEqual(selector.paths, (
+            (True, ('a',), None),
+            (False, ('b', '{http://www.w3.org/2001/XMLSchema}*'), None)
+        ))
+        field = schema.identities['unique1'].fields[0]
+        self.assertEqual(field.paths, (
+            (False, ('c',), '{http://www.w3.org/2001/XMLSchema}d'),
+            (False, (), '*')
+        ))
+
+        elements = ElementTree.XML(
+            '<b xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:e/><a/></b>'
+        )
+        self.assertTrue(selector.is_selecting([elements[1]]))
+        self.assertTrue(selector.is_selecting([elements, elements[1]]))
+        self.assertTrue(selector.is_selecting([elements, elements[0]]))
+        self.assertFalse(selector.is_selecting([elements[0]]))
+        self.assertFalse(selector.is_selecting([elements]))
+
+        elem = ElementTree.XML('<a x="1"><c d="2"/><!-- c --><c y="3"/></a>')
+        self.assertListEqual(list(field.iter_select(elem)), [(elem, 'x')])
+        elem[0].set('{http://www.w3.org/2001/XMLSchema}d', '4')
+        self.assertListEqual(list(field.iter_select(elem)), [
+            (elem[0], '{http://www.w3.org/2001/XMLSchema}d'), (elem, 'x')
+        ])
+
+    def test_streaming_validation(self):
+        schema = self.check_schema("""
+            <xs:element name="root">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="group" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:sequence>
+                        <xs:element name="item" maxOccurs="unbounded">
+                          <xs:complexType>
+                            <xs:sequence>
+                              <xs:element name="code" type="xs:int"/>
+                            </xs:sequence>
+                          </xs:complexType>
+                        </xs:element>
+                      </xs:sequence>
+                    </xs:complexType>
+                    <xs:unique name="local_code">
+                      <xs:selector xpath="item"/>
+                      <xs:field xpath="code"/>
+                    </xs:unique>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:key name="global_code">
+                <xs:selector xpath=".//item"/>
+                <xs:field xpath="code"/>
+              </xs:key>
+            </xs:element>""")
+
+        xml_data = '<root>{}</root>'.format(''.join(
+            '<group>{}</group>'.format(''.join(
+                f'<item><code>{k * 10 + j}</code></item>' for j in range(10)
+            )) for k in range(100)
+        ))
+        for lazy in (False, True):
+            resource = XMLResource(xml_data, lazy=lazy)
+            self.assertIsNone(schema.validate(resource))
+            if not lazy:
+                self.assertIsNone(resource._xpath_root)  # no XPath node tree is built
+
+        invalid_data = xml_data.replace('<code>123<', '<code> 124<')
+        for lazy in (False, True):
+            resource = XMLResource(invalid_data, lazy=lazy)
+            errors = list(schema.iter_errors(resource))
+            self.assertEqual(len(errors), 2)
+            self.assertTrue(all('duplicated value (124,)' in e.reason for e in errors))
+            self.assertIn("name='local_code'", ''.join(e.reason for e in errors))
+            self.assertIn("name='global_code'", ''.join(e.reason for e in errors))
+
     def test_key_multiple_values__issue_418(self):
         xsd_file = self.casepath('issues/issue_418/issue_418.xsd')
         schema = self.schema_class(xsd_file)
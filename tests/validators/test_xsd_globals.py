@@ -223,6 +223,177 @@ class TestXsd10GlobalsMaps(unittest.TestCase):
                     global_counter += 1
         self.assertEqual(global_counter, self.total_globals)
 
+    def test_overlay(self):
+        schema = self.schema_class("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root" type="rootType"/>
+              <xs:element name="item" type="xs:int"/>
+              <xs:complexType name="rootType">
+                <xs:sequence>
+                  <xs:element ref="item" maxOccurs="unbounded"/>
+                </xs:sequence>
+              </xs:complexType>
+            </xs:schema>""")
+
+        variant = schema.create_overlay()
+        maps = variant.maps
+        self.assertIsNot(variant, schema)
+        self.assertIs(maps.base, schema.maps)
+        self.assertIs(maps.validator, variant)
+        self.assertIsNone(schema.maps.base)
+        self.assertEqual(list(maps.iter_bases()), [schema.maps])
+
+        self.assertTrue(variant.built)
+        self.assertEqual(variant.validation_attempted, 'full')
+        self.assertEqual(variant.validity, 'valid')
+        self.assertEqual(maps.global_maps.total, schema.maps.global_maps.total)
+        self.assertIs(maps.elements['root'], schema.maps.elements['root'])
+        self.assertEqual(len(list(variant.iter_globals())), 3)
+        self.assertTrue(variant.is_valid('<root><item>1</item></root>'))
+
+        # Added globals are stored only in the overlay
+        other = variant.add_schema("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="extra" type="rootType"/>
+            </xs:schema>""", build=True)
+
+        self.assertIs(other.maps, maps)
+        self.assertTrue(variant.built)
+        self.assertEqual(maps.validity, 'valid')
+        self.assertTrue(maps.elements.is_owned('extra'))
+        self.assertFalse(maps.elements.is_owned('item'))
+        self.assertFalse(maps.elements.is_owned('root'))
+        self.assertIs(maps.elements['root'], schema.maps.elements['root'])
+        self.assertIs(maps.lookup(nm.XSD_ELEMENT, 'item').type, maps.types[nm.XSD_INT])
+        self.assertIs(maps.elements['extra'].type, schema.maps.types['rootType'])
+        self.assertEqual(maps.global_maps.total, schema.maps.global_maps.total + 1)
+
+        self.assertNotIn('extra', schema.maps.elements)
+        self.assertNotIn(other, schema.maps.schemas)
+        self.assertTrue(variant.is_valid('<extra><item>1</item></extra>'))
+        self.assertFalse(schema.is_valid('<extra><item>1</item></extra>'))
+        self.assertFalse(variant.is_valid('<root><item>foo</item></root>'))
+        self.assertFalse(variant.is_valid('<item>foo</item>'))
+
+        maps_copy = maps.copy()
+        self.assertIs(maps_copy.base, schema.maps)
+        maps_copy.build()
+        self.assertTrue(maps_copy.built)
+        self.assertIn('extra', maps_copy.elements)
+        self.assertIsNot(maps_copy.elements['extra'], maps.elements['extra'])
+        self.assertIs(maps_copy.elements['root'], schema.maps.elements['root'])
+
+        maps.clear(remove_schemas=True)
+        self.assertNotIn(other, maps.schemas)
+        self.assertIn(variant, maps.schemas)
+        self.assertNotIn(schema, maps.schemas)
+        maps.build()
+        self.assertNotIn('extra', maps.elements)
+        self.assertTrue(variant.is_valid('<root><item>1</item></root>'))
+
+        with self.assertRaises(ValueError):
+            other.create_overlay()
+
+    def test_overlay_redefinitions(self):
+        schema = self.schema_class("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root" type="rootType"/>
+              <xs:element name="item" type="xs:int"/>
+              <xs:element name="code" type="codeType"/>
+              <xs:simpleType name="codeType">
+                <xs:restriction base="xs:string">
+                  <xs:length value="2"/>
+                </xs:restriction>
+              </xs:simpleType>
+              <xs:complexType name="rootType">
+                <xs:sequence>
+                  <xs:element ref="item" maxOccurs="unbounded"/>
+                  <xs:element name="code" type="codeType" minOccurs="0"/>
+                </xs:sequence>
+              </xs:complexType>
+            </xs:schema>""")
+
+        # Redefine an element and a type of the base maps
+        variant = schema.create_overlay()
+        maps = variant.maps
+        variant.add_schema("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="item" type="xs:string"/>
+              <xs:simpleType name="codeType">
+                <xs:restriction base="xs:string">
+                  <xs:length value="3"/>
+                </xs:restriction>
+              </xs:simpleType>
+            </xs:schema>""", build=True)
+
+        self.assertEqual(maps.validity, 'valid')
+        self.assertTrue(maps.elements.is_owned('item'))
+        self.assertTrue(maps.types.is_owned('codeType'))
+        self.assertIs(maps.elements['item'].type, maps.types[nm.XSD_STRING])
+        self.assertIs(schema.maps.elements['item'].type, schema.maps.types[nm.XSD_INT])
+
+        # Base globals that depend on redefined globals are rebuilt in the overlay
+        self.assertTrue(maps.types.is_owned('rootType'))
+        self.assertTrue(maps.elements.is_owned('root'))
+        self.assertTrue(maps.elements.is_owned('code'))
+        self.assertIsNot(maps.elements['root'], schema.maps.elements['root'])
+        self.assertIs(maps.elements['root'].type, maps.types['rootType'])
+        self.assertIs(maps.elements['code'].type, maps.types['codeType'])
+        self.assertIs(maps.elements['root'].type.content[0].ref, maps.elements['item'])
+        self.assertIs(maps.elements['root'].schema.maps, maps)
+        self.assertIs(schema.maps.elements['root'].type, schema.maps.types['rootType'])
+
+        for xml_data in ('<item>foo</item>', '<root><item>foo</item></root>',
+                         '<code>abc</code>', '<root><item>1</item><code>abc</code></root>'):
+            self.assertTrue(variant.is_valid(xml_data), msg=xml_data)
+            self.assertFalse(schema.is_valid(xml_data), msg=xml_data)
+
+        self.assertFalse(variant.is_valid('<root><item>1</item><code>ab</code></root>'))
+        self.assertTrue(schema.is_valid('<root><item>1</item><code>ab</code></root>'))
+
+        maps.clear(remove_schemas=True)
+        maps.build()
+        self.assertFalse(maps.elements.is_owned('root'))
+        self.assertIs(maps.elements['root'], schema.maps.elements['root'])
+        self.assertFalse(variant.is_valid('<root><item>foo</item></root>'))
+
+    def test_overlay_substitution_groups(self):
+        schema = self.schema_class("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element ref="head" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:element name="head" type="xs:string"/>
+              <xs:element name="member1" type="xs:string" substitutionGroup="head"/>
+            </xs:schema>""")
+
+        variant = schema.create_overlay()
+        maps = variant.maps
+        variant.add_schema("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="member2" type="xs:string" substitutionGroup="head"/>
+            </xs:schema>""", build=True)
+
+        self.assertEqual(maps.validity, 'valid')
+        self.assertTrue(maps.elements.is_owned('head'))
+        self.assertTrue(maps.elements.is_owned('root'))
+        self.assertEqual(maps.elements['head'].substitutes, {'member1', 'member2'})
+        self.assertEqual(schema.maps.elements['head'].substitutes, {'member1'})
+        self.assertEqual({e.name for e in maps.substitution_groups['head']},
+                         {'member1', 'member2'})
+        self.assertTrue(all(maps.elements[e.name] is e
+                            for e in maps.substitution_groups['head']))
+        self.assertEqual(len(schema.maps.substitution_groups['head']), 1)
+
+        xml_data = '<root><head>a</head><member1>b</member1><member2>c</member2></root>'
+        self.assertTrue(variant.is_valid(xml_data))
+        self.assertFalse(schema.is_valid(xml_data))
+        self.assertTrue(schema.is_valid('<root><head>a</head><member1>b</member1></root>'))
+
 
 class TestXsd11GlobalsMaps(TestXsd10GlobalsMaps):
 
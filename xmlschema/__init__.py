@@ -11,16 +11,18 @@ from . import translation
 from . import limits
 from .exceptions import XMLSchemaException, XMLResourceError, XMLSchemaNamespaceError
 from .resources import fetch_resource, fetch_namespaces, fetch_schema_locations, \
-    fetch_schema, XMLResource
+    fetch_schema, XMLResource, ResourceCache
 from .xpath import ElementPathMixin, ElementSelector, ElementPathSelector
 from .converters import ElementData, XMLSchemaConverter, \
     UnorderedConverter, ParkerConverter, BadgerFishConverter, \
     AbderaConverter, JsonMLConverter, ColumnarConverter, GDataConverter
-from .dataobjects import DataElement, DataElementConverter, DataBindingConverter
+from .dataobjects import DataElement, CompactDataElement, DataElementConverter, \
+    DataBindingConverter
 from .documents import validate, is_valid, iter_errors, iter_decode, \
     to_dict, to_json, to_etree, from_json, XmlDocument
 from .exports import download_schemas
 from .loaders import SchemaLoader, LocationSchemaLoader, SafeSchemaLoader
+from .trusted import TrustedSources
 from .utils.etree import etree_tostring
 from .utils.urls import normalize_url, normalize_locations
 
@@ -44,14 +46,14 @@ __all__ = [
     'limits', 'translation', 'XMLSchemaException', 'XMLResourceError',
     'XMLSchemaNamespaceError', 'etree_tostring', 'normalize_url',
     'normalize_locations', 'fetch_resource', 'fetch_namespaces',
-    'fetch_schema_locations', 'fetch_schema',
+    'fetch_schema_locations', 'fetch_schema', 'ResourceCache',
     'XMLResource', 'ElementPathMixin', 'ElementData', 'XMLSchemaConverter',
     'UnorderedConverter', 'ParkerConverter', 'BadgerFishConverter', 'GDataConverter',
     'AbderaConverter', 'JsonMLConverter', 'ColumnarConverter', 'DataElement',
-    'DataElementConverter', 'DataBindingConverter', 'validate', 'is_valid',
+    'CompactDataElement', 'DataElementConverter', 'DataBindingConverter', 'validate', 'is_valid',
     'iter_errors', 'iter_decode', 'to_dict', 'to_json', 'to_etree', 'from_json',
     'XmlDocument', 'download_schemas', 'ElementSelector', 'ElementPathSelector',
-    'SchemaLoader', 'LocationSchemaLoader', 'SafeSchemaLoader',
+    'SchemaLoader', 'LocationSchemaLoader', 'SafeSchemaLoader', 'TrustedSources',
     'XMLSchemaValidatorError', 'XMLSchemaParseError', 'XMLSchemaNotBuiltError',
     'XMLSchemaModelError', 'XMLSchemaModelDepthError', 'XMLSchemaValidationError',
     'XMLSchemaDecodeError', 'XMLSchemaEncodeError', 'XMLSchemaChildrenValidationError',
@@ -376,6 +376,10 @@ class LocationsOption(Option[Optional[LocationsType]]):
     _validators = partial(validate_type, types=LOCATIONS_TYPES, none=True),
 
 
+class SpillThresholdOption(Option[Optional[int]]):
+    _validators = none_int_validator, pos_int_validator
+
+
 class ElementTypeOption(Option[Optional[ElementType]]):
     def validated_value(self, value: Any) -> Optional[ElementType]:
         if value is None or is_subclass(value, Element) or \
@@ -0,0 +1,595 @@
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+A benchmark suite for tracking the performance of schema builds, validation,
+decoding, encoding, lazy iteration, XSD 1.1 assertions and type alternatives,
+XPath selection, compiled XPath queries and filtered parsing on synthetic
+documents of scalable size, with a comparison of results for detecting
+regressions.
+"""
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, IO, Optional, Union
+
+from xmlschema.exceptions import XMLSchemaValueError
+
+__all__ = ['BENCHMARK_NAMESPACE', 'BENCHMARK_SCHEMA', 'BENCHMARKS', 'parse_size',
+           'write_document', 'BenchmarkResult', 'Regression', 'run_benchmarks',
+           'compare_results', 'format_results', 'format_regressions', 'SELECTOR_PATHS',
+           'run_selector_benchmarks', 'format_selector_results']
+
+BENCHMARK_NAMESPACE = 'http://xmlschema.test/benchmark'
+
+BENCHMARK_SCHEMA = f"""\
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+    xmlns="{BENCHMARK_NAMESPACE}" xmlns:b="{BENCHMARK_NAMESPACE}"
+    targetNamespace="{BENCHMARK_NAMESPACE}" elementFormDefault="qualified">
+  <xs:element name="records">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="record" type="recordType" minOccurs="0" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+    <xs:key name="recordKey">
+      <xs:selector xpath="b:record"/>
+      <xs:field xpath="@id"/>
+    </xs:key>
+  </xs:element>
+  <xs:complexType name="recordType">
+    <xs:sequence>
+      <xs:element name="name" type="xs:string"/>
+      <xs:element name="amount" type="amountType"/>
+      <xs:element name="date" type="xs:date"/>
+      <xs:element name="tags" type="tagsType"/>
+      <xs:element name="note" type="xs:string" minOccurs="0"/>
+    </xs:sequence>
+    <xs:attribute name="id" type="xs:positiveInteger" use="required"/>
+    <xs:attribute name="status" type="statusType" default="active"/>
+  </xs:complexType>
+  <xs:simpleType name="amountType">
+    <xs:restriction base="xs:decimal">
+      <xs:fractionDigits value="2"/>
+      <xs:minInclusive value="0"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:simpleType name="statusType">
+    <xs:restriction base="xs:token">
+      <xs:enumeration value="active"/>
+      <xs:enumeration value="closed"/>
+      <xs:enumeration value="pending"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:simpleType name="tagsType">
+    <xs:list itemType="xs:NCName"/>
+  </xs:simpleType>
+</xs:schema>
+"""
+"""The XSD source of the schema of the synthetic documents."""
+
+_STATUSES = ('active', 'closed', 'pending')
+_PREDICATE_PATTERN = re.compile(r'\[[^]]*]')
+_SIZE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'B': 1, 'K': 1 << 10, 'KB': 1 << 10,
+               'M': 1 << 20, 'MB': 1 << 20, 'G': 1 << 30, 'GB': 1 << 30}
+
+
+def parse_size(size: Union[str, int]) -> int:
+    """Returns the number of bytes of a size, that can be a string like '64KB' or '1GB'."""
+    if isinstance(size, int):
+        return size
+
+    match = _SIZE_PATTERN.match(size)
+    if match is None:
+        raise XMLSchemaValueError(f"invalid size {size!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def write_document(fp: IO[str], size: Union[str, int]) -> int:
+    """
+    Writes a synthetic XML document, valid against the schema *BENCHMARK_SCHEMA*,
+    with a size of at least the provided size. The content is deterministic
+    and the document is written in chunks, so also documents that don't fit
+    in memory can be generated. Returns the number of written records.
+
+    :param fp: a text file-like object.
+    :param size: the target size, in bytes or as a string like '64KB' or '1GB'.
+    """
+    target = parse_size(size)
+    written = fp.write(f'<records xmlns="{BENCHMARK_NAMESPACE}">\n')
+
+    count = 0
+    chunk: list[str] = []
+    while written < target:
+        count += 1
+        status = '' if count % 4 else f' status="{_STATUSES[count % 3]}"'
+        note = '' if count % 5 else f'\n    <note>Note &amp; comment on {count}</note>'
+        chunk.append(
+            f'  <record id="{count}"{status}>\n'
+            f'    <name>Record {count}</name>\n'
+            f'    <amount>{count % 10000}.{count % 100:02}</amount>\n'
+            f'    <date>{2000 + count % 30}-{1 + count % 12:02}-{1 + count % 28:02}</date>\n'
+            f'    <tags>t{count % 7} t{count % 11} t{count % 13}</tags>{note}\n'
+            f'  </record>\n'
+        )
+        written += len(chunk[-1])
+        if len(chunk) >= 1000:
+            fp.write(''.join(chunk))
+            chunk.clear()
+
+    if chunk:
+        fp.write(''.join(chunk))
+    fp.write('</records>\n')
+    return count
+
+
+def _build(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema
+    return lambda: XMLSchema(source)
+
+
+def _validate(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema
+    schema = XMLSchema(source)
+    return lambda: schema.validate(xml_file)
+
+
+def _decode(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema
+    schema = XMLSchema(source)
+    return lambda: schema.decode(xml_file)
+
+
+def _encode(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema, XMLResource
+    schema = XMLSchema(source)
+    data = schema.decode(xml_file)
+    path = XMLResource(xml_file, lazy=True).root.tag
+    return lambda: schema.encode(data, path=path)
+
+
+def _lazy_iteration(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema, XMLResource
+
+    schema = XMLSchema(source)
+
+    def lazy_iteration() -> None:
+        resource = XMLResource(xml_file, lazy=True)
+        for _ in schema.iter_decode(resource, path='*'):
+            pass
+
+    return lazy_iteration
+
+
+def _xpath_find(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLResource
+
+    resource = XMLResource(xml_file)
+    if source != BENCHMARK_SCHEMA:
+        return lambda: resource.findall('*/*')
+
+    namespaces = {'': BENCHMARK_NAMESPACE}
+    return lambda: resource.findall('record[@status="closed"]/tags', namespaces)
+
+
+def _compiled_xpath(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema, XMLResource
+
+    schema = XMLSchema(source)
+    if source != BENCHMARK_SCHEMA:
+        query = schema.compile_xpath('/*/*')
+        return lambda: query.select(XMLResource(xml_file, lazy=True))
+
+    query = schema.compile_xpath('/b:records/b:record[@status = "closed"]/b:amount')
+    return lambda: sum(query.iter_values(XMLResource(xml_file, lazy=True)))
+
+
+def _assertions(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema11
+
+    if source == BENCHMARK_SCHEMA:
+        # Add XSD 1.1 assertions on attributes, on the $value and on the subtree
+        attribute = '<xs:attribute name="status" type="statusType" default="active"/>'
+        source = source.replace(attribute, attribute + (
+            '\n    <xs:assert test="@id ge 1"/>'
+            '\n    <xs:assert test="not(@status) or string-length(@status) gt 0"/>'
+            '\n    <xs:assert test="b:amount ge 0 and exists(b:name)"/>'
+        )).replace('<xs:element name="name" type="xs:string"/>', (
+            '<xs:element name="name" type="nameType"/>'
+        )).replace('<xs:simpleType name="amountType">', (
+            '<xs:complexType name="nameType">\n'
+            '    <xs:simpleContent>\n'
+            '      <xs:extension base="xs:string">\n'
+            '        <xs:assert test="string-length($value) gt 0"/>\n'
+            '      </xs:extension>\n'
+            '    </xs:simpleContent>\n'
+            '  </xs:complexType>\n'
+            '  <xs:simpleType name="amountType">'
+        ))
+
+    schema = XMLSchema11(source)
+    return lambda: schema.validate(xml_file)
+
+
+def _alternatives(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLSchema11
+
+    if source == BENCHMARK_SCHEMA:
+        # Add XSD 1.1 type alternatives for the records, selected by attribute tests
+        record = '<xs:element name="record" type="recordType" minOccurs="0" maxOccurs="unbounded"/>'
+        source = source.replace(record, record[:-2] + '>' + ''.join(
+            f'\n          <xs:alternative test="@status = \'{status}\'" type="recordType"/>'
+            for status in _STATUSES
+        ) + (
+            '\n          <xs:alternative test="not(@status) and @id" type="recordType"/>'
+            '\n        </xs:element>'
+        ))
+
+    schema = XMLSchema11(source)
+    return lambda: schema.validate(xml_file)
+
+
+def _iterfind_parser(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLResource
+    from xmlschema.resources.parsers import iterfind_parser
+
+    if source != BENCHMARK_SCHEMA:
+        parser = iterfind_parser('*[2]')
+    else:
+        parser = iterfind_parser('record[@status="closed"]', {'': BENCHMARK_NAMESPACE})
+    return lambda: XMLResource(xml_file, iterparse=parser)
+
+
+def _lazy_iterfind(source: str, xml_file: str) -> Callable[[], Any]:
+    from xmlschema import XMLResource
+
+    resource = XMLResource(xml_file, lazy=True)
+    if source != BENCHMARK_SCHEMA:
+        return lambda: resource.findall('*[2]')
+
+    namespaces = {'': BENCHMARK_NAMESPACE}
+    return lambda: resource.findall('record[@status="closed"]', namespaces)
+
+
+BENCHMARKS: dict[str, Callable[[str, str], Callable[[], Any]]] = {
+    'build': _build,
+    'validate': _validate,
+    'decode': _decode,
+    'encode': _encode,
+    'lazy_iteration': _lazy_iteration,
+    'xpath_find': _xpath_find,
+    'compiled_xpath': _compiled_xpath,
+    'assertions': _assertions,
+    'alternatives': _alternatives,
+    'iterfind_parser': _iterfind_parser,
+    'lazy_iterfind': _lazy_iterfind,
+}
+"""
+The registered benchmarks. Each item is a function that takes the schema source
+and the XML file path and returns the callable to measure. The preparation is
+not included in the measures.
+"""
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The result of a benchmark on a document size. Times are in seconds,
+    the memory peak is in bytes, as traced by :mod:`tracemalloc` in a
+    separate round, or `None` if memory measurement is disabled.
+    """
+    name: str
+    size: int
+    rounds: int
+    min: float
+    mean: float
+    median: float
+    peak_memory: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f'{self.name}[{self.size}]'
+
+
+@dataclass
+class Regression:
+    """A metric of a benchmark result that regressed beyond the threshold."""
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float('inf')
+
+
+def run_benchmarks(sizes: Iterable[Union[str, int]] = ('64KB',),
+                   names: Optional[Iterable[str]] = None,
+                   rounds: int = 3,
+                   memory: bool = True,
+                   workdir: Union[str, Path, None] = None,
+                   schema: Union[str, Path, None] = None,
+                   seed: int = 0) -> dict[str, Any]:
+    """
+    Runs the benchmarks on synthetic documents of the provided sizes and
+    returns a report suitable for JSON serialization. The schema build is
+    independent of the document size, so it's measured only once.
+
+    :param sizes: the sizes of the documents, in bytes or as strings like '64KB'.
+    :param names: restricts the benchmarks to run, by default all are run.
+    :param rounds: the number of timed rounds of each benchmark.
+    :param memory: if `False` skips the memory peak measurements.
+    :param workdir: the directory where the documents are written, \
+    by default a temporary directory is used.
+    :param schema: an optional path to an XSD 1.0 schema to benchmark instead of \
+    the builtin one. The documents are generated with :class:`XmlInstanceGenerator`.
+    :param seed: the seed of the generator of documents for a custom schema.
+    """
+    if rounds < 1:
+        raise XMLSchemaValueError("the number of rounds must be positive")
+
+    selected = list(BENCHMARKS) if names is None else list(names)
+    for name in selected:
+        if name not in BENCHMARKS:
+            raise XMLSchemaValueError(f"unknown benchmark {name!r}")
+
+    if schema is None:
+        source = BENCHMARK_SCHEMA
+        generator = None
+    else:
+        from xmlschema import XMLSchema
+        from xmlschema.extras.instances import XmlInstanceGenerator
+
+        source = str(schema)
+        generator = XmlInstanceGenerator(XMLSchema(source), seed=seed)
+
+    results: list[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dirpath = Path(tmpdir if workdir is None else workdir)
+
+        for size in sorted(parse_size(x) for x in sizes):
+            xml_file = dirpath.joinpath(f'benchmark-{size}.xml')
+            with xml_file.open('w', encoding='utf-8') as fp:
+                if generator is None:
+                    write_document(fp, size)
+                else:
+                    generator.write(fp, size=size)
+
+            for name in selected:
+                if name == 'build' and any(r.name == 'build' for r in results):
+                    continue
+                func = BENCHMARKS[name](source, str(xml_file))
+                results.append(_measure(name, 0 if name == 'build' else size,
+                                        func, rounds, memory))
+
+            if workdir is None:
+                os.unlink(xml_file)
+
+    return {
+        'metadata': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'xmlschema': _get_version(),
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+        },
+        'results': [asdict(r) for r in results],
+    }
+
+
+def _measure(name: str, size: int, func: Callable[[], Any],
+             rounds: int, memory: bool) -> BenchmarkResult:
+    times = _timeit(func, rounds)
+
+    peak_memory = None
+    if memory:
+        # A separate round, because tracing slows down the execution
+        tracemalloc.start()
+        try:
+            func()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult(name, size, rounds, min(times), statistics.mean(times),
+                           statistics.median(times), peak_memory)
+
+
+SELECTOR_PATHS = (
+    'b:record',
+    'b:record/b:amount',
+    'b:record[@status="closed"]/b:tags',
+    'b:record[3]',
+    '/b:records/b:record/b:note',
+    'b:record//b:note',
+    '//b:note',
+    'b:record[b:note]/b:name',
+)
+"""Typical paths of the selector benchmarks, prefixed with 'b' for *BENCHMARK_NAMESPACE*."""
+
+
+def run_selector_benchmarks(size: Union[str, int] = '1MB',
+                            paths: Iterable[str] = SELECTOR_PATHS,
+                            rounds: int = 3) -> list[dict[str, Any]]:
+    """
+    Measures the selection of elements with :meth:`XMLResource.iterfind` and
+    the decoding of the selected elements with :meth:`XMLSchema.decode` on a
+    synthetic document, for each path and with both the selector classes.
+    Returns a list of rows with the path, the engine chosen by the planner
+    of :class:`ElementSelector` and the minimum times in seconds.
+
+    :param size: the size of the document, in bytes or as a string like '1MB'.
+    :param paths: the paths to measure, prefixes are mapped with the namespace \
+    map `{'b': BENCHMARK_NAMESPACE}`.
+    :param rounds: the number of timed rounds of each measure.
+    """
+    from xmlschema import XMLSchema, XMLResource
+    from xmlschema.xpath import ElementSelector, ElementPathSelector
+
+    if rounds < 1:
+        raise XMLSchemaValueError("the number of rounds must be positive")
+
+    schema = XMLSchema(BENCHMARK_SCHEMA)
+    namespaces = {'b': BENCHMARK_NAMESPACE}
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        xml_file = Path(tmpdir).joinpath('benchmark.xml')
+        with xml_file.open('w', encoding='utf-8') as fp:
+            write_document(fp, size)
+
+        resources = {
+            'xpath': XMLResource(str(xml_file), selector=ElementSelector),
+            'elementpath': XMLResource(str(xml_file), selector=ElementPathSelector),
+        }
+        for path in paths:
+            row: dict[str, Any] = {
+                'path': path,
+                'engine': ElementSelector(path, namespaces).engine,
+            }
+            # Predicates are removed from the paths of the XSD elements,
+            # because the attributes of the schema nodes aren't typed.
+            schema_path = _PREDICATE_PATTERN.sub('', path)
+            if not schema_path.startswith('/'):
+                schema_path = f'/b:records/{schema_path}'
+
+            for key, resource in resources.items():
+                row[f'{key}_iterfind'] = min(_timeit(
+                    lambda: resource.findall(path, namespaces), rounds
+                ))
+                row[f'{key}_decode'] = min(_timeit(
+                    lambda: schema.decode(resource, path, schema_path, namespaces=namespaces),
+                    rounds
+                ))
+            rows.append(row)
+
+    return rows
+
+
+def format_selector_results(rows: list[dict[str, Any]]) -> str:
+    """Returns a printable table of the results of the selector benchmarks."""
+    lines = [
+        f'  {"path":<36} {"engine":>8} {"iterfind (s)":>13} {"ET iterfind":>13} '
+        f'{"decode (s)":>13} {"ET decode":>13}',
+    ]
+    for row in rows:
+        lines.append(
+            f'  {row["path"]:<36} {row["engine"]:>8} {row["xpath_iterfind"]:>13.6f} '
+            f'{row["elementpath_iterfind"]:>13.6f} {row["xpath_decode"]:>13.6f} '
+            f'{row["elementpath_decode"]:>13.6f}'
+        )
+    return '\n'.join(lines)
+
+
+def _timeit(func: Callable[[], Any], rounds: int) -> list[float]:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _get_version() -> str:
+    from xmlschema import __version__
+    return __version__
+
+
+def _load_results(report: Union[dict[str, Any], str, Path]) -> dict[str, BenchmarkResult]:
+    if not isinstance(report, dict):
+        with open(report, encoding='utf-8') as fp:
+            report = json.load(fp)
+
+    assert isinstance(report, dict)
+    results = (BenchmarkResult(**item) for item in report['results'])
+    return {r.key: r for r in results}
+
+
+def compare_results(baseline: Union[dict[str, Any], str, Path],
+                    current: Union[dict[str, Any], str, Path],
+                    threshold: float = 0.1,
+                    metrics: Iterable[str] = ('min', 'peak_memory')) -> list[Regression]:
+    """
+    Compares two benchmark reports and returns the metrics that regressed
+    beyond the threshold. Results that are missing in one of the reports
+    are not compared.
+
+    :param baseline: the baseline report or the path of its JSON file.
+    :param current: the current report or the path of its JSON file.
+    :param threshold: the tolerated relative increase, e.g. 0.1 for 10%.
+    :param metrics: the compared metrics, by default the minimum time and \
+    the memory peak.
+    """
+    if threshold < 0:
+        raise XMLSchemaValueError("the threshold must be non-negative")
+
+    metrics = tuple(metrics)
+    for metric in metrics:
+        if metric not in ('min', 'mean', 'median', 'peak_memory'):
+            raise XMLSchemaValueError(f"unknown metric {metric!r}")
+
+    baseline_results = _load_results(baseline)
+    regressions = []
+    for key, result in _load_results(current).items():
+        try:
+            base_result = baseline_results[key]
+        except KeyError:
+            continue
+
+        for metric in metrics:
+            base_value = getattr(base_result, metric)
+            value = getattr(result, metric)
+            if base_value is None or value is None:
+                continue
+            elif value > base_value * (1.0 + threshold):
+                regressions.append(Regression(key, metric, base_value, value))
+
+    return regressions
+
+
+def format_results(report: dict[str, Any]) -> str:
+    """Returns a printable table of the results of a benchmark report."""
+    lines = [
+        f'Benchmarks (xmlschema {report["metadata"]["xmlschema"]}, '
+        f'Python {report["metadata"]["python"]})',
+        f'  {"benchmark":<16} {"size":>11} {"min (s)":>11} {"mean (s)":>11} '
+        f'{"median (s)":>11} {"peak (KiB)":>11}',
+    ]
+    for item in report['results']:
+        peak = '-' if item['peak_memory'] is None else f'{item["peak_memory"] / 1024:.1f}'
+        lines.append(
+            f'  {item["name"]:<16} {item["size"]:>11} {item["min"]:>11.6f} '
+            f'{item["mean"]:>11.6f} {item["median"]:>11.6f} {peak:>11}'
+        )
+    return '\n'.join(lines)
+
+
+def format_regressions(regressions: list[Regression]) -> str:
+    """Returns a printable report of regressions."""
+    if not regressions:
+        return 'No regressions found'
+
+    lines = [f'Found {len(regressions)} regression(s)']
+    lines.extend(
+        f'  {r.key} {r.metric}: {r.baseline:g} -> {r.current:g} ({r.ratio:.2f}x)'
+        for r in regressions
+    )
+    return '\n'.join(lines)
@@ -17,6 +17,7 @@ from xmlschema.exceptions import XMLSchemaAttributeError, XMLSchemaTypeError, XM
 
 if TYPE_CHECKING:
     from xmlschema.validators.xsdbase import XsdComponent  # noqa
+    from xmlschema.validators.xsd_globals import XsdGlobals
 
 
 T = TypeVar('T', bound=Union[SchemaType, 'XsdComponent'])
@@ -110,6 +111,24 @@ def schema_cache(func: Callable[..., RT]) -> Callable[..., RT]:
     return wrapped_func
 
 
+def maps_lru_cache(maxsize: int | None = None, typed: bool = False) \
+        -> Callable[[Callable[..., RT]], Callable[..., RT]]:
+    """
+    Cache a function using an LRU cache stored in XSD global maps cache. The wrapped
+    function takes the global maps as first argument, that is not passed to the cached
+    function, so the cached values are shared between all the maps' validators.
+    """
+    def wrapper_cached(func: Callable[..., RT]) -> Callable[..., RT]:
+        _cached_functions[func] = maxsize, typed
+
+        @wraps(func)
+        def wrapped_func(maps: 'XsdGlobals', *args: Any, **kwargs: Any) -> RT:
+            return maps.cache(func, *args, **kwargs)
+        return wrapped_func
+
+    return wrapper_cached
+
+
 # noinspection PyPep8Naming
 class schema_cached_property(Generic[T, RT]):
     """
@@ -12,6 +12,7 @@
 import sys
 import os
 import argparse
+import json
 import logging
 import pathlib
 from urllib.error import URLError
@@ -19,6 +20,9 @@ from urllib.error import URLError
 import xmlschema
 from xmlschema import XMLSchema, XMLSchema11, iter_errors, to_json, from_json, etree_tostring
 from xmlschema.exceptions import XMLSchemaValueError
+from xmlschema.profiler import BuildProfiler
+from xmlschema.benchmarks import BENCHMARKS, run_benchmarks, compare_results, \
+    format_results, format_regressions
 
 
 PROGRAM_NAME = os.path.basename(sys.argv[0])
@@ -276,3 +280,104 @@ def validate():
                         sys.stderr.write(f"{error}\n")
 
     sys.exit(tot_errors)
+
+
+def profile():
+    parser = argparse.ArgumentParser(prog=PROGRAM_NAME, add_help=True,
+                                     description="profile the build of a set of XSD schemas.")
+    parser.usage = "%(prog)s [OPTION]... [FILE]...\n" \
+                   "Try '%(prog)s --help' for more information."
+    parser.add_argument('-v', dest='verbosity', action='count', default=0,
+                        help="increase output verbosity.")
+    parser.add_argument('--version', type=xsd_version_number, default='1.0',
+                        help="XSD schema validator to use (default is 1.0).")
+    parser.add_argument('-L', dest='locations', nargs=2, type=str, action='append',
+                        metavar="URI/URL", help="schema location hint overrides.")
+    parser.add_argument('--sources', type=int, default=None, metavar='N',
+                        help="report only the N slowest sources (default is all).")
+    parser.add_argument('--json', action='store_true', default=False,
+                        help="print the report in JSON format.")
+    parser.add_argument('files', metavar='[XSD_FILE ...]', nargs='+',
+                        help="XSD schemas to be profiled.")
+
+    args = parser.parse_args()
+
+    loglevel = get_loglevel(args.verbosity)
+    schema_class = XMLSchema if args.version == '1.0' else XMLSchema11
+
+    tot_errors = 0
+    with BuildProfiler() as profiler:
+        for filepath in args.files:
+            try:
+                schema_class(filepath, locations=args.locations, loglevel=loglevel)
+            except (xmlschema.XMLSchemaException, URLError) as err:
+                tot_errors += 1
+                sys.stderr.write(f"{err}\n")
+
+    if args.json:
+        sys.stdout.write(json.dumps(profiler.report(), indent=2))
+    else:
+        sys.stdout.write(profiler.format_report(max_sources=args.sources))
+    sys.stdout.write('\n')
+
+    sys.exit(tot_errors)
+
+
+def benchmark():
+    parser = argparse.ArgumentParser(prog=PROGRAM_NAME, add_help=True,
+                                     description="run benchmarks or compare their results.")
+    parser.usage = "%(prog)s run [OPTION]...\n" \
+                   "       %(prog)s compare [OPTION]... BASELINE CURRENT\n" \
+                   "Try '%(prog)s --help' for more information."
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="run the benchmarks.")
+    run_parser.add_argument('--sizes', nargs='+', default=['64KB'], metavar='SIZE',
+                            help="sizes of the synthetic documents (default is 64KB).")
+    run_parser.add_argument('--only', nargs='+', default=None, metavar='NAME',
+                            choices=list(BENCHMARKS),
+                            help="run only the provided benchmarks.")
+    run_parser.add_argument('--rounds', type=int, default=3,
+                            help="timed rounds of each benchmark (default is 3).")
+    run_parser.add_argument('--no-memory', dest='memory', action='store_false',
+                            default=True, help="skip memory peak measurements.")
+    run_parser.add_argument('--workdir', type=str, default=None, metavar='PATH',
+                            help="directory where to write and keep the documents.")
+    run_parser.add_argument('-o', '--output', type=str, default=None, metavar='FILE',
+                            help="write the results to a JSON file.")
+    run_parser.add_argument('--schema', type=str, default=None, metavar='PATH',
+                            help="benchmark a custom XSD schema with generated documents.")
+    run_parser.add_argument('--seed', type=int, default=0,
+                            help="seed of the generator of documents (default is 0).")
+
+    compare_parser = subparsers.add_parser('compare', help="compare two results files.")
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="tolerated relative increase (default is 0.1).")
+    compare_parser.add_argument('--metrics', nargs='+', default=['min', 'peak_memory'],
+                                choices=['min', 'mean', 'median', 'peak_memory'],
+                                help="compared metrics (default are min and peak_memory).")
+    compare_parser.add_argument('baseline', metavar='BASELINE', help="baseline results file.")
+    compare_parser.add_argument('current', metavar='CURRENT', help="current results file.")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'run':
+            report = run_benchmarks(args.sizes, args.only, args.rounds,
+                                    args.memory, args.workdir, args.schema, args.seed)
+            if args.output is not None:
+                with open(args.output, 'w', encoding='utf-8') as fp:
+                    json.dump(report, fp, indent=2)
+            sys.stdout.write(format_results(report))
+            sys.stdout.write('\n')
+            sys.exit(0)
+
+        regressions = compare_results(args.baseline, args.current,
+                                      args.threshold, args.metrics)
+    except (XMLSchemaValueError, OSError, ValueError, KeyError) as err:
+        sys.stderr.write(f"{err}\n")
+        sys.exit(2)
+
+    sys.stdout.write(format_regressions(regressions))
+    sys.stdout.write('\n')
+    sys.exit(1 if regressions else 0)
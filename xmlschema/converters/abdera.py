@@ -55,12 +55,12 @@ class AbderaConverter(XMLSchemaConverter):
 
     def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
                        xsd_type: BaseXsdType | None = None, level: int = 0) -> Any:
-        xsd_type = xsd_type or xsd_element.type
-        if xsd_type.simple_type is not None:
+        plan = self.get_decode_plan(xsd_element, xsd_type)
+        if plan.xsd_type.simple_type is not None:
             children = data.text
         else:
             children = self.dict_class()
-            for name, value, xsd_child in self.map_content(data.content):
+            for name, value, xsd_child in plan.map_content(data.content):
                 if value is None:
                     value = self.list_class()
 
@@ -80,7 +80,7 @@ class AbderaConverter(XMLSchemaConverter):
         if data.attributes:
             result = self.dict_class([
                 ('attributes',
-                 self.dict_class((k, v) for k, v in self.map_attributes(data.attributes)))
+                 self.dict_class((k, v) for k, v in plan.map_attributes(data.attributes)))
             ])
             if children is not None and children != []:
                 result['children'] = self.list_class((children,))
@@ -93,8 +93,8 @@ class AbderaConverter(XMLSchemaConverter):
         if level:
             return result
         elif self.dict_class is dict:
-            return {self.map_qname(data.tag): result}
-        return self.dict_class(((self.map_qname(data.tag), result),))
+            return {plan.map_qname(data.tag): result}
+        return self.dict_class(((plan.map_qname(data.tag), result),))
 
     def element_encode(self, obj: Any, xsd_element: 'XsdElement', level: int = 0) -> ElementData:
         if not isinstance(obj, MutableMapping):
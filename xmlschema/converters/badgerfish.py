@@ -12,7 +12,6 @@ from typing import TYPE_CHECKING, Any
 
 from xmlschema.aliases import NsmapType, BaseXsdType, XmlnsType
 from xmlschema.exceptions import XMLSchemaTypeError
-from xmlschema.names import XSD_ANY_TYPE
 from xmlschema.utils.qnames import local_name
 
 from .base import ElementData, stackable, XMLSchemaConverter
@@ -53,22 +52,20 @@ class BadgerFishConverter(XMLSchemaConverter):
     @stackable
     def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
                        xsd_type: BaseXsdType | None = None, level: int = 0) -> Any:
-        xsd_type = xsd_type or xsd_element.type
+        plan = self.get_decode_plan(xsd_element, xsd_type)
 
-        tag = self.map_qname(data.tag)
-        result_dict = self.dict_class(t for t in self.map_attributes(data.attributes))
+        tag = plan.map_qname(data.tag)
+        result_dict = self.dict_class(t for t in plan.map_attributes(data.attributes))
 
         xmlns = self.get_effective_xmlns(data.xmlns, level, xsd_element)
         if self._use_namespaces and xmlns:
             result_dict['@xmlns'] = self.dict_class((k or '$', v) for k, v in xmlns)
 
-        xsd_group = xsd_type.model_group
-        if xsd_group is None or not data.content:
+        if plan.model_group is None or not data.content:
             if data.text is not None:
                 result_dict['$'] = data.text
         else:
-            has_single_group = xsd_group.is_single()
-            for name, item, xsd_child in self.map_content(data.content):
+            for name, item, xsd_child in plan.map_content(data.content):
                 if name.startswith('$') and name[1:].isdigit():
                     result_dict[name] = item
                     continue
@@ -86,8 +83,7 @@ class BadgerFishConverter(XMLSchemaConverter):
                     else:
                         result_dict[name] = self.list_class((other, item))
                 else:
-                    if xsd_type.name == XSD_ANY_TYPE or \
-                            has_single_group and xsd_child.is_single():
+                    if plan.is_any_type or plan.is_single(xsd_child):
                         result_dict[name] = item
                     else:
                         result_dict[name] = self.list_class((item,))
@@ -10,12 +10,13 @@
 from collections import namedtuple
 from collections.abc import Callable, Iterator, Iterable, MutableMapping, MutableSequence
 from itertools import chain
-from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union, cast
 from xml.etree.ElementTree import Element
 
 from xmlschema.aliases import NsmapType, BaseXsdType, XmlnsType
 from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError
-from xmlschema.namespaces import NamespaceMapper
+from xmlschema.names import XSD_ANY_TYPE
+from xmlschema.namespaces import XMLNS_SCOPES_CACHE_SIZE, NamespaceMapper
 from xmlschema.arguments import ConverterArguments
 from xmlschema.resources import XMLResource
 from xmlschema.utils.misc import iter_class_slots, deprecated
@@ -48,6 +49,102 @@ def stackable(method: Callable[..., T]) -> Callable[..., T]:
     return method
 
 
+class DecodePlan:
+    """
+    A decoding plan of a converter for an XSD element and its type, compiled
+    once for a namespace context. Caches the mapped names of the element, of
+    its attributes and of its children and the cardinality of the children,
+    so the decoding of repeated elements doesn't repeat these evaluations.
+
+    :param converter: the converter instance that owns the plan.
+    :param xsd_element: the XSD element of the plan.
+    :param xsd_type: the XSD type used for decoding the element.
+    """
+    __slots__ = ('converter', 'xsd_element', 'xsd_type', 'model_group', 'is_complex',
+                 'is_qname', 'is_any_type', 'single_group', 'names', 'attribute_names',
+                 'cardinality', '_map_attributes', '_map_content')
+
+    def __init__(self, converter: 'XMLSchemaConverter',
+                 xsd_element: 'XsdElement',
+                 xsd_type: BaseXsdType) -> None:
+        self.converter = converter
+        self.xsd_element = xsd_element
+        self.xsd_type = xsd_type
+        self.model_group = xsd_type.model_group
+        self.is_complex = xsd_type.is_complex()
+        self.is_qname = xsd_type.is_qname()
+        self.is_any_type = xsd_type.name == XSD_ANY_TYPE
+        self.single_group = self.model_group is not None and self.model_group.is_single()
+
+        self.names: dict[str, str] = {}
+        self.attribute_names: dict[str, str] = {}
+        self.cardinality: dict[Any, bool] = {}
+
+        # Custom mapping methods of converter subclasses are not bypassed
+        cls = type(converter)
+        self._map_attributes = cls.map_attributes is not XMLSchemaConverter.map_attributes
+        self._map_content = cls.map_content is not XMLSchemaConverter.map_content
+
+    def __repr__(self) -> str:
+        return '%s(xsd_element=%r, xsd_type=%r)' % (
+            self.__class__.__name__, self.xsd_element, self.xsd_type
+        )
+
+    def map_qname(self, qname: str) -> str:
+        """Maps a QName like the converter, caching the result."""
+        try:
+            return self.names[qname]
+        except KeyError:
+            name = self.names[qname] = self.converter.map_qname(qname)
+            return name
+
+    def map_attributes(self, attributes: Optional[Iterable[tuple[str, Any]]]) \
+            -> Iterator[tuple[str, Any]]:
+        """Maps the decoded attributes like the converter, using cached names."""
+        if self._map_attributes:
+            yield from self.converter.map_attributes(attributes)  # type: ignore[arg-type]
+        elif attributes and self.converter.attr_prefix is not None:
+            names = self.attribute_names
+            for name, value in attributes:
+                try:
+                    yield names[name], value
+                except KeyError:
+                    key = names[name] = self.converter.attr_prefix + self.map_qname(name)
+                    yield key, value
+
+    def map_content(self, content: Optional[Iterable[tuple[Any, Any, Any]]]) \
+            -> Iterator[tuple[str, Any, Any]]:
+        """Maps the decoded content like the converter, using cached names."""
+        if self._map_content:
+            yield from self.converter.map_content(content)  # type: ignore[arg-type]
+        elif content:
+            cdata_prefix = self.converter.cdata_prefix
+            names = self.names
+            for name, value, xsd_child in content:
+                if isinstance(name, int):
+                    if cdata_prefix is not None:
+                        yield f'{cdata_prefix}{name}', value, xsd_child
+                elif name[0] != '{':
+                    yield name, value, xsd_child
+                else:
+                    try:
+                        yield names[name], value, xsd_child
+                    except KeyError:
+                        yield self.map_qname(name), value, xsd_child
+
+    def is_single(self, xsd_child: Any) -> bool:
+        """
+        Returns `True` if a child element can occur at most once in the content
+        of the element, including children without an XSD declaration.
+        """
+        try:
+            return self.cardinality[xsd_child]
+        except KeyError:
+            single = self.cardinality[xsd_child] = \
+                xsd_child is None or self.single_group and xsd_child.is_single()
+            return single
+
+
 # Default placeholder for deprecation of argument 'indent' of XMLSchemaConverter
 _indent = type('int', (int,), {})(4)
 
@@ -111,7 +208,8 @@ class XMLSchemaConverter(NamespaceMapper):
     ns_prefix: str
 
     __slots__ = ('dict_class', 'list_class', 'text_key', 'ns_prefix', 'attr_prefix',
-                 'cdata_prefix', 'preserve_root', 'force_dict', 'force_list')
+                 'cdata_prefix', 'preserve_root', 'force_dict', 'force_list',
+                 '_plans', '_plans_version', '_plan_contexts', '_plan_versions')
 
     def __init__(self, namespaces: Optional[NsmapType] = None,
                  dict_class: Optional[type[dict[str, Any]]] = None,
@@ -162,10 +260,23 @@ class XMLSchemaConverter(NamespaceMapper):
         self.force_dict = force_dict
         self.force_list = force_list
 
+        self._plans: dict[tuple[Any, Any], DecodePlan] = {}
+        self._plans_version = -1
+        self._plan_contexts: dict[Any, dict[tuple[Any, Any], DecodePlan]] = {}
+        self._plan_versions: dict[int, dict[tuple[Any, Any], DecodePlan]] = {}
+
         super().__init__(
             namespaces, process_namespaces, strip_namespaces, xmlns_processing, source
         )
 
+    def __copy__(self) -> 'XMLSchemaConverter':
+        converter = cast(XMLSchemaConverter, super().__copy__())
+        converter._plans = {}
+        converter._plans_version = -1
+        converter._plan_contexts = {}
+        converter._plan_versions = {}
+        return converter
+
     @property
     def xmlns_processing_default(self) -> str:
         """
@@ -230,6 +341,43 @@ class XMLSchemaConverter(NamespaceMapper):
             kwargs['namespaces'] = None
         return self.replace(**kwargs)
 
+    def get_decode_plan(self, xsd_element: 'XsdElement',
+                        xsd_type: Optional[BaseXsdType] = None) -> DecodePlan:
+        """
+        Returns the decoding plan for an XSD element and type in the current namespace
+        context. Plans are cached per namespace context, so they are reused also after
+        restoring a namespace context of the stacked xmlns processing mode.
+
+        :param xsd_element: the XSD element to decode.
+        :param xsd_type: optional XSD type for supporting dynamic type through \
+        *xsi:type* or xs:alternative.
+        """
+        if self._plans_version != self._ns_version:
+            try:
+                self._plans = self._plan_versions[self._ns_version]
+            except KeyError:
+                if len(self._plan_versions) >= XMLNS_SCOPES_CACHE_SIZE:
+                    self._plan_versions.clear()
+
+                context_key = (bool(self.namespaces), tuple(self._reverse.items()))
+                try:
+                    self._plans = self._plan_contexts[context_key]
+                except KeyError:
+                    if len(self._plan_contexts) >= XMLNS_SCOPES_CACHE_SIZE:
+                        self._plan_contexts.clear()
+                    self._plans = self._plan_contexts[context_key] = {}
+                self._plan_versions[self._ns_version] = self._plans
+            self._plans_version = self._ns_version
+
+        if xsd_type is None:
+            xsd_type = xsd_element.type
+
+        try:
+            return self._plans[xsd_element, xsd_type]
+        except KeyError:
+            plan = self._plans[xsd_element, xsd_type] = DecodePlan(self, xsd_element, xsd_type)
+            return plan
+
     def map_attributes(self, attributes: Iterable[tuple[str, Any]]) \
             -> Iterator[tuple[str, Any]]:
         """
@@ -346,62 +494,32 @@ class XMLSchemaConverter(NamespaceMapper):
         :param level: the level related to the decoding process (0 means the root).
         :return: a data structure containing the decoded data.
         """
-        _xsd_type = xsd_type or xsd_element.type
+        plan = self.get_decode_plan(xsd_element, xsd_type)
         result_dict = self.dict_class()
         xmlns = self.get_effective_xmlns(data.xmlns, level, xsd_element)
 
-        def keep_result_dict() -> bool:
-            """
-            Decide when to keep a result dict in case of an element with simple content.
-            """
-            if data.attributes or self.force_dict and _xsd_type.is_complex():
-                return True
-            elif not xmlns or not self._use_namespaces:
-                return False
-
-            namespace = get_namespace(data.tag)
-            if any(x[1] == namespace for x in xmlns):
-                return True
-
-            if _xsd_type.is_qname() and isinstance(data.text, str):
-                try:
-                    prefix = data.text.split(':')[0]
-                except IndexError:
-                    prefix = ''
-
-                if any(x[0] == prefix for x in xmlns):
-                    return True
-
-            return False
-
         if self._use_namespaces and xmlns:
             result_dict.update(
                 (f'{self.ns_prefix}:{k}' if k else self.ns_prefix, v) for k, v in xmlns
             )
 
         if data.attributes:
-            result_dict.update(self.map_attributes(data.attributes))
+            result_dict.update(plan.map_attributes(data.attributes))
 
-        xsd_group = _xsd_type.model_group
-        if xsd_group is None or not data.content:
-            if keep_result_dict():
-                result_dict.update(self.map_attributes(data.attributes))
+        if plan.model_group is None or not data.content:
+            if self._keep_result_dict(data, xmlns, plan):
                 if data.text is not None and self.text_key is not None:
                     result_dict[self.text_key] = data.text
             elif not level and self.preserve_root:
-                return self.dict_class(((self.map_qname(data.tag), data.text),))
+                return self.dict_class(((plan.map_qname(data.tag), data.text),))
             else:
                 return data.text
         else:
-            if data.attributes:
-                result_dict.update(self.map_attributes(data.attributes))
-
-            has_single_group = xsd_group.is_single()
-            for name, value, xsd_child in self.map_content(data.content):
+            for name, value, xsd_child in plan.map_content(data.content):
                 try:
                     result = result_dict[name]
                 except KeyError:
-                    if xsd_child is None or has_single_group and xsd_child.is_single():
+                    if plan.is_single(xsd_child):
                         result_dict[name] = self.list_class((value,)) if self.force_list else value
                     else:
                         result_dict[name] = self.list_class((value,))
@@ -415,9 +533,33 @@ class XMLSchemaConverter(NamespaceMapper):
                         result_dict[name] = self.list_class((result, value))
 
         if not level and self.preserve_root:
-            return self.dict_class(((self.map_qname(data.tag), result_dict or None),))
+            return self.dict_class(((plan.map_qname(data.tag), result_dict or None),))
         return result_dict or None
 
+    def _keep_result_dict(self, data: ElementData, xmlns: XmlnsType, plan: DecodePlan) -> bool:
+        """
+        Decide when to keep a result dict in case of an element with simple content.
+        """
+        if data.attributes or self.force_dict and plan.is_complex:
+            return True
+        elif not xmlns or not self._use_namespaces:
+            return False
+
+        namespace = get_namespace(data.tag)
+        if any(x[1] == namespace for x in xmlns):
+            return True
+
+        if plan.is_qname and isinstance(data.text, str):
+            try:
+                prefix = data.text.split(':')[0]
+            except IndexError:
+                prefix = ''
+
+            if any(x[0] == prefix for x in xmlns):
+                return True
+
+        return False
+
     @stackable
     def element_encode(self, obj: Any, xsd_element: 'XsdElement', level: int = 0) -> ElementData:
         """
@@ -12,7 +12,6 @@ from typing import TYPE_CHECKING, Any, Optional
 
 from xmlschema.exceptions import XMLSchemaTypeError
 from xmlschema.aliases import NsmapType, BaseXsdType
-from xmlschema.names import XSD_ANY_TYPE
 from xmlschema.utils.qnames import local_name
 
 from .base import ElementData, stackable, XMLSchemaConverter
@@ -75,22 +74,20 @@ class GDataConverter(XMLSchemaConverter):
     @stackable
     def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
                        xsd_type: Optional[BaseXsdType] = None, level: int = 0) -> Any:
-        xsd_type = xsd_type or xsd_element.type
+        plan = self.get_decode_plan(xsd_element, xsd_type)
 
-        tag = self.map_qname(data.tag)
-        result_dict = self.dict_class(t for t in self.map_attributes(data.attributes))
+        tag = plan.map_qname(data.tag)
+        result_dict = self.dict_class(t for t in plan.map_attributes(data.attributes))
 
         xmlns = self.get_effective_xmlns(data.xmlns, level, xsd_element)
         if self._use_namespaces and xmlns:
             result_dict.update((f'xmlns${k}' if k else 'xmlns', v) for k, v in xmlns)
 
-        xsd_group = xsd_type.model_group
-        if xsd_group is None or not data.content:
+        if plan.model_group is None or not data.content:
             if data.text is not None:
                 result_dict['$t'] = data.text
         else:
-            has_single_group = xsd_group.is_single()
-            for name, item, xsd_child in self.map_content(data.content):
+            for name, item, xsd_child in plan.map_content(data.content):
                 if name.startswith('$') and name[1:].isdigit():
                     result_dict[name] = item
                     continue
@@ -108,8 +105,7 @@ class GDataConverter(XMLSchemaConverter):
                     else:
                         result_dict[name] = self.list_class((other, item))
                 else:
-                    if xsd_type.name == XSD_ANY_TYPE or \
-                            has_single_group and xsd_child.is_single():
+                    if plan.is_any_type or plan.is_single(xsd_child):
                         result_dict[name] = item
                     else:
                         result_dict[name] = self.list_class((item,))
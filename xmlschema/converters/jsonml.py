@@ -64,13 +64,13 @@ class JsonMLConverter(XMLSchemaConverter):
     @stackable
     def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
                        xsd_type: BaseXsdType | None = None, level: int = 0) -> Any:
-        xsd_type = xsd_type or xsd_element.type
+        plan = self.get_decode_plan(xsd_element, xsd_type)
         result_list = [] if self.list_class is list else self.list_class()
         xmlns = self.get_effective_xmlns(data.xmlns, level, xsd_element)
 
-        result_list.append(self.map_qname(data.tag))
+        result_list.append(plan.map_qname(data.tag))
 
-        attributes = self.dict_class(self.map_attributes(data.attributes))
+        attributes = self.dict_class(plan.map_attributes(data.attributes))
         if xmlns and self._use_namespaces:
             attributes.update(
                 (f'{self.ns_prefix}:{k}' if k else self.ns_prefix, v) for k, v in xmlns
@@ -81,10 +81,10 @@ class JsonMLConverter(XMLSchemaConverter):
         if data.text is not None:
             result_list.append(data.text)
 
-        if xsd_type.model_group is not None:
+        if plan.model_group is not None:
             result_list.extend(
                 value if value is not None else self.list_class((name,))
-                for name, value, _ in self.map_content(data.content)
+                for name, value, _ in plan.map_content(data.content)
             )
 
         return result_list
@@ -57,17 +57,17 @@ class ParkerConverter(XMLSchemaConverter):
 
     def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
                        xsd_type: BaseXsdType | None = None, level: int = 0) -> Any:
-        xsd_type = xsd_type or xsd_element.type
+        plan = self.get_decode_plan(xsd_element, xsd_type)
         preserve_root = self.preserve_root
 
-        if xsd_type.model_group is None or not data.content:
+        if plan.model_group is None or not data.content:
             if preserve_root:
-                return self.dict_class(((self.map_qname(data.tag), data.text),))
+                return self.dict_class(((plan.map_qname(data.tag), data.text),))
             else:
                 return data.text
         else:
             result_dict = self.dict_class()
-            for name, value, xsd_child in self.map_content(data.content):
+            for name, value, xsd_child in plan.map_content(data.content):
                 if preserve_root:
                     try:
                         if len(value) == 1:
@@ -91,7 +91,7 @@ class ParkerConverter(XMLSchemaConverter):
                     v.extend(value)
 
             if preserve_root:
-                return self.dict_class(((self.map_qname(data.tag), result_dict),))
+                return self.dict_class(((plan.map_qname(data.tag), result_dict),))
             else:
                 return result_dict if result_dict else None
 
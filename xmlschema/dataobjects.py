@@ -9,7 +9,8 @@
 #
 from abc import ABCMeta
 from itertools import count
-from collections.abc import Iterator, MutableMapping, MutableSequence
+from collections.abc import Iterator, Mapping, MutableMapping, MutableSequence
+from types import MappingProxyType
 from typing import TYPE_CHECKING, cast, overload, Any, Optional, Union
 
 from elementpath import XPathContext, XPath2Parser, build_node_tree
@@ -24,6 +25,7 @@ from xmlschema.resources import XMLResource
 from xmlschema.utils.qnames import get_namespace, get_prefixed_qname, \
     local_name, update_namespaces, get_namespace_map
 from xmlschema.utils.decoding import raw_encode_value
+from xmlschema.namespaces import XMLNS_SCOPES_CACHE_SIZE
 from xmlschema import validators
 
 if TYPE_CHECKING:
@@ -57,7 +59,7 @@ class DataElement(MutableSequence['DataElement']):
     def __init__(self, tag: str,
                  value: Optional[Any] = None,
                  attrib: Optional[dict[str, Any]] = None,
-                 nsmap: Optional[MutableMapping[str, str]] = None,
+                 nsmap: Optional[Mapping[str, str]] = None,
                  xmlns: Optional[list[tuple[str, str]]] = None,
                  xsd_element: Optional['XsdElement'] = None,
                  xsd_type: Optional[BaseXsdType] = None) -> None:
@@ -459,6 +461,126 @@ class DataBindingMeta(ABCMeta):
         return cls.xsd_element.schema.decode(source, **kwargs)
 
 
+EMPTY_NSMAP: Mapping[str, str] = MappingProxyType({})
+_NO_CHILDREN = cast(list[DataElement], ())
+
+
+class CompactDataElement(DataElement):
+    """
+    A memory-efficient variant of :class:`DataElement`. The data is stored in
+    slots, so the instance dictionary is allocated only if other attributes are
+    set, the children and the attributes storages are allocated only on first
+    insertion, and the namespace map is a read-only mapping that can be shared
+    between the data elements decoded within the same xmlns context. Takes the
+    same arguments of its parent class.
+    """
+    __slots__ = ('_children', 'tag', '_attrib', 'nsmap', 'value', 'tail',
+                 'xmlns', '_xsd_element', '_xsd_type', '_encoder')
+
+    _attrib: Optional[dict[str, Any]]
+    _xsd_element: Optional['XsdElement']
+    _xsd_type: Optional[BaseXsdType]
+
+    def __init__(self, tag: str,
+                 value: Optional[Any] = None,
+                 attrib: Optional[dict[str, Any]] = None,
+                 nsmap: Optional[Mapping[str, str]] = None,
+                 xmlns: Optional[list[tuple[str, str]]] = None,
+                 xsd_element: Optional['XsdElement'] = None,
+                 xsd_type: Optional[BaseXsdType] = None) -> None:
+
+        _setattr = object.__setattr__
+        _setattr(self, '_children', _NO_CHILDREN)
+        _setattr(self, 'tag', tag)
+        _setattr(self, '_attrib', dict(attrib) if attrib else None)
+        if nsmap is None or not nsmap:
+            _setattr(self, 'nsmap', EMPTY_NSMAP)
+        elif isinstance(nsmap, MappingProxyType):
+            _setattr(self, 'nsmap', nsmap)
+        else:
+            _setattr(self, 'nsmap', MappingProxyType(dict(nsmap)))
+        _setattr(self, 'value', value)
+        _setattr(self, 'tail', None)
+        _setattr(self, 'xmlns', xmlns)
+        _setattr(self, '_xsd_element', None)
+        _setattr(self, '_xsd_type', None)
+        _setattr(self, '_encoder', None)
+
+        if xsd_element is not None:
+            self.xsd_element = xsd_element
+            self.xsd_type = xsd_type or xsd_element.type
+        elif xsd_type is not None:
+            self.xsd_type = xsd_type
+        elif self.xsd_element is not None:
+            self._encoder = self.xsd_element
+
+    def __setitem__(self, i: Union[int, slice], child: Any) -> None:
+        if self._children is _NO_CHILDREN:
+            self._children = []
+        self._children[i] = child
+
+    def __delitem__(self, i: Union[int, slice]) -> None:
+        if self._children is _NO_CHILDREN:
+            self._children = []
+        del self._children[i]
+
+    def insert(self, i: int, child: 'DataElement') -> None:
+        assert isinstance(child, DataElement)
+        if self._children is _NO_CHILDREN:
+            self._children = []
+        self._children.insert(i, child)
+
+    @property
+    def attrib(self) -> dict[str, Any]:
+        """The attributes of the data element, allocated on first access."""
+        if self._attrib is None:
+            self._attrib = {}
+        return self._attrib
+
+    @attrib.setter
+    def attrib(self, attrib: dict[str, Any]) -> None:
+        self._attrib = attrib
+
+    @property
+    def xsd_element(self) -> Optional['XsdElement']:
+        return self._xsd_element
+
+    @xsd_element.setter
+    def xsd_element(self, xsd_element: Optional['XsdElement']) -> None:
+        self._xsd_element = xsd_element
+
+    @property
+    def xsd_type(self) -> Optional[BaseXsdType]:
+        return self._xsd_type
+
+    @xsd_type.setter
+    def xsd_type(self, xsd_type: Optional[BaseXsdType]) -> None:
+        self._xsd_type = xsd_type
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._attrib is None:
+            return default
+        return super().get(key, default)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.update((name, getattr(self, name)) for name in self.__slots__)
+        state['nsmap'] = dict(self.nsmap)
+        if self._children is _NO_CHILDREN:
+            state['_children'] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        _setattr = object.__setattr__
+        for name, value in state.items():
+            if name == '_children':
+                _setattr(self, name, _NO_CHILDREN if value is None else value)
+            elif name == 'nsmap':
+                _setattr(self, name, MappingProxyType(value) if value else EMPTY_NSMAP)
+            else:
+                _setattr(self, name, value)
+
+
 class DataElementConverter(XMLSchemaConverter):
     """
     XML Schema based converter class for DataElement objects.
@@ -468,19 +590,29 @@ class DataElementConverter(XMLSchemaConverter):
     Default is `DataElement`.
     :param map_attribute_names: define if map the names of attributes to prefixed \
     form. Defaults to `True`. If `False` the names are kept to extended format.
+    :param compact: if `True` the decoded data elements share read-only namespace \
+    maps, interned per xmlns context. For default the data element class is \
+    `CompactDataElement`. Defaults to `False`.
     """
-    __slots__ = 'data_element_class', 'map_attribute_names'
+    __slots__ = ('data_element_class', 'map_attribute_names', 'compact',
+                 '_nsmaps', '_nsmap_versions')
 
     def __init__(self, namespaces: Optional[NsmapType] = None,
                  data_element_class: Optional[type['DataElement']] = None,
                  map_attribute_names: bool = True,
+                 compact: bool = False,
                  **kwargs: Any) -> None:
-        if data_element_class is None:
-            self.data_element_class = DataElement
-        else:
+        if data_element_class is not None:
             self.data_element_class = data_element_class
+        elif compact:
+            self.data_element_class = CompactDataElement
+        else:
+            self.data_element_class = DataElement
 
         self.map_attribute_names = map_attribute_names
+        self.compact = compact
+        self._nsmaps: dict[tuple[tuple[str, str], ...], Mapping[str, str]] = {}
+        self._nsmap_versions: dict[int, Mapping[str, str]] = {}
         kwargs.update(attr_prefix='', text_key='', cdata_prefix='')
         super().__init__(namespaces, **kwargs)
 
@@ -510,6 +642,32 @@ class DataElementConverter(XMLSchemaConverter):
 
         return namespaces
 
+    def get_nsmap(self) -> Optional[Mapping[str, str]]:
+        """
+        Returns the namespace map to associate with a decoded data element. In compact
+        mode the returned map is a read-only mapping shared by all the data elements
+        decoded within the same xmlns context.
+        """
+        if not self._use_namespaces:
+            return None
+        elif not self.compact:
+            return self.namespaces
+
+        try:
+            return self._nsmap_versions[self._ns_version]
+        except KeyError:
+            if len(self._nsmap_versions) >= XMLNS_SCOPES_CACHE_SIZE:
+                self._nsmap_versions.clear()
+
+            # Namespace maps with the same content are shared between versions
+            key = tuple(self.namespaces.items())
+            try:
+                nsmap = self._nsmaps[key]
+            except KeyError:
+                nsmap = self._nsmaps[key] = MappingProxyType(dict(key))
+            self._nsmap_versions[self._ns_version] = nsmap
+            return nsmap
+
     @property
     def lossy(self) -> bool:
         return False
@@ -526,7 +684,7 @@ class DataElementConverter(XMLSchemaConverter):
         return self.data_element_class(
             tag=data.tag,
             value=data.text,
-            nsmap=self.namespaces if self._use_namespaces else None,
+            nsmap=self.get_nsmap(),
             xmlns=xmlns,
             xsd_element=xsd_element,
             xsd_type=xsd_type
@@ -535,9 +693,11 @@ class DataElementConverter(XMLSchemaConverter):
     def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
                        xsd_type: Optional[BaseXsdType] = None, level: int = 0) -> 'DataElement':
         data_element = self.get_data_element(data, xsd_element, xsd_type, level)
-        if self.map_attribute_names:
+        if not data.attributes:
+            pass
+        elif self.map_attribute_names:
             data_element.attrib.update(self.map_attributes(data.attributes))
-        elif data.attributes:
+        else:
             data_element.attrib.update(data.attributes)
 
         if (xsd_type or xsd_element.type).model_group is not None:
@@ -596,7 +756,7 @@ class DataBindingConverter(DataElementConverter):
         return cls(
             tag=data.tag,
             value=data.text,
-            nsmap=self.namespaces if self._use_namespaces else None,
+            nsmap=self.get_nsmap(),
             xmlns=xmlns,
             xsd_type=xsd_type
         )
@@ -12,7 +12,7 @@ import dataclasses as dc
 from io import IOBase, TextIOBase
 from collections.abc import Iterator
 from functools import partial
-from typing import Any, BinaryIO, IO, Optional, TextIO, Union
+from typing import cast, Any, BinaryIO, IO, Optional, TextIO, Union
 from xml.etree import ElementTree
 
 from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError, XMLResourceError
@@ -675,30 +675,29 @@ class XmlDocument(XMLResource):
     def write(self, file: Union[str, TextIO, BinaryIO],
               encoding: str = 'us-ascii', xml_declaration: bool = False,
               default_namespace: Optional[str] = None, method: str = "xml") -> None:
-        """Serialize an XML resource to a file. Cannot be used with lazy resources."""
-        if self._lazy:
+        """
+        Serialize an XML resource to a file. With the default method the data is
+        written in chunks, re-reading the source in case of a lazy resource, see
+        :meth:`XMLResource.tofile`. Other methods cannot be used with lazy resources.
+        """
+        if self._lazy and method != 'xml':
             raise XMLResourceError("cannot serialize a lazy XML resource")
 
-        kwargs: dict[str, Any] = {
-            'xml_declaration': xml_declaration,
-            'encoding': encoding,
-            'method': method,
-        }
-        if not default_namespace:
-            kwargs['namespaces'] = self.namespaces
-        else:
-            namespaces: Optional[dict[Optional[str], str]]
-            namespaces = {k: v for k, v in self.namespaces.items()}
-
+        namespaces: dict[Optional[str], str]
+        namespaces = {k: v for k, v in self.namespaces.items()}
+        if default_namespace:
             if hasattr(self.root, 'nsmap'):
                 # noinspection PyTypeChecker
                 namespaces[None] = default_namespace
             else:
                 namespaces[''] = default_namespace
-            kwargs['namespaces'] = namespaces
 
-        _string = etree_tostring(self.root, **kwargs)
+        if method == 'xml':
+            self.tofile(file, cast(dict[str, str], namespaces), encoding, xml_declaration)
+            return
 
+        _string = etree_tostring(self.root, cast(dict[str, str], namespaces), encoding=encoding,
+                                 xml_declaration=xml_declaration, method=method)
         match file:
             case str():
                 if isinstance(_string, str):
@@ -15,10 +15,15 @@ functions for building XSD based code generators.
 import os
 import re
 import sys
+import builtins
+import importlib
 import inspect
 import logging
+import math
 from abc import ABC, ABCMeta
+from decimal import Decimal
 from fnmatch import fnmatch
+from itertools import count
 from pathlib import Path
 from typing import Optional
 
@@ -27,8 +32,13 @@ from jinja2 import Environment, ChoiceLoader, FileSystemLoader, \
 from elementpath import datatypes
 
 import xmlschema
-from xmlschema.validators import XsdType, XsdElement, XsdAttribute
-from xmlschema.names import XSD_NAMESPACE
+from xmlschema.validators import XsdType, XsdElement, XsdAttribute, XsdGroup, \
+    XsdSimpleType, XsdAtomicBuiltin, XsdAtomicRestriction, XsdList, XsdUnion, \
+    XsdFacet, XsdLengthFacet, XsdMinLengthFacet, XsdMaxLengthFacet, XsdMinInclusiveFacet, \
+    XsdMinExclusiveFacet, XsdMaxInclusiveFacet, XsdMaxExclusiveFacet, \
+    XsdTotalDigitsFacet, XsdFractionDigitsFacet, XsdEnumerationFacets
+from xmlschema.names import XSD_NAMESPACE, XSD_ID, XSD_IDREF, XSD_QNAME, XSD_NOTATION_TYPE, \
+    XSD_ERROR, XSD_ANY_TYPE, XSD_ANY_SIMPLE_TYPE, XSD_ANY_ATOMIC_TYPE
 
 
 NCNAME_PATTERN = re.compile(r'^[^\d\W][\w.\-]*$')
@@ -621,3 +631,765 @@ class PythonGenerator(AbstractGenerator):
         'dayTimeDuration': 'datatypes.DayTimeDuration',
         'yearMonthDuration': 'datatypes.YearMonthDuration',
     }
+
+    @staticmethod
+    @filter_method
+    def python_decoder(schema):
+        """Returns the builder of the code of a decoder module for the schema."""
+        return PythonDecoderBuilder(schema)
+
+
+class UnsupportedComponent(Exception):
+    """Raised when an XSD component cannot be translated into decoder code."""
+
+
+class DecoderFunction:
+    """
+    The code of a function of a decoder module, with the other functions
+    that it calls. The *reason* is not `None` if the function is not usable.
+    """
+    __slots__ = ('component', 'name', 'lines', 'deps', 'reason')
+
+    def __init__(self, component, name):
+        self.component = component
+        self.name = name
+        self.lines = []
+        self.deps = []
+        self.reason = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(name={self.name!r})'
+
+    @property
+    def code(self):
+        return '\n'.join(self.lines)
+
+
+class PythonDecoderBuilder:
+    """
+    Builds the code of a decoder module for an XSD schema, used by the template
+    *decoder.py.jinja*. Each global element and complex type is translated into
+    a function, that checks the content model, the attributes and the simple
+    types, including facets, and produces the same data of the default converter.
+    Components that use features not covered by generated code (wildcards,
+    substitution groups, identity constraints, mixed content, XSD 1.1 assertions
+    and type alternatives, QName values) are left to the schema instance, as the
+    other components that depend on them.
+
+    :param schema: the XSD schema instance.
+    """
+    reserved_names = frozenset((
+        're', 'Decimal', 'islice', 'AbstractDateTime', 'Duration', 'xmlschema',
+        'XMLResource', 'XMLSchemaConverter', 'XSI_SCHEMA_LOCATION',
+        'XSI_NONS_SCHEMA_LOCATION', 'get_namespace', 'DecoderFallback',
+        'DecoderContext', 'get_schema', 'decode', 'is_valid', 'ROOT_ELEMENTS',
+        'SCHEMA_SOURCE', 'SCHEMA_CLASS'
+    ))
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.records = {}
+        self.imports = {}
+        self.constants = []
+        self._aliases = {}
+        self._names = set(self.reserved_names)
+        self._counter = count(1)
+
+        maps = schema.maps
+        self.elements = [e for e in maps.elements.values()
+                         if e.target_namespace != XSD_NAMESPACE]
+        self.types = [t for t in maps.types.values()
+                      if t.is_complex() and t.target_namespace != XSD_NAMESPACE]
+
+        for xsd_element in self.elements:
+            self.element_function(xsd_element)
+        for xsd_type in self.types:
+            self.type_function(xsd_type)
+
+        # Functions that call not usable functions are not usable
+        changed = True
+        while changed:
+            changed = False
+            for record in self.records.values():
+                if record.reason is None:
+                    for dep in record.deps:
+                        if dep.reason is not None:
+                            record.reason = dep.reason
+                            changed = True
+                            break
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(schema={self.schema!r})'
+
+    @property
+    def schema_class(self):
+        return 'XMLSchema10' if self.schema.XSD_VERSION == '1.0' else 'XMLSchema11'
+
+    @property
+    def schema_source(self):
+        if self.schema.url is not None:
+            return repr(self.schema.url)
+        return repr(self.schema.source.get_text())
+
+    @property
+    def functions(self):
+        """The code of the usable functions."""
+        return [r.code for r in self.records.values() if r.reason is None]
+
+    @property
+    def root_elements(self):
+        """A list of couples with the names of global elements and of their functions."""
+        return [(e.name, self.records[id(e)].name) for e in self.elements
+                if self.records[id(e)].reason is None]
+
+    @property
+    def unsupported(self):
+        """A dictionary with the global components left to the schema instance."""
+        return {x: self.records[id(x)].reason for x in self.elements + self.types
+                if self.records[id(x)].reason is not None}
+
+    def _new_name(self, prefix, component=None, suffix=''):
+        if component is not None and component.is_global():
+            local_name = PythonGenerator.name(component, '')
+            if local_name and f'{prefix}{local_name}'.isidentifier():
+                name = f'{prefix}{local_name}{suffix}'
+                if name not in self._names:
+                    self._names.add(name)
+                    return name
+
+        while True:
+            name = f'_{prefix}{suffix[1:]}_{next(self._counter)}'
+            if name not in self._names:
+                self._names.add(name)
+                return name
+
+    def _build(self, key, name, method, *args):
+        try:
+            return self.records[key]
+        except KeyError:
+            record = self.records[key] = DecoderFunction(args[0], name)
+
+        try:
+            record.lines = method(record, *args)
+        except UnsupportedComponent as err:
+            record.reason = str(err)
+        return record
+
+    @staticmethod
+    def _depend(record, other):
+        if other.reason is not None:
+            raise UnsupportedComponent(other.reason)
+        if other not in record.deps:
+            record.deps.append(other)
+        return other.name
+
+    def _reference(self, obj):
+        """Returns an expression that refers to an importable object."""
+        name = getattr(obj, '__name__', None)
+        if name is not None and getattr(builtins, name, None) is obj:
+            return name
+        elif inspect.ismethod(obj) and isinstance(obj.__self__, type):
+            return f'{self._reference(obj.__self__)}.{obj.__name__}'
+
+        module = getattr(obj, '__module__', None)
+        qualname = getattr(obj, '__qualname__', None)
+        if not module or not qualname or '<' in qualname:
+            raise UnsupportedComponent(f"{obj!r} is not importable")
+
+        try:
+            target = importlib.import_module(module)
+            for part in qualname.split('.'):
+                target = getattr(target, part)
+        except (ImportError, AttributeError):
+            target = None
+        if target is not obj:
+            raise UnsupportedComponent(f"{obj!r} is not importable")
+
+        top_name = qualname.split('.')[0]
+        try:
+            alias = self._aliases[module, top_name]
+        except KeyError:
+            alias = top_name
+            while alias in self._names:
+                alias = f'{top_name}_{next(self._counter)}'
+            self._names.add(alias)
+            self._aliases[module, top_name] = alias
+            if alias == top_name:
+                self.imports[alias] = f'from {module} import {top_name}'
+            else:
+                self.imports[alias] = f'from {module} import {top_name} as {alias}'
+
+        return alias + qualname[len(top_name):]
+
+    def _constant(self, prefix, expression):
+        name = f'_{prefix}_{next(self._counter)}'
+        self._names.add(name)
+        self.constants.append(f'{name} = {expression}')
+        return name
+
+    @classmethod
+    def literal(cls, value):
+        """Returns the Python literal of a value, `None` if it's not representable."""
+        if value is None or type(value) in (bool, int, str):
+            return repr(value)
+        elif type(value) is float:
+            if math.isfinite(value):
+                return repr(value)
+            return f'float({str(value)!r})'
+        elif isinstance(value, Decimal):
+            return f'Decimal({str(value)!r})'
+        elif isinstance(value, list):
+            items = [cls.literal(x) for x in value]
+            if None not in items:
+                return '[%s]' % ', '.join(items)
+        return None
+
+    ###
+    # Simple types
+    def simple_type_function(self, xsd_type):
+        """Returns the function record for decoding a text with a simple type."""
+        if id(xsd_type) in self.records:
+            return self.records[id(xsd_type)]
+        name = self._new_name('decode_simple_', xsd_type, '_type')
+        return self._build(id(xsd_type), name, self._simple_type_lines, xsd_type)
+
+    @staticmethod
+    def _normalize_line(xsd_type, arg='text'):
+        if xsd_type.white_space == 'replace':
+            return f"value = _REGEX_SPACE.sub(' ', {arg})"
+        elif xsd_type.white_space == 'collapse':
+            return f"value = _REGEX_SPACES.sub(' ', {arg}).strip()"
+        return f'value = {arg}'
+
+    def _patterns_lines(self, patterns):
+        if not patterns:
+            return []
+
+        items = []
+        for pattern in patterns.patterns:
+            flags = pattern.flags & ~re.UNICODE
+            if flags:
+                items.append(f're.compile({pattern.pattern!r}, {flags})')
+            else:
+                items.append(f're.compile({pattern.pattern!r})')
+
+        if len(items) == 1:
+            name = self._constant('PATTERN', items[0])
+            return [f'if {name}.match(value) is None:',
+                    '    raise DecoderFallback']
+
+        name = self._constant('PATTERNS', '(%s,)' % ', '.join(items))
+        return [f'if all(p.match(value) is None for p in {name}):',
+                '    raise DecoderFallback']
+
+    def _validator_lines(self, validator):
+        if not isinstance(validator, XsdFacet):
+            return [f'{self._reference(validator)}(result)']
+        elif isinstance(validator, (XsdLengthFacet, XsdMinLengthFacet, XsdMaxLengthFacet)):
+            if validator.validate == validator.skip_validation:
+                return []
+            op = {XsdLengthFacet: '!=', XsdMinLengthFacet: '<',
+                  XsdMaxLengthFacet: '>'}[type(validator)]
+            return [f'if len(result) {op} {validator.value!r}:',
+                    '    raise DecoderFallback']
+        elif isinstance(validator, (XsdMinInclusiveFacet, XsdMinExclusiveFacet,
+                                    XsdMaxInclusiveFacet, XsdMaxExclusiveFacet)):
+            value = self.literal(validator.value)
+            if value is None:
+                raise UnsupportedComponent(f"unsupported facet value {validator.value!r}")
+            op = {XsdMinInclusiveFacet: '<', XsdMinExclusiveFacet: '<=',
+                  XsdMaxInclusiveFacet: '>', XsdMaxExclusiveFacet: '>='}[type(validator)]
+            return [f'if result {op} {value}:',
+                    '    raise DecoderFallback']
+        elif isinstance(validator, XsdTotalDigitsFacet):
+            return [f'if sum(_count_digits(result)) > {validator.value!r}:',
+                    '    raise DecoderFallback']
+        elif isinstance(validator, XsdFractionDigitsFacet):
+            return [f'if _count_digits(result)[1] > {validator.value!r}:',
+                    '    raise DecoderFallback']
+        elif isinstance(validator, XsdEnumerationFacets):
+            value = self.literal(validator.enumeration)
+            if value is None:
+                raise UnsupportedComponent(f"unsupported enumeration {validator!r}")
+            name = self._constant('ENUMERATION', value)
+            return [f'_check_enumeration(result, {name})']
+
+        raise UnsupportedComponent(f"unsupported facet {validator!r}")
+
+    def _validators_lines(self, validators):
+        lines = []
+        for validator in validators:
+            lines.extend(self._validator_lines(validator))
+        if not lines:
+            return []
+        return ['try:', *(f'    {x}' for x in lines),
+                'except _DECODE_ERRORS:',
+                '    raise DecoderFallback from None']
+
+    def _simple_type_lines(self, record, xsd_type):
+        lines = [f'def {record.name}(text, ctx):']
+        if xsd_type.is_global():
+            lines.append(f'    """Decodes a text with {xsd_type.prefixed_name}."""')
+
+        if isinstance(xsd_type, XsdAtomicBuiltin):
+            if xsd_type.name in (XSD_QNAME, XSD_NOTATION_TYPE, XSD_ERROR):
+                raise UnsupportedComponent(f"{xsd_type!r} is not supported")
+
+            validators = []
+            for validator in xsd_type.validators:
+                validators.extend(self._validator_lines(validator))
+
+            body = [self._normalize_line(xsd_type)]
+            body.extend(self._patterns_lines(xsd_type.patterns))
+            if xsd_type.to_python is str and not validators:
+                body.append('result = value')
+            else:
+                body.extend([
+                    'try:',
+                    f'    result = {self._reference(xsd_type.to_python)}(value)',
+                    *(f'    {x}' for x in validators),
+                    'except _DECODE_ERRORS:',
+                    '    raise DecoderFallback from None'
+                ])
+            if xsd_type.name == XSD_ID:
+                body.append('ctx.register_id(result)')
+            elif xsd_type.name == XSD_IDREF:
+                body.append('ctx.register_idref(result)')
+            body.append('return result')
+
+        elif isinstance(xsd_type, XsdAtomicRestriction):
+            if isinstance(xsd_type.primitive_type, XsdUnion) and xsd_type.patterns:
+                raise UnsupportedComponent(f"{xsd_type!r} is not supported")
+
+            base_type = xsd_type.base_type
+            if base_type.is_complex():
+                if not isinstance(base_type.content, XsdSimpleType):
+                    raise UnsupportedComponent(f"{xsd_type!r} is not supported")
+                base_type = base_type.content
+
+            base_name = self._depend(record, self.simple_type_function(base_type))
+            body = [self._normalize_line(xsd_type)]
+            body.extend(self._patterns_lines(xsd_type.patterns))
+            body.append(f'result = {base_name}(value, ctx)')
+            body.extend(self._validators_lines(xsd_type.validators))
+            body.append('return result')
+
+        elif isinstance(xsd_type, XsdList):
+            item_name = self._depend(record, self.simple_type_function(xsd_type.item_type))
+            body = [
+                self._normalize_line(xsd_type),
+                'result = []',
+                'for chunk in value.split():',
+                f'    item = {item_name}(chunk, ctx)',
+                '    if isinstance(item, list):',
+                '        raise DecoderFallback',
+                '    result.append(_convert(item, chunk))',
+                'return result'
+            ]
+
+        elif isinstance(xsd_type, XsdUnion):
+            members = [self._depend(record, self.simple_type_function(x))
+                       for x in xsd_type.member_types]
+            body = [
+                f"for member in ({', '.join(members)},):",
+                '    try:',
+                '        return member(text, ctx)',
+                '    except DecoderFallback:',
+                '        pass',
+                'raise DecoderFallback'
+            ]
+
+        elif xsd_type.name in (XSD_ANY_SIMPLE_TYPE, XSD_ANY_ATOMIC_TYPE):
+            body = [self._normalize_line(xsd_type), 'return value']
+        else:
+            raise UnsupportedComponent(f"{xsd_type!r} is not supported")
+
+        lines.extend(f'    {x}' for x in body)
+        return lines
+
+    ###
+    # Elements and complex types
+    def element_function(self, xsd_element):
+        """Returns the function record for decoding an element."""
+        if xsd_element.ref is not None:
+            xsd_element = xsd_element.ref
+        if id(xsd_element) in self.records:
+            return self.records[id(xsd_element)]
+        name = self._new_name('decode_', xsd_element, '_element')
+        return self._build(id(xsd_element), name, self._element_lines, xsd_element)
+
+    def type_function(self, xsd_type):
+        """Returns the function record for decoding an element with a complex type."""
+        if id(xsd_type) in self.records:
+            return self.records[id(xsd_type)]
+        name = self._new_name('decode_', xsd_type, '_type')
+        return self._build(id(xsd_type), name, self._type_lines, xsd_type)
+
+    def attributes_function(self, attribute_group):
+        """Returns the function record for decoding the attributes of an element."""
+        if id(attribute_group) in self.records:
+            return self.records[id(attribute_group)]
+        name = self._new_name('decode_attributes')
+        return self._build(id(attribute_group), name, self._attributes_lines, attribute_group)
+
+    def group_function(self, group, single_group):
+        """Returns the function record for decoding an occurrence of a model group."""
+        key = id(group), single_group
+        if key in self.records:
+            return self.records[key]
+        name = self._new_name('decode_group')
+        return self._build(key, name, self._group_lines, group, single_group)
+
+    def _element_lines(self, record, xsd_element):
+        if xsd_element.abstract or xsd_element.substitution_group is not None or \
+                self.schema.maps.substitution_groups.get(xsd_element.name):
+            raise UnsupportedComponent(f"{xsd_element!r}: substitution groups not supported")
+        elif xsd_element.identities or xsd_element.selected_by:
+            raise UnsupportedComponent(f"{xsd_element!r}: identities not supported")
+        elif getattr(xsd_element, 'alternatives', None):
+            raise UnsupportedComponent(f"{xsd_element!r}: type alternatives not supported")
+        elif getattr(xsd_element, 'inheritable', None):
+            raise UnsupportedComponent(f"{xsd_element!r}: inheritable attributes not supported")
+
+        xsd_type = xsd_element.type
+        lines = [f'def {record.name}(elem, level, ctx):']
+        if xsd_element.is_global():
+            lines.append(f'    """Decodes a {xsd_element.prefixed_name} element."""')
+
+        if xsd_type.is_simple() or xsd_type.has_simple_content():
+            if xsd_element.fixed is not None:
+                lines.extend([
+                    '    text = elem.text',
+                    '    if not text:',
+                    f'        text = {xsd_element.fixed!r}',
+                    f'    elif text != {xsd_element.fixed!r}:',
+                    '        raise DecoderFallback',
+                ])
+            elif xsd_element.default is not None:
+                lines.append(f'    text = elem.text or {xsd_element.default!r}')
+            else:
+                lines.append('    text = elem.text')
+        elif xsd_element.fixed is not None:
+            raise UnsupportedComponent(f"{xsd_element!r}: fixed value not supported")
+        else:
+            lines.append('    text = elem.text')
+
+        xmlns = 'not level' if xsd_element.is_global() else 'False'
+        if xsd_type.is_complex():
+            type_name = self._depend(record, self.type_function(xsd_type))
+            lines.extend([
+                f'    attributes, value, content = {type_name}(elem, text, level, ctx)',
+                f'    return ctx.build(elem.tag, {xmlns}, attributes, value, content)'
+            ])
+        else:
+            type_name = self._depend(record, self.simple_type_function(xsd_type))
+            lines.extend([
+                '    if len(elem):',
+                '        raise DecoderFallback',
+                '    attributes = _no_attributes(elem.attrib, level)',
+                f"    result = {type_name}(text or '', ctx)",
+                '    value = _convert(result, text) if text else None',
+                f'    return ctx.build(elem.tag, {xmlns}, attributes, value, None)'
+            ])
+        return lines
+
+    def _type_lines(self, record, xsd_type):
+        if xsd_type.abstract:
+            raise UnsupportedComponent(f"{xsd_type!r}: abstract types not supported")
+        elif xsd_type.name == XSD_ANY_TYPE or xsd_type.mixed:
+            raise UnsupportedComponent(f"{xsd_type!r}: mixed content not supported")
+        elif getattr(xsd_type, 'assertions', None):
+            raise UnsupportedComponent(f"{xsd_type!r}: assertions not supported")
+        elif getattr(xsd_type, 'open_content', None) is not None and \
+                xsd_type.open_content.mode != 'none':
+            raise UnsupportedComponent(f"{xsd_type!r}: open content not supported")
+
+        lines = [f'def {record.name}(elem, text, level, ctx):']
+        if xsd_type.is_global():
+            lines.append(f'    """Decodes an element of type {xsd_type.prefixed_name}."""')
+
+        if xsd_type.attributes:
+            attrs_name = self._depend(record, self.attributes_function(xsd_type.attributes))
+            lines.append(f'    attributes = {attrs_name}(elem.attrib, level, ctx)')
+        else:
+            lines.append('    attributes = _no_attributes(elem.attrib, level)')
+
+        if xsd_type.has_simple_content():
+            content_name = self._depend(record, self.simple_type_function(xsd_type.content))
+            lines.extend([
+                '    if len(elem):',
+                '        raise DecoderFallback',
+                f"    result = {content_name}(text or '', ctx)",
+                '    return attributes, _convert(result, text) if text else text, None'
+            ])
+            return lines
+
+        group = xsd_type.content
+        if not isinstance(group, XsdGroup):
+            raise UnsupportedComponent(f"{xsd_type!r} is not supported")
+
+        lines.extend([
+            '    if text and not text.isspace():',
+            '        raise DecoderFallback',
+            '    children = []',
+            '    for child in elem:',
+            '        if child.tail and not child.tail.isspace():',
+            '            raise DecoderFallback',
+            '        if not callable(child.tag):',
+            '            children.append(child)',
+            '',
+            '    content = []',
+        ])
+        if not any(p.max_occurs != 0 for p in group) or group.max_occurs == 0:
+            if group.model == 'choice' and group.min_occurs:
+                raise UnsupportedComponent(f"{xsd_type!r}: an empty choice is not valid")
+            lines.extend([
+                '    if children:',
+                '        raise DecoderFallback',
+            ])
+        else:
+            lines.extend([
+                '    level += 1',
+                '    i, n = 0, len(children)',
+            ])
+            particle_lines = self._particle_lines(record, group, group.is_single())
+            lines.extend(f'    {x}' for x in particle_lines)
+            lines.extend([
+                '    if i < n:',
+                '        raise DecoderFallback',
+            ])
+        lines.append('    return attributes, None, content')
+        return lines
+
+    def _attributes_lines(self, record, attribute_group):
+        if any(getattr(x, 'inheritable', False) for x in attribute_group.values()):
+            raise UnsupportedComponent(f"{attribute_group!r}: inheritable attributes not supported")
+        elif None in attribute_group:
+            raise UnsupportedComponent(f"{attribute_group!r}: wildcards not supported")
+
+        lines = [
+            f'def {record.name}(attrib, level, ctx):',
+            '    result = []',
+            '    for name, value in attrib.items():',
+        ]
+        keyword = 'if'
+        required = []
+        defaults = []
+        for name, xsd_attribute in attribute_group.items():
+            if xsd_attribute.use == 'prohibited':
+                if xsd_attribute.default is not None or xsd_attribute.fixed is not None:
+                    raise UnsupportedComponent(f"{xsd_attribute!r} is not supported")
+                continue
+
+            xsd_type = xsd_attribute.type
+            if xsd_type.is_notation():
+                raise UnsupportedComponent(f"{xsd_attribute!r}: NOTATION not supported")
+            type_name = self._depend(record, self.simple_type_function(xsd_type))
+
+            lines.append(f'        {keyword} name == {name!r}:')
+            keyword = 'elif'
+            if xsd_attribute.fixed is not None:
+                lines.extend([
+                    f'            if value != {xsd_attribute.fixed!r}:',
+                    '                raise DecoderFallback',
+                ])
+            lines.append(f'            result.append((name, _convert({type_name}(value, ctx), '
+                         'value)))')
+
+            if xsd_attribute.use == 'required':
+                required.append(name)
+            value = xsd_attribute.fixed if xsd_attribute.fixed is not None \
+                else xsd_attribute.default
+            if value is not None:
+                defaults.append((name, type_name, value))
+
+        if keyword == 'if':
+            lines.append('        if name in _XSI_LOCATIONS and not level:')
+        else:
+            lines.append('        elif name in _XSI_LOCATIONS and not level:')
+        lines.extend([
+            '            result.append((name, value))',
+            '        else:',
+            '            raise DecoderFallback',
+        ])
+
+        for name in required:
+            lines.extend([
+                f'    if {name!r} not in attrib:',
+                '        raise DecoderFallback'
+            ])
+        for name, type_name, value in defaults:
+            lines.extend([
+                f'    if {name!r} not in attrib:',
+                f'        result.append(({name!r}, _convert({type_name}({value!r}, ctx), '
+                f'{value!r})))'
+            ])
+        lines.append('    return result')
+        return lines
+
+    ###
+    # Model groups
+    @classmethod
+    def is_emptiable(cls, particle):
+        """Returns `True` if a particle can match an empty sequence of elements."""
+        if not particle.min_occurs:
+            return True
+        elif not isinstance(particle, XsdGroup):
+            return False
+        elif particle.model == 'choice':
+            return any(cls.is_emptiable(p) for p in particle if p.max_occurs != 0)
+        return all(cls.is_emptiable(p) for p in particle if p.max_occurs != 0)
+
+    @classmethod
+    def first_names(cls, particle):
+        """Returns the names of the elements that can start a particle occurrence."""
+        if not isinstance(particle, XsdGroup):
+            return {particle.name}
+
+        names = set()
+        for p in particle:
+            if p.max_occurs != 0:
+                names.update(cls.first_names(p))
+                if particle.model == 'sequence' and not cls.is_emptiable(p):
+                    break
+        return names
+
+    def _particle_lines(self, record, particle, single_group):
+        """Returns the lines of code that decode the occurrences of a particle."""
+        max_occurs = particle.max_occurs
+
+        if isinstance(particle, XsdGroup):
+            group_name = self._depend(record, self.group_function(particle, single_group))
+            names = self.first_names(particle)
+            if len(names) == 1:
+                test = f'children[i].tag == {next(iter(names))!r}'
+            else:
+                test = f'children[i].tag in {self._constant("NAMES", repr(frozenset(names)))}'
+
+            if max_occurs == 1:
+                lines = [
+                    f'if i < n and {test}:',
+                    f'    i = {group_name}(children, i, n, content, level, ctx)',
+                ]
+                if not self.is_emptiable(particle):
+                    lines.extend(['else:', '    raise DecoderFallback'])
+                return lines
+
+            lines = [
+                f'while i < n and {test}:',
+                f'    k = {group_name}(children, i, n, content, level, ctx)',
+                '    if k == i:',
+                '        break',
+                '    i = k',
+            ]
+            return self._occurs_lines(
+                lines, max_occurs, 0 if self.is_emptiable(particle) else particle.min_occurs
+            )
+
+        if not isinstance(particle, XsdElement):
+            raise UnsupportedComponent(f"{particle!r}: wildcards not supported")
+
+        element_name = self._depend(record, self.element_function(particle))
+        single = bool(single_group and particle.is_single())
+        item = f'(ctx.key({particle.name!r}), {element_name}(children[i], level, ctx), {single})'
+
+        if max_occurs == 1:
+            lines = [
+                f'if i < n and children[i].tag == {particle.name!r}:',
+                f'    content.append({item})',
+                '    i += 1',
+            ]
+            if particle.min_occurs:
+                lines.extend(['else:', '    raise DecoderFallback'])
+            return lines
+
+        lines = [
+            f'while i < n and children[i].tag == {particle.name!r}:',
+            f'    content.append({item})',
+            '    i += 1',
+        ]
+        return self._occurs_lines(lines, max_occurs, particle.min_occurs)
+
+    @staticmethod
+    def _occurs_lines(lines, max_occurs, min_occurs):
+        """Adds the count of the occurrences to the lines of a loop, if necessary."""
+        if max_occurs is None and not min_occurs:
+            return lines
+
+        lines = ['occurs = 0', *lines, '    occurs += 1']
+        if max_occurs is not None:
+            condition = f'while i < n and occurs < {max_occurs} and '
+            lines[1] = lines[1].replace('while i < n and ', condition)
+        if min_occurs:
+            lines.extend([f'if occurs < {min_occurs}:', '    raise DecoderFallback'])
+        return lines
+
+    def _group_lines(self, record, group, single_group):
+        if group.open_content_mode != 'none':
+            raise UnsupportedComponent(f"{group!r}: open content not supported")
+
+        particles = [p for p in group if p.max_occurs != 0]
+        lines = [f'def {record.name}(children, i, n, content, level, ctx):']
+        body = []
+
+        if group.model == 'sequence':
+            for particle in particles:
+                body.extend(self._particle_lines(record, particle, single_group))
+
+        elif group.model == 'choice':
+            if not particles:
+                raise UnsupportedComponent(f"{group!r}: an empty choice is not valid")
+
+            body.append('tag = children[i].tag if i < n else None')
+            keyword = 'if'
+            for particle in particles:
+                names = self.first_names(particle)
+                if len(names) == 1:
+                    body.append(f'{keyword} tag == {next(iter(names))!r}:')
+                else:
+                    name = self._constant('NAMES', repr(frozenset(names)))
+                    body.append(f'{keyword} tag in {name}:')
+                keyword = 'elif'
+                particle_lines = self._particle_lines(record, particle, single_group)
+                body.extend(f'    {x}' for x in particle_lines)
+
+            if not self.is_emptiable(group):
+                body.extend(['else:', '    raise DecoderFallback'])
+
+        elif any(not isinstance(p, XsdElement) or p.max_occurs != 1 for p in particles):
+            raise UnsupportedComponent(f"{group!r}: model group not supported")
+
+        else:
+            names = self._constant('NAMES', repr(frozenset(p.name for p in particles)))
+            body.extend([
+                'seen = set()',
+                f'while i < n and children[i].tag in {names} and children[i].tag not in seen:',
+                '    tag = children[i].tag',
+                '    seen.add(tag)',
+            ])
+            keyword = 'if'
+            for particle in particles:
+                element_name = self._depend(record, self.element_function(particle))
+                single = bool(single_group and particle.is_single())
+                body.extend([
+                    f'    {keyword} tag == {particle.name!r}:',
+                    f'        content.append((ctx.key(tag), {element_name}'
+                    f'(children[i], level, ctx), {single}))',
+                ])
+                keyword = 'elif'
+            body.append('    i += 1')
+
+            required = [p.name for p in particles if p.min_occurs]
+            if required:
+                name = self._constant('NAMES', repr(frozenset(required)))
+                condition = f'not {name}.issubset(seen)'
+                if not group.min_occurs:
+                    condition = f'seen and {condition}'
+                body.extend([
+                    f'if {condition}:',
+                    '    raise DecoderFallback',
+                ])
+
+        body.append('return i')
+        lines.extend(f'    {x}' for x in body)
+        return lines
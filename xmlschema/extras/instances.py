@@ -0,0 +1,703 @@
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Schema-driven generation of synthetic XML instances, for load testing.
+"""
+import base64
+import math
+import random
+import string
+import sys
+from collections.abc import Iterator
+from io import StringIO
+from pathlib import Path
+from typing import Any, IO, Optional, Union
+from xml.etree.ElementTree import Element
+
+if sys.version_info >= (3, 11):
+    import re._parser as sre_parse  # type: ignore[import-not-found]
+else:
+    import sre_parse  # pragma: no cover
+
+import xmlschema.names as nm
+from xmlschema.aliases import BaseXsdType, ModelParticleType
+from xmlschema.benchmarks import parse_size
+from xmlschema.exceptions import XMLSchemaValueError
+from xmlschema.utils.etree import XmlStreamWriter
+from xmlschema.utils.qnames import local_name, get_extended_qname
+from xmlschema.validators import XMLSchemaBase, XsdElement, XsdGroup, XsdAnyElement, \
+    XsdSimpleType, XsdAtomicBuiltin, XsdList, XsdUnion, XsdIdentity, XsdKeyref, \
+    XsdPatternFacets, XsdEnumerationFacets
+
+__all__ = ['XmlInstanceGenerator']
+
+EXTRA_NAMESPACE = 'http://xmlschema.test/extra'
+LETTERS = string.ascii_letters
+ALPHABET = string.ascii_letters + string.digits + '-._ '
+
+INTEGER_RANGES = {
+    'integer': (-10 ** 6, 10 ** 6),
+    'long': (-10 ** 6, 10 ** 6),
+    'int': (-10 ** 6, 10 ** 6),
+    'short': (-32768, 32767),
+    'byte': (-128, 127),
+    'nonPositiveInteger': (-10 ** 6, 0),
+    'negativeInteger': (-10 ** 6, -1),
+    'nonNegativeInteger': (0, 10 ** 6),
+    'positiveInteger': (1, 10 ** 6),
+    'unsignedLong': (0, 10 ** 6),
+    'unsignedInt': (0, 10 ** 6),
+    'unsignedShort': (0, 65535),
+    'unsignedByte': (0, 255),
+}
+
+XSI_ATTRIBUTES = frozenset((nm.XSI_TYPE, nm.XSI_SCHEMA_LOCATION, nm.XSI_NONS_SCHEMA_LOCATION))
+NAME_TYPES = frozenset(('Name', 'NCName', 'ID', 'IDREF', 'ENTITY', 'NMTOKEN', 'QName'))
+
+
+class XmlInstanceGenerator:
+    """
+    A generator of synthetic XML instances that are valid against a schema.
+    The generator walks the declarations of the schema, respecting the occurrences
+    of the particles, the choices of the model groups, the facets of the simple
+    types, including enumerations and patterns, and the uniqueness of the values
+    selected by identity constraints and of ID values. Values of keyrefs and IDREFs
+    are chosen between the values already generated for the referenced fields.
+    The documents are streamed to a file, so they can be larger than the memory.
+    With the same seed the generator produces the same documents.
+
+    Abstract elements are replaced by substitutes, abstract types by derived
+    types declared with *xsi:type* and XSD 1.1 type alternatives are applied
+    after the generation of the attributes. Some constraints are not taken into
+    account, so the generated instances could be invalid for schemas that use
+    them: XSD 1.1 assertions, identity fields that select more values and keyrefs
+    to values of inner scopes. Patterns are generated from a parse of the regular
+    expression, so the values of types derived by intersections of patterns could
+    not be found.
+
+    :param schema: the schema instance.
+    :param seed: the seed for the pseudo-random generator.
+    :param max_repeat: the maximum number of occurrences generated for particles \
+    with an unbounded or large *maxOccurs*, if greater than *minOccurs*.
+    :param max_depth: the maximum depth of the optional content. Deeper than this \
+    level only the required content is generated.
+    :param optional_probability: the probability of generating optional attributes.
+    :param max_attempts: the maximum number of attempts for generating a simple value.
+    """
+    def __init__(self, schema: XMLSchemaBase,
+                 seed: Optional[int] = 0,
+                 max_repeat: int = 3,
+                 max_depth: int = 8,
+                 optional_probability: float = 0.5,
+                 max_attempts: int = 100) -> None:
+        self.schema = schema
+        self.seed = seed
+        self.max_repeat = max_repeat
+        self.max_depth = max_depth
+        self.optional_probability = optional_probability
+        self.max_attempts = max_attempts
+        self.random = random.Random(seed)
+
+        self._writer: Optional[XmlStreamWriter] = None
+        self._target = 0
+        self._fill_particle: Optional[ModelParticleType] = None
+        self._count = 0
+        self._used: dict[int, set[str]] = {}
+        self._values: dict[int, list[str]] = {}
+        self._refers: dict[int, int] = {}
+        self._scopes: dict[int, set[int]] = {}
+        self._ids: list[str] = []
+        self._used_ids: set[str] = set()
+        self._stack: list[int] = []
+        self._prefixes: dict[str, str] = {}
+
+    def __repr__(self) -> str:
+        return '%s(schema=%r, seed=%r)' % (self.__class__.__name__, self.schema, self.seed)
+
+    def get_root_element(self, element: Union[str, XsdElement, None] = None) -> XsdElement:
+        """
+        Returns the declaration of the root element. If no element is provided
+        the first global element that is not abstract and not referenced by
+        other declarations is returned.
+
+        :param element: an optional name or a declaration of a global element.
+        """
+        if isinstance(element, XsdElement):
+            return element
+        elif element is not None:
+            name = get_extended_qname(element, self.schema.namespaces)
+            try:
+                return self.schema.maps.elements[name]
+            except KeyError:
+                try:
+                    return self.schema.elements[element]
+                except KeyError:
+                    msg = f"{element!r} is not a global element of {self.schema!r}"
+                    raise XMLSchemaValueError(msg) from None
+
+        referenced = {
+            e.name for e in self.schema.iter_components(XsdElement)
+            if isinstance(e, XsdElement) and e.ref is not None
+        }
+        candidates = [e for e in self.schema.elements.values() if not e.abstract]
+        for xsd_element in candidates:
+            if xsd_element.name not in referenced:
+                return xsd_element
+        if candidates:
+            return candidates[0]
+        raise XMLSchemaValueError(f"{self.schema!r} has no global element to generate")
+
+    def write(self, target: Union[str, Path, IO[str]],
+              element: Union[str, XsdElement, None] = None,
+              size: Union[str, int, None] = None,
+              schema_location: Optional[str] = None) -> int:
+        """
+        Writes a generated XML instance to a file. Returns the number of the
+        generated elements.
+
+        :param target: a path or a text file-like object.
+        :param element: the root element, see :meth:`get_root_element`.
+        :param size: the target size of the document, in characters or as a \
+        string like '64KB' or '1GB'. The first repeatable particle of the root \
+        element is repeated until the target size is reached. If not provided \
+        the number of occurrences is random, limited by the argument *max_repeat*.
+        :param schema_location: if provided adds a schema location hint to the root.
+        """
+        if not isinstance(target, (str, Path)):
+            return self._write(target, element, size, schema_location)
+
+        with open(target, 'w', encoding='utf-8') as fp:
+            return self._write(fp, element, size, schema_location)
+
+    def tostring(self, element: Union[str, XsdElement, None] = None,
+                 size: Union[str, int, None] = None,
+                 schema_location: Optional[str] = None) -> str:
+        """Returns a generated XML instance as a string. Arguments are like :meth:`write`."""
+        fp = StringIO()
+        self._write(fp, element, size, schema_location)
+        return fp.getvalue()
+
+    def _write(self, fp: IO[str],
+               element: Union[str, XsdElement, None],
+               size: Union[str, int, None],
+               schema_location: Optional[str]) -> int:
+        root = self.get_root_element(element)
+        self._prepare_identities()
+        self.random.seed(self.seed)
+        self._target = 0 if size is None else parse_size(size)
+        self._fill_particle = self._find_fill_particle(root) if self._target else None
+        self._count = 0
+
+        attrib = {}
+        if schema_location is not None:
+            namespace = root.target_namespace
+            if namespace:
+                attrib[nm.XSI_SCHEMA_LOCATION] = f'{namespace} {schema_location}'
+            else:
+                attrib[nm.XSI_NONS_SCHEMA_LOCATION] = schema_location
+
+        # Namespaces are declared at root, so they can be used for xsi:type values
+        namespaces = {k: v for k, v in self.schema.namespaces.items()
+                      if k and v and v != nm.XSD_NAMESPACE}
+        self._prefixes = {v: k for k, v in namespaces.items()}
+        self._stack.clear()
+        self._writer = XmlStreamWriter(fp, namespaces)
+        try:
+            self._write_element(root, 0, attrib)
+            self._writer.write('\n')
+            self._writer.close()
+        finally:
+            self._writer = None
+        return self._count
+
+    def _prepare_identities(self) -> None:
+        """Maps the components selected by identity constraints."""
+        self._used.clear()
+        self._values.clear()
+        self._refers.clear()
+        self._scopes.clear()
+        self._ids.clear()
+        self._used_ids.clear()
+
+        for xsd_element in self.schema.maps.iter_components(XsdElement):
+            if not isinstance(xsd_element, XsdElement):
+                continue
+
+            for identity in xsd_element.identities:
+                if identity.ref is not None and identity.ref is not identity:
+                    continue
+
+                for selected, selectors in identity.elements.items():
+                    for k, selector in enumerate(selectors):
+                        for component in selector.decoders:
+                            if not isinstance(identity, XsdKeyref):
+                                self._used.setdefault(id(component), set())
+                                self._values.setdefault(id(component), [])
+                                self._scopes.setdefault(id(component), set()).add(id(selected))
+                            elif isinstance(identity.refer, XsdIdentity) and \
+                                    len(identity.fields) == 1:
+                                for refer_selectors in identity.refer.elements.values():
+                                    for refer_component in refer_selectors[k].decoders:
+                                        self._refers[id(component)] = id(refer_component)
+
+    def _find_fill_particle(self, xsd_element: XsdElement) -> Optional[ModelParticleType]:
+        """Returns the first particle of the content of an element with unbounded occurs."""
+        content = getattr(xsd_element.type, 'content', None)
+        if not isinstance(content, XsdGroup):
+            return None
+
+        groups = [content]
+        while groups:
+            group = groups.pop(0)
+            if group.max_occurs is None:
+                return group
+            for item in group:
+                if item.max_occurs is None:
+                    return item
+                elif isinstance(item, XsdGroup):
+                    groups.append(item)
+        return None
+
+    def _is_filled(self) -> bool:
+        return self._writer is not None and self._writer.length >= self._target
+
+    def _occurs(self, particle: ModelParticleType, depth: int) -> Iterator[int]:
+        """Yields the occurrences of a particle."""
+        min_occurs = particle.min_occurs
+        if particle is self._fill_particle:
+            k = 0
+            while k < min_occurs or not self._is_filled():
+                yield k
+                k += 1
+                if particle.max_occurs is not None and k >= particle.max_occurs:
+                    break
+            return
+
+        if depth > self.max_depth:
+            yield from range(min_occurs)
+            return
+
+        max_occurs = particle.max_occurs
+        if max_occurs is None or max_occurs > max(min_occurs, self.max_repeat):
+            max_occurs = max(min_occurs, self.max_repeat)
+        yield from range(self.random.randint(min_occurs, max_occurs))
+
+    def _write_element(self, xsd_element: XsdElement, depth: int,
+                       attrib: Optional[dict[str, str]] = None) -> None:
+        if xsd_element.abstract:
+            substitutes = [e for e in xsd_element.iter_substitutes() if not e.abstract]
+            if not substitutes:
+                msg = f"{xsd_element!r} is abstract and has no substitutes"
+                raise XMLSchemaValueError(msg)
+            xsd_element = self.random.choice(substitutes)
+
+        if depth > self.max_depth * 4:
+            raise XMLSchemaValueError(f"{self.schema!r} has unbounded required content")
+
+        assert self._writer is not None
+        self._count += 1
+        self._stack.append(id(xsd_element))
+
+        xsd_type = xsd_element.type
+        attrib = {} if attrib is None else attrib
+        if getattr(xsd_type, 'abstract', False):
+            xsd_type = self._get_instance_type(xsd_type, attrib)
+
+        elem = Element(xsd_element.name, self._get_attributes(xsd_type, attrib))
+        if xsd_element.alternatives:
+            alternative_type = xsd_element.get_alternative_type(elem)
+            if alternative_type is not xsd_type:
+                xsd_type = alternative_type
+                elem.attrib = self._get_attributes(xsd_type, elem.attrib)
+
+        if xsd_type.has_simple_content():
+            if xsd_element.fixed is not None:
+                text = xsd_element.fixed
+            else:
+                simple_type = xsd_type.simple_type
+                assert simple_type is not None
+                text = self.get_value(simple_type, id(xsd_element))
+            self._writer.start(elem, text)
+        else:
+            self._writer.start(elem)
+            content = getattr(xsd_type, 'content', None)
+            if isinstance(content, XsdGroup):
+                for _ in self._occurs(content, depth):
+                    self._write_group(content, depth + 1)
+        self._writer.end()
+        self._stack.pop()
+
+    def _get_instance_type(self, xsd_type: BaseXsdType, attrib: dict[str, str]) -> BaseXsdType:
+        """Chooses a derived type for an abstract type, adding an xsi:type attribute."""
+        derived_types = [
+            t for t in self.schema.maps.types.values()
+            if not getattr(t, 'abstract', False) and t.name is not None
+            and t.target_namespace != nm.XSD_NAMESPACE and t.is_derived(xsd_type)
+            and (not t.target_namespace or t.target_namespace in self._prefixes)
+        ]
+        if not derived_types:
+            raise XMLSchemaValueError(f"{xsd_type!r} is abstract and has no derived types")
+
+        instance_type = self.random.choice(derived_types)
+        assert instance_type.name is not None
+        if instance_type.target_namespace:
+            prefix = self._prefixes[instance_type.target_namespace]
+            attrib[nm.XSI_TYPE] = f'{prefix}:{local_name(instance_type.name)}'
+        else:
+            attrib[nm.XSI_TYPE] = instance_type.name
+        return instance_type
+
+    def _get_attributes(self, xsd_type: BaseXsdType, attrib: dict[str, str]) -> dict[str, str]:
+        result = {
+            k: v for k, v in attrib.items()
+            if k in XSI_ATTRIBUTES or not isinstance(xsd_type, XsdSimpleType)
+            and k in xsd_type.attributes
+        }
+        if isinstance(xsd_type, XsdSimpleType):
+            return result
+
+        for name, xsd_attribute in xsd_type.attributes.items():
+            if name is None or name in result or xsd_attribute.use == 'prohibited':
+                continue
+            elif xsd_attribute.fixed is not None:
+                result[name] = xsd_attribute.fixed
+            elif xsd_attribute.use == 'required' or \
+                    id(xsd_attribute) in self._used or \
+                    self.random.random() < self.optional_probability:
+                assert xsd_attribute.type is not None
+                result[name] = self.get_value(xsd_attribute.type, id(xsd_attribute))
+        return result
+
+    def _write_group(self, group: XsdGroup, depth: int) -> None:
+        if group.model == 'choice':
+            if not group:
+                return
+            particles = list(group)
+            if depth > self.max_depth:
+                particles = [p for p in particles if p.is_emptiable()] or particles
+            self._write_particle(self.random.choice(particles), depth)
+        else:
+            for particle in group:
+                self._write_particle(particle, depth)
+
+    def _write_particle(self, particle: ModelParticleType, depth: int) -> None:
+        for _ in self._occurs(particle, depth):
+            if isinstance(particle, XsdGroup):
+                self._write_group(particle, depth)
+            elif isinstance(particle, XsdElement):
+                self._write_element(particle, depth)
+            elif isinstance(particle, XsdAnyElement) and particle.min_occurs:
+                self._write_wildcard(particle, depth)
+
+    def _write_wildcard(self, wildcard: XsdAnyElement, depth: int) -> None:
+        for xsd_element in self.schema.maps.elements.values():
+            if isinstance(xsd_element, XsdElement) and not xsd_element.abstract and \
+                    (xsd_element.target_namespace != nm.XSD_NAMESPACE
+                     or nm.XSD_NAMESPACE in wildcard.namespace) and \
+                    wildcard.is_matching(xsd_element.name):
+                self._write_element(xsd_element, depth)
+                return
+
+        if wildcard.process_contents != 'strict':
+            # An undeclared element is admitted if the contents are not strictly processed
+            namespaces = sorted(x for x in wildcard.namespace if x[:2] != '##')
+            namespaces.extend(('', EXTRA_NAMESPACE))
+            for namespace in namespaces:
+                name = f'{{{namespace}}}extra' if namespace else 'extra'
+                if name not in self.schema.maps.elements and wildcard.is_matching(name):
+                    assert self._writer is not None
+                    self._count += 1
+                    self._writer.start(Element(name))
+                    self._writer.end()
+                    return
+
+        msg = f"no element can be generated for the required wildcard {wildcard!r}"
+        raise XMLSchemaValueError(msg)
+
+    def get_value(self, xsd_type: XsdSimpleType, key: Optional[int] = None) -> str:
+        """
+        Returns a generated value for a simple type.
+
+        :param xsd_type: the simple type.
+        :param key: an optional key of the component for that the value is generated, \
+        used for generating unique values and values of references.
+        """
+        if key is not None:
+            try:
+                refer = self._refers[key]
+            except KeyError:
+                pass
+            else:
+                if self._values.get(refer):
+                    return self.random.choice(self._values[refer])
+
+        used = None if key is None else self._used.get(key)
+        builtin_name = get_builtin_name(xsd_type)
+        if builtin_name == 'IDREF' and self._ids:
+            return self.random.choice(self._ids)
+        elif builtin_name == 'ID':
+            used = self._used_ids
+
+        for attempt in range(self.max_attempts):
+            # Unique values are generated with a serial number, if the type admits it
+            serial = None if used is None else len(used) + attempt
+            value = self._get_candidate(xsd_type, builtin_name, serial)
+            if used is not None and value in used:
+                continue
+            elif xsd_type.is_valid(value):
+                break
+        else:
+            value = self._get_fallback(xsd_type, used)
+
+        if used is not None:
+            used.add(value)
+            if key is not None and key in self._values and \
+                    any(x in self._scopes[key] for x in self._stack):
+                self._values[key].append(value)
+            if builtin_name == 'ID':
+                self._ids.append(value)
+        return value
+
+    def _get_fallback(self, xsd_type: XsdSimpleType, used: Optional[set[str]]) -> str:
+        for value in (xsd_type.min_value, xsd_type.max_value):
+            if value is not None:
+                text = str(value)
+                if xsd_type.is_valid(text) and (used is None or text not in used):
+                    return text
+
+        msg = f"cannot generate a valid value for {xsd_type!r}"
+        raise XMLSchemaValueError(msg)
+
+    def _get_candidate(self, xsd_type: XsdSimpleType, builtin_name: str,
+                       serial: Optional[int] = None) -> str:
+        if xsd_type.is_list():
+            return self._get_list_candidate(xsd_type)
+        elif xsd_type.is_union():
+            union_type = xsd_type
+            while not isinstance(union_type, XsdUnion):
+                union_type = union_type.base_type  # type: ignore[assignment]
+            member_type = self.random.choice(union_type.member_types)
+            return self._get_candidate(member_type, get_builtin_name(member_type), serial)
+
+        enumeration = xsd_type.get_facet(nm.XSD_ENUMERATION)
+        if isinstance(enumeration, XsdEnumerationFacets):
+            return self.random.choice([e.get('value', '') for e in enumeration])
+
+        patterns = xsd_type.get_facet(nm.XSD_PATTERN)
+        if isinstance(patterns, XsdPatternFacets):
+            pattern = self.random.choice(patterns.patterns)
+            return self._get_pattern_candidate(pattern.pattern)
+
+        if builtin_name in INTEGER_RANGES:
+            return self._get_integer_candidate(xsd_type, builtin_name, serial)
+        elif builtin_name in ('decimal', 'float', 'double'):
+            return self._get_decimal_candidate(xsd_type)
+        elif builtin_name in NAME_TYPES:
+            return self._get_string_candidate(xsd_type, serial, name=True)
+        elif builtin_name == 'boolean':
+            return self.random.choice(('true', 'false'))
+        elif builtin_name == 'language':
+            return self.random.choice(('en', 'it', 'fr', 'de', 'en-US'))
+        elif builtin_name == 'anyURI':
+            return f'http://example.test/{self._get_string_candidate(xsd_type, serial)}'
+        elif builtin_name in ('hexBinary', 'base64Binary'):
+            return self._get_binary_candidate(xsd_type, builtin_name)
+        elif builtin_name in DATETIME_FORMATS:
+            return self._get_datetime_candidate(builtin_name)
+        return self._get_string_candidate(xsd_type, serial)
+
+    def _get_length(self, xsd_type: XsdSimpleType, default: int = 8) -> int:
+        min_length = xsd_type.min_length or 0
+        max_length = xsd_type.max_length
+        if max_length is None:
+            max_length = max(min_length, default)
+        return self.random.randint(min_length, max_length)
+
+    def _get_list_candidate(self, xsd_type: XsdSimpleType) -> str:
+        list_type = xsd_type
+        while not isinstance(list_type, XsdList):
+            list_type = list_type.base_type  # type: ignore[assignment]
+
+        item_type = list_type.item_type
+        builtin_name = get_builtin_name(item_type)
+        length = max(self._get_length(xsd_type, self.max_repeat), 1)
+        return ' '.join(
+            self._get_candidate(item_type, builtin_name) for _ in range(length)
+        )
+
+    def _get_string_candidate(self, xsd_type: XsdSimpleType,
+                              serial: Optional[int] = None, name: bool = False) -> str:
+        length = self._get_length(xsd_type)
+        suffix = '' if serial is None else str(serial)
+        chars = self.random.choices(LETTERS, k=max(length - len(suffix), 1 if name else 0))
+        return ''.join(chars) + suffix
+
+    def _get_integer_candidate(self, xsd_type: XsdSimpleType, builtin_name: str,
+                               serial: Optional[int] = None) -> str:
+        low, high = INTEGER_RANGES[builtin_name]
+        low, high = self._apply_bounds(xsd_type, low, high)
+
+        total_digits = getattr(xsd_type.get_facet(nm.XSD_TOTAL_DIGITS), 'value', None)
+        if total_digits is not None:
+            low = max(low, 1 - 10 ** total_digits)
+            high = min(high, 10 ** total_digits - 1)
+
+        if serial is not None and low + serial <= high:
+            return str(low + serial)
+        return str(self.random.randint(low, max(low, high)))
+
+    def _get_decimal_candidate(self, xsd_type: XsdSimpleType) -> str:
+        low, high = self._apply_bounds(xsd_type, -10 ** 6, 10 ** 6)
+
+        fraction_digits = getattr(xsd_type.get_facet(nm.XSD_FRACTION_DIGITS), 'value', 2)
+        total_digits = getattr(xsd_type.get_facet(nm.XSD_TOTAL_DIGITS), 'value', None)
+        if total_digits is not None:
+            fraction_digits = min(fraction_digits, total_digits)
+            limit = 10 ** (total_digits - fraction_digits) - 1
+            low, high = max(low, -limit), min(high, limit)
+
+        integer_part = self.random.randint(low, max(low, high))
+        if not fraction_digits:
+            return str(integer_part)
+
+        fraction_part = self.random.randint(0, 10 ** fraction_digits - 1)
+        sign = '-' if integer_part < 0 else ''
+        return f'{sign}{abs(integer_part)}.{fraction_part:0{fraction_digits}}'
+
+    @staticmethod
+    def _apply_bounds(xsd_type: XsdSimpleType, low: int, high: int) -> tuple[int, int]:
+        for facet_name, is_min in ((nm.XSD_MIN_INCLUSIVE, True), (nm.XSD_MIN_EXCLUSIVE, True),
+                                   (nm.XSD_MAX_INCLUSIVE, False),
+                                   (nm.XSD_MAX_EXCLUSIVE, False)):
+            value = getattr(xsd_type.get_facet(facet_name), 'value', None)
+            try:
+                if value is None or math.isinf(value) or value != value:
+                    continue
+                elif is_min:
+                    low = max(low, math.ceil(value))
+                else:
+                    high = min(high, math.floor(value))
+            except (TypeError, ValueError):
+                continue
+        return low, high
+
+    def _get_binary_candidate(self, xsd_type: XsdSimpleType, builtin_name: str) -> str:
+        data = self.random.randbytes(self._get_length(xsd_type))
+        if builtin_name == 'hexBinary':
+            return data.hex().upper()
+        return base64.b64encode(data).decode('ascii')
+
+    def _get_datetime_candidate(self, builtin_name: str) -> str:
+        rnd = self.random
+        values = {
+            'Y': rnd.randint(1970, 2030), 'M': rnd.randint(1, 12), 'D': rnd.randint(1, 28),
+            'h': rnd.randint(0, 23), 'm': rnd.randint(0, 59), 's': rnd.randint(0, 59),
+            'n': rnd.randint(1, 100),
+        }
+        return DATETIME_FORMATS[builtin_name].format(**values)
+
+    def _get_pattern_candidate(self, pattern: str) -> str:
+        try:
+            parsed = sre_parse.parse(pattern)
+        except Exception:  # pragma: no cover
+            return ''
+        return ''.join(self._iter_regex_chars(list(parsed)))
+
+    def _iter_regex_chars(self, items: list[tuple[Any, Any]]) -> Iterator[str]:
+        for op, args in items:
+            op_name = str(op)
+            if op_name == 'LITERAL':
+                yield chr(args)
+            elif op_name == 'NOT_LITERAL':
+                yield self._choose_char([(sre_parse.NEGATE, None), (sre_parse.LITERAL, args)])
+            elif op_name == 'ANY':
+                yield self.random.choice(LETTERS)
+            elif op_name == 'IN':
+                yield self._choose_char(args)
+            elif op_name == 'SUBPATTERN':
+                yield from self._iter_regex_chars(list(args[-1]))
+            elif op_name == 'BRANCH':
+                yield from self._iter_regex_chars(list(self.random.choice(args[1])))
+            elif op_name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+                min_repeat, max_repeat, sub_items = args
+                max_repeat = min(max_repeat, min_repeat + self.max_repeat)
+                for _ in range(self.random.randint(min_repeat, max_repeat)):
+                    yield from self._iter_regex_chars(list(sub_items))
+            elif op_name == 'CATEGORY':
+                yield self._choose_char([(op, args)])
+
+    def _choose_char(self, items: list[tuple[Any, Any]]) -> str:
+        candidates = [c for c in ALPHABET if char_in_class(c, items)]
+        if candidates:
+            return self.random.choice(candidates)
+
+        for op, args in items:
+            if str(op) == 'RANGE':
+                return chr(self.random.randint(*args))
+            elif str(op) == 'LITERAL':
+                return chr(args)
+        return self.random.choice(LETTERS)
+
+
+DATETIME_FORMATS = {
+    'date': '{Y:04}-{M:02}-{D:02}',
+    'dateTime': '{Y:04}-{M:02}-{D:02}T{h:02}:{m:02}:{s:02}',
+    'dateTimeStamp': '{Y:04}-{M:02}-{D:02}T{h:02}:{m:02}:{s:02}Z',
+    'time': '{h:02}:{m:02}:{s:02}',
+    'gYear': '{Y:04}',
+    'gYearMonth': '{Y:04}-{M:02}',
+    'gMonth': '--{M:02}',
+    'gMonthDay': '--{M:02}-{D:02}',
+    'gDay': '---{D:02}',
+    'duration': 'P{n}DT{h}H',
+    'dayTimeDuration': 'P{n}DT{h}H',
+    'yearMonthDuration': 'P{n}M',
+}
+
+_CATEGORIES = {
+    'CATEGORY_DIGIT': str.isdigit,
+    'CATEGORY_SPACE': str.isspace,
+    'CATEGORY_WORD': lambda c: c.isalnum() or c == '_',
+}
+
+
+def char_in_class(char: str, items: list[tuple[Any, Any]]) -> bool:
+    """Returns `True` if a character matches the items of a parsed regex class."""
+    negate = False
+    for op, args in items:
+        op_name = str(op)
+        if op_name == 'NEGATE':
+            negate = True
+        elif op_name == 'LITERAL':
+            if ord(char) == args:
+                return not negate
+        elif op_name == 'RANGE':
+            if args[0] <= ord(char) <= args[1]:
+                return not negate
+        elif op_name == 'CATEGORY':
+            category = str(args)
+            if category.startswith('CATEGORY_NOT_'):
+                if not _CATEGORIES[category.replace('NOT_', '')](char):
+                    return not negate
+            elif category in _CATEGORIES and _CATEGORIES[category](char):
+                return not negate
+    return negate
+
+
+def get_builtin_name(xsd_type: XsdSimpleType) -> str:
+    """Returns the local name of the nearest builtin base type of a simple type."""
+    base_type: Optional[BaseXsdType] = xsd_type
+    while base_type is not None:
+        if isinstance(base_type, XsdAtomicBuiltin) or \
+                isinstance(base_type, XsdList) and base_type.name is not None and \
+                base_type.target_namespace == nm.XSD_NAMESPACE:
+            return local_name(base_type.name)
+        base_type = base_type.base_type
+    return 'string'
@@ -0,0 +1,345 @@
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Schema-driven decoding of XML data to columnar batches of rows.
+"""
+import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from xmlschema.exceptions import XMLSchemaValueError
+from xmlschema.translation import gettext as _
+from xmlschema.aliases import BaseXsdType, NsmapType, XMLSourceType
+from xmlschema.converters import XMLSchemaConverter
+from xmlschema.resources import XMLResource
+from xmlschema.utils.qnames import local_name
+from xmlschema.validators import XMLSchemaBase, XMLSchemaValidationError, \
+    XsdAtomicBuiltin, XsdElement, XsdGroup, XsdSimpleType
+
+__all__ = ['Column', 'ColumnBatch', 'TabularDecoder']
+
+BACKENDS = ('array', 'numpy', 'arrow')
+
+# Typecodes of the array buffers for the Python types that have a fixed size
+TYPECODES = {bool: 'b', int: 'q', float: 'd'}
+NULL_VALUES = {'b': 0, 'q': 0, 'd': float('nan')}
+NUMPY_DTYPES = {'b': 'int8', 'q': 'int64', 'd': 'float64'}
+
+
+def get_python_type(xsd_type: Optional[BaseXsdType]) -> type[Any]:
+    """
+    Returns the Python type of the values decoded by an XSD type, `object`
+    if the type has not a simple content or if it's a list or a union.
+    """
+    item: Any = xsd_type
+    while item is not None:
+        if item.is_complex():
+            if not item.has_simple_content():
+                return object
+            item = item.content
+        elif isinstance(item, XsdAtomicBuiltin):
+            return item.python_type
+        elif not isinstance(item, XsdSimpleType) or not item.is_atomic():
+            return object
+        else:
+            item = item.base_type
+    return object
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    A column of a tabular layout.
+
+    :param name: the name of the column, a path of local names relative to \
+    the row element, with attribute names prefixed by '@'.
+    :param keys: the sequence of keys that locates the value into a decoded row.
+    :param python_type: the Python type associated with the XSD type of the column.
+    """
+    name: str
+    keys: tuple[str, ...]
+    python_type: type[Any]
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """The typecode of the array buffers, `None` for columns of objects."""
+        return TYPECODES.get(self.python_type)
+
+    def get_value(self, row: Any) -> Any:
+        """Gets the value of the column from a decoded row."""
+        value = row
+        for key in self.keys:
+            if isinstance(value, dict):
+                value = value.get(key)
+            elif key == '$':
+                break  # a simple content decoded without attributes
+            else:
+                return None
+        return None if isinstance(value, dict) else value
+
+
+@dataclass
+class ColumnBatch:
+    """
+    A batch of rows in columnar layout. Columns with a fixed size type
+    are stored in arrays, other columns in lists.
+
+    :param num_rows: the number of rows of the batch.
+    :param columns: a map from column names to column values.
+    :param validity: a map from column names to bytearrays, where a zero \
+    byte marks a null value of the column.
+    """
+    num_rows: int
+    columns: dict[str, Union['array.array[Any]', list[Any]]]
+    validity: dict[str, bytearray]
+
+    def to_pylist(self) -> list[dict[str, Any]]:
+        """Returns the batch as a list of rows, with `None` for null values."""
+        return [
+            {name: values[k] if self.validity[name][k] else None
+             for name, values in self.columns.items()}
+            for k in range(self.num_rows)
+        ]
+
+
+class _ColumnBuffer:
+    """A preallocated buffer for the values of a column."""
+    __slots__ = ('column', 'typecode', 'values', 'validity')
+
+    values: Union['array.array[Any]', list[Any]]
+
+    def __init__(self, column: Column, size: int) -> None:
+        self.column = column
+        self.typecode = column.typecode
+        if self.typecode is None:
+            self.values = [None] * size
+        else:
+            self.values = array.array(self.typecode, [NULL_VALUES[self.typecode]]) * size
+        self.validity = bytearray(size)
+
+    def set(self, index: int, value: Any) -> None:
+        if value is None:
+            self.values[index] = None if self.typecode is None else NULL_VALUES[self.typecode]
+            self.validity[index] = 0
+            return
+
+        try:
+            self.values[index] = value
+        except (TypeError, OverflowError):
+            # A value that doesn't fit into the array (e.g. an unbounded xs:integer
+            # or a decimal_type option): from now on store the column into a list.
+            self.values = self.values.tolist()  # type: ignore[union-attr]
+            self.typecode = None
+            self.values[index] = value
+
+        self.validity[index] = 1
+
+
+class TabularDecoder:
+    """
+    A decoder of XML data to a columnar layout, derived once from the XSD element
+    selected by *path*. The rows are the XML elements selected by *path*, and the
+    columns are the attributes and the simple contents of the element and of its
+    descendants that can occur at most once in a row. Other descendants are listed
+    in the *skipped* attribute.
+
+    The rows are decoded one at a time and are stored into preallocated buffers,
+    flushed every *batch_size* rows, so the memory usage is bounded also decoding
+    large XML data from lazy resources.
+
+    :param schema: the schema instance used for decoding.
+    :param path: an absolute path that selects the XML elements to decode as rows, \
+    e.g. `'/col:collection/object'`.
+    :param namespaces: an optional mapping from namespace prefixes to URIs, used \
+    for resolving the *path*.
+    :param batch_size: the maximum number of rows of a batch.
+    :param backend: the format of the batches. Can be 'array' (default) for \
+    :class:`ColumnBatch` instances, 'numpy' for dictionaries of NumPy arrays, \
+    masked where there are null values, or 'arrow' for `pyarrow.RecordBatch` \
+    instances. The backends 'numpy' and 'arrow' require the installation of \
+    the respective package.
+    """
+    def __init__(self, schema: XMLSchemaBase,
+                 path: str,
+                 namespaces: Optional[NsmapType] = None,
+                 batch_size: int = 1024,
+                 backend: str = 'array') -> None:
+
+        if not path.startswith('/'):
+            raise XMLSchemaValueError(_("{!r} is not an absolute path").format(path))
+        elif not isinstance(batch_size, int) or batch_size < 1:
+            raise XMLSchemaValueError(_("'batch_size' must be a positive integer"))
+        elif backend not in BACKENDS:
+            raise XMLSchemaValueError(_("'backend' must be one of {!r}").format(BACKENDS))
+
+        xsd_element = schema.find(path, namespaces)
+        if not isinstance(xsd_element, XsdElement):
+            msg = _("path {!r} doesn't select an XSD element")
+            raise XMLSchemaValueError(msg.format(path))
+
+        self.schema = schema
+        self.path = path
+        self.namespaces = namespaces
+        self.batch_size = batch_size
+        self.backend = backend
+        self.xsd_element = xsd_element
+
+        self.columns: list[Column] = []
+        self.skipped: list[str] = []
+        self.errors: list[XMLSchemaValidationError] = []
+        self._add_columns(xsd_element, (), '', [xsd_element.type])
+
+    def __repr__(self) -> str:
+        return '%s(path=%r, columns=%d)' % (
+            self.__class__.__name__, self.path, len(self.columns)
+        )
+
+    @property
+    def names(self) -> list[str]:
+        """The names of the columns."""
+        return [col.name for col in self.columns]
+
+    def _add_columns(self, xsd_element: XsdElement, keys: tuple[str, ...],
+                     prefix: str, ancestors: list[BaseXsdType]) -> None:
+        xsd_type = xsd_element.type
+        for name, xsd_attribute in xsd_element.attributes.items():
+            if name is not None:
+                key = '@' + local_name(name)
+                self.columns.append(Column(
+                    prefix + key, keys + (key,), get_python_type(xsd_attribute.type)
+                ))
+
+        if xsd_type.has_simple_content():
+            self.columns.append(Column(
+                name=prefix[:-1] if prefix else xsd_element.local_name,
+                keys=keys + ('$',) if xsd_element.attributes else keys,
+                python_type=get_python_type(xsd_type),
+            ))
+        elif xsd_type.model_group is not None:
+            for child, single in self._iter_child_elements(xsd_type.model_group):
+                name = prefix + child.local_name
+                if not isinstance(child, XsdElement) or not single \
+                        or child.type in ancestors:
+                    self.skipped.append(name)
+                else:
+                    ancestors.append(child.type)
+                    self._add_columns(child, keys + (child.local_name,),
+                                      name + '/', ancestors)
+                    ancestors.pop()
+
+    def _iter_child_elements(self, group: XsdGroup, single: bool = True) \
+            -> Iterator[tuple[Any, bool]]:
+        single = single and group.max_occurs == 1
+        for item in group.content:
+            if isinstance(item, XsdGroup):
+                if item.max_occurs != 0:
+                    yield from self._iter_child_elements(item, single)
+            elif item.max_occurs != 0:
+                yield item, single and item.max_occurs == 1
+
+    def iter_batches(self, source: Union[XMLSourceType, XMLResource],
+                     validation: str = 'strict', **kwargs: Any) -> Iterator[Any]:
+        """
+        Decodes the XML data and yields the batches of rows, in the format
+        of the backend. With lazy resources the memory usage is bounded by
+        the size of a batch.
+
+        :param source: the source of XML data.
+        :param validation: the validation mode. Can be 'lax', 'strict' or 'skip'. \
+        With 'lax' mode the decoding errors are collected in the *errors* attribute.
+        :param kwargs: other options for decoding, with the exception of *path*, \
+        *namespaces* and *converter*, that are set by the tabular decoder.
+        """
+        kwargs['converter'] = XMLSchemaConverter(
+            attr_prefix='@', text_key='$', cdata_prefix=None, strip_namespaces=True
+        )
+        buffers = [_ColumnBuffer(col, self.batch_size) for col in self.columns]
+        self.errors.clear()
+
+        index = 0
+        for obj in self.schema.iter_decode(source, self.path, validation=validation,
+                                           namespaces=self.namespaces, **kwargs):
+            if isinstance(obj, XMLSchemaValidationError):
+                if validation == 'strict':
+                    raise obj
+                self.errors.append(obj)
+                continue
+
+            for buffer in buffers:
+                buffer.set(index, buffer.column.get_value(obj))
+
+            index += 1
+            if index == self.batch_size:
+                yield self._flush(buffers, index)
+                index = 0
+
+        if index:
+            yield self._flush(buffers, index)
+
+    def decode(self, source: Union[XMLSourceType, XMLResource],
+               validation: str = 'strict', **kwargs: Any) -> list[Any]:
+        """Decodes the XML data and returns the list of all the batches."""
+        return list(self.iter_batches(source, validation, **kwargs))
+
+    def _flush(self, buffers: list[_ColumnBuffer], num_rows: int) -> Any:
+        if self.backend == 'numpy':
+            return self._get_numpy_arrays(buffers, num_rows)
+        elif self.backend == 'arrow':
+            return self._get_record_batch(buffers, num_rows)
+
+        return ColumnBatch(
+            num_rows=num_rows,
+            columns={b.column.name: b.values[:num_rows] for b in buffers},
+            validity={b.column.name: b.validity[:num_rows] for b in buffers},
+        )
+
+    @staticmethod
+    def _get_numpy_arrays(buffers: list[_ColumnBuffer], num_rows: int) -> dict[str, Any]:
+        import numpy  # type: ignore[import-not-found]
+
+        arrays = {}
+        for buffer in buffers:
+            values: Any
+            if buffer.typecode is None:
+                values = numpy.empty(num_rows, dtype=object)
+                for k in range(num_rows):
+                    values[k] = buffer.values[k]
+            else:
+                values = numpy.frombuffer(
+                    buffer.values, NUMPY_DTYPES[buffer.typecode], num_rows
+                ).copy()
+                if buffer.column.python_type is bool:
+                    values = values.astype(bool)
+
+            mask = numpy.frombuffer(buffer.validity, numpy.uint8, num_rows) == 0
+            if mask.any():
+                values = numpy.ma.MaskedArray(values, mask=mask)
+            arrays[buffer.column.name] = values
+
+        return arrays
+
+    @staticmethod
+    def _get_record_batch(buffers: list[_ColumnBuffer], num_rows: int) -> Any:
+        import pyarrow  # type: ignore[import-not-found]
+
+        arrow_types = {'b': pyarrow.bool_(), 'q': pyarrow.int64(), 'd': pyarrow.float64()}
+        arrays = []
+        for buffer in buffers:
+            validity = buffer.validity
+            if buffer.typecode == 'b':
+                data = [bool(v) if validity[k] else None
+                        for k, v in enumerate(buffer.values[:num_rows])]
+            else:
+                data = [v if validity[k] else None
+                        for k, v in enumerate(buffer.values[:num_rows])]
+            arrays.append(pyarrow.array(data, type=arrow_types.get(buffer.typecode or '')))
+
+        return pyarrow.RecordBatch.from_arrays(arrays, names=[b.column.name for b in buffers])
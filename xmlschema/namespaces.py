@@ -12,6 +12,7 @@ This module contains the base definitions for xmlschema's converters.
 """
 import re
 from collections.abc import Callable, Container, Iterator, Mapping, MutableMapping
+from itertools import count
 from typing import Any, NamedTuple, Optional, Union, TypeVar, TYPE_CHECKING, cast
 
 from xmlschema.aliases import NsmapType, ElementType, XmlnsType, SchemaType
@@ -29,12 +30,27 @@ if TYPE_CHECKING:
 __all__ = ('NamespaceMapper', 'NamespaceResourcesMap', 'NamespaceView')
 
 
+QNAMES_CACHE_SIZE = 2048
+XMLNS_SCOPES_CACHE_SIZE = 1024
+
+_next_version = count(1).__next__
+
+
 class NamespaceMapperContext(NamedTuple):
+    """
+    A context of the stacked xmlns processing mode. Instead of copies of the
+    namespace maps it saves only the previous values of the entries changed by
+    the xmlns declarations (`None` for new entries), with the version and the
+    QName memos of the namespace map state to restore.
+    """
     obj: Union[ElementType, Any]
     level: int
     xmlns: XmlnsType
-    namespaces: NsmapType
-    reverse: NsmapType
+    namespaces: tuple[tuple[str, Optional[str]], ...]
+    reverse: tuple[tuple[str, Optional[str]], ...]
+    version: int
+    qnames: dict[str, str]
+    unqnames: dict[str, str]
 
 
 class NamespaceMapper(MutableMapping[str, str]):
@@ -64,11 +80,17 @@ class NamespaceMapper(MutableMapping[str, str]):
     """
     __slots__ = ('namespaces', 'process_namespaces', 'strip_namespaces',
                  'xmlns_processing', 'source', '__dict__', '_use_namespaces',
-                 '_xmlns_getter', '_xmlns_contexts', '_reverse')
+                 '_xmlns_getter', '_xmlns_contexts', '_reverse', '_ns_version',
+                 '_qnames', '_unqnames', '_xmlns_scopes')
 
     _arguments = NsMapperArguments
     _xmlns_getter: Optional[Callable[[ElementType], XmlnsType]]
     _xmlns_contexts: list[NamespaceMapperContext]
+    _ns_version: int
+    _qnames: dict[str, str]
+    _unqnames: dict[str, str]
+    _xmlns_scopes: dict[tuple[int, bool, tuple[tuple[str, str], ...]],
+                        tuple[int, dict[str, str], dict[str, str]]]
 
     def __init__(self, namespaces: Optional[NsmapType] = None,
                  process_namespaces: bool = True,
@@ -96,18 +118,26 @@ class NamespaceMapper(MutableMapping[str, str]):
         self.namespaces = self.get_namespaces(namespaces)
         self._reverse = {v: k and k + ':' for k, v in reversed(self.namespaces.items())}
         self._xmlns_contexts = []
+        self._xmlns_scopes = {}
+        self._reset_version()
         self._arguments.validate(self)
 
     def __getitem__(self, prefix: str) -> str:
         return self.namespaces[prefix]
 
     def __setitem__(self, prefix: str, uri: str) -> None:
+        if self._xmlns_contexts:
+            self._save_entries(prefix, uri)
         self.namespaces[prefix] = uri
         self._reverse[uri] = prefix and prefix + ':'
+        self._reset_version()
 
     def __delitem__(self, prefix: str) -> None:
+        if self._xmlns_contexts and prefix in self.namespaces:
+            self._save_entries(prefix, self.namespaces[prefix])
         uri = self.namespaces.pop(prefix)
         del self._reverse[uri]
+        self._reset_version()
 
         for k in reversed(self.namespaces.keys()):
             if self.namespaces[k] == uri:
@@ -144,6 +174,7 @@ class NamespaceMapper(MutableMapping[str, str]):
         self.namespaces.clear()
         self._reverse.clear()
         self._xmlns_contexts.clear()
+        self._reset_version()
 
     def get_xmlns_from_data(self, obj: Any) -> XmlnsType:
         """Returns the XML declarations from decoded element data."""
@@ -191,8 +222,6 @@ class NamespaceMapper(MutableMapping[str, str]):
 
         if self._xmlns_contexts:
             # Remove contexts of sibling or descendant elements
-            namespaces = reverse = None
-
             while self._xmlns_contexts:  # pragma: no cover
                 context = self._xmlns_contexts[-1]
                 if level > context.level:
@@ -202,13 +231,7 @@ class NamespaceMapper(MutableMapping[str, str]):
                     xmlns = context.xmlns
                     break
 
-                namespaces, reverse = self._xmlns_contexts.pop()[-2:]
-
-            if namespaces is not None and reverse is not None:
-                self.namespaces.clear()
-                self.namespaces.update(namespaces)
-                self._reverse.clear()
-                self._reverse.update(reverse)
+                self._restore_context(self._xmlns_contexts.pop())
 
         if xmlns or not self._xmlns_getter:
             return xmlns
@@ -216,23 +239,11 @@ class NamespaceMapper(MutableMapping[str, str]):
         xmlns = self._xmlns_getter(obj)
         if xmlns:
             if self.xmlns_processing == 'stacked':
-                context = NamespaceMapperContext(
-                    obj,
-                    level,
-                    xmlns,
-                    {k: v for k, v in self.namespaces.items()},
-                    {k: v for k, v in self._reverse.items()},
-                )
-                self._xmlns_contexts.append(context)
-                self.namespaces.update(xmlns)
-                if level:
-                    self._reverse.update((v, k and k + ':') for k, v in xmlns)
-                else:
-                    self._reverse.update((v, k and k + ':') for k, v in reversed(xmlns)
-                                         if v not in self._reverse)
+                self._push_context(obj, level, xmlns)
                 return xmlns
 
             elif not level or self.xmlns_processing == 'collapsed':
+                self._reset_version()
                 for prefix, uri in xmlns:
                     if not prefix:
                         if not uri:
@@ -270,24 +281,34 @@ class NamespaceMapper(MutableMapping[str, str]):
         :param qname: a QName in extended format or a local name.
         :return: a QName in prefixed format or a local name.
         """
-        if not self._use_namespaces:
-            return local_name(qname) if self.strip_namespaces else qname
-
         try:
-            if qname[0] != '{' or not self.namespaces:
+            return self._qnames[qname]
+        except (KeyError, TypeError):
+            pass
+
+        if not self._use_namespaces:
+            name = local_name(qname) if self.strip_namespaces else qname
+        else:
+            try:
+                if qname[0] != '{' or not self.namespaces:
+                    return qname
+                namespace, local_part = qname[1:].split('}')
+            except IndexError:
                 return qname
-            namespace, local_part = qname[1:].split('}')
-        except IndexError:
-            return qname
-        except ValueError:
-            raise XMLSchemaValueError("the argument 'qname' has an invalid value %r" % qname)
-        except TypeError:
-            raise XMLSchemaTypeError("the argument 'qname' must be a string-like object")
+            except ValueError:
+                msg = "the argument 'qname' has an invalid value %r"
+                raise XMLSchemaValueError(msg % qname)
+            except TypeError:
+                raise XMLSchemaTypeError("the argument 'qname' must be a string-like object")
 
-        try:
-            return self._reverse[namespace] + local_part
-        except KeyError:
-            return qname
+            try:
+                name = self._reverse[namespace] + local_part
+            except KeyError:
+                name = qname
+
+        if len(self._qnames) < QNAMES_CACHE_SIZE:
+            self._qnames[qname] = name
+        return name
 
     def unmap_qname(self, qname: str,
                     name_table: Optional[Container[Optional[str]]] = None,
@@ -306,15 +327,30 @@ class NamespaceMapper(MutableMapping[str, str]):
         """
         namespaces: MutableMapping[str, str]
 
-        if not self._use_namespaces:
-            return local_name(qname) if self.strip_namespaces else qname
-
         if xmlns:
             namespaces = {k: v for k, v in self.namespaces.items()}
             namespaces.update(xmlns)
+        elif name_table is None:
+            try:
+                return self._unqnames[qname]
+            except (KeyError, TypeError):
+                pass
+
+            name = self._unmap_qname(qname, self.namespaces)
+            if len(self._unqnames) < QNAMES_CACHE_SIZE:
+                self._unqnames[qname] = name
+            return name
         else:
             namespaces = self.namespaces
 
+        return self._unmap_qname(qname, namespaces, name_table)
+
+    def _unmap_qname(self, qname: str,
+                     namespaces: MutableMapping[str, str],
+                     name_table: Optional[Container[Optional[str]]] = None) -> str:
+        if not self._use_namespaces:
+            return local_name(qname) if self.strip_namespaces else qname
+
         try:
             if qname[0] == '{' or not namespaces:
                 return qname
@@ -343,6 +379,66 @@ class NamespaceMapper(MutableMapping[str, str]):
             else:
                 return f'{{{uri}}}{name}' if uri else name
 
+    def _reset_version(self) -> None:
+        """Sets a new version for the namespace map, with empty QName memos."""
+        self._ns_version = _next_version()
+        self._qnames = {}
+        self._unqnames = {}
+
+    def _push_context(self, obj: Any, level: int, xmlns: list[tuple[str, str]]) -> None:
+        namespaces = self.namespaces
+        reverse = self._reverse
+        saved_reverse: list[tuple[str, Optional[str]]] = []
+
+        saved_namespaces = tuple((k, namespaces.get(k)) for k, _ in xmlns)
+        if level:
+            for prefix, uri in xmlns:
+                saved_reverse.append((uri, reverse.get(uri)))
+                reverse[uri] = prefix and prefix + ':'
+        else:
+            for prefix, uri in reversed(xmlns):
+                if uri not in reverse:
+                    saved_reverse.append((uri, None))
+                    reverse[uri] = prefix and prefix + ':'
+        namespaces.update(xmlns)
+
+        self._xmlns_contexts.append(NamespaceMapperContext(
+            obj, level, xmlns, saved_namespaces, tuple(saved_reverse),
+            self._ns_version, self._qnames, self._unqnames
+        ))
+
+        # The same declarations in the same namespace context produce the same
+        # state, so version and QName memos are shared, e.g. between siblings.
+        key = (self._ns_version, not level, tuple(xmlns))
+        try:
+            self._ns_version, self._qnames, self._unqnames = self._xmlns_scopes[key]
+        except KeyError:
+            if len(self._xmlns_scopes) >= XMLNS_SCOPES_CACHE_SIZE:
+                self._xmlns_scopes.clear()
+            self._reset_version()
+            self._xmlns_scopes[key] = self._ns_version, self._qnames, self._unqnames
+
+    def _restore_context(self, context: NamespaceMapperContext) -> None:
+        for maps, saved in ((self.namespaces, context.namespaces),
+                            (self._reverse, context.reverse)):
+            for key, value in reversed(saved):
+                if value is None:
+                    maps.pop(key, None)
+                else:
+                    maps[key] = value
+
+        self._ns_version = context.version
+        self._qnames = context.qnames
+        self._unqnames = context.unqnames
+
+    def _save_entries(self, prefix: str, uri: str) -> None:
+        # Saves the entries changed by a direct update within a stacked context
+        context = self._xmlns_contexts[-1]
+        self._xmlns_contexts[-1] = context._replace(
+            namespaces=context.namespaces + ((prefix, self.namespaces.get(prefix)),),
+            reverse=context.reverse + ((uri, self._reverse.get(uri)),),
+        )
+
 
 CT = TypeVar('CT', bound=Union['XsdComponent', set['XsdElement']])
 
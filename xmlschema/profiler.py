@@ -0,0 +1,407 @@
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Opt-in instrumentation for measuring where time goes during schema builds
+and during the validation or the decoding of XML instances.
+"""
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from types import TracebackType
+from typing import Any, ContextManager, Optional
+
+from xmlschema.exceptions import XMLSchemaRuntimeError
+from xmlschema.names import XSD_NAMESPACE
+from xmlschema.utils.qnames import local_name
+
+__all__ = ['PhaseStats', 'PhaseRecord', 'BuildProfiler', 'profile_phase',
+           'ComponentStats', 'DecodeProfiler', 'get_decode_profiler']
+
+_NULL_CONTEXT: ContextManager[None] = nullcontext()
+
+_active_build_profiler: ContextVar[Optional['BuildProfiler']] = \
+    ContextVar('_active_build_profiler', default=None)
+
+
+@dataclass
+class PhaseStats:
+    """Cumulative statistics of a profiled phase."""
+    count: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+
+    def add(self, wall: float, cpu: float) -> None:
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+
+
+class PhaseRecord:
+    """
+    A running phase. Times are exclusive: the time spent in nested
+    phases is not accounted to the enclosing phase.
+    """
+    __slots__ = ('name', 'source', 'wall', 'cpu', '_wall_start', '_cpu_start')
+
+    def __init__(self, name: str, source: Optional[str] = None) -> None:
+        self.name = name
+        self.source = source
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.resume()
+
+    def pause(self) -> None:
+        self.wall += time.perf_counter() - self._wall_start
+        self.cpu += time.thread_time() - self._cpu_start
+
+    def resume(self) -> None:
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+
+
+class BuildProfiler:
+    """
+    A context manager that collects wall and CPU times, with counts, of the schema
+    build phases executed in its context. Statistics are collected per phase and
+    per schema source. Usage example::
+
+        with BuildProfiler() as profiler:
+            schema = XMLSchema('collection.xsd')
+        report = profiler.format_report()
+    """
+    phases: dict[str, PhaseStats]
+    sources: dict[str, dict[str, PhaseStats]]
+
+    def __init__(self) -> None:
+        self.phases = {}
+        self.sources = {}
+        self.elapsed = 0.0
+        self._stack: list[PhaseRecord] = []
+        self._token: Any = None
+        self._start = 0.0
+
+    def __repr__(self) -> str:
+        return '%s(phases=%d, elapsed=%f)' % (
+            self.__class__.__name__, len(self.phases), self.elapsed
+        )
+
+    def __enter__(self) -> 'BuildProfiler':
+        if self._token is not None:
+            raise XMLSchemaRuntimeError(f"{self!r} is already active")
+        self._token = _active_build_profiler.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:
+        self.elapsed += time.perf_counter() - self._start
+        _active_build_profiler.reset(self._token)
+        self._token = None
+
+    @contextmanager
+    def phase(self, name: str, source: Optional[str] = None) -> Iterator[PhaseRecord]:
+        """Profiles a phase, with an optional source name."""
+        if self._stack:
+            parent = self._stack[-1]
+            parent.pause()
+            if source is None:
+                source = parent.source
+        else:
+            parent = None
+
+        record = PhaseRecord(name, source)
+        self._stack.append(record)
+        try:
+            yield record
+        finally:
+            record.pause()
+            self._stack.pop()
+            self._add(record)
+            if parent is not None:
+                parent.resume()
+
+    def _add(self, record: PhaseRecord) -> None:
+        try:
+            self.phases[record.name].add(record.wall, record.cpu)
+        except KeyError:
+            self.phases[record.name] = PhaseStats(1, record.wall, record.cpu)
+
+        source = record.source or ''
+        try:
+            stats = self.sources[source]
+        except KeyError:
+            stats = self.sources[source] = {}
+
+        try:
+            stats[record.name].add(record.wall, record.cpu)
+        except KeyError:
+            stats[record.name] = PhaseStats(1, record.wall, record.cpu)
+
+    def clear(self) -> None:
+        self.phases.clear()
+        self.sources.clear()
+        self.elapsed = 0.0
+
+    def report(self) -> dict[str, Any]:
+        """Returns a structured report, suitable for JSON serialization."""
+        return {
+            'elapsed': self.elapsed,
+            'phases': {k: asdict(v) for k, v in self.phases.items()},
+            'sources': {
+                src: {k: asdict(v) for k, v in stats.items()}
+                for src, stats in self.sources.items()
+            },
+        }
+
+    def format_report(self, max_sources: Optional[int] = None) -> str:
+        """
+        Returns a printable report, with phases and sources ordered by wall time.
+
+        :param max_sources: limits the number of reported sources to the slowest ones.
+        """
+        def format_table(phases: dict[str, PhaseStats]) -> list[str]:
+            total = sum(s.wall for s in phases.values()) or 1.0
+            return [
+                f'  {name:<24} {s.count:>7} {s.wall:>11.6f} {s.cpu:>11.6f} '
+                f'{100.0 * s.wall / total:>6.1f}%'
+                for name, s in sorted(phases.items(), key=lambda x: -x[1].wall)
+            ]
+
+        header = f'  {"phase":<24} {"count":>7} {"wall (s)":>11} {"cpu (s)":>11} {"wall %":>7}'
+        lines = [f'Schema build profile (elapsed {self.elapsed:.6f} s)', header]
+        lines.extend(format_table(self.phases))
+
+        sources = sorted(
+            self.sources.items(), key=lambda x: -sum(s.wall for s in x[1].values())
+        )
+        if max_sources is not None:
+            sources = sources[:max_sources]
+
+        for source, phases in sources:
+            lines.append('')
+            lines.append(f'Source {source or "<unknown>"}')
+            lines.append(header)
+            lines.extend(format_table(phases))
+
+        return '\n'.join(lines)
+
+
+def profile_phase(name: str, source: Optional[str] = None) \
+        -> ContextManager[Optional[PhaseRecord]]:
+    """
+    Returns a context manager that profiles a schema build phase if a
+    :class:`BuildProfiler` is active, a no-op context manager otherwise.
+    """
+    profiler = _active_build_profiler.get()
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.phase(name, source)
+
+
+@dataclass
+class ComponentStats:
+    """
+    Cumulative statistics of a profiled XSD component at an instance path.
+    The *cumulative* time includes the time spent in nested profiled
+    components, the *exclusive* time doesn't.
+    """
+    component: str
+    path: str
+    count: int = 0
+    cumulative: float = 0.0
+    exclusive: float = 0.0
+
+
+_active_decode_profiler: ContextVar[Optional['DecodeProfiler']] = \
+    ContextVar('_active_decode_profiler', default=None)
+
+
+def get_decode_profiler() -> Optional['DecodeProfiler']:
+    """
+    Returns the active :class:`DecodeProfiler`, `None` if no decode profiler
+    is active. Validation contexts are bound to the profiler at creation.
+    """
+    return _active_decode_profiler.get()
+
+
+class DecodeProfiler:
+    """
+    A context manager that collects call counts and times of the XSD components
+    used for validating or decoding XML instances in its context. Statistics are
+    collected per component and per instance path. The validation contexts
+    created in the profiler's context are bound to it, so only the decoding
+    calls of XSD elements, model groups, attribute groups, atomic types and
+    assertions of those contexts are profiled, and when profiling is disabled
+    the cost is a check of the context. Usage example::
+
+        with DecodeProfiler() as profiler:
+            schema.validate('collection.xml')
+        report = profiler.format_report(max_items=10)
+    """
+    stats: dict[tuple[int, str], ComponentStats]
+
+    def __init__(self) -> None:
+        self.stats = {}
+        self.elapsed = 0.0
+        self._labels: dict[int, tuple[Any, str]] = {}  # keeps the ids valid
+        self._frames: list[list[Any]] = []
+        self._pending: Any = None  # a component entered and not yet called
+        self._paths: list[tuple[Any, str]] = [(None, '')]
+        self._token: Any = None
+        self._start = 0.0
+
+    def __repr__(self) -> str:
+        return '%s(components=%d, elapsed=%f)' % (
+            self.__class__.__name__, len(self.stats), self.elapsed
+        )
+
+    def __enter__(self) -> 'DecodeProfiler':
+        if self._token is not None:
+            raise XMLSchemaRuntimeError(f"{self!r} is already active")
+        self._token = _active_decode_profiler.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:
+        self.elapsed += time.perf_counter() - self._start
+        _active_decode_profiler.reset(self._token)
+        self._token = None
+
+    def enter(self, component: Any, elem: Any = None) -> bool:
+        """
+        Starts timing a component call, optionally entering an instance element.
+        Returns `False` for the call of the component that has just been entered,
+        that is the profiled call, `True` otherwise. Usage in a decoding method::
+
+            if context.profiler is not None and context.profiler.enter(self, obj):
+                try:
+                    return XsdElement.raw_decode(self, obj, validation, context)
+                finally:
+                    context.profiler.exit()
+        """
+        if self._pending is component:
+            self._pending = None
+            return False
+        elif elem is not None and elem is not self._paths[-1][0]:
+            path = f'{self._paths[-1][1]}/{local_name(elem.tag)}'
+            self._paths.append((elem, path))
+        else:
+            elem = None
+
+        self._pending = component
+        self._frames.append([component, elem, time.perf_counter(), 0.0])
+        return True
+
+    def exit(self) -> None:
+        """Stops timing the last entered component call."""
+        end = time.perf_counter()
+        component, elem, start, nested = self._frames.pop()
+        elapsed = end - start
+
+        key = id(component), self._paths[-1][1]
+        if elem is not None:
+            self._paths.pop()
+
+        try:
+            stats = self.stats[key]
+        except KeyError:
+            stats = self.stats[key] = ComponentStats(self._get_label(component), key[1])
+
+        stats.count += 1
+        stats.cumulative += elapsed
+        stats.exclusive += elapsed - nested
+        if self._frames:
+            self._frames[-1][3] += elapsed
+
+    def _get_label(self, component: Any) -> str:
+        try:
+            return self._labels[id(component)][1]
+        except KeyError:
+            pass
+
+        name = getattr(component, 'name', None)
+        if name is not None:
+            prefix = 'xs:' if component.target_namespace == XSD_NAMESPACE else ''
+            label = '%s(%s%s)' % (component.__class__.__name__, prefix, local_name(name))
+        else:
+            # Anonymous components are labeled also by the nearest named ancestor
+            label = repr(component)
+            parent = getattr(component, 'parent', None)
+            while parent is not None:
+                if parent.name is not None:
+                    label = f'{label} in {self._get_label(parent)}'
+                    break
+                parent = parent.parent
+
+        self._labels[id(component)] = component, label
+        return label
+
+    def clear(self) -> None:
+        self.stats.clear()
+        self._labels.clear()
+        self.elapsed = 0.0
+
+    def get_components(self) -> list[ComponentStats]:
+        """
+        Returns the statistics aggregated per component, regardless of the
+        instance path, ordered by exclusive time.
+        """
+        components: dict[int, ComponentStats] = {}
+        for (key, _path), stats in self.stats.items():
+            try:
+                item = components[key]
+            except KeyError:
+                item = components[key] = ComponentStats(stats.component, '')
+            item.count += stats.count
+            item.cumulative += stats.cumulative
+            item.exclusive += stats.exclusive
+        return sorted(components.values(), key=lambda x: -x.exclusive)
+
+    def report(self) -> dict[str, Any]:
+        """Returns a structured report, suitable for JSON serialization."""
+        return {
+            'elapsed': self.elapsed,
+            'components': [asdict(s) for s in self.get_components()],
+            'paths': [
+                asdict(s) for s in sorted(self.stats.values(), key=lambda x: -x.exclusive)
+            ],
+        }
+
+    def format_report(self, max_items: Optional[int] = None, by_path: bool = False) -> str:
+        """
+        Returns a printable report, with the hottest components ordered by exclusive time.
+
+        :param max_items: limits the number of reported items to the slowest ones.
+        :param by_path: if `True` reports statistics per component and instance path.
+        """
+        if by_path:
+            items = sorted(self.stats.values(), key=lambda x: -x.exclusive)
+        else:
+            items = self.get_components()
+
+        if max_items is not None:
+            items = items[:max_items]
+
+        total = sum(s.exclusive for s in self.stats.values()) or 1.0
+        lines = [
+            f'Decode profile (elapsed {self.elapsed:.6f} s)',
+            f'  {"count":>9} {"cumul (s)":>11} {"excl (s)":>11} {"excl %":>7}  component',
+        ]
+        for s in items:
+            line = f'  {s.count:>9} {s.cumulative:>11.6f} {s.exclusive:>11.6f} ' \
+                   f'{100.0 * s.exclusive / total:>6.1f}%  {s.component}'
+            lines.append(f'{line} at {s.path or "/"}' if by_path else line)
+
+        return '\n'.join(lines)
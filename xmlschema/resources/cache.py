@@ -0,0 +1,342 @@
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union, cast
+from urllib.error import HTTPError, URLError
+from urllib.request import OpenerDirector, Request, urlopen
+
+from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError, \
+    XMLResourceOSError
+from xmlschema.translation import gettext as _
+from xmlschema.arguments import Option
+from xmlschema.utils.urls import is_remote_url
+
+logger = logging.getLogger('xmlschema')
+
+MAX_AGE_PATTERN = re.compile(r'\bmax-age\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+@dataclass
+class CacheEntry:
+    """Metadata of a cached remote resource."""
+    url: str
+    digest: str
+    size: int
+    fetched: float
+    accessed: float
+    expires: Optional[float] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Returns `True` if the entry can be served without revalidation."""
+        if self.expires is None:
+            return False
+        return (time.time() if now is None else now) < self.expires
+
+
+class ResourceCache:
+    """
+    A local content-addressed cache for remote XML resources. Cached data is
+    stored in the *objects* subdirectory, named by the SHA-256 digest of the
+    content, and the metadata of each cached URL is stored as JSON in the
+    *index* subdirectory. All the writes are atomic, so a cache directory
+    can be shared between processes.
+
+    :param directory: the path of the cache directory, created if missing.
+    :param max_size: an optional maximum size in bytes for cached data. When \
+    exceeded the least recently accessed entries are evicted.
+    :param max_age: an optional freshness lifetime in seconds that overrides \
+    the one provided by *Cache-Control* or *Expires* HTTP headers. Stale entries \
+    are revalidated with conditional requests using *ETag* and *Last-Modified*.
+    :param offline: if `True` the network is never accessed and only already \
+    cached resources can be opened.
+    """
+    orphan_grace_time = 60.0
+    """Seconds before a data object without index entries can be evicted."""
+
+    def __init__(self, directory: Union[str, Path],
+                 max_size: Optional[int] = None,
+                 max_age: Optional[int] = None,
+                 offline: bool = False) -> None:
+
+        if max_size is not None and max_size < 0:
+            raise XMLSchemaValueError(_("'max_size' must be a non-negative integer"))
+        if max_age is not None and max_age < 0:
+            raise XMLSchemaValueError(_("'max_age' must be a non-negative integer"))
+
+        self.directory = Path(directory).absolute()
+        self.max_size = max_size
+        self.max_age = max_age
+        self.offline = offline
+
+        self._objects_dir = self.directory.joinpath('objects')
+        self._index_dir = self.directory.joinpath('index')
+        self._objects_dir.mkdir(parents=True, exist_ok=True)
+        self._index_dir.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return '%s(directory=%r)' % (self.__class__.__name__, str(self.directory))
+
+    def __contains__(self, url: str) -> bool:
+        return self.get_entry(url) is not None
+
+    @property
+    def size(self) -> int:
+        """The total size in bytes of the cached data."""
+        return sum(p.stat().st_size for p in self._objects_dir.iterdir() if p.is_file())
+
+    def get_entry(self, url: str) -> Optional[CacheEntry]:
+        """Returns the cache entry of the URL, `None` if the URL is not cached."""
+        try:
+            with self._get_index_path(url).open(encoding='utf-8') as fp:
+                entry = CacheEntry(**json.load(fp))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        if entry.url != url or not self._objects_dir.joinpath(entry.digest).is_file():
+            return None
+        return entry
+
+    def open(self, url: str,
+             opener: Optional[OpenerDirector] = None,
+             timeout: int = 300) -> BinaryIO:
+        """
+        Returns a binary file object for the URL, fetching the remote data
+        only if it's not cached or if the cached entry is stale and has been
+        changed on the server.
+
+        :param url: the URL of the resource.
+        :param opener: an optional :class:`OpenerDirector` to use for requests.
+        :param timeout: the timeout in seconds for the connection attempt.
+        """
+        if not is_remote_url(url):
+            raise XMLSchemaValueError(_("{!r} is not a remote URL").format(url))
+
+        entry = self.get_entry(url)
+        if entry is not None:
+            if self.offline or entry.is_fresh():
+                logger.debug("Serve %r from cache %r", url, self)
+                return self._open_entry(entry)
+        elif self.offline:
+            msg = _("can't access to resource {!r}: not cached and offline mode is set")
+            raise XMLResourceOSError(msg.format(url))
+
+        request = Request(url)
+        if entry is not None:
+            if entry.etag is not None:
+                request.add_header('If-None-Match', entry.etag)
+            if entry.last_modified is not None:
+                request.add_header('If-Modified-Since', entry.last_modified)
+
+        try:
+            if opener is not None:
+                response = opener.open(request, timeout=timeout)
+            else:
+                response = urlopen(request, timeout=timeout)
+        except HTTPError as err:
+            if err.code == 304 and entry is not None:
+                logger.debug("Cached resource %r is not modified", url)
+                self._update_entry(entry, err.headers)
+                return self._open_entry(entry)
+            msg = _("can't access to resource {!r}: {}").format(url, err.reason)
+            raise XMLResourceOSError(msg)
+        except (URLError, OSError) as err:
+            if entry is not None:
+                logger.warning("Serve stale resource %r from cache: %s", url, err)
+                return self._open_entry(entry)
+            reason = getattr(err, 'reason', err)
+            msg = _("can't access to resource {!r}: {}").format(url, reason)
+            raise XMLResourceOSError(msg)
+
+        with response:
+            data = response.read()
+            headers = response.headers
+
+        if 'no-store' in (headers.get('Cache-Control') or '').lower():
+            return self._temporary_file(data)
+
+        entry = self.store(url, data, headers)
+        try:
+            return self._open_entry(entry)
+        except FileNotFoundError:
+            # The data exceeds the cache size or has been evicted by another process
+            return self._temporary_file(data)
+
+    def store(self, url: str, data: bytes, headers: Any = None) -> CacheEntry:
+        """
+        Stores data for a URL into the cache and returns the new entry.
+
+        :param url: the URL of the resource.
+        :param data: the resource data.
+        :param headers: optional HTTP headers of the response.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._objects_dir.joinpath(digest)
+        try:
+            os.utime(path)  # protects the object from evictions of other processes
+        except OSError:
+            self._atomic_write(path, data)
+
+        now = time.time()
+        entry = CacheEntry(url, digest, len(data), fetched=now, accessed=now)
+        self._update_entry(entry, headers, now)
+
+        if self.max_size is not None:
+            self.evict(self.max_size)
+        return entry
+
+    def evict(self, max_size: int = 0) -> None:
+        """
+        Evicts the least recently accessed entries until the size of the cached
+        data is less or equal to *max_size*. Unreferenced data objects are removed,
+        except the ones written in the last *orphan_grace_time* seconds, that could
+        be still waiting for the index entry of a concurrent store.
+
+        :param max_size: the target size in bytes, for default clears the cache.
+        """
+        start = time.time()
+        entries = []
+        for path in self._index_dir.glob('*.json'):
+            try:
+                with path.open(encoding='utf-8') as fp:
+                    entries.append((path, CacheEntry(**json.load(fp))))
+            except (OSError, ValueError, TypeError):
+                self._unlink(path)
+
+        entries.sort(key=lambda x: x[1].accessed)
+        sizes = {}
+        for _path, entry in entries:
+            sizes[entry.digest] = entry.size
+        size = sum(sizes.values())
+
+        referenced = {entry.digest for _path, entry in entries}
+        evicted = set()
+        while entries and size > max_size:
+            path, entry = entries.pop(0)
+            self._unlink(path)
+            if all(e.digest != entry.digest for _path, e in entries):
+                referenced.discard(entry.digest)
+                evicted.add(entry.digest)
+                size -= entry.size
+
+        # Objects written or reused by a concurrent store are kept
+        orphans_mtime = start - self.orphan_grace_time
+        for path in self._objects_dir.iterdir():
+            if path.name not in referenced and not path.name.startswith('.'):
+                try:
+                    mtime = path.stat().st_mtime
+                    if mtime < (start if path.name in evicted else orphans_mtime):
+                        path.unlink()
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        """Removes all the entries and the data from the cache."""
+        self.evict(0)
+        for path in self._objects_dir.iterdir():
+            if not path.name.startswith('.'):
+                self._unlink(path)
+
+    ###
+    # Protected helper methods
+
+    def _get_index_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self._index_dir.joinpath(f'{key}.json')
+
+    def _open_entry(self, entry: CacheEntry) -> BinaryIO:
+        fp = self._objects_dir.joinpath(entry.digest).open('rb')
+        entry.accessed = time.time()
+        self._write_entry(entry)
+        return fp
+
+    def _update_entry(self, entry: CacheEntry, headers: Any,
+                      now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.time()
+
+        if headers is not None:
+            if etag := headers.get('ETag'):
+                entry.etag = etag
+            if last_modified := headers.get('Last-Modified'):
+                entry.last_modified = last_modified
+
+        entry.expires = self._get_expires(headers, now)
+        self._write_entry(entry)
+
+    def _get_expires(self, headers: Any, now: float) -> Optional[float]:
+        if self.max_age is not None:
+            return now + self.max_age
+        elif headers is None:
+            return None
+
+        cache_control = (headers.get('Cache-Control') or '').lower()
+        if 'no-cache' in cache_control:
+            return None
+        elif (match := MAX_AGE_PATTERN.search(cache_control)) is not None:
+            return now + int(match.group(1))
+        elif expires := headers.get('Expires'):
+            try:
+                return float(parsedate_to_datetime(expires).timestamp())
+            except (TypeError, ValueError):
+                return None
+        return None
+
+    def _write_entry(self, entry: CacheEntry) -> None:
+        data = json.dumps(asdict(entry)).encode('utf-8')
+        try:
+            self._atomic_write(self._get_index_path(entry.url), data)
+        except OSError as err:
+            logger.warning("Can't update cache entry for %r: %s", entry.url, err)
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix='.', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._unlink(Path(tmp_path))
+            raise
+
+    @staticmethod
+    def _temporary_file(data: bytes) -> BinaryIO:
+        fp = tempfile.TemporaryFile()
+        fp.write(data)
+        fp.seek(0)
+        return cast(BinaryIO, fp)
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class ResourceCacheOption(Option[Optional[ResourceCache]]):
+    def validated_value(self, value: Any) -> Optional[ResourceCache]:
+        if value is None or isinstance(value, ResourceCache):
+            return value
+        elif isinstance(value, (str, Path)):
+            return ResourceCache(value)
+
+        msg = _("invalid type {!r} for {}, must be None, a path or a {!r} instance")
+        raise XMLSchemaTypeError(msg.format(type(value), self, ResourceCache))
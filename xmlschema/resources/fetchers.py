@@ -7,19 +7,22 @@
 #
 # @author Davide Brunato <brunato@sissa.it>
 #
-from typing import Any, Optional, Union
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union, cast
 from urllib.request import urlopen
 
 from xmlschema.names import XSD_NAMESPACE
 from xmlschema.aliases import NsmapType, NormalizedLocationsType, \
     LocationsType, XMLSourceType, UriMapperType
 from xmlschema.exceptions import XMLResourceError, XMLResourceOSError, XMLSchemaValueError
-from xmlschema.utils.urls import normalize_url
+from xmlschema.utils.urls import normalize_url, is_remote_url
 
+from .cache import ResourceCache
 from .xml_resource import XMLResource
 
 
-def fetch_resource(location: str, base_url: Optional[str] = None, timeout: int = 30) -> str:
+def fetch_resource(location: str, base_url: Optional[str] = None, timeout: int = 30,
+                   cache: Union[None, str, Path, ResourceCache] = None) -> str:
     """
     Fetches a resource by trying to access it. If the resource is accessible
     returns its normalized URL, otherwise raises an `XMLResourceOSError`.
@@ -27,14 +30,27 @@ def fetch_resource(location: str, base_url: Optional[str] = None, timeout: int =
     :param location: a URL or a file path.
     :param base_url: reference base URL for normalizing local and relative URLs.
     :param timeout: the timeout in seconds for the connection attempt in case of remote data.
+    :param cache: an optional :class:`ResourceCache` instance or a directory path, \
+    used for accessing remote resources through a local cache.
     :return: a normalized URL.
     """
+    def open_url(url_: str) -> BinaryIO:
+        if resource_cache is not None and is_remote_url(url_):
+            return resource_cache.open(url_, timeout=timeout)
+        return cast(BinaryIO, urlopen(url_, timeout=timeout))
+
     if not location:
         raise XMLSchemaValueError("the 'location' argument must contain a not empty string")
 
+    resource_cache: Optional[ResourceCache]
+    if cache is None or isinstance(cache, ResourceCache):
+        resource_cache = cache
+    else:
+        resource_cache = ResourceCache(cache)
+
     url = normalize_url(location, base_url)
     try:
-        with urlopen(url, timeout=timeout):
+        with open_url(url):
             return url
     except OSError as err:
         if url == normalize_url(location):
@@ -43,7 +59,7 @@ def fetch_resource(location: str, base_url: Optional[str] = None, timeout: int =
         # fallback using the location without a base URL
         alt_url = normalize_url(location)
         try:
-            with urlopen(alt_url, timeout=timeout):
+            with open_url(alt_url):
                 return alt_url
         except OSError:
             raise XMLResourceOSError(err) from err
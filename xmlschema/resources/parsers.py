@@ -54,8 +54,7 @@ def generic_iterparse(fp: IOType,
     :param fp: an open file-like object to read from.
     :param events: an optional sequence of events to filter on.
     :param filter_fn: a function that takes the root element, the \
-    current element and an optional list of ancestors elements and \
-    returns a boolean.
+    current element and the list of its ancestors and returns a boolean.
     :param clear_fn: a function that takes the root element, the \
     current element and an optional list of ancestors elements.
     :param ancestors: an optional sequence of ancestors to track.
@@ -74,6 +73,9 @@ def generic_iterparse(fp: IOType,
     if clear_fn is None:
         clear_fn = no_cleanup
 
+    # The ancestors at filter depth are tracked also if not requested, because
+    # the elements after the current one could be already added to the tree.
+    parents: list[ElementType] = [] if ancestors is None else ancestors
     level = 0
     stop_node: Any = None
     root: Any = None
@@ -88,18 +90,20 @@ def generic_iterparse(fp: IOType,
             if event == 'end':
                 level -= 1
                 if level < depth:
-                    if ancestors is not None:
-                        ancestors.pop()
+                    parents.pop()
                 elif level == depth and stop_node is node:
                     stop_node = None
                     clear_fn(root, node, ancestors)
+                    continue
+
+                if stop_node is None:
+                    yield event, node
             elif event == 'start':
                 if level < depth:
                     if not level:
                         root = node
-                    if ancestors is not None:
-                        ancestors.append(node)
-                elif level == depth and not filter_fn(root, node, ancestors):
+                    parents.append(node)
+                elif level == depth and not filter_fn(root, node, parents):
                     stop_node = node
                     level += 1
                     continue
@@ -126,14 +130,22 @@ def iterfind_parser(path: str,
     def filter_fn(r: ElementType, e: ElementType, a: AncestorsType) -> bool:
         return selector.select_all or e in selector.iter_select(r)
 
-    return partial(
-        generic_iterparse,
-        filter_fn=filter_fn,
-        clear_fn=clear_elem,
-        ancestors=ancestors,
-        depth=selector.depth,
-        limit=limit
-    )
+    def iterparse(fp: IOType, events: Optional[Sequence[str]] = None) \
+            -> Iterator[tuple[str, Any]]:
+        # A stream filter keeps counters for positions, so it's created for each parsing
+        stream_filter = None if selector.select_all else selector.get_stream_filter()
+
+        return generic_iterparse(
+            fp,
+            events,
+            filter_fn=filter_fn if stream_filter is None else stream_filter,
+            clear_fn=clear_elem,
+            ancestors=ancestors,
+            depth=selector.depth,
+            limit=limit
+        )
+
+    return iterparse
 
 
 def limited_parser(limit: int,
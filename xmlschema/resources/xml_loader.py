@@ -14,8 +14,7 @@ from threading import Lock, RLock
 from typing import cast, Any, Optional, Union
 from xml.etree import ElementTree
 
-from elementpath import ElementNode, LazyElementNode, DocumentNode, \
-    build_lxml_node_tree, build_node_tree
+from elementpath import ElementNode, LazyElementNode, DocumentNode, build_lxml_node_tree
 from elementpath.protocols import LxmlElementProtocol
 
 from xmlschema.aliases import ElementType, ElementTreeType, \
@@ -26,6 +25,8 @@ from xmlschema.utils.qnames import get_namespace
 from xmlschema.arguments import BooleanOption, LazyOption, IterParseOption
 from xmlschema import _limits
 
+from .xpath_nodes import ResourceElementNode, build_resource_node_tree
+
 LazyLockType = RLock if platform.python_implementation() == 'PyPy' else Lock
 
 
@@ -148,21 +149,8 @@ class XMLResourceLoader:
             elif hasattr(self.root, 'xpath'):
                 self._xpath_root = build_lxml_node_tree(cast(LxmlElementProtocol, self.root))
             else:
-                try:
-                    _nsmap = self._nsmaps[self.root]
-                except KeyError:
-                    # A resource based on an ElementTree structure (no namespace maps)
-                    self._xpath_root = build_node_tree(self.root)
-                else:
-                    node_tree = build_node_tree(self.root, _nsmap)
-
-                    # Update namespace maps
-                    for node in node_tree.iter_descendants(with_self=False):
-                        if isinstance(node, ElementNode):
-                            nsmap = self._nsmaps[cast(ElementType, node.obj)]
-                            node.nsmap = {k or '': v for k, v in nsmap.items()}
-
-                    self._xpath_root = node_tree
+                # Child nodes are created on demand, sharing the namespace maps
+                self._xpath_root = build_resource_node_tree(self.root, self._nsmaps)
 
         return self._xpath_root
 
@@ -198,6 +186,24 @@ class XMLResourceLoader:
         xpath_node = self.xpath_root.get_element_node(elem)
         if isinstance(xpath_node, ElementNode):
             return xpath_node
+        elif not self._lazy and isinstance(self._xpath_root, ResourceElementNode):
+            # Create the nodes on the path from the nearest created ancestor
+            elements = self._xpath_root.tree.elements
+            path = []
+            parent: Optional[ElementType] = elem
+            while parent is not None and parent not in elements:
+                path.append(parent)
+                parent = self.parent_map.get(parent)
+
+            if parent is not None:
+                for e in reversed(path):
+                    node = elements[parent]
+                    if isinstance(node, ResourceElementNode):
+                        next(iter(node), None)
+                    parent = e
+                xpath_node = elements.get(elem)
+                if isinstance(xpath_node, ElementNode):
+                    return xpath_node
 
         try:
             return LazyElementNode(elem, nsmap=self._nsmaps[elem])
@@ -15,7 +15,7 @@ from collections.abc import Iterator, MutableMapping
 from io import StringIO, BytesIO
 from pathlib import Path
 from types import TracebackType
-from typing import cast, Any, Optional, Union
+from typing import cast, Any, IO, Optional, Union
 from urllib.request import urlopen, OpenerDirector
 from urllib.parse import urlsplit, unquote
 from urllib.error import URLError
@@ -27,7 +27,8 @@ from xmlschema.aliases import SettingsType, ElementType, EtreeType, NsmapType, \
 from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError, \
     XMLResourceError, XMLResourceOSError, XMLResourceBlocked
 from xmlschema.utils.paths import LocationPath
-from xmlschema.utils.etree import is_etree_element, etree_tostring, iter_schema_location_hints
+from xmlschema.utils.etree import is_etree_element, etree_tostring, \
+    iter_schema_location_hints, XmlStreamWriter
 from xmlschema.utils.misc import iter_class_slots
 from xmlschema.utils.streams import is_file_object
 from xmlschema.utils.qnames import update_namespaces, get_namespace_map
@@ -40,6 +41,7 @@ from xmlschema.arguments import Argument, SourceArgument, BaseUrlOption, \
 
 from .sax import defuse_xml
 from .xml_loader import XMLResourceLoader
+from .cache import ResourceCache, ResourceCacheOption
 
 
 class XMLResourceManager:
@@ -98,6 +100,8 @@ class XMLResource(XMLResourceLoader):
     for building the XML tree. For default that callable is *ElementTree.iterparse*, \
     provide *lxml.etree.iterparse* to build lxml trees or another callable if a \
     different parsing of your data.
+    :param cache: an optional :class:`ResourceCache` instance or a directory path, \
+    used for serving remote resources from a local cache.
     """
     # Descriptor-based attributes for arguments
     source = SourceArgument()
@@ -110,6 +114,7 @@ class XMLResource(XMLResourceLoader):
     uri_mapper = UriMapperOption(default=None)
     opener = OpenerOption(default=None)
     selector = SelectorOption(default=ElementSelector)
+    cache = ResourceCacheOption(default=None)
 
     # Private attributes for arguments
     _source: XMLSourceType
@@ -121,6 +126,7 @@ class XMLResource(XMLResourceLoader):
     _uri_mapper: Optional[UriMapperType]
     _opener: Optional[OpenerDirector]
     _selector: type[ElementSelector]
+    _cache: Optional[ResourceCache]
 
     text: Optional[str] = None
     """The XML text source, `None` if it's not loaded or available."""
@@ -161,7 +167,8 @@ class XMLResource(XMLResourceLoader):
                  uri_mapper: Optional[UriMapperType] = None,
                  opener: Optional[OpenerDirector] = None,
                  iterparse: Optional[IterParseType] = None,
-                 selector: Optional[type[ElementSelector]] = None) -> None:
+                 selector: Optional[type[ElementSelector]] = None,
+                 cache: Union[None, str, Path, ResourceCache] = None) -> None:
 
         if allow == 'sandbox' and base_url is None:
             if not is_local_url(source):
@@ -180,6 +187,7 @@ class XMLResource(XMLResourceLoader):
         self.uri_mapper = uri_mapper
         self.opener = opener
         self.selector = selector
+        self.cache = cache
         self.source = source
 
         if is_url(source):
@@ -361,7 +369,7 @@ class XMLResource(XMLResourceLoader):
 
     def tostring(self, namespaces: Optional[MutableMapping[str, str]] = None,
                  indent: str = '', max_lines: Optional[int] = None,
-                 spaces_for_tab: int = 4, xml_declaration: bool = False,
+                 spaces_for_tab: Optional[int] = 4, xml_declaration: bool = False,
                  encoding: str = 'unicode', method: str = 'xml') -> str:
         """
         Serialize an XML resource to a string.
@@ -400,6 +408,128 @@ class XMLResource(XMLResourceLoader):
             return _string.decode('utf-8')
         return _string
 
+    def tofile(self, file: Union[str, Path, IO[str], IO[bytes]],
+               namespaces: Optional[MutableMapping[str, str]] = None,
+               encoding: str = 'us-ascii',
+               xml_declaration: bool = False,
+               spaces_for_tab: Optional[int] = 4) -> None:
+        """
+        Serialize an XML resource to a file, writing the data in chunks, without
+        building the whole serialized string. The output is the same of :meth:`tostring`
+        without indentation. A lazy resource is re-read from its source and its
+        elements are discarded after being written, but comments and processing
+        instructions are not included. Trees of lxml elements are serialized
+        with :meth:`tostring`.
+
+        :param file: a path or a file-like object, binary or text.
+        :param namespaces: is an optional mapping from namespace prefix to URI, \
+        for default the namespace declarations of the whole resource are used. \
+        Like for :meth:`tostring` only the namespaces used by tags and attribute \
+        names are declared, that for a lazy resource requires an additional \
+        parsing of the source.
+        :param encoding: the encoding of the output, "unicode" for writing \
+        text data to a path. Characters that can't be encoded are written as \
+        character references.
+        :param xml_declaration: if set to `True` writes the XML declaration at the \
+        start, if the encoding is not "unicode".
+        :param spaces_for_tab: number of spaces for replacing tab characters. For \
+        default tabs are replaced with 4 spaces, provide `None` to keep tab characters.
+        """
+        if isinstance(file, (str, Path)):
+            mode = 'w' if encoding == 'unicode' else 'wb'
+            with open(file, mode, encoding='utf-8' if mode == 'w' else None) as fp:
+                self._write(fp, namespaces, encoding, xml_declaration, spaces_for_tab)
+        elif is_file_object(file):
+            self._write(file, namespaces, encoding, xml_declaration, spaces_for_tab)
+        else:
+            msg = "unexpected type %r for 'file' argument"
+            raise XMLSchemaTypeError(msg % type(file))
+
+    def _write(self, file: Union[IO[str], IO[bytes]],
+               namespaces: Optional[MutableMapping[str, str]],
+               encoding: str,
+               xml_declaration: bool,
+               spaces_for_tab: Optional[int]) -> None:
+        if not self._lazy and hasattr(self.root, 'nsmap'):
+            data = self.tostring(namespaces, spaces_for_tab=spaces_for_tab,
+                                 xml_declaration=xml_declaration, encoding=encoding)
+            writer = XmlStreamWriter(file, encoding=encoding)
+            writer.write(data)
+            writer.close()
+            return
+        elif self._lazy:
+            declared, uris = self._get_lazy_namespaces()
+            if namespaces is None:
+                namespaces = declared
+        else:
+            uris = {name[1:].split('}')[0] for elem in self.root.iter()
+                    for name in (elem.tag, *elem.keys())
+                    if isinstance(name, str) and name[:1] == '{'}
+            if namespaces is None:
+                namespaces = self.get_namespaces(root_only=False)
+
+        # Like ElementTree's serializer declares only the namespaces that are used
+        namespaces = {k: v for k, v in namespaces.items() if v in uris}
+        writer = XmlStreamWriter(file, namespaces, encoding, xml_declaration,
+                                 spaces_for_tab=spaces_for_tab)
+        if not self._lazy:
+            writer.write_element(self.root)
+        else:
+            self._write_lazy(writer)
+        writer.close()
+
+    def _get_lazy_namespaces(self) -> tuple[dict[str, str], set[str]]:
+        # Like get_namespaces(root_only=False), pruning the tree while parsing.
+        # Returns also the namespace URIs used by the tags and the attributes.
+        namespaces: dict[str, str] = {}
+        uris: set[str] = set()
+        ancestors: list[ElementType] = []
+
+        with XMLResourceManager(self) as cm:
+            for event, node in self._iterparse(cm.fp, ('start-ns', 'start', 'end')):
+                if event == 'start-ns':
+                    update_namespaces(namespaces, [node], not ancestors)
+                elif event == 'start':
+                    ancestors.append(node)
+                    uris.update(name[1:].split('}')[0] for name in (node.tag, *node.keys())
+                                if name[:1] == '{')
+                else:
+                    ancestors.pop()
+                    if ancestors:
+                        ancestors[-1].remove(node)
+        return namespaces, uris
+
+    def _write_lazy(self, writer: XmlStreamWriter) -> None:
+        # The text and the tail of an element are complete at the next event
+        pending: Optional[ElementType] = None  # started, start tag not written
+        last: Optional[ElementType] = None  # ended, tail not written
+        ancestors: list[ElementType] = []
+
+        with XMLResourceManager(self) as cm:
+            for event, node in self._iterparse(cm.fp, ('start', 'end')):
+                if last is not None:
+                    writer.write_text(last.tail)
+                    if ancestors:
+                        ancestors[-1].remove(last)
+                    last = None
+
+                if pending is not None:
+                    if event == 'end':
+                        writer.write_element(node)  # an element without children
+                        ancestors.pop()
+                        pending, last = None, node
+                        continue
+                    writer.start(pending, pending.text)
+                    pending = None
+
+                if event == 'start':
+                    ancestors.append(node)
+                    pending = node
+                else:
+                    writer.end()
+                    ancestors.pop()
+                    last = node
+
     def subresource(self, elem: ElementType) -> 'XMLResource':
         """Create an XMLResource instance from a subelement of a non-lazy XML tree."""
         if self._lazy:
@@ -436,6 +566,8 @@ class XMLResource(XMLResourceLoader):
         before returning if to the caller.
         """
         def open_url(url: str) -> IOType:
+            if self._cache is not None and is_remote_url(url):
+                return cast(IOType, self._cache.open(url, self._opener, self._timeout))
             try:
                 if self._opener is not None:
                     return cast(IOType, self._opener.open(url, timeout=self._timeout))
@@ -697,28 +829,34 @@ class XMLResource(XMLResourceLoader):
         elif path_depth < lazy_depth:
             raise XMLSchemaValueError(f"can't use path {path!r} on a lazy resource "
                                       f"with lazy_depth=={lazy_depth}")
-        select_all = selector.select_all
+        if selector.select_all:
+            stream_filter = None
+        else:
+            stream_filter = selector.get_stream_filter()
         level = 0
 
         if ancestors is not None:
             ancestors.clear()
         elif self._thin_lazy:
             ancestors = []
+        parents: list[ElementType] = [] if ancestors is None else ancestors
 
         with XMLResourceManager(self) as cm:
             for event, node in self._lazy_iterparse(cm.fp):
                 if event == "start":
-                    if ancestors is not None and level < path_depth:
-                        ancestors.append(node)
+                    if level < path_depth:
+                        parents.append(node)
                     level += 1
                 else:
                     level -= 1
                     if level < path_depth:
-                        if ancestors is not None:
-                            ancestors.pop()
+                        parents.pop()
                         continue
                     elif level == path_depth:
-                        if select_all or node in selector.iter_select(self):
+                        if stream_filter is not None:
+                            if stream_filter(self.root, node, parents):
+                                yield node
+                        elif selector.select_all or node in selector.iter_select(self):
                             yield node
                     if level == lazy_depth:
                         self._clear(node, ancestors)
@@ -0,0 +1,179 @@
+#
+# Copyright (c), 2016-2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+XPath node trees of XML resources, materialized on demand.
+"""
+from collections.abc import Iterator
+from typing import Any, Optional
+
+from elementpath import LazyElementNode, TextNode, CommentNode, ProcessingInstructionNode
+from elementpath.xpath_nodes import XPathNodeTree
+
+from xmlschema.aliases import ElementType
+
+
+class ResourceNodeTree(XPathNodeTree):
+    """
+    The status of a node tree of an XML resource, shared between its nodes. Keeps
+    the namespace maps of the resource by reference and the positions of the nodes
+    in document order, that are computed at first access with a light pass on the
+    elements, without creating the nodes.
+    """
+    nsmaps: dict[ElementType, dict[str, str]]
+
+    __slots__ = ('nsmaps', '_positions', '_tails')
+
+    def __init__(self, root: 'ResourceElementNode',
+                 nsmaps: dict[ElementType, dict[str, str]],
+                 namespaces: Optional[dict[str, str]] = None) -> None:
+        super().__init__(root, namespaces=namespaces)
+        self.nsmaps = nsmaps
+        self._positions: Optional[dict[ElementType, int]] = None
+        self._tails: dict[ElementType, int] = {}
+
+    @property
+    def positions(self) -> dict[ElementType, int]:
+        """A map from the elements to the positions of their nodes."""
+        if self._positions is None:
+            self._positions, self._tails = self._get_positions()
+        return self._positions
+
+    def get_text_position(self, elem: ElementType) -> int:
+        """Returns the position of the text node of an element."""
+        return self.positions[elem] + self.ns_offset + len(elem.attrib)
+
+    def get_tail_position(self, elem: ElementType) -> int:
+        """Returns the position of the text node of the tail of an element."""
+        if self._positions is None:
+            self._positions, self._tails = self._get_positions()
+        return self._tails[elem]
+
+    @property
+    def ns_offset(self) -> int:
+        return len(self.namespaces) + int('xml' not in self.namespaces) + 1
+
+    def _get_positions(self) -> tuple[dict[ElementType, int], dict[ElementType, int]]:
+        # Numbers the nodes as elementpath.build_node_tree() does.
+        positions: dict[ElementType, int] = {}
+        tails: dict[ElementType, int] = {}
+        ns_offset = self.ns_offset
+
+        elem: Any = self.root_node.value
+        position = self.root_node.position
+        positions[elem] = position
+        position += ns_offset + len(elem.attrib)
+        if elem.text is not None:
+            position += 1
+
+        children: Iterator[Any] = iter(elem)
+        iterators: list[tuple[Iterator[Any], Any]] = []
+
+        while True:
+            for elem in children:
+                positions[elem] = position
+                if callable(elem.tag):
+                    position += 1
+                else:
+                    position += ns_offset + len(elem.attrib)
+                    if elem.text is not None:
+                        position += 1
+
+                if len(elem):
+                    iterators.append((children, elem))
+                    children = iter(elem)
+                    break
+
+                if elem.tail is not None:
+                    tails[elem] = position
+                    position += 1
+            else:
+                try:
+                    children, elem = iterators.pop()
+                except IndexError:
+                    return positions, tails
+
+                if elem.tail is not None:
+                    tails[elem] = position
+                    position += 1
+
+
+class ResourceElementNode(LazyElementNode):
+    """
+    An element node of an XML resource, whose child nodes are created when
+    the node is navigated. The nodes are registered in the tree's elements
+    map and have the positions and the namespace maps of a full tree.
+    """
+    tree: ResourceNodeTree
+
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self.children:
+            elem: Any = self.value
+            tree = self.tree
+            if elem.text is not None:
+                TextNode(elem.text, self, tree.get_text_position(elem))
+
+            if len(elem):
+                positions = tree.positions
+                nsmaps = tree.nsmaps
+                child: Any
+                for child in elem:
+                    if not callable(child.tag):
+                        ResourceElementNode(child, self, positions[child], nsmaps.get(child))
+                    elif child.tag.__name__ == 'Comment':
+                        CommentNode(child, self, positions[child])
+                    else:
+                        ProcessingInstructionNode(child, None, self, positions[child])
+
+                    if child.tail is not None:
+                        TextNode(child.tail, self, tree.get_tail_position(child))
+
+        return iter(self.children)
+
+    def iter_descendants(self, with_self: bool = True) -> Iterator[Any]:
+        if with_self:
+            yield self
+
+        child: Any
+        iterators: list[Iterator[Any]] = []
+        children: Iterator[Any] = iter(self)
+
+        while True:
+            for child in children:
+                yield child
+
+                if isinstance(child, ResourceElementNode) and \
+                        (child.children or len(child.value) or child.value.text is not None):
+                    iterators.append(children)
+                    children = iter(child)
+                    break
+            else:
+                try:
+                    children = iterators.pop()
+                except IndexError:
+                    return
+
+
+def build_resource_node_tree(root: ElementType,
+                             nsmaps: dict[ElementType, dict[str, str]]) \
+        -> ResourceElementNode:
+    """
+    Returns the root node of a tree of XPath nodes for a full XML resource,
+    whose descendant nodes are created on demand.
+
+    :param root: the root element of the XML resource.
+    :param nsmaps: the namespace maps of the elements of the resource.
+    """
+    namespaces = nsmaps.get(root)
+    root_node = ResourceElementNode(root, nsmap=namespaces)
+    root_node.tree = tree = ResourceNodeTree(root_node, nsmaps, namespaces)
+    tree.elements[root] = root_node
+    return root_node
@@ -20,12 +20,14 @@ from xmlschema.translation import gettext as _
 from xmlschema.arguments import BooleanOption, BaseUrlOption, AllowOption, \
     DefuseOption, LazyOption, BlockOption, UriMapperOption, IterParseOption, \
     SelectorOption, OpenerOption, PositiveIntOption, LocationsOption, \
-    ValidationOption, LogLevelOption
+    ValidationOption, LogLevelOption, SpillThresholdOption
 from xmlschema.utils.decoding import raw_encode_value, raw_encode_attributes
 from xmlschema.utils.etree import is_etree_element, is_etree_document
 from xmlschema.resources import XMLResource
+from xmlschema.resources.cache import ResourceCacheOption
 from xmlschema.converters import XMLSchemaConverter, ConverterOption, ConverterType
 from xmlschema.loaders import SchemaLoader, LoaderClassOption
+from xmlschema.trusted import DigestResource, TrustedSourcesOption
 from xmlschema.caching import SchemaCache
 from xmlschema.xpath import ElementSelector
 
@@ -106,6 +108,12 @@ class ResourceSettings:
     selector: SelectorOption = SelectorOption(default=ElementSelector)
     """The selector class to use for XPath element selectors."""
 
+    cache: ResourceCacheOption = ResourceCacheOption(default=None)
+    """
+    An optional :class:`ResourceCache` instance or a directory path, used for
+    serving repeated loads of remote resources from a local cache.
+    """
+
     _DEFAULT_SETTINGS = '_DEFAULT_RESOURCE_SETTINGS'
 
     @classmethod
@@ -194,6 +202,12 @@ class SchemaSettings(ResourceSettings):
     predefined meta-schemas.
     """
 
+    trusted_sources: TrustedSourcesOption = TrustedSourcesOption(default=None)
+    """
+    An optional :class:`xmlschema.TrustedSources` instance, or the path of a manifest
+    of trusted sources. The meta-schema validation of trusted schema sources is skipped.
+    """
+
     loglevel: LogLevelOption = LogLevelOption(default=None)
     """
     Used for setting a different logging level for schema initialization and building.
@@ -202,6 +216,29 @@ class SchemaSettings(ResourceSettings):
     building, when exiting the initialization method.
     """
 
+    incremental_keyrefs: BooleanOption = BooleanOption(default=False)
+    """
+    If `True` the key references are resolved as soon as the referenced key values are
+    collected, keeping only the unresolved references until the end of the scope. For
+    default all the references are kept and checked at the end of the scope, that for
+    lazy validation is the end of the document.
+    """
+
+    identity_spill_threshold: SpillThresholdOption = SpillThresholdOption(default=None)
+    """
+    An optional number of values of an identity constraint beyond which the collected
+    values are moved to a temporary database on disk, for validating documents with
+    key sets that don't fit in memory. For default all the values are kept in memory.
+    """
+
+    id_spill_threshold: SpillThresholdOption = SpillThresholdOption(default=None)
+    """
+    An optional number of xs:ID values of an XML document beyond which the registered
+    values are moved to a temporary database on disk, for validating documents with
+    sets of IDs that don't fit in memory. For default all the IDs are kept in memory,
+    using about the same space of a counter of the values.
+    """
+
     _DEFAULT_SETTINGS = '_DEFAULT_SCHEMA_SETTINGS'
 
     def get_xml_resource(self, source: SourceArgType) -> XMLResource:
@@ -225,6 +262,7 @@ class SchemaSettings(ResourceSettings):
             opener=self.opener,
             iterparse=self.iterparse,
             selector=self.selector,
+            cache=self.cache,
         )
 
     def get_resource_from_data(self, source: Any, tag: Optional[str] = None) -> XMLResource:
@@ -272,7 +310,8 @@ class SchemaSettings(ResourceSettings):
                 raise XMLResourceError(msg)
             return source
 
-        return XMLResource(
+        resource_class = XMLResource if self.trusted_sources is None else DigestResource
+        return resource_class(
             source=source,
             base_url=base_url or self.base_url,
             allow=self.allow,
@@ -281,6 +320,7 @@ class SchemaSettings(ResourceSettings):
             block=self.block,
             uri_mapper=self.uri_mapper,
             opener=self.opener,
+            cache=self.cache,
         )
 
     def get_converter(self, converter: Optional[ConverterType] = None,
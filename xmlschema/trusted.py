@@ -0,0 +1,252 @@
+#
+# Copyright (c), 2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Optional, Union, cast
+
+from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError, \
+    XMLResourceError
+from xmlschema.translation import gettext as _
+from xmlschema.arguments import Option
+from xmlschema.aliases import IOType
+from xmlschema.resources import XMLResource
+
+logger = logging.getLogger('xmlschema')
+
+MANIFEST_VERSION = 1
+
+
+class _DigestReader:
+    """A file-like object wrapper that computes the SHA-256 digest of the data read."""
+    def __init__(self, fp: IOType) -> None:
+        self._fp = fp
+        self._sha256 = hashlib.sha256()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fp, name)
+
+    def read(self, size: int = -1) -> Union[str, bytes]:
+        data: Union[str, bytes] = self._fp.read(size)
+        self._sha256.update(data.encode('utf-8') if isinstance(data, str) else data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+class DigestResource(XMLResource):
+    """
+    An XML resource that computes the SHA-256 digest of its content while
+    loading it, used for schema sources when trusted sources are configured.
+    The digest is `None` if the resource is built from an ElementTree structure.
+    """
+    digest: Optional[str] = None
+    _reader: Optional[_DigestReader]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._reader = None
+        super().__init__(*args, **kwargs)
+        if self._reader is not None:
+            self.digest = self._reader.hexdigest()
+        del self._reader
+
+    def open(self, use_loaded: bool = False) -> IOType:
+        fp = super().open(use_loaded)
+        if getattr(self, '_reader', False) is None:
+            self._reader = _DigestReader(fp)
+            return cast(IOType, self._reader)
+        return fp
+
+
+class TrustedSources:
+    """
+    A registry of schema sources that are trusted to be valid against the
+    meta-schema, whose validation can be skipped when building a schema.
+    A source is trusted if its URL matches one of the location patterns or if
+    the SHA-256 digest of its content is known, either provided explicitly or
+    recorded in a manifest file.
+
+    :param patterns: fnmatch-style patterns matched against the URLs of the \
+    schema sources, e.g. `'file:///opt/schemas/*'`.
+    :param digests: SHA-256 hex digests of the contents of trusted sources.
+    :param manifest: the path of a JSON manifest of trusted sources. It's loaded \
+    if the file exists and it's the default path used by :meth:`save`.
+    :param record: if `True` the sources that pass meta-schema validation without \
+    errors are recorded in the manifest, with their validation times. If a manifest \
+    path is provided the manifest file is saved after each recorded source.
+    """
+    def __init__(self, patterns: Iterable[str] = (),
+                 digests: Iterable[str] = (),
+                 manifest: Optional[Union[str, Path]] = None,
+                 record: bool = False) -> None:
+
+        if isinstance(patterns, str) or isinstance(digests, str):
+            msg = _("'patterns' and 'digests' must be collections of strings")
+            raise XMLSchemaTypeError(msg)
+
+        self.patterns = list(patterns)
+        self.digests = {x.lower() for x in digests}
+        self.manifest = None if manifest is None else Path(manifest)
+        self.record = record
+
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.skipped: list[Optional[str]] = []
+        self.time_saved = 0.0
+        self._lock = threading.Lock()
+
+        if self.manifest is not None and self.manifest.is_file():
+            self.load(self.manifest)
+
+    def __repr__(self) -> str:
+        return '%s(patterns=%r, manifest=%r)' % (
+            self.__class__.__name__, self.patterns,
+            None if self.manifest is None else str(self.manifest)
+        )
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> 'TrustedSources':
+        return self  # A shared registry, that is not copied with settings
+
+    @staticmethod
+    def get_digest(resource: XMLResource) -> str:
+        """
+        Returns the SHA-256 hex digest of the content of an XML resource. The digest
+        computed at loading is used for instances of :class:`DigestResource`, other
+        resources are opened again for reading their content.
+        """
+        if isinstance(resource, DigestResource) and resource.digest is not None:
+            return resource.digest
+
+        try:
+            fp = resource.open()
+        except XMLResourceError:
+            data: Union[str, bytes] = resource.get_text()
+        else:
+            try:
+                data = fp.read()
+            finally:
+                if fp is not resource.fp:
+                    fp.close()
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return hashlib.sha256(data).hexdigest()
+
+    def match_url(self, url: Optional[str]) -> bool:
+        """Returns `True` if the URL matches one of the trusted location patterns."""
+        return url is not None and any(fnmatchcase(url, p) for p in self.patterns)
+
+    def is_trusted(self, resource: XMLResource) -> bool:
+        """
+        Returns `True` if the resource is trusted, registering the skip of its
+        meta-schema validation and the time saved, if it's known by the manifest.
+        """
+        if self.match_url(resource.url):
+            digest = None
+        elif self.digests or self.entries:
+            digest = self.get_digest(resource)
+            if digest not in self.digests and digest not in self.entries:
+                return False
+        else:
+            return False
+
+        with self._lock:
+            self.skipped.append(resource.url)
+            if digest is not None and digest in self.entries:
+                self.time_saved += self.entries[digest].get('validation_time', 0.0)
+        return True
+
+    def add(self, resource: XMLResource, validation_time: float = 0.0) -> None:
+        """
+        Records a resource, validated in the provided time, in the manifest entries.
+        The manifest file is saved if its path has been provided at initialization.
+        """
+        digest = self.get_digest(resource)
+        with self._lock:
+            self.entries[digest] = {
+                'url': resource.url,
+                'validation_time': validation_time,
+            }
+
+        if self.manifest is not None:
+            self.save()
+
+    def load(self, manifest: Union[str, Path]) -> None:
+        """Loads the entries of a manifest file."""
+        with open(manifest, encoding='utf-8') as fp:
+            try:
+                data = json.load(fp)
+                entries = data['sources']
+            except (ValueError, TypeError, KeyError) as err:
+                msg = _("invalid manifest of trusted sources {!r}: {}")
+                raise XMLSchemaValueError(msg.format(str(manifest), err)) from None
+
+        if not isinstance(entries, dict):
+            msg = _("invalid manifest of trusted sources {!r}: {}")
+            raise XMLSchemaValueError(msg.format(str(manifest), "'sources' is not a map"))
+
+        with self._lock:
+            self.entries.update((k.lower(), v) for k, v in entries.items())
+
+    def save(self, manifest: Optional[Union[str, Path]] = None) -> None:
+        """
+        Writes the entries to a manifest file. The write is atomic, so a manifest
+        can be replaced while other processes are reading it.
+
+        :param manifest: the path of the manifest file, for default is the path \
+        provided at initialization.
+        """
+        if manifest is None:
+            if self.manifest is None:
+                raise XMLSchemaValueError(_("no manifest path provided"))
+            manifest = self.manifest
+
+        with self._lock:
+            data = json.dumps({'version': MANIFEST_VERSION, 'sources': self.entries},
+                              indent=2, sort_keys=True)
+
+        path = Path(manifest)
+        fd, tmp_path = tempfile.mkstemp(prefix='.', dir=path.absolute().parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                fp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns a report of the sources whose meta-schema validation has been
+        skipped and of the time saved, estimated from manifest validation times.
+        """
+        with self._lock:
+            return {
+                'skipped': len(self.skipped),
+                'sources': self.skipped.copy(),
+                'time_saved': self.time_saved,
+            }
+
+
+class TrustedSourcesOption(Option[Optional[TrustedSources]]):
+    def validated_value(self, value: Any) -> Optional[TrustedSources]:
+        if value is None or isinstance(value, TrustedSources):
+            return value
+        elif isinstance(value, (str, Path)):
+            return TrustedSources(manifest=value)
+
+        msg = _("invalid type {!r} for {}, must be None, a path or a {!r} instance")
+        raise XMLSchemaTypeError(msg.format(type(value), self, TrustedSources))
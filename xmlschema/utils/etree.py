@@ -9,8 +9,9 @@
 #
 import importlib
 import re
+from io import IOBase, TextIOBase
 from collections.abc import Callable, Iterator
-from typing import Any, Optional, Union
+from typing import Any, Optional, Union, cast
 from xml.etree import ElementTree
 
 from xmlschema.names import XSI_SCHEMA_LOCATION, XSI_NONS_SCHEMA_LOCATION, \
@@ -301,3 +302,235 @@ def etree_tostring(elem: ElementType,
     if encoding == 'unicode':
         return '\n'.join(reindent(line) for line in lines)
     return '\n'.join(reindent(line) for line in lines).encode(encoding)
+
+
+def escape_cdata(text: str) -> str:
+    """Escapes character data like the ElementTree's serializer."""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def escape_attrib(text: str) -> str:
+    """Escapes an attribute value like the ElementTree's serializer."""
+    text = escape_cdata(text)
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if '\r' in text:
+        text = text.replace('\r', '&#13;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    if '\t' in text:
+        text = text.replace('\t', '&#09;')
+    return text
+
+
+class XmlStreamWriter:
+    """
+    An incremental writer of XML data to a file-like object. Elements are written
+    like the ElementTree's serializer does, with the same prefixes that are used
+    by :func:`etree_tostring` when a namespace map is provided, but an element can
+    be written in parts, its start tag before the encoding of its children and its
+    end tag after them, so a tree doesn't need to be built for serializing it.
+
+    The namespaces of the provided map are declared on the root element. Other
+    namespaces are declared on the first element that uses them, with a scope
+    limited to its subtree.
+
+    :param fp: a writable file-like object.
+    :param namespaces: an optional mapping from namespace prefix to URI.
+    :param encoding: if "unicode" (the default) the data is written as text, \
+    otherwise it's encoded to bytes, using character references for the \
+    characters that can't be encoded.
+    :param xml_declaration: if set to `True` writes an XML declaration at the \
+    start. Ignored if the encoding is "unicode".
+    :param buffer_size: the size of the chunks of data written to the file object.
+    :param flush: if `True` flushes the file object after each chunk written.
+    :param spaces_for_tab: if provided the tab characters are replaced by this \
+    number of spaces, like :func:`etree_tostring` does.
+    """
+    def __init__(self, fp: Any,
+                 namespaces: Optional[NsmapType] = None,
+                 encoding: str = 'unicode',
+                 xml_declaration: bool = False,
+                 buffer_size: int = 8 * 1024,
+                 flush: bool = False,
+                 spaces_for_tab: Optional[int] = None) -> None:
+        self.fp = fp
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+        self.flush = flush
+        self.spaces_for_tab = spaces_for_tab
+        self.last_closed: Optional[ElementType] = None
+        self.length = 0  # the number of characters written, including the buffered ones
+
+        # Namespace prefixes are registered like etree_tostring() does
+        self._prefixes = dict(getattr(ElementTree, '_namespace_map', ()))
+        self._root_namespaces: list[str] = []
+        if namespaces:
+            default_namespace = namespaces.get('')
+            for prefix, uri in namespaces.items():
+                if prefix and not re.match(r'ns\d+$', prefix):
+                    self._register(prefix, uri)
+                    if uri == default_namespace:
+                        default_namespace = None
+                if uri and uri not in self._root_namespaces:
+                    self._root_namespaces.append(uri)
+
+            if default_namespace:
+                self._register('', default_namespace)
+
+        self._declared: dict[str, str] = {}
+        self._stack: list[tuple[ElementType, str, list[str]]] = []
+        self._parts: list[str] = []
+        self._size = 0
+
+        if xml_declaration and encoding.lower() != 'unicode':
+            self.write(f'<?xml version="1.0" encoding="{encoding}"?>\n')
+
+    def __repr__(self) -> str:
+        return '%s(fp=%r, encoding=%r)' % (self.__class__.__name__, self.fp, self.encoding)
+
+    @property
+    def current(self) -> Optional[ElementType]:
+        """The innermost element whose start tag has been written and not its end tag."""
+        return self._stack[-1][0] if self._stack else None
+
+    def write(self, data: str) -> None:
+        """Writes a string, buffering it until the buffer size is reached."""
+        self._parts.append(data)
+        self._size += len(data)
+        self.length += len(data)
+        if self._size >= self.buffer_size:
+            self._write_buffer()
+
+    def write_text(self, text: Optional[str]) -> None:
+        """Writes escaped character data."""
+        if text:
+            self.write(escape_cdata(text))
+
+    def start(self, elem: ElementType, text: Optional[str] = None) -> None:
+        """Writes the start tag of an element followed by the provided text."""
+        declared: list[str] = []
+        tag = self._write_start_tag(elem, declared)
+        self.write('>')
+        if text:
+            self.write(escape_cdata(text))
+        self._stack.append((elem, tag, declared))
+
+    def end(self) -> None:
+        """Writes the end tag of the current element."""
+        elem, tag, declared = self._stack.pop()
+        self.write(f'</{tag}>')
+        for uri in declared:
+            del self._declared[uri]
+        self.last_closed = elem
+
+    def write_element(self, elem: ElementType) -> None:
+        """Writes an element with its content, excluding its tail."""
+        if callable(elem.tag):
+            factory = cast(Callable[..., Any], elem.tag)
+            if factory is ElementTree.Comment:
+                self.write(f'<!--{elem.text}-->')
+            elif factory is ElementTree.ProcessingInstruction:
+                self.write(f'<?{elem.text}?>')
+            return
+
+        declared: list[str] = []
+        tag = self._write_start_tag(elem, declared)
+        if elem.text or len(elem):
+            self.write('>')
+            if elem.text:
+                self.write(escape_cdata(elem.text))
+            for child in elem:
+                self.write_element(child)
+                if child.tail:
+                    self.write(escape_cdata(child.tail))
+            self.write(f'</{tag}>')
+        else:
+            self.write(' />')
+
+        for uri in declared:
+            del self._declared[uri]
+
+    def close(self) -> None:
+        """Writes the buffered data to the file object."""
+        if self._parts:
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        data = ''.join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        if self.spaces_for_tab is not None and '\t' in data:
+            data = data.replace('\t', ' ' * self.spaces_for_tab)
+
+        if self.encoding == 'unicode':
+            if isinstance(self.fp, IOBase) and not isinstance(self.fp, TextIOBase):
+                self.fp.write(data.encode('utf-8'))
+            else:
+                self.fp.write(data)
+        elif isinstance(self.fp, TextIOBase):
+            self.fp.write(data.encode(self.encoding, 'xmlcharrefreplace').decode(self.encoding))
+        else:
+            self.fp.write(data.encode(self.encoding, 'xmlcharrefreplace'))
+        if self.flush:
+            self.fp.flush()
+
+    def _register(self, prefix: str, uri: str) -> None:
+        for k, v in list(self._prefixes.items()):
+            if k == uri or v == prefix:
+                del self._prefixes[k]
+        self._prefixes[uri] = prefix
+
+    def _declare(self, uri: str, declared: list[str]) -> str:
+        prefixes = self._declared.values()
+        prefix = self._prefixes.get(uri)
+        if prefix is None or prefix in prefixes:
+            k = 0
+            while f'ns{k}' in prefixes:
+                k += 1
+            prefix = f'ns{k}'
+
+        if prefix != 'xml':
+            self._declared[uri] = prefix
+            declared.append(uri)
+        return prefix
+
+    def _get_qname(self, name: str, declared: list[str]) -> str:
+        if name[:1] != '{':
+            return name
+
+        uri, local_name = name[1:].rsplit('}', 1)
+        try:
+            prefix = self._declared[uri]
+        except KeyError:
+            prefix = self._declare(uri, declared)
+        return f'{prefix}:{local_name}' if prefix else local_name
+
+    def _write_start_tag(self, elem: ElementType, declared: list[str]) -> str:
+        if self._root_namespaces:
+            for uri in self._root_namespaces:
+                self._declare(uri, declared)
+            self._root_namespaces.clear()
+
+        tag = self._get_qname(elem.tag, declared)
+        attributes = [(self._get_qname(k, declared), v) for k, v in elem.items()]
+
+        parts = [f'<{tag}']
+        if declared:
+            for prefix, uri in sorted((self._declared[u], u) for u in declared):
+                if prefix:
+                    parts.append(f' xmlns:{prefix}="{escape_attrib(uri)}"')
+                else:
+                    parts.append(f' xmlns="{escape_attrib(uri)}"')
+
+        for name, value in attributes:
+            parts.append(f' {name}="{escape_attrib(value)}"')
+
+        self.write(''.join(parts))
+        return tag
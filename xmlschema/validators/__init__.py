@@ -14,7 +14,8 @@ from .exceptions import XMLSchemaValidatorError, XMLSchemaParseError, \
     XMLSchemaIncludeWarning, XMLSchemaImportWarning, \
     XMLSchemaTypeTableWarning, XMLSchemaAssertPathWarning
 
-from .validation import ValidationContext, DecodeContext, EncodeContext, ValidationMixin
+from .validation import ValidationContext, DecodeContext, EncodeContext, \
+    StreamEncodeContext, ValidationMixin, IdRegistry
 from .xsdbase import XsdValidator, XsdComponent, XsdAnnotation, XsdType
 from .particles import ParticleMixin
 from .assertions import XsdAssert
@@ -41,7 +42,8 @@ from .schemas import XMLSchemaMeta, XMLSchemaBase, XMLSchema, XMLSchema10, XMLSc
 
 
 __all__ = [
-    'ValidationContext', 'DecodeContext', 'EncodeContext', 'ValidationMixin',
+    'ValidationContext', 'DecodeContext', 'EncodeContext', 'StreamEncodeContext',
+    'ValidationMixin', 'IdRegistry',
     'XMLSchemaValidatorError', 'XMLSchemaParseError', 'XMLSchemaModelError',
     'XMLSchemaModelDepthError', 'XMLSchemaValidationError', 'XMLSchemaDecodeError',
     'XMLSchemaEncodeError', 'XMLSchemaNotBuiltError', 'XMLSchemaChildrenValidationError',
@@ -9,10 +9,11 @@
 #
 import warnings
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, Any, Union
+from copy import copy
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from elementpath import ElementPathError, XPathContext, XPathToken, \
-    SchemaElementNode, build_schema_node_tree
+    SchemaElementNode, LazyElementNode, build_schema_node_tree
 
 from xmlschema.names import XSD_ASSERT
 from xmlschema.aliases import ElementType, SchemaType, SchemaElementType
@@ -32,6 +33,111 @@ if TYPE_CHECKING:
 
 warnings.filterwarnings(action="always", category=XMLSchemaAssertPathWarning)
 
+# Operators and functions that don't depend on the context item if their operands don't
+_OPERATORS = frozenset((
+    'and', 'or', '=', '!=', '<', '>', '<=', '>=', 'eq', 'ne', 'lt', 'le', 'gt', 'ge',
+    '+', '-', '*', 'div', 'idiv', 'mod', 'to', ',', '(', 'if', 'cast', 'castable'
+))
+_FUNCTIONS = frozenset((
+    'true', 'false', 'not', 'boolean', 'exists', 'empty', 'count', 'abs', 'ceiling',
+    'floor', 'round', 'round-half-to-even', 'min', 'max', 'sum', 'avg', 'contains',
+    'starts-with', 'ends-with', 'matches', 'upper-case', 'lower-case', 'concat',
+    'substring', 'substring-before', 'substring-after', 'string-join', 'compare',
+    'translate', 'replace', 'tokenize', 'distinct-values', 'index-of', 'zero-or-one',
+    'one-or-more', 'exactly-one', 'string', 'number', 'data', 'string-length',
+    'normalize-space',
+))
+_CONTEXT_FUNCTIONS = frozenset((  # the context item is the default argument
+    'string', 'number', 'data', 'string-length', 'normalize-space'
+))
+
+
+def get_dependencies(token: XPathToken) -> frozenset[str]:
+    """
+    Returns the parts of the context that are used by an assertion's XPath token:
+    'value' for the $value variable, 'attributes' for the attributes of the context
+    element and 'subtree' if the token can access other nodes or the evaluation
+    context. An empty set means that the expression is static.
+    """
+    if token.symbol == '$':
+        return frozenset(('value',))
+    elif token.symbol == '@':
+        return frozenset(('attributes',))
+    elif token.label == 'literal':
+        return frozenset()
+    elif token.label == 'function':
+        if token.symbol not in _FUNCTIONS or \
+                not len(token) and token.symbol in _CONTEXT_FUNCTIONS:
+            return frozenset(('subtree',))
+    elif token.symbol not in _OPERATORS or token.symbol == '*' and len(token) != 2:
+        return frozenset(('subtree',))
+    elif token.symbol in ('cast', 'castable'):
+        return get_dependencies(token[0])  # the second operand is a type name
+
+    return frozenset().union(*(get_dependencies(tk) for tk in token))
+
+
+class AssertionScope:
+    """
+    The scope for evaluating the assertions of a complex type on an element. The
+    XPath contexts and the typed value are built only when an assertion requires
+    them and are shared between the assertions of the type. A subtree-only node
+    tree is built only for assertions that access nodes other than the attributes
+    of the element.
+
+    :param obj: the element to check.
+    :param context: the validation context.
+    :param value: the text value of an element with simple content.
+    :param subtree: if `True` all the assertions are evaluated on the subtree, \
+    useful if at least one of the assertions to evaluate requires it.
+    """
+    __slots__ = ('obj', 'context', 'value', 'subtree',
+                 '_variables', '_xpath_context', '_tree_context')
+
+    def __init__(self, obj: ElementType,
+                 context: ValidationContext,
+                 value: Any = None,
+                 subtree: bool = False) -> None:
+        self.obj = obj
+        self.context = context
+        self.value = value
+        self.subtree = subtree
+        self._variables: Optional[dict[str, Any]] = None
+        self._xpath_context: Optional[XPathContext] = None
+        self._tree_context: Optional[XPathContext] = None
+
+    def get_xpath_context(self, assertion: 'XsdAssert') -> XPathContext:
+        """Returns a new XPath context for evaluating an assertion."""
+        if self._variables is None:
+            if self.value is not None:
+                value = assertion.base_type.text_decode(self.value, context=self.context)
+            else:
+                value = None
+            self._variables = {'value': value}
+
+        if self.subtree or 'subtree' in assertion.dependencies:
+            if self._tree_context is None:
+                self._tree_context = self._create_context(self.obj, assertion)
+            return copy(self._tree_context)
+        elif self._tree_context is not None:
+            return copy(self._tree_context)
+        elif self._xpath_context is None:
+            # Attributes and $value only: no need to build the children nodes
+            elem = self.obj.makeelement(self.obj.tag, self.obj.attrib)
+            self._xpath_context = self._create_context(elem, assertion)
+        return copy(self._xpath_context)
+
+    def _create_context(self, elem: ElementType, assertion: 'XsdAssert') -> XPathContext:
+        source = self.context.source
+        return XPathContext(
+            root=LazyElementNode(elem, nsmap=source.get_nsmap(self.obj)),
+            namespaces=self.context.namespaces,
+            uri=source.url,
+            fragment=True,
+            variables=self._variables,
+            schema=assertion.parser.schema,
+        )
+
 
 class XsdAssert(XsdComponent, ElementPathMixin[Union['XsdAssert', SchemaElementType]]):
     """
@@ -53,8 +159,12 @@ class XsdAssert(XsdComponent, ElementPathMixin[Union['XsdAssert', SchemaElementT
 
     __slots__ = (
         'token', 'parser', 'path', 'base_type', 'xpath_default_namespace',
+        'dependencies', '_static_result',
     )
 
+    dependencies: frozenset[str]
+    """The parts of the validated element that are used by the assertion's test."""
+
     def __init__(self, elem: ElementType,
                  schema: SchemaType,
                  parent: 'XsdComplexType',
@@ -96,12 +206,15 @@ class XsdAssert(XsdComponent, ElementPathMixin[Union['XsdAssert', SchemaElementT
             schema=self.xpath_proxy,
         )
 
+        self._static_result: Optional[bool] = None
         try:
             self.token = self.parser.parse(self.path)
         except ElementPathError as err:
             self.token = self.parser.parse('true()')
+            self.dependencies = get_dependencies(self.token)
             self.parse_error(err)
         else:
+            self.dependencies = get_dependencies(self.token)
             if any(len(tk) < 2 for tk in self.token.iter('/', '//')):
                 msg = (
                     f"The XPath expression of {self} contains absolute location paths "
@@ -120,7 +233,15 @@ class XsdAssert(XsdComponent, ElementPathMixin[Union['XsdAssert', SchemaElementT
                  obj: ElementType,
                  validation: str,
                  context: ValidationContext,
-                 value: Any = None) -> None:
+                 value: Any = None,
+                 scope: Optional[AssertionScope] = None) -> None:
+
+        if context.profiler is not None and context.profiler.enter(self):
+            try:
+                XsdAssert.__call__(self, obj, validation, context, value, scope)
+            finally:
+                context.profiler.exit()
+            return
 
         if not hasattr(self, 'parser') or not hasattr(self, 'token'):
             raise XMLSchemaNotBuiltError(self, 'schema bound parser not set')
@@ -128,23 +249,23 @@ class XsdAssert(XsdComponent, ElementPathMixin[Union['XsdAssert', SchemaElementT
         if not self.parser.is_schema_bound() and self.parser.schema:
             self.parser.schema.bind_parser(self.parser)
 
-        if value is not None:
-            value = self.base_type.text_decode(value, context=context)
+        if self._static_result is not None:
+            result = self._static_result
+        else:
+            if scope is None:
+                scope = AssertionScope(obj, context, value)
 
-        xpath_context = XPathContext(
-            root=context.source.get_xpath_node(obj),
-            namespaces=context.namespaces,
-            uri=context.source.url,
-            fragment=True,
-            variables={'value': value},
-            schema=self.parser.schema,
-        )
+            try:
+                result = bool(self.token.evaluate(scope.get_xpath_context(self)))
+            except ElementPathError as err:
+                context.validation_error(validation, self, err, obj)
+                return
 
-        try:
-            if not self.token.evaluate(xpath_context):
-                context.validation_error(validation, self, "assertion test is false", obj)
-        except ElementPathError as err:
-            context.validation_error(validation, self, err, obj)
+            if not self.dependencies:
+                self._static_result = result
+
+        if not result:
+            context.validation_error(validation, self, "assertion test is false", obj)
 
     # For implementing ElementPathMixin
     def __iter__(self) -> Iterator[Union['XsdElement', 'XsdAnyElement']]:
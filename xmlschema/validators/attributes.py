@@ -657,6 +657,12 @@ class XsdAttributeGroup(
     def raw_decode(self, obj: MutableMapping[str, str], validation: str,
                    context: ValidationContext) -> AttributeGroupDecodeType:
 
+        if context.profiler is not None and context.profiler.enter(self):
+            try:
+                return XsdAttributeGroup.raw_decode(self, obj, validation, context)
+            finally:
+                context.profiler.exit()
+
         if not obj and not self:
             return []
 
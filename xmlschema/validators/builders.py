@@ -23,6 +23,7 @@ from xmlschema.exceptions import XMLSchemaAttributeError, XMLSchemaKeyError, \
     XMLSchemaTypeError, XMLSchemaValueError
 from xmlschema.translation import gettext as _
 from xmlschema.utils.qnames import local_name, get_qname
+from xmlschema.profiler import profile_phase
 
 from .helpers import parse_xsd_derivation
 from .exceptions import XMLSchemaCircularityError, XMLSchemaModelDepthError
@@ -371,12 +372,13 @@ class StagedMap(Mapping[str, CT]):
     def _factory_or_class(self, elem: ElementType, schema: SchemaType) -> CT:
         """Returns the builder class or method used to build the global map."""
 
-    __slots__ = ('_store', '_staging', '_builders')
+    __slots__ = ('_store', '_staging', '_builders', '_base')
 
-    def __init__(self, builders: XsdBuilders):
+    def __init__(self, builders: XsdBuilders, base: Optional['StagedMap[CT]'] = None):
         self._store: dict[str, CT] = {}
         self._staging: dict[str, StagedItemType] = {}
         self._builders = builders
+        self._base = base
 
     def __getitem__(self, qname: str) -> CT:
         try:
@@ -384,28 +386,42 @@ class StagedMap(Mapping[str, CT]):
         except KeyError:
             if qname in self._staging:
                 return self._build_global(qname)
+            elif self._base is None:
+                msg = _('global {} {!r} not found').format(self.label, qname)
+                raise XMLSchemaKeyError(msg) from None
 
-            msg = _('global {} {!r} not found').format(self.label, qname)
-            raise XMLSchemaKeyError(msg) from None
+        return self._base[qname]  # Fallback lookup on the base of an overlay map
 
     def __iter__(self) -> Iterator[str]:
         yield from self._store
+        if self._base is not None:
+            yield from (k for k in self._base if k not in self._store)
 
     def __len__(self) -> int:
-        return len(self._store)
+        if self._base is None:
+            return len(self._store)
+        return len(self._store) + sum(1 for k in self._base if k not in self._store)
 
     def __repr__(self) -> str:
-        return repr(self._store)
+        if self._base is None:
+            return repr(self._store)
+        return repr(dict(self.items()))
 
     def __copy__(self) -> 'StagedMap[CT]':
         obj = object.__new__(self.__class__)
         obj._builders = self._builders
         obj._staging = self._staging.copy()
         obj._store = self._store.copy()
+        obj._base = self._base
         return obj
 
     copy = __copy__
 
+    @property
+    def base(self) -> Optional['StagedMap[CT]']:
+        """The base map of an overlay map, `None` otherwise."""
+        return self._base
+
     def clear(self) -> None:
         self._store.clear()
         self._staging.clear()
@@ -413,6 +429,10 @@ class StagedMap(Mapping[str, CT]):
     def update(self, other: 'StagedMap[CT]') -> None:
         self._store.update(other._store)
 
+    def is_owned(self, qname: str) -> bool:
+        """Returns `True` if the global is stored or staged in the map, not in its base."""
+        return qname in self._store or qname in self._staging
+
     @property
     def total_staged(self) -> int:
         return len(self._staging)
@@ -548,7 +568,9 @@ class TypesMap(StagedMap[BaseXsdType]):
             return self._builders.simple_type_factory(elem, schema)
 
     def build_builtins(self, schema: SchemaType) -> None:
-        if schema.meta_schema is not None and nm.XSD_ANY_TYPE in self._store:
+        if schema.meta_schema is not None and (
+                nm.XSD_ANY_TYPE in self._store or
+                self._base is not None and nm.XSD_ANY_TYPE in self._base):
             # builtin types already provided
             return
         #
@@ -658,14 +680,29 @@ class GlobalMaps(NamedTuple):
     groups: GroupsMap
 
     @classmethod
-    def from_builders(cls, builders: XsdBuilders) -> 'GlobalMaps':
+    def from_builders(cls, builders: XsdBuilders,
+                      base: Optional['GlobalMaps'] = None) -> 'GlobalMaps':
+        """
+        Creates new global maps. If *base* global maps are provided creates
+        overlay maps, that lookup the globals in the base maps as fallback.
+        """
+        if base is None:
+            return cls(
+                TypesMap(builders),
+                NotationsMap(builders),
+                AttributesMap(builders),
+                AttributeGroupsMap(builders),
+                ElementsMap(builders),
+                GroupsMap(builders)
+            )
+
         return cls(
-            TypesMap(builders),
-            NotationsMap(builders),
-            AttributesMap(builders),
-            AttributeGroupsMap(builders),
-            ElementsMap(builders),
-            GroupsMap(builders)
+            TypesMap(builders, base.types),
+            NotationsMap(builders, base.notations),
+            AttributesMap(builders, base.attributes),
+            AttributeGroupsMap(builders, base.attribute_groups),
+            ElementsMap(builders, base.elements),
+            GroupsMap(builders, base.groups)
         )
 
     def clear(self) -> None:
@@ -784,9 +821,12 @@ class GlobalMaps(NamedTuple):
 
     def build(self, schemas: Iterable[SchemaType]) -> None:
         """Builds global XSD components for the given schemas."""
-        self.notations.build()
-        self.attributes.build()
-        self.attribute_groups.build()
+        with profile_phase('build-notations'):
+            self.notations.build()
+        with profile_phase('build-attributes'):
+            self.attributes.build()
+        with profile_phase('build-attribute-groups'):
+            self.attribute_groups.build()
 
         for schema in schemas:
             if not isinstance(schema.default_attributes, str):
@@ -804,19 +844,28 @@ class GlobalMaps(NamedTuple):
             else:
                 schema.default_attributes = attributes
 
-        self.types.build()
-        self.elements.build()
-        self.groups.build()
+        with profile_phase('build-types'):
+            self.types.build()
+        with profile_phase('build-elements'):
+            self.elements.build()
+        with profile_phase('build-groups'):
+            self.groups.build()
 
         # Build element declarations inside model groups.
-        for schema in schemas:
-            for group in schema.iter_components(XsdGroup):
-                try:
-                    group.build()
-                except XMLSchemaModelDepthError as e:
-                    schema.parse_error(error=e, elem=group.elem)
+        with profile_phase('build-group-elements'):
+            for schema in schemas:
+                for group in schema.iter_components(XsdGroup):
+                    try:
+                        group.build()
+                    except XMLSchemaModelDepthError as e:
+                        schema.parse_error(error=e, elem=group.elem)
 
         # Build identity references and XSD 1.1 assertions
         for schema in schemas:
             for obj in schema.iter_components((XsdIdentity, XsdAssert)):
-                obj.build()
+                if isinstance(obj, XsdIdentity):
+                    with profile_phase('build-identities'):
+                        obj.build()
+                else:
+                    with profile_phase('build-assertions'):
+                        obj.build()
@@ -26,7 +26,7 @@ from .validation import ValidationContext, EncodeContext, ValidationMixin
 from .helpers import parse_xsd_derivation
 from .xsdbase import XSD_TYPE_DERIVATIONS, XsdComponent, XsdType
 from .attributes import XsdAttributeGroup
-from .assertions import XsdAssert
+from .assertions import XsdAssert, AssertionScope
 from .simple_types import FacetsValueType, XsdSimpleType, XsdUnion, XsdAtomic
 from .groups import XsdGroup
 from .wildcards import XsdAnyElement, XsdOpenContent, XsdDefaultOpenContent
@@ -686,6 +686,25 @@ class XsdComplexType(XsdType, ValidationMixin[Union[ElementType, str, bytes], An
             if xsd_classes is None or isinstance(obj, xsd_classes):
                 yield obj
 
+    def check_assertions(self, obj: ElementType,
+                         validation: str,
+                         context: ValidationContext,
+                         value: Optional[str] = None) -> None:
+        """
+        Checks the assertions of the complex type on an element, sharing the
+        XPath contexts and the typed value between the assertions.
+
+        :param obj: the element to check.
+        :param validation: the validation mode.
+        :param context: the validation context.
+        :param value: the text value, for an element with simple content.
+        """
+        if self.assertions:
+            subtree = any('subtree' in x.dependencies for x in self.assertions)
+            scope = AssertionScope(obj, context, value, subtree)
+            for assertion in self.assertions:
+                assertion(obj, validation, context, value, scope)
+
     def get_facet(self, tag: str) -> Optional[FacetsValueType]:
         if isinstance(self.content, XsdSimpleType):
             return self.content.get_facet(tag)
@@ -14,14 +14,14 @@ import warnings
 from copy import copy as _copy
 from decimal import Decimal
 from types import GeneratorType
-from collections.abc import Iterator, MutableSequence
+from collections.abc import Callable, Iterator, Mapping, MutableSequence
+from functools import cached_property, partial
 from typing import TYPE_CHECKING, cast, Any, Optional, Union
 from xml.etree.ElementTree import Element, ParseError
 
 from elementpath import XPath2Parser, ElementPathError, XPathContext, XPathToken, \
-    LazyElementNode, SchemaElementNode, build_schema_node_tree
+    SchemaElementNode, build_schema_node_tree
 from elementpath.datatypes import AbstractDateTime, Duration
-from elementpath.xpath_nodes import EtreeElementNode
 
 import xmlschema.names as nm
 from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError, \
@@ -601,6 +601,12 @@ class XsdElement(XsdComponent, ParticleMixin,
         :param context: the decoding context.
         :return: a decoded object.
         """
+        if context.profiler is not None and context.profiler.enter(self, obj):
+            try:
+                return XsdElement.raw_decode(self, obj, validation, context)
+            finally:
+                context.profiler.exit()
+
         error: Union[XMLSchemaValueError, XMLSchemaValidationError]
         result: Any
 
@@ -631,6 +637,7 @@ class XsdElement(XsdComponent, ParticleMixin,
                     return Empty
 
         context.elem = obj
+        context.stack.append(obj)
 
         for identity in self.identities:
             if identity in context.identities:
@@ -735,8 +742,7 @@ class XsdElement(XsdComponent, ParticleMixin,
             pass
         elif not isinstance(content_decoder, XsdSimpleType):
             if not isinstance(xsd_type, XsdSimpleType):
-                for assertion in xsd_type.assertions:
-                    assertion(obj, validation, context)
+                xsd_type.check_assertions(obj, validation, context)
 
             context.level += 1
             content = content_decoder.raw_decode(obj, validation, context)
@@ -770,8 +776,7 @@ class XsdElement(XsdComponent, ParticleMixin,
                 text = self.default
 
             if not isinstance(xsd_type, XsdSimpleType):
-                for assertion in xsd_type.assertions:
-                    assertion(obj, validation, context, value=text)
+                xsd_type.check_assertions(obj, validation, context, text)
 
                 if text and content_decoder.is_list():
                     value = text.split()
@@ -848,7 +853,8 @@ class XsdElement(XsdComponent, ParticleMixin,
                     for error in errors:
                         context.validation_error(validation, self, error, obj)
 
-        # Disable collect for out of scope identities and check key references
+        # Disable collect for out of scope identities, check key references
+        # and propagate the key values to the key references still in scope.
         if context.max_depth is None:
             for identity in self.identities:
                 counter = context.identities[identity]
@@ -857,45 +863,38 @@ class XsdElement(XsdComponent, ParticleMixin,
                     assert isinstance(counter, KeyrefCounter)
                     for error in counter.iter_errors(context.identities):
                         context.validation_error(validation, self, error, obj)
+                else:
+                    counter.propagate(context.identities)
         elif context.level:
             for identity in self.identities:
-                context.identities[identity].enabled = False
+                counter = context.identities[identity]
+                counter.enabled = False
+                if not isinstance(identity, XsdKeyref):
+                    counter.propagate(context.identities)
 
+        context.stack.pop()
         return result
 
     def collect_key_fields(self, obj: ElementType, xsd_type: BaseXsdType,
                            validation: str, nilled: bool, context: ValidationContext) -> None:
 
-        element_node: Union[EtreeElementNode, LazyElementNode]
-        element_node = cast(EtreeElementNode, context.source.get_xpath_node(obj))
-
         xsd_element = self if self.ref is None else self.ref
         if xsd_element.type is not xsd_type:
             xsd_element = _copy(xsd_element)
             xsd_element._set_type(xsd_type)
 
         # Collect field values for identities that refer to this XSD element.
+        # With incremental key references the counters resolve them on the fly.
+        identities = context.identities if self.maps.settings.incremental_keyrefs else None
         for identity in self.selected_by:
             try:
                 counter = context.identities[identity]
             except KeyError:
                 continue
             else:
-                if not counter.enabled:
+                if not counter.enabled or not counter.is_selecting(context.stack):
                     continue
 
-            if counter.elements is None:
-                # Apply selector on Element ancestor for obtain the selected elements
-                root_node = context.source.get_xpath_node(counter.elem)
-                xpath_context = XPathContext(root_node)
-                assert identity.selector is not None
-                counter.elements = {
-                    x for x in identity.selector.token.select_results(xpath_context)
-                }
-
-            if obj not in counter.elements:
-                continue
-
             if xsd_element in identity.elements:
                 selectors = identity.elements[xsd_element]
             else:
@@ -903,15 +902,13 @@ class XsdElement(XsdComponent, ParticleMixin,
                 selectors = [FieldValueSelector(f, xsd_element) for f in identity.fields]
 
             try:
-                fields = tuple(
-                    s.get_value(element_node, context.namespaces) for s in selectors
-                )
+                fields = tuple(s.get_value(obj, context.namespaces) for s in selectors)
             except (XMLSchemaValueError, XMLSchemaTypeError) as err:
                 context.validation_error(validation, self, err, obj)
             else:
                 if any(x is not None for x in fields) or nilled:
                     try:
-                        counter.increase(fields)
+                        counter.increase(fields, identities)
                     except ValueError as err:
                         context.validation_error(validation, self, err, obj)
 
@@ -1344,22 +1341,45 @@ class Xsd11Element(XsdElement):
             else:
                 elem = Element(elem.tag)
 
+        dummy: Optional[ElementType] = None
         if inherited:
             dummy = Element('_dummy_element', attrib=inherited)
             dummy.attrib.update(elem.attrib)
 
-            for alt in self.alternatives:
-                if alt.type is not None:
-                    if alt.token is None or alt.test(elem) or alt.test(dummy):
-                        return alt.type
-        else:
-            for alt in self.alternatives:
-                if alt.type is not None:
-                    if alt.token is None or alt.test(elem):
-                        return alt.type
+        for alt in self.alternatives_table:
+            if isinstance(alt, XsdAlternative):
+                if alt.token is None or alt.test(elem) or \
+                        dummy is not None and alt.test(dummy):
+                    return alt.type
+            else:
+                name, types = alt
+                if (xsd_type := types.get(elem.get(name))) is not None:
+                    return xsd_type
+                elif dummy is not None and \
+                        (xsd_type := types.get(dummy.get(name))) is not None:
+                    return xsd_type
 
         return self.type
 
+    @cached_property
+    def alternatives_table(self) \
+            -> list[Union['XsdAlternative', tuple[str, dict[Optional[str], BaseXsdType]]]]:
+        """
+        The type alternatives of the element, with the consecutive equality tests on
+        the same attribute merged to a dispatch table from attribute values to types.
+        """
+        table: list[Union[XsdAlternative, tuple[str, dict[Optional[str], BaseXsdType]]]] = []
+        for alt in self.alternatives:
+            if alt.type is None:
+                continue
+            elif alt.dispatch_key is None:
+                table.append(alt)
+            elif table and isinstance(table[-1], tuple) and table[-1][0] == alt.dispatch_key[0]:
+                table[-1][1].setdefault(alt.dispatch_key[1], alt.type)
+            else:
+                table.append((alt.dispatch_key[0], {alt.dispatch_key[1]: alt.type}))
+        return table
+
     def is_overlap(self, other: SchemaElementType) -> bool:
         if isinstance(other, XsdElement):
             if self.name == other.name:
@@ -1447,6 +1467,117 @@ class Xsd11Element(XsdElement):
                     context.validation_error(validation, self, reason, elem)
 
 
+AttributesTestType = Callable[[Mapping[str, str]], bool]
+
+
+def get_attribute_name(token: XPathToken) -> Optional[str]:
+    """Returns the name of the attribute selected by an attribute reference token."""
+    if token.symbol != '@':
+        return None
+    elif token[0].symbol == '(name)':
+        return cast(str, token[0].value)
+    elif token[0].symbol != ':' or token[0][1].symbol != '(name)':
+        return None
+
+    uri = token.parser.namespaces.get(cast(str, token[0][0].value))
+    return f'{{{uri}}}{token[0][1].value}' if uri else None
+
+
+def get_comparison_operands(token: XPathToken) -> Optional[tuple[str, str]]:
+    """
+    Returns the attribute name and the string literal of a comparison between
+    an attribute and a string literal, `None` for other expressions.
+    """
+    if token.symbol not in ('=', 'eq', '!=', 'ne'):
+        return None
+    elif token[1].symbol == '(string)':
+        name, value = get_attribute_name(token[0]), token[1].value
+    elif token[0].symbol == '(string)':
+        name, value = get_attribute_name(token[1]), token[0].value
+    else:
+        return None
+    return None if name is None else (name, cast(str, value))
+
+
+# Compiled tests are partials of module level functions, for keeping schemas picklable.
+def _has_attribute(name: str, attrib: Mapping[str, str]) -> bool:
+    return name in attrib
+
+
+def _is_equal(name: str, value: str, attrib: Mapping[str, str]) -> bool:
+    return attrib.get(name) == value
+
+
+def _is_not_equal(name: str, value: str, attrib: Mapping[str, str]) -> bool:
+    return name in attrib and attrib[name] != value
+
+
+def _and_tests(test1: AttributesTestType, test2: AttributesTestType,
+               attrib: Mapping[str, str]) -> bool:
+    return test1(attrib) and test2(attrib)
+
+
+def _or_tests(test1: AttributesTestType, test2: AttributesTestType,
+              attrib: Mapping[str, str]) -> bool:
+    return test1(attrib) or test2(attrib)
+
+
+def _not_test(test: AttributesTestType, attrib: Mapping[str, str]) -> bool:
+    return not test(attrib)
+
+
+def _constant_test(result: bool, attrib: Mapping[str, str]) -> bool:
+    return result
+
+
+def compile_attributes_test(token: XPathToken) -> Optional[AttributesTestType]:
+    """
+    Compiles the test of a type alternative to a function on the attributes of the
+    element, if the test is a boolean combination of existence checks and of
+    comparisons with string literals of the attributes. The attributes of the
+    test are untyped, so these comparisons are between strings. Returns `None`
+    for other tests, that have to be evaluated with XPath.
+    """
+    if token.symbol == '@':
+        name = get_attribute_name(token)
+        if name is None:
+            return None
+        return partial(_has_attribute, name)
+
+    elif token.symbol in ('=', 'eq', '!=', 'ne'):
+        operands = get_comparison_operands(token)
+        if operands is None:
+            return None
+
+        name, value = operands
+        if token.symbol in ('=', 'eq'):
+            return partial(_is_equal, name, value)
+        return partial(_is_not_equal, name, value)
+
+    elif token.symbol in ('and', 'or'):
+        test1, test2 = compile_attributes_test(token[0]), compile_attributes_test(token[1])
+        if test1 is None or test2 is None:
+            return None
+        elif token.symbol == 'and':
+            return partial(_and_tests, test1, test2)
+        return partial(_or_tests, test1, test2)
+
+    elif token.symbol == '(':
+        if not len(token):
+            return partial(_constant_test, False)  # an empty sequence
+        return compile_attributes_test(token[0])
+    elif token.label != 'function':
+        return None
+    elif token.symbol == 'not':
+        test = compile_attributes_test(token[0])
+        if test is None:
+            return None
+        return partial(_not_test, test)
+    elif token.symbol in ('true', 'false') and not len(token):
+        return partial(_constant_test, token.symbol == 'true')
+    return None
+
+
 class XsdAlternative(XsdComponent):
     """
     XSD 1.1 type *alternative* definitions.
@@ -1464,9 +1595,17 @@ class XsdAlternative(XsdComponent):
     type: BaseXsdType
     path: Optional[str]
     token: Optional[XPathToken]
+
+    attributes_test: Optional[AttributesTestType]
+    """The test compiled to a function on attributes, if it's simple enough."""
+
+    dispatch_key: Optional[tuple[str, str]]
+    """The attribute name and the value, for a test that is an equality comparison."""
+
     _ADMITTED_TAGS = nm.XSD_ALTERNATIVE,
 
-    __slots__ = ('xpath_default_namespace', 'path', 'token', 'type')
+    __slots__ = ('xpath_default_namespace', 'path', 'token', 'type',
+                 'attributes_test', 'dispatch_key')
 
     def __repr__(self) -> str:
         return '%s(type=%r, test=%r)' % (
@@ -1497,6 +1636,7 @@ class XsdAlternative(XsdComponent):
             default_namespace=self.xpath_default_namespace
         )
 
+        self.attributes_test = self.dispatch_key = None
         try:
             self.path = attrib['test']
         except KeyError:
@@ -1510,6 +1650,10 @@ class XsdAlternative(XsdComponent):
                 self.token = parser.parse('false()')
                 self.path = 'false()'
 
+            self.attributes_test = compile_attributes_test(self.token)
+            if self.token.symbol in ('=', 'eq'):
+                self.dispatch_key = get_comparison_operands(self.token)
+
         try:
             type_qname = self.schema.resolve_qname(attrib['type'])
         except (KeyError, ValueError, RuntimeError) as err:
@@ -1566,6 +1710,8 @@ class XsdAlternative(XsdComponent):
     def test(self, elem: ElementType) -> bool:
         if self.token is None:
             return False
+        elif self.attributes_test is not None:
+            return self.attributes_test(elem.attrib)
 
         try:
             result = list(self.token.select(context=XPathContext(elem)))
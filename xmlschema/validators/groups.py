@@ -959,6 +959,12 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
         :param context: the encoding context.
         :return: a list of 3-tuples (key, decoded data, decoder).
         """
+        if context.profiler is not None and context.profiler.enter(self):
+            try:
+                return XsdGroup.raw_decode(self, obj, validation, context)
+            finally:
+                context.profiler.exit()
+
         result: GroupDecodeType = None if context.validation_only else []
         cdata_index = 1  # keys for CDATA sections are positive integers
         index = 0
@@ -1115,6 +1121,7 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
         index = cdata_index = 0
         wrong_content_type = False
         over_max_depth = context.max_depth is not None and context.max_depth <= context.level
+        mixed = self.mixed and context.preserve_mixed
         model = self.get_model_visitor()
 
         content: Iterable[Any]
@@ -1179,6 +1186,7 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
             if over_max_depth:
                 continue
 
+            context.start_child(elem, text, children, mixed)
             child = xsd_element.raw_encode(value, validation, context)
             if children is not None and child is not None:
                 children.append(child)
@@ -1193,7 +1201,7 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
             text=text,
             children=children,
             level=context.level,
-            mixed=self.mixed and context.preserve_mixed
+            mixed=mixed
         )
 
         if wrong_content_type:
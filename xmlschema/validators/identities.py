@@ -13,28 +13,28 @@ This module contains classes for other XML Schema identity constraints.
 import copy
 import re
 import math
+import pickle
 from collections import Counter
-from collections.abc import Iterator
+from collections.abc import Iterator, MutableMapping, Sequence
 from typing import TYPE_CHECKING, cast, Any, Optional, Union
 
 from elementpath import ElementPathError, XPathContext, \
     ElementNode, translate_pattern, AttributeNode
 from elementpath.datatypes import UntypedAtomic
-from elementpath.xpath_nodes import EtreeElementNode
 
 import xmlschema.names as nm
 from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError
 from xmlschema.translation import gettext as _
 from xmlschema.utils.qnames import get_qname, get_extended_qname
 from xmlschema.aliases import ElementType, SchemaType, NsmapType, AtomicValueType, \
-    BaseXsdType, SchemaElementType, SchemaAttributeType
+    SchemaElementType, SchemaAttributeType
 from .helpers import parse_xpath_default_namespace
 from ..xpath import IdentityXPathParser, XPathElement, XMLSchemaProxy
 
 from .exceptions import XMLSchemaNotBuiltError
 from .xsdbase import XsdComponent
 from .attributes import XsdAttribute
-from .wildcards import XsdAnyElement, XsdWildcard
+from .wildcards import XsdAnyElement, XsdAnyAttribute, XsdWildcard
 from . import elements as elements_module
 
 if TYPE_CHECKING:
@@ -50,9 +50,24 @@ IdentityCounterType = tuple[IdentityFieldItemType, ...]
 
 IdentityMapType = dict[Union['XsdKey', 'XsdKeyref', str, None],
                        Union['IdentityCounter', 'KeyrefCounter']]
-IdentityNodeType = Union[ElementNode, AttributeNode]
 FieldDecoderType = Union[SchemaElementType, SchemaAttributeType]
 
+# A compiled alternative of a selector/field path: a flag for a leading './/',
+# the name tests of the child steps and the optional final attribute name test.
+IdentityPathType = tuple[bool, tuple[str, ...], Optional[str]]
+
+
+def match_name(name_test: str, name: Any) -> bool:
+    """Matches an element or an attribute name with a compiled name test."""
+    if not isinstance(name, str):
+        return False  # comments and processing instructions
+    elif name_test == '*':
+        return True
+    elif name_test[-1] == '*':
+        return name.startswith(name_test[:-1])
+    else:
+        return name == name_test
+
 
 class XsdSelector(XsdComponent):
     """Class for defining an XPath selector for an XSD identity constraint."""
@@ -64,6 +79,7 @@ class XsdSelector(XsdComponent):
     )
     pattern: Optional[re.Pattern[str]] = None
     xpath_default_namespace = ''
+    paths: tuple[IdentityPathType, ...] = ((False, ('*',), None),)
 
     def __init__(self, elem: ElementType, schema: SchemaType,
                  parent: Optional['XsdIdentity']) -> None:
@@ -110,10 +126,68 @@ class XsdSelector(XsdComponent):
         except ElementPathError as err:
             self.token = self.parser.parse('*')
             self.parse_error(err)
+        else:
+            try:
+                self.paths = self.compile_path(self.path)
+            except (KeyError, ValueError) as err:
+                self.parse_error(err)
 
     def __repr__(self) -> str:
         return '%s(path=%r)' % (self.__class__.__name__, self.path)
 
+    def get_name_test(self, name: str, attribute: bool = False) -> str:
+        """Returns the name test of a step, with the prefix resolved to a namespace URI."""
+        if ':' in name:
+            prefix, local_name = name.split(':')
+            return f'{{{self.parser.namespaces[prefix]}}}{local_name}'
+        elif name == '*' or attribute or not self.xpath_default_namespace:
+            return name
+        else:
+            return f'{{{self.xpath_default_namespace}}}{name}'
+
+    def compile_path(self, path: str) -> tuple[IdentityPathType, ...]:
+        """
+        Compiles a selector or field path to a tuple of alternatives that can be
+        matched during the traversal of the XML data, without using XPath nodes.
+        """
+        paths = []
+        for alternative in ''.join(path.split()).split('|'):
+            descendant = alternative.startswith('.//')
+            if descendant:
+                alternative = alternative[3:]
+
+            steps = []
+            attribute = None
+            for step in alternative.split('/'):
+                if attribute is not None:
+                    raise XMLSchemaValueError(_("an attribute must be the last step"))
+                elif step.startswith('@'):
+                    attribute = self.get_name_test(step[1:], attribute=True)
+                elif step.startswith('attribute::'):
+                    attribute = self.get_name_test(step[11:], attribute=True)
+                elif step.startswith('child::'):
+                    steps.append(self.get_name_test(step[7:]))
+                elif step != '.':
+                    steps.append(self.get_name_test(step))
+
+            paths.append((descendant, tuple(steps), attribute))
+        return tuple(paths)
+
+    def is_selecting(self, elements: Sequence[ElementType]) -> bool:
+        """
+        Returns `True` if the selector path selects the last of a sequence
+        of elements, that starts from a child of the context element.
+        """
+        for descendant, steps, _attribute in self.paths:
+            if len(steps) > len(elements):
+                continue
+            elif not descendant and len(steps) < len(elements):
+                continue
+            elif all(match_name(name_test, e.tag) for name_test, e
+                     in zip(reversed(steps), reversed(elements))):
+                return True
+        return False
+
 
 class XsdFieldSelector(XsdSelector):
     """Class for defining an XPath field selector for an XSD identity constraint."""
@@ -127,6 +201,34 @@ class XsdFieldSelector(XsdSelector):
     )
     pattern = None
 
+    def iter_select(self, elem: ElementType) -> Iterator[tuple[ElementType, Optional[str]]]:
+        """
+        Yields the items selected by the field path on an element. Each item is
+        a couple with the selected element and the name of the selected attribute,
+        that is `None` if the field selects the element itself.
+        """
+        selected = set()
+        for descendant, steps, attribute in self.paths:
+            elements: Iterator[ElementType] = elem.iter() if descendant else iter((elem,))
+            for name_test in steps:
+                elements = (child for e in elements for child in e
+                            if match_name(name_test, child.tag))
+
+            for e in elements:
+                if not isinstance(e.tag, str):
+                    continue  # skip comments and processing instructions
+                elif attribute is None:
+                    items: Iterator[tuple[ElementType, Optional[str]]] = iter(((e, None),))
+                else:
+                    items = ((e, name) for name in e.keys() if match_name(attribute, name))
+
+                for item in items:
+                    if len(self.paths) > 1:
+                        if (id(item[0]), item[1]) in selected:
+                            continue
+                        selected.add((id(item[0]), item[1]))
+                    yield item
+
 
 class XsdIdentity(XsdComponent):
     """
@@ -361,54 +463,271 @@ class Xsd11Keyref(XsdKeyref):
             super()._parse()
 
 
+class SpilledCounter(MutableMapping[IdentityCounterType, int]):
+    """
+    A counter of identity values kept in a temporary SQLite database on disk.
+    The values are indexed by their hash and are matched by equality, like the
+    keys of a dictionary, so equal values of different types are counted
+    together as in a :class:`collections.Counter`.
+
+    :param counter: an optional counter with the initial values.
+    """
+    __slots__ = ('_db', '_size')
+
+    def __init__(self, counter: Optional[Counter[IdentityCounterType]] = None) -> None:
+        import sqlite3
+
+        self._db = sqlite3.connect('')  # a private temporary on-disk database
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute('CREATE TABLE counts (hash INTEGER, value BLOB, count INTEGER)')
+        self._db.execute('CREATE INDEX counts_hash ON counts (hash)')
+        self._size = 0
+        if counter is not None:
+            self.update(counter)
+
+    def __repr__(self) -> str:
+        return '%s(<%d values>)' % (self.__class__.__name__, self._size)
+
+    def _find(self, value: IdentityCounterType) -> Optional[tuple[int, int]]:
+        rows = self._db.execute(
+            'SELECT rowid, value, count FROM counts WHERE hash = ?', (hash(value),)
+        )
+        for rowid, data, count in rows:
+            if pickle.loads(data) == value:
+                return rowid, count
+        return None
+
+    def __getitem__(self, value: IdentityCounterType) -> int:
+        row = self._find(value)
+        if row is None:
+            raise KeyError(value)
+        return row[1]
+
+    def __setitem__(self, value: IdentityCounterType, count: int) -> None:
+        row = self._find(value)
+        if row is not None:
+            self._db.execute('UPDATE counts SET count = ? WHERE rowid = ?', (count, row[0]))
+        else:
+            self._insert(value, count)
+
+    def _insert(self, value: IdentityCounterType, count: int) -> None:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._db.execute('INSERT INTO counts VALUES (?, ?, ?)', (hash(value), data, count))
+        self._size += 1
+
+    def __delitem__(self, value: IdentityCounterType) -> None:
+        row = self._find(value)
+        if row is None:
+            raise KeyError(value)
+        self._db.execute('DELETE FROM counts WHERE rowid = ?', (row[0],))
+        self._size -= 1
+
+    def __contains__(self, value: object) -> bool:
+        try:
+            return self._find(cast(IdentityCounterType, value)) is not None
+        except TypeError:
+            return False  # an unhashable value
+
+    def __iter__(self) -> Iterator[IdentityCounterType]:
+        for (data,) in self._db.execute('SELECT value FROM counts'):
+            yield cast(IdentityCounterType, pickle.loads(data))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: IdentityCounterType, count: int = 1) -> int:
+        """Adds a count to a value and returns the updated count of the value."""
+        row = self._find(value)
+        if row is None:
+            self._insert(value, count)
+            return count
+
+        count += row[1]
+        self._db.execute('UPDATE counts SET count = ? WHERE rowid = ?', (count, row[0]))
+        return count
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Adds the counts of another counter, like :meth:`collections.Counter.update`."""
+        for other in args:
+            for value, count in other.items():
+                self.add(value, count)
+
+    def clear(self) -> None:
+        self._db.execute('DELETE FROM counts')
+        self._size = 0
+
+    def close(self) -> None:
+        self._db.close()
+
+
 class IdentityCounter:
-    elements: Optional[set[Any]]  # don't need to check, should be only etree elements anyway
+    depth: Optional[int]  # the position of the context element in the stack of elements
+    counter: Union[Counter[IdentityCounterType], SpilledCounter]
+    spill_threshold: Optional[int]  # the number of values before moving them to disk
 
-    __slots__ = ('elements', 'counter', 'identity', 'elem', 'enabled')
+    __slots__ = ('depth', 'counter', 'identity', 'elem', 'enabled', 'spill_threshold')
 
     def __init__(self, identity: XsdIdentity, elem: ElementType) -> None:
-        self.counter: Counter[IdentityCounterType] = Counter[IdentityCounterType]()
+        self.counter = Counter[IdentityCounterType]()
         self.identity = identity
         self.elem = elem
         self.enabled = True
-        self.elements = None
+        self.depth = None
+        self.spill_threshold = identity.maps.settings.identity_spill_threshold
 
     def __repr__(self) -> str:
         return "%s%r" % (self.__class__.__name__[:-7], self.counter)
 
     def reset(self, elem: ElementType) -> None:
-        self.counter.clear()
+        if isinstance(self.counter, SpilledCounter):
+            self.counter.close()
+            self.counter = Counter[IdentityCounterType]()
+        else:
+            self.counter.clear()
         self.elem = elem
         self.enabled = True
-        self.elements = None
+        self.depth = None
+
+    def is_selecting(self, stack: list[ElementType]) -> bool:
+        """
+        Returns `True` if the identity selector selects the last element of a
+        stack of elements under decoding. The stack must include the context
+        element of the counter, otherwise the selection is always empty.
+        """
+        if self.depth is None or self.depth >= len(stack) or stack[self.depth] is not self.elem:
+            for self.depth in range(len(stack) - 1, -1, -1):
+                if stack[self.depth] is self.elem:
+                    break
+            else:
+                self.depth = None
+                return False
+
+        assert self.identity.selector is not None
+        return self.identity.selector.is_selecting(stack[self.depth + 1:])
 
-    def increase(self, fields: IdentityCounterType) -> None:
-        self.counter[fields] += 1
-        if self.counter[fields] == 2:
+    def increase(self, fields: IdentityCounterType,
+                 identities: Optional[dict[XsdIdentity, 'IdentityCounter']] = None) -> None:
+        """
+        Counts a value of the identity. If the map of the identity counters of the
+        validation is provided, the key references to the value are resolved.
+        """
+        if self._add(fields) == 2:
             msg = _("duplicated value {0!r} for {1!r}")
             raise XMLSchemaValueError(msg.format(fields, self.identity))
 
+        if identities is not None:
+            for counter in identities.values():
+                if isinstance(counter, KeyrefCounter) and counter.refer is self.identity \
+                        and counter.counter and self.is_enclosing(counter):
+                    counter.counter.pop(fields, None)
+                    counter.counter.pop((fields,), None)
+
+    def is_enclosing(self, other: 'IdentityCounter') -> bool:
+        """
+        Returns `True` if the scope of the counter is still open and includes
+        the scope of another counter that is open, so the values collected
+        by the counter are available until the end of the other scope.
+        """
+        if not self.enabled or not other.enabled:
+            return False
+        elif self.elem is other.elem:
+            return True
+        return self.depth is not None and other.depth is not None and \
+            self.depth < other.depth
+
+    def merge(self, other: 'IdentityCounter') -> None:
+        """Adds the values counted by another counter of the same identity."""
+        for fields, count in other.counter.items():
+            self._add(fields, count)
+
+    def propagate(self, identities: dict[XsdIdentity, 'IdentityCounter']) -> None:
+        """
+        Propagates the values of an ended scope to the key references to the
+        identity that are still in scope, like the node table of the scope
+        element is propagated to its ancestors (XSD 1.0 par. 3.11.5 Part 1).
+        """
+        for counter in identities.values():
+            if isinstance(counter, KeyrefCounter) and counter.enabled and \
+                    counter.refer is self.identity and counter.elem is not self.elem:
+                if counter.propagated is None:
+                    counter.propagated = IdentityCounter(self.identity, counter.elem)
+                counter.propagated.merge(self)
+
+    def _add(self, fields: IdentityCounterType, count: int = 1) -> int:
+        if isinstance(self.counter, SpilledCounter):
+            return self.counter.add(fields, count)
+
+        count = self.counter[fields] = self.counter[fields] + count
+        if self.spill_threshold is not None and len(self.counter) > self.spill_threshold:
+            self.counter = SpilledCounter(self.counter)
+        return count
+
 
 class KeyrefCounter(IdentityCounter):
     identity: XsdKeyref
+    refer: Union[XsdKey, XsdUnique, None]
+    propagated: Optional[IdentityCounter]  # the referred values of ended inner scopes
+
+    __slots__ = ('refer', 'propagated')
 
     def __init__(self, identity: XsdIdentity, elem: ElementType) -> None:
         super().__init__(identity, elem)
+        self.propagated = None
         if isinstance(self.identity.refer, (XsdKey, XsdUnique)):
             self.refer = self.identity.refer
+        else:
+            self.refer = None
 
-    def increase(self, fields: IdentityCounterType) -> None:
-        self.counter[fields] += 1
+    def reset(self, elem: ElementType) -> None:
+        super().reset(elem)
+        if self.propagated is not None:
+            self.propagated.reset(elem)
+            self.propagated = None
+
+    def merge(self, other: IdentityCounter) -> None:
+        super().merge(other)
+        if isinstance(other, KeyrefCounter) and other.propagated is not None:
+            if self.propagated is None:
+                self.propagated = IdentityCounter(other.propagated.identity, self.elem)
+            self.propagated.merge(other.propagated)
+
+    def increase(self, fields: IdentityCounterType,
+                 identities: Optional[dict[XsdIdentity, IdentityCounter]] = None) -> None:
+        """
+        Counts a value of the key reference. If the map of the identity counters of
+        the validation is provided, a value that is already resolved is not counted.
+        Only the values of a referred scope that includes the scope of the key
+        reference are used, because these are still collected at the end of it.
+        """
+        if identities is not None and self.refer is not None:
+            refer_counter = identities.get(self.refer)
+            if refer_counter is not None and refer_counter.is_enclosing(self):
+                refer_values = refer_counter.counter
+                if fields in refer_values or len(fields) == 1 and fields[0] in refer_values:
+                    return
+        self._add(fields)
 
     def iter_errors(self, identities: dict[XsdIdentity, IdentityCounter]) \
             -> Iterator[XMLSchemaValueError]:
         if self.refer is None:
             return  # don't validate with an unbuilt keyref
 
-        refer_values = identities[self.refer].counter
+        # The referred values are those of a referred scope that includes the
+        # scope of the key reference and those propagated from ended inner
+        # scopes, excluding the values that conflict between these scopes.
+        refer_counter = identities[self.refer]
+        if refer_counter.enabled or refer_counter.elem is self.elem:
+            refer_values = refer_counter.counter
+        else:
+            refer_values = Counter()
+        propagated = self.propagated.counter if self.propagated is not None else Counter()
+
+        def is_referred(value: Any) -> bool:
+            return value in refer_values or propagated.get(value) == 1
 
-        for v in filter(lambda x: x not in refer_values, self.counter):
-            if len(v) == 1 and v[0] in refer_values:
+        for v in filter(lambda x: not is_referred(x), self.counter):
+            if len(v) == 1 and is_referred(v[0]):
                 continue
             elif self.counter[v] > 1:
                 msg = "value {} not found for {!r} ({} times)"
@@ -458,71 +777,72 @@ class FieldValueSelector:
         if len(self.decoders) > 1 and None in self.value_constraints:
             self.value_constraints.pop(None)
 
-    def get_value(self, element_node: EtreeElementNode,
+    def get_decoder(self, name: str, attribute: bool = False) -> Optional[FieldDecoderType]:
+        """
+        Returns the XSD element or attribute declaration that matches the name of a
+        selected field item. Returns `None` if no declaration is found or if the name
+        matches a wildcard and no global declaration is available.
+        """
+        for decoder in self.decoders:
+            if isinstance(decoder, (XsdAttribute, XsdAnyAttribute)) is not attribute:
+                continue
+            elif not decoder.is_matching(name):
+                continue
+            elif not isinstance(decoder, XsdWildcard):
+                return decoder
+            elif attribute:
+                return self.xsd_element.maps.attributes.get(name)
+            else:
+                return self.xsd_element.maps.elements.get(name)
+        return None
+
+    def get_value(self, elem: ElementType,
                   namespaces: Optional[NsmapType] = None) -> IdentityFieldItemType:
         """
-        Get field value from an element node for a schema or instance context element.
+        Get field value from an element for a schema or instance context element.
 
-        :param element_node: a no Element
+        :param elem: the Element instance selected by the identity selector.
         :param namespaces: is an optional mapping from namespace prefix to URI.
         """
         value: Union[AtomicValueType, list[Optional[AtomicValueType]], None] = None
-        element_node.schema = None  # type: ignore[assignment]
-        context = XPathContext(
-            element_node,
-            namespaces=namespaces,
-            schema=self.xpath_proxy,
-        )
 
-        empty = True
-        for node in cast(Iterator[IdentityNodeType], self.token.select(context)):
-            if empty:
-                empty = False
+        items = list(self.field.iter_select(elem))
+        if len(items) > 1:
+            msg = _("%r field selects multiple values!")
+            raise XMLSchemaValueError(msg % self.field)
+        elif not items:
+            value = self.value_constraints.get(None)
+        else:
+            e, name = items[0]
+            if name is None:
+                name = e.tag
+                string_value = ''.join(e.itertext())
+                decoder = self.get_decoder(name)
             else:
-                msg = _("%r field selects multiple values!")
-                raise XMLSchemaValueError(msg % self.field)
-
-            try:
-                xsd_type = cast(Optional[BaseXsdType], node.xsd_type)
-            except AttributeError:
-                msg = _("%r field selects a %r!")
-                raise XMLSchemaTypeError(msg % (self.field, type(node)))
+                string_value = cast(str, e.get(name))
+                decoder = self.get_decoder(name, attribute=True)
 
+            xsd_type = decoder.type if decoder is not None else None
             if xsd_type is None:
                 if self.skip_wildcard:
                     value = None
                 else:
-                    value = node.string_value
+                    value = string_value
             elif xsd_type.content_type_label not in ('simple', 'mixed'):
                 msg = _("%r field doesn't have a simple type!")
                 raise XMLSchemaTypeError(msg % self.field)
             elif xsd_type.is_qname():
-                value = get_extended_qname(node.string_value.strip(), namespaces)
-            elif xsd_type.is_boolean():
-                # Workarounds for discovered issues with XPath processors
-                value = xsd_type.text_decode(node.string_value.strip())
+                value = get_extended_qname(string_value.strip(), namespaces)
             else:
-                try:
-                    value = node.typed_value  # type: ignore[assignment,unused-ignore]
-                except (KeyError, ValueError):
-                    for decoder in self.decoders:
-                        if not isinstance(decoder, XsdWildcard):
-                            if decoder.is_matching(node.name):
-                                value = decoder.type.text_decode(node.string_value)
-                                break
-                    else:
-                        value = node.string_value
+                value = xsd_type.text_decode(string_value)
 
             if value is None:
-                value = self.value_constraints.get(node.name)
-        else:
-            if empty:
-                value = self.value_constraints.get(None)
+                value = self.value_constraints.get(name)
 
         match value:
             case None:
                 if not isinstance(self.field.parent, XsdKey) or \
-                        'ref' in element_node.obj.attrib and \
+                        'ref' in elem.attrib and \
                         self.field.schema.meta_schema is None and \
                         self.field.schema.XSD_VERSION != '1.0':
                     return None
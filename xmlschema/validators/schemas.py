@@ -18,6 +18,7 @@ from abc import ABCMeta
 import logging
 import re
 import sys
+import time
 from collections.abc import Callable, Iterator
 from functools import cached_property
 from operator import attrgetter
@@ -46,17 +47,19 @@ from xmlschema.utils.qnames import get_namespace_ext
 from xmlschema.resources import XMLResource
 from xmlschema.arguments import check_validation_mode
 from xmlschema.converters import XMLSchemaConverter, ConverterType
-from xmlschema.xpath import XMLSchemaProxy, ElementPathMixin
+from xmlschema.xpath import XMLSchemaProxy, ElementPathMixin, CompiledXPath
 from xmlschema.namespaces import NamespaceView, NamespaceMapper
 from xmlschema.locations import SCHEMAS_DIR
 from xmlschema.loaders import SchemaLoader
 from xmlschema.exports import export_schema
 from xmlschema.settings import SchemaSettings, ResourceSettings
+from xmlschema.profiler import profile_phase
 from xmlschema import dataobjects
 
 from .exceptions import XMLSchemaValidationError, XMLSchemaEncodeError, \
     XMLSchemaStopValidation
-from .validation import ValidationContext, DecodeContext, EncodeContext
+from .validation import ValidationContext, DecodeContext, EncodeContext, \
+    StreamEncodeContext
 from .helpers import parse_xsd_derivation, get_schema_annotations, qname_validator, \
     parse_xpath_default_namespace, parse_target_namespace
 from .xsdbase import XSD_ELEMENT_DERIVATIONS, XsdValidator, XsdComponent, XsdAnnotation
@@ -324,7 +327,10 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             other_sources = []
 
         logger.debug("Load schema from %r", source)
-        self.source = settings.get_schema_resource(source, base_url)
+        with profile_phase('resource') as phase:
+            self.source = settings.get_schema_resource(source, base_url)
+            if phase is not None:
+                phase.source = self.source.url
 
         self.name = self.source.name
         root = self.source.root
@@ -392,10 +398,22 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
         # Validate the schema document (transforming validation errors to parse errors)
         # Don't check package schemas.
-        if validation != 'skip':
+        trusted_sources = settings.trusted_sources
+        if validation == 'skip':
+            pass
+        elif trusted_sources is not None and trusted_sources.is_trusted(self.source):
+            logger.info("Skip meta-schema validation of trusted source %r", self.source)
+        else:
             self.meta_schema.build()
-            for e in self.meta_schema.iter_errors(root, namespaces=self.namespaces):
-                self.parse_error(e.reason or e, elem=e.elem)
+            with profile_phase('meta-validation', self.source.url):
+                start_time = time.perf_counter()
+                errors_count = len(self.errors)
+                for e in self.meta_schema.iter_errors(root, namespaces=self.namespaces):
+                    self.parse_error(e.reason or e, elem=e.elem)
+
+                if trusted_sources is not None and trusted_sources.record \
+                        and len(self.errors) == errors_count:
+                    trusted_sources.add(self.source, time.perf_counter() - start_time)
 
         if partial:
             for child in iter_schema_declarations(root):
@@ -405,7 +423,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                     self.imported_namespaces.append(namespace)
             return
 
-        self.maps.loader.load_declared_schemas(self, other_sources)
+        with profile_phase('imports', self.source.url):
+            self.maps.loader.load_declared_schemas(self, other_sources)
 
         # Parse XSD 1.1 default declarations (defaultAttributes, defaultOpenContent,
         # xpathDefaultNamespace) after all imports/includes.
@@ -506,6 +525,19 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
     copy = __copy__
 
+    def create_overlay(self) -> SchemaType:
+        """
+        Creates a copy-on-write variant of the schema, that shares the built
+        components of the schema and stores only the globals of the schemas
+        added to it (e.g. with :meth:`add_schema`), that are looked up first.
+        The added schemas can redefine the globals of the schema. The schema
+        must be the main validator of its global maps.
+        """
+        if self.maps.validator is not self:
+            msg = _("{!r} is not the main validator of its global maps")
+            raise XMLSchemaValueError(msg.format(self))
+        return self.maps.create_overlay().validator
+
     @property
     def xsd_version(self) -> str:
         """Compatibility property that returns the class attribute XSD_VERSION."""
@@ -561,6 +593,18 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         # noinspection PyTypeChecker
         return build_schema_node_tree(root=self, uri=self.source.url)
 
+    def compile_xpath(self, expression: str,
+                      namespaces: Optional[NsmapType] = None) -> CompiledXPath:
+        """
+        Compiles an XPath 2.0 expression to a query bound to the schema, that can
+        be applied to XML instances for selecting typed nodes and values.
+
+        :param expression: the XPath 2.0 expression.
+        :param namespaces: an optional mapping from namespace prefixes to URIs \
+        used for parsing the expression. Defaults to the namespaces of the schema.
+        """
+        return CompiledXPath(self, expression, namespaces)
+
     @property
     def xpath_tokens(self) -> dict[str, type[XPathToken]]:
         """Returns the XPath constructors tokens."""
@@ -850,8 +894,11 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
     @cached_property
     def validation_attempted(self) -> str:
-        if any(isinstance(t, tuple) and t[-1] is self
-               for x in self.maps.global_maps.iter_staged() for t in x):
+        if self.maps.base is not None and self.maps.validator is self:
+            # The globals of the main validator of an overlay are provided by the base
+            return self.maps.base.validator.validation_attempted
+        elif any(isinstance(t, tuple) and t[-1] is self
+                 for x in self.maps.global_maps.iter_staged() for t in x):
             return 'partial'
         elif any(c.schema is self and not c.built
                  for c in self.maps.global_maps.iter_globals()):
@@ -880,14 +927,20 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         def schema_filter(comp: XsdComponent) -> bool:
             return comp.schema is self
 
-        yield from filter(schema_filter, self.maps.iter_globals())
+        if self.maps.base is not None and self.maps.validator is self:
+            yield from self.maps.base.validator.iter_globals()
+        else:
+            yield from filter(schema_filter, self.maps.iter_globals())
 
     def iter_staged(self) -> Iterator[StagedItemType]:
         """Iterates the unbuilt XSD global definitions/declarations of the schema."""
         def schema_filter(x: StagedItemType) -> bool:
             return x[1] is self if len(x) == 2 else x[0][1] is self
 
-        yield from filter(schema_filter, self.maps.iter_staged())
+        if self.maps.base is not None and self.maps.validator is self:
+            yield from self.maps.base.validator.iter_staged()
+        else:
+            yield from filter(schema_filter, self.maps.iter_staged())
 
     def iter_components(self, xsd_classes: ComponentClassType = None) \
             -> Iterator[Union[XsdComponent, SchemaType]]:
@@ -1305,6 +1358,7 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             converter=NamespaceMapper(namespaces, source=resource),
             level=resource.lazy_depth or bool(path),
             check_identities=True,
+            id_spill_threshold=self.maps.settings.id_spill_threshold,
             use_defaults=use_defaults,
             use_location_hints=use_location_hints,
             max_depth=max_depth,
@@ -1369,6 +1423,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                     yield context.missing_element_error(validation, self, elem, path, schema_path)
                     return
 
+            # Identity selectors are matched on the stack of decoded elements
+            context.stack = [] if elem is resource.root else ancestors[:]
             try:
                 xsd_element.raw_decode(elem, validation, context)
             except XMLSchemaStopValidation:
@@ -1385,7 +1441,7 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
         if context.identities is not identities:
             for identity, counter in context.identities.items():
-                identities[identity].counter.update(counter.counter)
+                identities[identity].merge(counter)
             context.identities = identities
 
         yield from self._validate_references(validation, context)
@@ -1393,10 +1449,9 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
     def _validate_references(self, validation: str, context: ValidationContext) \
             -> Iterator[XMLSchemaValidationError]:
         # Check unresolved IDREF values
-        for k, v in context.id_map.items():
-            if v == 0:
-                msg = _("IDREF %r not found in XML document") % k
-                yield context.validation_error(validation, self, msg, context.source.root)
+        for k in context.id_map.pending:
+            msg = _("IDREF %r not found in XML document") % k
+            yield context.validation_error(validation, self, msg, context.source.root)
 
         # Check still enabled key references (lazy validation cases)
         for identity, counter in context.identities.items():
@@ -1542,6 +1597,7 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             process_namespaces=process_namespaces,
             namespaces=namespaces,
             check_identities=True,
+            id_spill_threshold=self.maps.settings.id_spill_threshold,
             use_defaults=use_defaults,
             use_location_hints=use_location_hints,
             decimal_type=decimal_type,
@@ -1705,6 +1761,7 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             source=obj,
             namespaces=namespaces,
             check_identities=True,
+            id_spill_threshold=self.maps.settings.id_spill_threshold,
             use_defaults=use_defaults,
             converter=converter,
             unordered=unordered,
@@ -1714,9 +1771,12 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             etree_element_class=etree_element_class,
         )
         kwargs['converter'] = self.maps.settings.get_converter(**kwargs)
-        context = EncodeContext(**kwargs)
-        namespaces = context.namespaces
+        yield from self._iter_encode(obj, path, validation, EncodeContext(**kwargs))
 
+    def _iter_encode(self, obj: Any, path: Optional[str], validation: str,
+                     context: EncodeContext) \
+            -> Iterator[Union[Element, XMLSchemaValidationError]]:
+        namespaces = context.namespaces
         xsd_element = None
         if path is not None:
             match = re.search(r'[{\w]', path)
@@ -1793,6 +1853,67 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
     to_etree = encode
 
+    def encode_to_stream(self, obj: Any, fp: Any,
+                         path: Optional[str] = None,
+                         validation: str = 'strict',
+                         encoding: str = 'unicode',
+                         xml_declaration: bool = False,
+                         buffer_size: int = 8 * 1024,
+                         flush: bool = False,
+                         **kwargs: Any) -> list[XMLSchemaValidationError]:
+        """
+        Encodes to XML data writing it directly to a file-like object, without
+        building an ElementTree structure. The elements are written as soon as
+        they are encoded, so the memory usage doesn't depend on the size of data.
+        The output is the same of :func:`etree_tostring` called on the result of
+        :meth:`encode` with the namespace map of the converter, except that
+        namespaces not included in the map are declared on the first element
+        that uses them and that unused namespaces of the map are declared too.
+
+        :param obj: the data that has to be encoded to XML data.
+        :param fp: a writable file-like object. If *encoding* is "unicode" \
+        it must be a text stream, otherwise it must be a binary stream.
+        :param path: is an optional XPath expression for selecting the element of \
+        the schema that matches the data that has to be encoded.
+        :param validation: the XSD validation mode. Can be 'strict', 'lax' or 'skip'. \
+        In 'strict' mode a validation error stops the encoding after writing the \
+        data that precedes it.
+        :param encoding: if "unicode" (the default) writes text, otherwise writes bytes.
+        :param xml_declaration: if set to `True` writes an XML declaration at the \
+        start. Ignored if the encoding is "unicode".
+        :param buffer_size: the size of the chunks of data written to the file object.
+        :param flush: if `True` flushes the file object after each chunk written.
+        :param kwargs: other options of :meth:`iter_encode`, except *etree_element_class*.
+        :return: the list of validation errors collected in 'lax' mode.
+        """
+        self.check_validator(validation)
+        if not self.elements:
+            msg = _("encoding needs at least one XSD element declaration")
+            raise XMLSchemaValueError(msg)
+
+        kwargs.update(source=obj, check_identities=True,
+                      id_spill_threshold=self.maps.settings.id_spill_threshold)
+        kwargs.pop('etree_element_class', None)
+        kwargs['converter'] = self.maps.settings.get_converter(**kwargs)
+        context = StreamEncodeContext(
+            fp=fp,
+            encoding=encoding,
+            xml_declaration=xml_declaration,
+            buffer_size=buffer_size,
+            flush=flush,
+            **kwargs
+        )
+
+        errors = []
+        for result in self._iter_encode(obj, path, validation, context):
+            if isinstance(result, XMLSchemaValidationError):
+                if validation == 'strict':
+                    raise result
+                errors.append(result)
+            else:
+                context.write_root(result)
+        return errors
+
 
 class XMLSchema10(XMLSchemaBase):
     """
@@ -701,6 +701,12 @@ class XsdAtomicBuiltin(XsdAtomic):
 
     def raw_decode(self, obj: str | bytes, validation: str,
                    context: ValidationContext) -> DecodedValueType:
+        if context.profiler is not None and context.profiler.enter(self):
+            try:
+                return XsdAtomicBuiltin.raw_decode(self, obj, validation, context)
+            finally:
+                context.profiler.exit()
+
         if isinstance(obj, (str, bytes)):
             obj = self.normalize(obj)
         elif not isinstance(obj, self.instance_types):
@@ -758,17 +764,13 @@ class XsdAtomicBuiltin(XsdAtomic):
             elif not context.check_identities:
                 pass  # context created from a component
             elif self.name == nm.XSD_IDREF:
-                if obj not in context.id_map:
-                    context.id_map[obj] = 0
+                context.id_map.add_idref(obj)
             elif context.level:
                 if context.id_list is None:
-                    if not context.id_map[obj]:
-                        context.id_map[obj] = 1
-                    else:
+                    if not context.id_map.add_id(obj):
                         reason = _("duplicated xs:ID value {!r}").format(obj)
                         context.validation_error(validation, self, reason, obj)
-                elif not context.id_map[obj]:
-                    context.id_map[obj] = 1
+                elif context.id_map.add_id(obj):
                     context.id_list.append(obj)
                     if len(context.id_list) > 1 and self.xsd_version == '1.0':
                         reason = _("no more than one attribute of type ID should "
@@ -1448,6 +1450,12 @@ class XsdAtomicRestriction(XsdAtomic):
     def raw_decode(self, obj: str | bytes, validation: str,
                    context: ValidationContext) -> DecodedValueType:
 
+        if context.profiler is not None and context.profiler.enter(self):
+            try:
+                return XsdAtomicRestriction.raw_decode(self, obj, validation, context)
+            finally:
+                context.profiler.exit()
+
         if isinstance(obj, (str, bytes)):
             obj = self.normalize(obj)
 
@@ -10,8 +10,8 @@
 import copy
 import decimal
 import logging
+import sys
 from abc import abstractmethod, ABCMeta
-from collections import Counter
 from collections.abc import Iterable, Iterator, MutableSequence
 from functools import partial
 from typing import Any, Generic, Optional, TYPE_CHECKING, TypeVar, Union
@@ -27,13 +27,14 @@ from xmlschema.aliases import DecodeType, DepthFillerType, ElementType, \
 from xmlschema.exceptions import XMLSchemaTypeError
 from xmlschema.translation import gettext as _
 from xmlschema.utils.decoding import EmptyType, raw_encode_value
-from xmlschema.utils.etree import is_etree_element, is_etree_document
+from xmlschema.utils.etree import is_etree_element, is_etree_document, XmlStreamWriter
 from xmlschema.utils.logger import format_xmlschema_stack
 from xmlschema.utils.misc import iter_class_slots
 from xmlschema.utils.qnames import get_prefixed_qname
 from xmlschema.namespaces import NamespaceMapper
 from xmlschema.converters import XMLSchemaConverter
 from xmlschema.resources import XMLResource
+from xmlschema.profiler import DecodeProfiler, get_decode_profiler
 from xmlschema.arguments import Arguments, BooleanOption, NonNegIntOption, \
     validate_type, Argument, MaxDepthOption, ExtraValidatorOption, \
     ValidationHookOption, FillerOption, ElementHookOption, DepthFillerOption, \
@@ -113,6 +114,132 @@ class EncodeArguments(ValidationArguments):
     unordered = untyped_data = BooleanOption(default=False)
 
 
+class IdRegistry:
+    """
+    A registry of the xs:ID values of an XML document, that keeps also the IDREF
+    values not yet resolved. The IDs are stored in a set and the pending IDREF
+    values in an ordered mapping, that shrinks when the referenced IDs appear.
+    An in-memory registry takes about the same memory of a counter of the IDs,
+    only the spilling to disk saves memory: beyond an optional spill threshold
+    the IDs are moved to a temporary SQLite database on disk.
+
+    A copy shares the IDs spilled to disk by the original registry, limited to
+    those registered at the moment of the copy, and spills its own IDs to a
+    new database, so the registries remain independent.
+
+    :param spill_threshold: an optional number of IDs to keep in memory.
+    """
+    ids: set[str]
+    pending: dict[str, None]  # the unresolved IDREF values, in order of occurrence
+    spill_threshold: Optional[int]
+    spilled: int  # the number of IDs stored on disk
+
+    __slots__ = ('ids', 'pending', 'spill_threshold', 'spilled', '_db', '_size', '_shared')
+
+    def __init__(self, spill_threshold: Optional[int] = None) -> None:
+        self.ids = set()
+        self.pending = {}
+        self.spill_threshold = spill_threshold
+        self.spilled = 0
+        self._db: Any = None
+        self._size = 0  # the number of IDs stored in the own database
+        self._shared: tuple[tuple[Any, int], ...] = ()  # databases and row limits
+
+    def __repr__(self) -> str:
+        return '%s(<%d IDs>, <%d pending IDREFs>)' % (
+            self.__class__.__name__, len(self), len(self.pending)
+        )
+
+    def __contains__(self, value: object) -> bool:
+        if value in self.ids:
+            return True
+
+        for db, limit in self._shared:
+            row = db.execute('SELECT rowid FROM ids WHERE id = ?', (value,)).fetchone()
+            if row is not None and row[0] <= limit:
+                return True
+
+        if self._db is None:
+            return False
+        return self._db.execute(
+            'SELECT 1 FROM ids WHERE id = ?', (value,)
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return len(self.ids) + self.spilled
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.ids
+        for db, limit in self._shared:
+            for (value,) in db.execute('SELECT id FROM ids WHERE rowid <= ?', (limit,)):
+                yield value
+        if self._db is not None:
+            for (value,) in self._db.execute('SELECT id FROM ids'):
+                yield value
+
+    def copy(self) -> 'IdRegistry':
+        registry = IdRegistry(self.spill_threshold)
+        registry.ids = self.ids.copy()
+        registry.pending = self.pending.copy()
+        registry.spilled = self.spilled
+        registry._shared = self._shared
+        if self._db is not None:
+            # Rows are never deleted, so the rowids of the IDs are 1..size
+            registry._shared += ((self._db, self._size),)
+        return registry
+
+    @property
+    def memory_usage(self) -> int:
+        """An estimate of the memory used by the registry, in bytes."""
+        return sys.getsizeof(self.ids) + sys.getsizeof(self.pending) + \
+            sum(sys.getsizeof(x) for x in self.ids) + \
+            sum(sys.getsizeof(x) for x in self.pending)
+
+    def add_id(self, value: str) -> bool:
+        """
+        Registers an ID value, resolving the pending IDREF values that refer to it.
+        Returns `False` if the value was already registered, `True` otherwise.
+        """
+        if value in self:
+            return False
+
+        self.ids.add(value)
+        if self.pending:
+            self.pending.pop(value, None)
+        if self.spill_threshold is not None and len(self.ids) > self.spill_threshold:
+            self._spill(self.ids)
+            self.spilled += len(self.ids)
+            self._size += len(self.ids)
+            self.ids.clear()
+        return True
+
+    def add_idref(self, value: str) -> None:
+        """Registers an IDREF value, that is pending if its ID is not registered yet."""
+        if value not in self.pending and value not in self:
+            self.pending[value] = None
+
+    def _spill(self, values: Iterable[str]) -> None:
+        if self._db is None:
+            import sqlite3
+
+            self._db = sqlite3.connect('')  # a private temporary on-disk database
+            self._db.execute('PRAGMA journal_mode = OFF')
+            self._db.execute('PRAGMA synchronous = OFF')
+            self._db.execute('CREATE TABLE ids (id TEXT UNIQUE)')
+
+        self._db.executemany('INSERT INTO ids VALUES (?)', ((x,) for x in values))
+
+    def clear(self) -> None:
+        # The databases are not closed because they can be shared with copies,
+        # a temporary database is removed when its last reference is lost.
+        self.ids.clear()
+        self.pending.clear()
+        self.spilled = 0
+        self._db = None
+        self._size = 0
+        self._shared = ()
+
+
 class ValidationContext:
     """
     A context class for handling validated decoding process. It stores together
@@ -128,7 +255,7 @@ class ValidationContext:
                  'preserve_mixed', 'process_skipped', 'max_depth',
                  'extra_validator', 'validation_hook', 'use_location_hints',
                  'inherited', 'id_map', 'identities', 'id_list', 'elem',
-                 'attribute', 'patterns')
+                 'attribute', 'patterns', 'stack', 'profiler')
 
     def __init__(self,
                  source: Union[XMLResource, Any],
@@ -143,6 +270,7 @@ class ValidationContext:
                  extra_validator: Optional[ExtraValidatorType] = None,
                  validation_hook: Optional[ValidationHookType] = None,
                  use_location_hints: bool = False,
+                 id_spill_threshold: Optional[int] = None,
                  **kwargs: Any) -> None:
 
         self.source = source
@@ -163,7 +291,7 @@ class ValidationContext:
         self.validation_hook = validation_hook
         self.use_location_hints = use_location_hints
 
-        self.id_map: Counter[str] = Counter()
+        self.id_map = IdRegistry(id_spill_threshold)
         self.identities: dict['XsdIdentity', 'IdentityCounter'] = {}
         self.inherited: dict[str, str] = {}
 
@@ -172,6 +300,8 @@ class ValidationContext:
         self.elem: Optional[ElementType] = None
         self.attribute: Optional[str] = None
         self.patterns: Optional['XsdPatternFacets'] = None
+        self.stack: list[ElementType] = []  # the elements under decoding
+        self.profiler: Optional[DecodeProfiler] = get_decode_profiler()
 
         self.validation_only = self.__class__ is ValidationContext
         self._arguments.validate(self)
@@ -205,6 +335,7 @@ class ValidationContext:
         self.attribute = None
         self.id_list = None
         self.patterns = None
+        self.stack.clear()
 
     @property
     def root_namespace(self) -> Optional[str]:
@@ -464,6 +595,98 @@ class EncodeContext(ValidationContext):
                     assert children[-1].tail is not None
                     children[-1].tail = children[-1].tail[:-self.indent]
 
+    def start_child(self, elem: ElementType,
+                    text: Optional[str],
+                    children: list[ElementType],
+                    mixed: bool = False) -> None:
+        """
+        Called before encoding each child of an Element, for default does nothing.
+
+        :param elem: the parent Element.
+        :param text: the text of the parent Element before the first child.
+        :param children: the list of the children already encoded.
+        :param mixed: whether the content of the parent is mixed.
+        """
+
+
+class StreamEncodeContext(EncodeContext):
+    """
+    A context for encoding processes that write the XML data to a file-like object.
+    The elements are created without attaching them to their parent and are written
+    as soon as they are completed, so the memory usage is bound to the depth of the
+    encoded data. The output is the same of :func:`etree_tostring` on the encoded
+    tree with the namespace map of the converter, with the differences explained
+    for :class:`xmlschema.utils.etree.XmlStreamWriter`.
+    """
+    __slots__ = ('writer', '_last_written')
+
+    def __init__(self, source: Any,
+                 fp: Any,
+                 encoding: str = 'unicode',
+                 xml_declaration: bool = False,
+                 buffer_size: int = 8 * 1024,
+                 flush: bool = False,
+                 **kwargs: Any) -> None:
+        super().__init__(source, **kwargs)
+        self.etree_element_class = Element
+        self.writer = XmlStreamWriter(
+            fp, self.namespaces, encoding, xml_declaration, buffer_size, flush
+        )
+        self._last_written: list[Optional[ElementType]] = []
+
+    def start_child(self, elem: ElementType,
+                    text: Optional[str],
+                    children: list[ElementType],
+                    mixed: bool = False) -> None:
+        if self.writer.current is not elem:
+            if not mixed:
+                padding = '\n' + ' ' * self.indent * self.level
+                text = padding if not text else padding + text
+            self.writer.start(elem, text)
+            self._last_written.append(None)
+        elif children and children[-1] is not self._last_written[-1]:
+            child = children[-1]
+            if mixed:
+                self._write_child(child, child.tail)
+            else:
+                padding = '\n' + ' ' * self.indent * self.level
+                self._write_child(child, padding if not child.tail
+                                  else padding + child.tail + padding)
+
+            self._last_written[-1] = child
+            del children[:-1]  # keep only the last for mixed content tails
+
+    def set_element_content(self, elem: ElementType,
+                            text: Optional[str] = None,
+                            children: Optional[list[Element]] = None,
+                            level: int = 0,
+                            mixed: bool = False) -> None:
+        if self.writer.current is not elem:
+            elem.text = text  # An element without children, written by its parent
+            return
+
+        if children and children[-1] is not self._last_written[-1]:
+            child = children[-1]
+            if mixed:
+                self._write_child(child, child.tail)
+            else:
+                padding = '\n' + ' ' * self.indent * level
+                tail = padding if not child.tail else padding + child.tail + padding
+                self._write_child(child, tail[:-self.indent] if self.indent else tail)
+
+        self._last_written.pop()
+        self.writer.end()
+
+    def write_root(self, root: ElementType) -> None:
+        """Completes the writing of the encoded root and flushes the data."""
+        self._write_child(root, root.tail)
+        self.writer.close()
+
+    def _write_child(self, child: ElementType, tail: Optional[str]) -> None:
+        if child is not self.writer.last_closed:
+            self.writer.write_element(child)
+        self.writer.write_text(tail)
+
 
 ST = TypeVar('ST')
 DT = TypeVar('DT')
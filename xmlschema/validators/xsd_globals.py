@@ -15,12 +15,13 @@ from collections.abc import Collection, Iterator, Iterable
 from contextlib import contextmanager
 from functools import cached_property
 from itertools import dropwhile
+from types import MappingProxyType
 from typing import Any, cast, Optional
 from elementpath import XPathToken, XPath2Parser
 
 import xmlschema.names as nm
 from xmlschema.aliases import SchemaType, BaseXsdType, SchemaGlobalType, \
-    SourceArgType, NsmapType, StagedItemType, ComponentClassType
+    SourceArgType, NsmapType, StagedItemType, ComponentClassType, ElementType
 from xmlschema.exceptions import XMLSchemaAttributeError, XMLSchemaTypeError, \
     XMLSchemaValueError, XMLSchemaWarning, XMLSchemaNamespaceError, XMLSchemaException
 from xmlschema.translation import gettext as _
@@ -31,6 +32,7 @@ from xmlschema.locations import NamespaceResourcesMap
 from xmlschema.resources import XMLResource
 from xmlschema.xpath import XsdAssertionXPathParser
 from xmlschema.settings import SchemaSettings
+from xmlschema.profiler import profile_phase
 
 from .exceptions import XMLSchemaValidatorError, XMLSchemaModelError, \
     XMLSchemaModelDepthError, XMLSchemaParseError
@@ -39,14 +41,47 @@ from .models import check_model
 from . import XsdAttribute, XsdSimpleType, XsdComplexType, XsdElement, \
     XsdGroup, XsdIdentity, XsdUnion, XsdAtomicRestriction, \
     XsdAtomic, XsdAtomicBuiltin, XsdNotation, XsdAttributeGroup
-from .builders import GLOBAL_MAP_ATTRIBUTE, GlobalMaps, TypesMap, NotationsMap, \
-    AttributesMap, AttributeGroupsMap, ElementsMap, GroupsMap
+from .builders import GLOBAL_MAP_ATTRIBUTE, GLOBAL_MAP_INDEX, GlobalMaps, StagedMap, \
+    TypesMap, NotationsMap, AttributesMap, AttributeGroupsMap, ElementsMap, GroupsMap
 from xmlschema import _limits
 
 
 # Default placeholder for deprecation of argument 'validation' in XsdGlobals
 _strict = type('str', (str,), {})('strict')
 
+# Attributes of XSD declarations/definitions that refer to global components,
+# with the tag that selects the global map of the referred components.
+REFERENCE_ATTRIBUTES = MappingProxyType({
+    nm.XSD_ELEMENT: (('ref', nm.XSD_ELEMENT), ('type', nm.XSD_SIMPLE_TYPE),
+                     ('substitutionGroup', nm.XSD_ELEMENT)),
+    nm.XSD_ATTRIBUTE: (('ref', nm.XSD_ATTRIBUTE), ('type', nm.XSD_SIMPLE_TYPE)),
+    nm.XSD_GROUP: (('ref', nm.XSD_GROUP),),
+    nm.XSD_ATTRIBUTE_GROUP: (('ref', nm.XSD_ATTRIBUTE_GROUP),),
+    nm.XSD_RESTRICTION: (('base', nm.XSD_SIMPLE_TYPE),),
+    nm.XSD_EXTENSION: (('base', nm.XSD_SIMPLE_TYPE),),
+    nm.XSD_LIST: (('itemType', nm.XSD_SIMPLE_TYPE),),
+    nm.XSD_UNION: (('memberTypes', nm.XSD_SIMPLE_TYPE),),
+    nm.XSD_ALTERNATIVE: (('type', nm.XSD_SIMPLE_TYPE),),
+})
+
+
+def iter_references(elem: ElementType, schema: SchemaType) -> Iterator[tuple[int, str]]:
+    """
+    Iterates the references to global components of an XSD declaration/definition,
+    as couples of global map index and expanded QName.
+    """
+    for e in elem.iter():
+        for attribute, tag in REFERENCE_ATTRIBUTES.get(e.tag, ()):
+            value = e.get(attribute)
+            if value is None:
+                continue
+
+            for qname in value.split():
+                try:
+                    yield GLOBAL_MAP_INDEX[tag], schema.resolve_qname(qname, False)
+                except XMLSchemaException:
+                    pass
+
 
 class XsdGlobals(XsdValidator, Collection[SchemaType]):
     """
@@ -67,12 +102,16 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
     location hints to load well-known namespaces (e.g. xhtml).
     :param use_xpath3: if `True` an XSD 1.1 schema instance uses the XPath 3 processor \
     for assertions. For default a full XPath 2.0 processor is used.
+    :param base: optional base global maps for creating a copy-on-write overlay. \
+    In this case the validator must be a copy of the main validator of the base \
+    maps. Use :meth:`create_overlay` for creating overlay global maps.
     :param kwargs: other keyword arguments passed to :class:`SchemaLoader`.
     """
     _schemas: set[SchemaType]
 
     settings: SchemaSettings
     namespaces: NamespaceResourcesMap[SchemaType]
+    global_maps: GlobalMaps
 
     types: TypesMap
     """Global types map"""
@@ -101,7 +140,7 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
     xpath_parser_class: type[XPath2Parser]
     assertion_parser_class: type[XsdAssertionXPathParser]
 
-    __slots__ = ('_build_lock', '_built', '_schemas', '_parent', 'validation',
+    __slots__ = ('_build_lock', '_built', '_schemas', '_parent', '_base', 'validation',
                  'errors', 'validator', 'namespaces', 'loader', 'global_maps',
                  'types', 'notations', 'attributes', 'attribute_groups',
                  'elements', 'groups', 'substitution_groups', 'identities',
@@ -111,6 +150,7 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
                  validation: str = _strict,
                  parent: Optional[SchemaType] = None,
                  settings: Optional[SchemaSettings] = None,
+                 base: Optional['XsdGlobals'] = None,
                  **kwargs: Any) -> None:
 
         if not isinstance(validation, _strict.__class__):
@@ -121,12 +161,15 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
         self._build_lock = threading.Lock()
         self._built = False
         self._schemas = set()
-        self._parent = parent
+        self._parent = parent if base is None else base.parent
+        self._base = base
 
         self.validator = validator
         self.namespaces = NamespaceResourcesMap()  # Registered schemas by namespace URI
 
-        self.global_maps = GlobalMaps.from_builders(validator.builders)
+        self.global_maps = GlobalMaps.from_builders(
+            validator.builders, None if base is None else base.global_maps
+        )
         (self.types, self.notations, self.attributes,
          self.attribute_groups, self.elements, self.groups) = self.global_maps
 
@@ -135,6 +178,8 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
 
         if isinstance(settings, SchemaSettings):
             self.settings = settings
+        elif base is not None:
+            self.settings = base.settings
         else:
             self.settings = SchemaSettings(**kwargs)
 
@@ -146,14 +191,17 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
             self.xpath_parser_class = XPath2Parser
             self.assertion_parser_class = XsdAssertionXPathParser
 
-        for ancestor in self.iter_ancestors():
-            self._schemas.update(ancestor.maps.schemas)
-            self.namespaces.update(ancestor.maps.namespaces)
+        if base is not None:
+            self._update_from_base(schemas=True)
+        else:
+            for ancestor in self.iter_ancestors():
+                self._schemas.update(ancestor.maps.schemas)
+                self.namespaces.update(ancestor.maps.namespaces)
 
-            ancestor.maps.build()
-            self.global_maps.update(ancestor.maps.global_maps)
-            self.substitution_groups.update(ancestor.maps.substitution_groups)
-            self.identities.update(ancestor.maps.identities)
+                ancestor.maps.build()
+                self.global_maps.update(ancestor.maps.global_maps)
+                self.substitution_groups.update(ancestor.maps.substitution_groups)
+                self.identities.update(ancestor.maps.identities)
 
         self.loader = self.settings.get_loader(self)
         self.cache = self.settings.get_cache()
@@ -172,6 +220,11 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
     def parent(self) -> Optional[SchemaType]:
         return self._parent
 
+    @property
+    def base(self) -> Optional['XsdGlobals']:
+        """The base global maps of an overlay, `None` otherwise."""
+        return self._base
+
     @cached_property
     def any_type(self) -> 'XsdComplexType':
         return self.validator.create_any_type()
@@ -222,7 +275,8 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
         other = type(self)(
             validator=copy.copy(self.validator),
             parent=self._parent,
-            settings=self.settings
+            settings=self.settings,
+            base=self._base,
         )
         other.loader.__dict__.update(self.loader.__dict__)
         other.loader.locations = self.loader.locations.copy()
@@ -238,6 +292,32 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
 
     copy = __copy__
 
+    def create_overlay(self) -> 'XsdGlobals':
+        """
+        Creates a copy-on-write overlay of the global maps, builds the global maps
+        if necessary. The overlay shares the schemas and the built components of
+        the global maps and stores only the globals of the schemas added to it,
+        that are looked up before the shared ones. The main validator of the
+        overlay is a shallow copy of the main validator of the global maps.
+
+        The globals added to the overlay can redefine the globals of the base
+        maps. The shared components are not changed by the overlay, so the base
+        globals that depend on redefined globals, or that are head elements of
+        substitution groups with members in the overlay, are rebuilt in the
+        overlay from copies of their schemas.
+        """
+        self.build()
+
+        validator = copy.copy(self.validator)
+        validator.clear()
+
+        overlay = type(self)(validator, base=self)
+        overlay.loader.__dict__.update(self.loader.__dict__)
+        overlay.loader.locations = self.loader.locations.copy()
+        overlay.loader.missing_locations.update(self.loader.missing_locations)
+        overlay._built = True
+        return overlay
+
     def lookup(self, tag: str, qname: str) -> SchemaGlobalType:
         """
         General lookup method for XSD global components.
@@ -407,6 +487,13 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
         """Creates an iterator for the registered schemas."""
         yield from self._schemas
 
+    def iter_bases(self) -> Iterator['XsdGlobals']:
+        """Creates an iterator for the chain of base global maps of an overlay."""
+        base = self._base
+        while base is not None:
+            yield base
+            base = base._base
+
     def iter_ancestors(self) -> Iterator[SchemaType]:
         ancestors: list[SchemaType] = []
         parent = self._parent
@@ -463,7 +550,7 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
         if ns_schemas is None:
             self.namespaces[namespace] = [schema]
             self._schemas.add(schema)
-        elif ns_schemas[0].maps is not self:
+        elif ns_schemas[0].maps is not self and ns_schemas[0].maps not in self.iter_bases():
             self._schemas.add(schema)
             ns_schemas.append(schema)
             schema.maps = self
@@ -524,9 +611,12 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
             self._schemas.clear()
             self.namespaces.clear()
 
-            for ancestor in self.iter_ancestors():
-                self._schemas.update(ancestor.maps._schemas)
-                self.namespaces.update(ancestor.maps.namespaces)
+            if self._base is not None:
+                self._update_from_base(schemas=True)
+            else:
+                for ancestor in self.iter_ancestors():
+                    self._schemas.update(ancestor.maps._schemas)
+                    self.namespaces.update(ancestor.maps.namespaces)
 
             self.register(self.validator)
             if self.validator.includes:
@@ -549,22 +639,43 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
             self.check_loaded_schemas()
             self.clear()
 
-            for ancestor in self.iter_ancestors():
-                ancestor.maps.build()
-                self.global_maps.update(ancestor.maps.global_maps)
-                self.substitution_groups.update(ancestor.maps.substitution_groups)
-                self.identities.update(ancestor.maps.identities)
-
-            # Have to respect the insertion order for redefinitions/overrides
-            schemas = [s for ns_schemas in self.namespaces.values()
-                       for s in ns_schemas if s.maps is self]
-
-            self.global_maps.load(schemas)
-            self.types.build_builtins(self.validator)
-            self.global_maps.build(schemas)
+            if self._base is not None:
+                # The globals of the validator of an overlay are provided by the base
+                self._base.build()
+                self._update_from_base()
+                schemas = [s for ns_schemas in self.namespaces.values()
+                           for s in ns_schemas if s.maps is self and s is not self.validator]
+            else:
+                for ancestor in self.iter_ancestors():
+                    ancestor.maps.build()
+                    self.global_maps.update(ancestor.maps.global_maps)
+                    self.substitution_groups.update(ancestor.maps.substitution_groups)
+                    self.identities.update(ancestor.maps.identities)
+
+                # Have to respect the insertion order for redefinitions/overrides
+                schemas = [s for ns_schemas in self.namespaces.values()
+                           for s in ns_schemas if s.maps is self]
+
+            with profile_phase('globals-load', self.validator.url):
+                self.global_maps.load(schemas)
+                if self._base is not None:
+                    schemas.extend(self._load_shadowed_globals())
+            with profile_phase('build-builtins', self.validator.url):
+                self.types.build_builtins(self.validator)
+            with profile_phase('build', self.validator.url):
+                self.global_maps.build(schemas)
 
             # Update substitutes of global elements
+            if self._base is not None:
+                # Remove the shared members replaced by the overlay
+                for name, members in self.substitution_groups.items():
+                    members.intersection_update(
+                        e for e in members if self.elements.get(e.name) is e
+                    )
+
             for name in self.substitution_groups:
+                if self._base is not None and not self.elements.is_owned(name):
+                    continue  # Shared head elements are not changed by an overlay
                 xsd_element = self.elements[name]
                 assert not isinstance(xsd_element.substitutes, tuple)
                 xsd_element.substitutes.update(e.name for e in xsd_element.iter_substitutes())
@@ -575,7 +686,89 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
             for s in schemas:
                 s.clear()
 
-            self.check_validator()
+            with profile_phase('check-validator', self.validator.url):
+                self.check_validator()
+
+    def _load_shadowed_globals(self) -> list[SchemaType]:
+        """
+        Loads in an overlay the base globals that depend on the globals redefined
+        by the overlay, and the base head elements of the substitution groups that
+        have members in the overlay. These globals are rebuilt in the overlay from
+        copies of their schemas, that are returned in a list.
+        """
+        base = cast(XsdGlobals, self._base)
+        global_maps = cast(tuple[StagedMap[Any], ...], self.global_maps)
+        base_maps = cast(tuple[StagedMap[Any], ...], base.global_maps)
+
+        changed: set[tuple[int, str]] = set()
+        for k, global_map in enumerate(global_maps):
+            changed.update((k, name) for name in global_map.staged if name in base_maps[k])
+
+        heads: set[tuple[int, str]] = set()
+        for item in self.elements.staged_values:
+            if isinstance(item, list):
+                item = item[-1]
+            elif len(item) != 2:
+                continue
+
+            elem, schema = item
+            for head in elem.get('substitutionGroup', '').split():
+                try:
+                    name = schema.resolve_qname(head, False)
+                except XMLSchemaException:
+                    continue
+                if name in base.elements and not self.elements.is_owned(name):
+                    heads.add((GLOBAL_MAP_INDEX[nm.XSD_ELEMENT], name))
+
+        if not changed and not heads:
+            return []
+
+        dependents: dict[tuple[int, str], list[tuple[int, SchemaGlobalType]]] = {}
+        for k, global_map in enumerate(base_maps):
+            for component in global_map.values():
+                if component.schema.meta_schema is not None:
+                    for key in iter_references(component.elem, component.schema):
+                        dependents.setdefault(key, []).append((k, component))
+
+        shadowed = [(k, base_maps[k][name]) for k, name in heads]
+        changed.update(heads)
+        stack = list(changed)
+        while stack:
+            for k, component in dependents.get(stack.pop(), ()):
+                key = k, cast(str, component.name)
+                if key not in changed:
+                    changed.add(key)
+                    stack.append(key)
+                    shadowed.append((k, component))
+
+        schemas: dict[SchemaType, SchemaType] = {}
+        for k, component in shadowed:
+            try:
+                schema = schemas[component.schema]
+            except KeyError:
+                schema = schemas[component.schema] = copy.copy(component.schema)
+                object.__setattr__(schema, 'maps', self)  # not registered, like a view
+
+            global_maps[k].load(cast(str, component.name), component.elem, schema)
+
+        return list(schemas.values())
+
+    def _update_from_base(self, schemas: bool = False) -> None:
+        base = cast(XsdGlobals, self._base)
+        self.substitution_groups.update(
+            (k, v.copy()) for k, v in base.substitution_groups.items()
+        )
+        self.identities.update(base.identities)
+
+        if schemas:
+            # Share the schemas of the base, replacing its main validator
+            self._schemas.update(base.schemas)
+            self._schemas.discard(base.validator)
+            self._schemas.add(self.validator)
+
+            self.namespaces.update(base.namespaces)
+            ns_schemas = self.namespaces[base.validator.target_namespace]
+            ns_schemas[ns_schemas.index(base.validator)] = self.validator
 
     @contextmanager
     def protect_status(self, reraise: bool = True) -> Iterator['XsdGlobals']:
@@ -607,7 +800,7 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
         if self.validator not in self._schemas:
             raise XMLSchemaValueError(_('global maps main validator is not registered'))
 
-        if self._parent is None:
+        if self._parent is None and self._base is None:
             self.validator.create_meta_schema(global_maps=self)
 
         total = 0
@@ -634,6 +827,10 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
         :param schemas: optional argument with the set of the schemas to check.
         :raise: XMLSchemaParseError
         """
+        with profile_phase('check', self.validator.url):
+            self._check(schemas)
+
+    def _check(self, schemas: Optional[Iterable[SchemaType]] = None) -> None:
         if schemas is None:
             schemas = {s for s in self._schemas if s.maps is self}
 
@@ -682,7 +879,8 @@ class XsdGlobals(XsdValidator, Collection[SchemaType]):
                             _group.parse_error(msg)
 
                 try:
-                    check_model(xsd_type.content)
+                    with profile_phase('check-model'):
+                        check_model(xsd_type.content)
                 except XMLSchemaModelDepthError:
                     msg = _("can't verify the content model of {!r} "
                             "due to exceeding of maximum recursion depth")
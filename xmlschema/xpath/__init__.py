@@ -9,14 +9,15 @@
 #
 """
 This package defines a proxy class and a mixin class for enabling XPath on schemas,
-and custom parser for identities and assertions.
+custom parsers for identities and assertions and compiled queries on instances.
 """
 from .proxy import XMLSchemaProxy
 from .mixin import ElementPathMixin, XPathElement
 from .assertion_parser import XsdAssertionXPathParser
 from .identity_parser import IdentityXPathParser
 from .selectors import split_path, ElementSelector, ElementPathSelector
+from .queries import CompiledXPath
 
 __all__ = ['XMLSchemaProxy', 'ElementPathMixin', 'XPathElement',
            'XsdAssertionXPathParser', 'IdentityXPathParser',
-           'split_path', 'ElementSelector', 'ElementPathSelector']
+           'split_path', 'ElementSelector', 'ElementPathSelector', 'CompiledXPath']
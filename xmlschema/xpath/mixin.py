@@ -11,10 +11,12 @@ from abc import abstractmethod
 from collections.abc import Iterator, Sequence
 from typing import cast, overload, Any, Optional, TypeVar, Union, TYPE_CHECKING
 
-from elementpath import XPathSchemaContext, LazyElementNode, SchemaElementNode
+from elementpath import XPath2Parser, XPathToken, XPathSchemaContext, \
+    LazyElementNode, SchemaElementNode
 from elementpath.protocols import XsdElementProtocol
 
 from xmlschema.aliases import NsmapType, SchemaType, BaseXsdType
+from xmlschema.caching import maps_lru_cache
 from xmlschema.utils.qnames import get_qname, local_name, get_prefixed_qname
 
 from .proxy import XMLSchemaProxy
@@ -26,6 +28,16 @@ if TYPE_CHECKING:
 E_co = TypeVar('E_co', covariant=True, bound='ElementPathMixin[Any]')
 
 
+@maps_lru_cache(maxsize=1000)
+def parse_path(path: str, namespaces: tuple[tuple[str, str], ...],
+               parser_class: type[XPath2Parser] = SchemaFindParser) -> XPathToken:
+    """
+    Parses a path for find/findall/iterfind API. Called with the global maps as
+    first argument, that cache the parsed tokens by path, namespaces and parser.
+    """
+    return parser_class(dict(namespaces), strict=False).parse(path)
+
+
 class ElementPathMixin(Sequence[E_co]):
     """
     Mixin abstract class for enabling ElementTree and XPath 2.0 API on XSD components.
@@ -87,6 +99,11 @@ class ElementPathMixin(Sequence[E_co]):
         """Returns an XPath node for applying selectors on XSD schema/component."""
         raise NotImplementedError
 
+    @property
+    def maps(self) -> 'XsdGlobals':
+        """The global maps of the schema, that cache the parsed paths."""
+        raise NotImplementedError
+
     def is_matching(self, name: Optional[str], default_namespace: Optional[str] = None) -> bool:
         if not name or name[0] == '{' or not default_namespace:
             return self.name == name
@@ -103,9 +120,9 @@ class ElementPathMixin(Sequence[E_co]):
         """
         if namespaces is None:
             namespaces = self.namespaces
-        parser = SchemaFindParser(namespaces, strict=False)
+        token = parse_path(self.maps, path, tuple(namespaces.items()))
         context = XPathSchemaContext(self.xpath_node)
-        return cast(Optional[E_co], next(parser.parse(path).select_results(context), None))
+        return cast(Optional[E_co], next(token.select_results(context), None))
 
     def findall(self, path: str, namespaces: Optional[NsmapType] = None) -> list[E_co]:
         """
@@ -118,9 +135,9 @@ class ElementPathMixin(Sequence[E_co]):
         """
         if namespaces is None:
             namespaces = self.namespaces
-        parser = SchemaFindParser(namespaces, strict=False)
+        token = parse_path(self.maps, path, tuple(namespaces.items()))
         context = XPathSchemaContext(self.xpath_node)
-        return cast(list[E_co], parser.parse(path).get_results(context))
+        return cast(list[E_co], token.get_results(context))
 
     def iterfind(self, path: str, namespaces: Optional[NsmapType] = None) -> Iterator[E_co]:
         """
@@ -132,9 +149,9 @@ class ElementPathMixin(Sequence[E_co]):
         """
         if namespaces is None:
             namespaces = self.namespaces
-        parser = SchemaFindParser(namespaces, strict=False)
+        token = parse_path(self.maps, path, tuple(namespaces.items()))
         context = XPathSchemaContext(self.xpath_node)
-        return cast(Iterator[E_co], parser.parse(path).select_results(context))
+        return cast(Iterator[E_co], token.select_results(context))
 
     def iter(self, tag: Optional[str] = None) -> Iterator[E_co]:
         """
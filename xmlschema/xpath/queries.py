@@ -0,0 +1,239 @@
+#
+# Copyright (c), 2016-2026, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Schema-bound compiled XPath queries on XML instances.
+"""
+from collections.abc import Iterator
+from itertools import chain
+from typing import cast, Any, Optional, TYPE_CHECKING
+
+from elementpath import XPath2Parser, XPathToken, XPathContext
+
+from xmlschema.aliases import ElementType, NsmapType, SchemaType, SourceArgType
+from xmlschema.exceptions import XMLSchemaValueError
+
+from .proxy import XMLSchemaProxy
+
+if TYPE_CHECKING:
+    from xmlschema.validators import XsdElement  # noqa: F401
+
+PathStepType = tuple[str, XPathToken]
+StreamType = tuple[list[Optional[str]], XPathToken]
+
+
+def get_path_steps(token: XPathToken) -> Optional[list[PathStepType]]:
+    """
+    Returns the steps of an absolute location path as couples of separator
+    and step token, `None` if the expression is not an absolute path.
+    """
+    steps = []
+    while token.symbol in ('/', '//') and len(token) == 2:
+        steps.append((token.symbol, token[1]))
+        token = token[0]
+
+    if token.symbol != '/' or len(token) != 1:
+        return None
+    steps.append(('/', token[0]))
+    steps.reverse()
+    return steps
+
+
+_BOOLEAN_SYMBOLS = frozenset((
+    '=', '!=', '<', '<=', '>', '>=', 'eq', 'ne', 'lt', 'le', 'gt', 'ge',
+    'and', 'or', 'not', 'exists', 'empty', 'boolean', 'true', 'false', '@'
+))
+
+
+_SUBTREE_AXES = frozenset(('child', 'attribute', 'self'))
+
+_CONTEXT_FUNCTIONS = frozenset((
+    'position', 'last', 'root', 'id', 'idref', 'element-with-id'
+))
+
+
+def is_boolean_predicate(token: XPathToken) -> bool:
+    """
+    Returns `True` if the token is a predicate that is evaluable on a single
+    element, without the context position and size, `False` otherwise. The
+    paths of the predicate can select only the attributes and the children
+    of the element, because its ancestors and siblings are not fully loaded
+    on a lazy resource.
+    """
+    if token.symbol not in _BOOLEAN_SYMBOLS:
+        return False
+
+    for tk in token.iter():
+        if tk.symbol in ('..', '//') or tk.symbol in _CONTEXT_FUNCTIONS:
+            return False
+        elif tk.symbol == '/' and len(tk) < 2:
+            return False  # an absolute path
+        elif tk.label == 'axis' and tk.symbol not in _SUBTREE_AXES:
+            return False
+    return True
+
+
+class CompiledXPath:
+    """
+    An XPath 2.0 query on XML instances, bound to a schema. The expression is
+    parsed and statically analyzed once, then the query can be applied to any
+    number of XML resources. The nodes of the instances are typed with the
+    schema's types, so atomized values are decoded with the schema's simple
+    types.
+
+    On lazy resources the expression has to be an absolute location path
+    with simple name tests (or wildcards) down to the *lazy_depth* level,
+    where a step can have predicates that don't depend on the position.
+    The rest of the path is evaluated on each subtree, so elements selected
+    on lazy resources are full only during the iteration.
+
+    :param schema: the schema instance.
+    :param expression: the XPath 2.0 expression.
+    :param namespaces: an optional mapping from namespace prefixes to URIs \
+    used for parsing the expression. Defaults to the namespaces of the schema.
+    """
+    schema: SchemaType
+    expression: str
+    namespaces: dict[str, str]
+    parser: XPath2Parser
+    root_token: XPathToken
+
+    __slots__ = ('schema', 'expression', 'namespaces', 'parser',
+                 'root_token', '_proxy', '_steps', '_streams')
+
+    def __init__(self, schema: SchemaType, expression: str,
+                 namespaces: Optional[NsmapType] = None) -> None:
+        self.schema = schema
+        self.expression = expression
+        self.namespaces = dict(schema.namespaces if namespaces is None else namespaces)
+        self._proxy = schema.xpath_proxy
+        self.parser = XPath2Parser(self.namespaces, strict=False, schema=self._proxy)
+        self.root_token = self.parser.parse(expression)
+        self._steps = get_path_steps(self.root_token)
+        self._streams: dict[int, Optional[StreamType]] = {}
+
+    def __repr__(self) -> str:
+        return '%s(expression=%r)' % (self.__class__.__name__, self.expression)
+
+    def is_streamable(self, lazy_depth: int = 1) -> bool:
+        """
+        Returns `True` if the query can be applied to lazy resources with the
+        provided *lazy_depth*, `False` otherwise.
+        """
+        return self._get_stream(lazy_depth) is not None
+
+    def iter_select(self, source: SourceArgType) -> Iterator[Any]:
+        """
+        Applies the query to an XML source or resource, yielding the results.
+        Selected nodes are returned as elements or attribute values, the other
+        results are typed atomic values.
+        """
+        for token, context in self._iter_contexts(source):
+            yield from token.select_results(context)
+
+    def select(self, source: SourceArgType) -> list[Any]:
+        """Applies the query to an XML source or resource, returning a list of results."""
+        return list(self.iter_select(source))
+
+    def iter_values(self, source: SourceArgType) -> Iterator[Any]:
+        """
+        Applies the query to an XML source or resource, yielding the typed values
+        of the results, as computed by the atomization of the selected items.
+        """
+        for token, context in self._iter_contexts(source):
+            yield from token.atomization(context)
+
+    def select_values(self, source: SourceArgType) -> list[Any]:
+        """
+        Applies the query to an XML source or resource, returning a list
+        with the typed values of the results.
+        """
+        return list(self.iter_values(source))
+
+    def _get_stream(self, lazy_depth: int) -> Optional[StreamType]:
+        try:
+            return self._streams[lazy_depth]
+        except KeyError:
+            pass
+
+        stream: Optional[StreamType] = None
+        steps = self._steps
+        if steps is not None and len(steps) > lazy_depth:
+            names: list[Optional[str]] = []
+            predicates: list[str] = []
+            for separator, token in steps[:lazy_depth + 1]:
+                if len(names) == lazy_depth:
+                    # Predicates of the last step are evaluated on subtrees
+                    while token.symbol == '[' and is_boolean_predicate(token[1]):
+                        predicates.insert(0, f'[{token[1].source}]')
+                        token = token[0]
+
+                if separator != '/':
+                    break
+                elif token.symbol == '*' and not len(token):
+                    names.append(None)
+                elif token.symbol == '(name)':
+                    if self.parser.default_namespace:
+                        names.append(f'{{{self.parser.default_namespace}}}{token.value}')
+                    else:
+                        names.append(cast(str, token.value))
+                elif token.symbol == ':' and token[0].symbol == '(name)' \
+                        and token[1].symbol == '(name)':
+                    uri = self.namespaces.get(cast(str, token[0].value), '')
+                    names.append(f'{{{uri}}}{token[1].value}' if uri else cast(str, token[1].value))
+                else:
+                    break
+            else:
+                path = ''.join(
+                    separator + token.source for separator, token in steps[lazy_depth + 1:]
+                )
+                stream = names, self.parser.parse(f'.{"".join(predicates)}{path}')
+
+        self._streams[lazy_depth] = stream
+        return stream
+
+    def _iter_contexts(self, source: SourceArgType) \
+            -> Iterator[tuple[XPathToken, XPathContext]]:
+        from xmlschema.resources import XMLResource
+
+        if isinstance(source, XMLResource):
+            resource = source
+        else:
+            resource = XMLResource(source)
+
+        if not resource.is_lazy():
+            yield self.root_token, XPathContext(resource.xpath_root, schema=self._proxy)
+            return
+
+        lazy_depth = resource.lazy_depth
+        stream = self._get_stream(lazy_depth)
+        if stream is None:
+            raise XMLSchemaValueError(f"can't use XPath expression {self.expression!r} "
+                                      f"on a lazy resource with lazy_depth=={lazy_depth}")
+
+        names, token = stream
+        proxies: dict[tuple[str, ...], Optional[XMLSchemaProxy]] = {}
+        ancestors: list[ElementType] = []
+
+        for elem in resource.iter_depth(mode=2, ancestors=ancestors):
+            path = tuple(e.tag for e in chain(ancestors, (elem,)))
+            if any(name is not None and name != tag for name, tag in zip(names, path)):
+                continue
+
+            try:
+                proxy = proxies[path]
+            except KeyError:
+                xsd_element = cast(Optional['XsdElement'],
+                                   self.schema.find('/' + '/'.join(path)))
+                if xsd_element is None:
+                    proxy = proxies[path] = None
+                else:
+                    proxy = proxies[path] = XMLSchemaProxy(xsd_element.schema, xsd_element)
+
+            yield token, XPathContext(elem, schema=proxy)
@@ -16,7 +16,7 @@ from xml.etree.ElementTree import Element
 from elementpath import XPath2Parser, XPathToken, ElementNode, XPathContext
 
 from xmlschema.aliases import ElementType, NsmapType
-from xmlschema.exceptions import XMLSchemaTypeError
+from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError
 
 if TYPE_CHECKING:
     from xmlschema.resources import XMLResource
@@ -26,12 +26,16 @@ CacheKeyType = Union[
     tuple[Union[str, type['ElementSelector'], Iterable[tuple[str, str]], tuple[str, str]], ...]
 ]
 
+PredicateType = Union[int, tuple[str, Optional[str]]]
+PathStepType = tuple[str, tuple[PredicateType, ...]]
+StreamFilterType = Callable[[ElementType, ElementType, Optional[list[ElementType]]], bool]
+
 _selectors_cache: dict[CacheKeyType, 'ElementSelector'] = {}
 _dummy_element = Element('dummy')
 
 
 def is_ncname(s: str) -> bool:
-    return s.isalpha() and ':' not in s and all(is_ncname_continuation(c) for c in s[1:])
+    return s[:1].isalpha() and all(is_ncname_continuation(c) for c in s[1:])
 
 
 def is_ncname_continuation(c: str) -> bool:
@@ -111,10 +115,33 @@ def split_path(path: str, namespaces: Optional[NsmapType] = None,
             return chunks
 
 
+def match_name(name_test: str, name: str) -> bool:
+    if name_test == '*':
+        return isinstance(name, str)
+    elif name_test == '{}*':
+        return isinstance(name, str) and not name.startswith('{')
+    elif name_test[-1] == '*':
+        return isinstance(name, str) and name.startswith(name_test[:-1])
+    return name_test == name
+
+
+def match_attribute(elem: ElementType, predicate: tuple[str, Optional[str]]) -> bool:
+    value = elem.get(predicate[0])
+    return value is not None if predicate[1] is None else value == predicate[1]
+
+
+def match_element(elem: ElementType, name_test: str,
+                  predicates: tuple[PredicateType, ...]) -> bool:
+    return match_name(name_test, elem.tag) and \
+        all(isinstance(p, int) or match_attribute(elem, p) for p in predicates)
+
+
 class ElementSelector:
     """
     An XPath selector for selecting ElementTree elements. Raises an error
     if the path parse fails or is incompatible with the selector type.
+    The selections have the XPath 2.0 semantics, but the path is evaluated
+    with the cheapest engine that gives the same results (see `engine`).
 
     :param path: the XPath expression.
     :param namespaces: an optional namespace mapping.
@@ -129,6 +156,9 @@ class ElementSelector:
     _parser: XPath2Parser
     _token: XPathToken
 
+    _match_root = True  # the root element is matched by the first step of an absolute path
+    _tag_positions = False  # positions are counted among the siblings with the same tag
+
     @classmethod
     def cached_selector(cls, path: str, namespaces: Optional[NsmapType] = None) \
             -> 'ElementSelector':
@@ -201,10 +231,221 @@ class ElementSelector:
         else:
             return sum(s == '/' for s in self._parts) + 1
 
+    @cached_property
+    def steps(self) -> Optional[tuple[PathStepType, ...]]:
+        """
+        The path compiled to a sequence of steps that match the elements from the root
+        to the selected element, `None` if the path cannot be matched on a stream of
+        elements. Each step is a couple with a name test and a tuple of predicates,
+        that can be attribute tests or a position, the latter only on the last step.
+        """
+        parts = self._parts.copy()
+        steps: list[PathStepType] = []
+
+        if parts and parts[0] == '/':
+            parts.popleft()
+        else:
+            steps.append(('*', ()))  # the root of a relative path
+
+        try:
+            while parts:
+                name_test, predicates = self._pop_step(parts)
+                if any(isinstance(p, int) for p in predicates[:-1]) or \
+                        predicates and isinstance(predicates[-1], int) and parts:
+                    return None  # a position is allowed only at the end of the path
+
+                steps.append((name_test, predicates))
+                if parts and (parts.popleft() != '/' or not parts):
+                    return None
+
+        except (IndexError, KeyError, ValueError):
+            return None
+
+        if len(steps) != self.depth + 1 or len(steps) < 2 and \
+                any(isinstance(p, int) for p in steps[0][1]):
+            return None
+        elif not self._match_root:
+            steps[0] = ('*', ())
+        return tuple(steps)
+
+    @cached_property
+    def engine(self) -> str:
+        """
+        The engine used for selecting the elements, chosen analyzing the path.
+        It's 'native' for paths that have the same results with ElementTree's
+        `iterfind()`, 'walk' for the other paths of child steps, that are matched
+        walking down the children of the elements, 'xpath' for the remaining
+        paths, that are evaluated with the XPath 2.0 parser.
+        """
+        return self._plan[0]
+
+    @cached_property
+    def _plan(self) -> tuple[str, Optional[PathStepType]]:
+        # The plan is a couple with the engine and the step that has to
+        # match the root element before applying the native engine.
+        engine = 'xpath' if self.steps is None else 'walk'
+        parts = self._parts.copy()
+        separators: list[str] = []
+        steps: list[PathStepType] = []
+
+        try:
+            separator = parts.popleft() if parts[0] in ('/', '//') else ''
+            while True:
+                name_test, predicates = self._pop_step(parts)
+                if '*' in name_test or any(isinstance(p, int) for p in predicates):
+                    # Wildcards match also comments and positions are
+                    # counted between same tag siblings by iterfind().
+                    return engine, None
+
+                separators.append(separator)
+                steps.append((name_test, predicates))
+                if not parts:
+                    break
+                separator = parts.popleft()
+                if separator not in ('/', '//') or not parts:
+                    return engine, None
+
+        except (IndexError, KeyError, ValueError):
+            return engine, None
+
+        if '//' in separators[:-1]:
+            return engine, None  # nested descendants break the document order
+        elif separators[0] == '':
+            return 'native', None
+        return 'native', steps[0]  # the root is matched by the first step
+
+    def _pop_step(self, parts: deque[str]) -> PathStepType:
+        """Pops a path step, with its predicates, from the parts of a path."""
+        name = parts.popleft()
+        if name.endswith('}') and parts and parts[0] == '*':
+            name += parts.popleft()  # a wildcard for a namespace
+        name_test = self._get_name_test(name)
+        predicates: list[PredicateType] = []
+
+        while parts and parts[0] == '[':
+            end = parts.index(']')
+            predicate = list(parts)[1:end]
+            for _ in range(end + 1):
+                parts.popleft()
+
+            if predicate[0] != '@':
+                position = int(''.join(predicate))
+                if position < 1:
+                    raise XMLSchemaValueError(f"unsupported position {position}")
+                predicates.append(position)
+            elif len(predicate) == 2:
+                predicates.append((self._get_name_test(predicate[1], True), None))
+            elif len(predicate) == 4 and predicate[2] == '=' and \
+                    len(predicate[3]) > 1 and predicate[3][0] == predicate[3][-1] \
+                    and predicate[3][0] in '"\'':
+                name = self._get_name_test(predicate[1], True)
+                predicates.append((name, predicate[3][1:-1]))
+            else:
+                raise XMLSchemaValueError(f"unsupported predicate {''.join(predicate)!r}")
+
+        return name_test, tuple(predicates)
+
+    def _get_name_test(self, name: str, attribute: bool = False) -> str:
+        if name == '*' and not attribute:
+            return name
+        elif name.startswith('{'):
+            local_name = name[name.index('}') + 1:]
+            if not is_ncname(local_name) and (local_name != '*' or attribute):
+                raise XMLSchemaValueError(f"{name!r} is not a name test")
+            elif name.startswith('{}') and local_name != '*':
+                return local_name  # an explicit empty namespace
+            return name
+        elif is_ncname(name):
+            return name
+        elif ':' not in name or not self.namespaces:
+            raise XMLSchemaValueError(f"{name!r} is not a name test")
+
+        prefix, local_name = name.split(':')
+        if not is_ncname(local_name):
+            raise XMLSchemaValueError(f"{name!r} is not a name test")
+        uri = self.namespaces[prefix]
+        return f'{{{uri}}}{local_name}' if uri else local_name
+
+    def get_stream_filter(self) -> Optional[StreamFilterType]:
+        """
+        Returns a function for checking the elements during a parsing, `None` if the
+        path cannot be matched on a stream of elements. The returned function takes the
+        root, the element and the list of its ancestors and has to be called for all the
+        elements at the depth of the path, in document order. Each returned function
+        keeps its own counters for positional predicates.
+        """
+        steps = self.steps
+        if steps is None:
+            return None
+
+        *ancestors_steps, (name_test, predicates) = steps
+        depth = len(ancestors_steps)
+        tag_positions = self._tag_positions
+        positions: dict[str, int] = {}
+        parent: Optional[ElementType] = None
+        position = 0
+
+        def stream_filter(root: ElementType,
+                          elem: ElementType,
+                          ancestors: Optional[list[ElementType]]) -> bool:
+            nonlocal parent, position
+
+            if ancestors is None or len(ancestors) != depth:
+                msg = f"the ancestors of the element are required for matching {self.path!r}"
+                raise XMLSchemaValueError(msg)
+
+            for (test, preds), e in zip(ancestors_steps, ancestors):
+                if not match_element(e, test, preds):
+                    return False
+
+            if ancestors and ancestors[-1] is not parent:
+                parent = ancestors[-1]
+                positions.clear()
+                position = 0
+
+            if tag_positions:
+                positions[elem.tag] = positions.get(elem.tag, 0) + 1
+            if not match_name(name_test, elem.tag):
+                return False
+
+            for pred in predicates:
+                if not isinstance(pred, int):
+                    if not match_attribute(elem, pred):
+                        return False
+                elif tag_positions:
+                    if positions[elem.tag] != pred:
+                        return False
+                else:
+                    position += 1
+                    if position != pred:
+                        return False
+            return True
+
+        return stream_filter
+
     def select(self, root: Union[ElementType, 'XMLResource']) -> list[ElementType]:
         return list(self.iter_select(root))
 
     def iter_select(self, root: Union[ElementType, 'XMLResource']) -> Iterator[Element]:
+        engine, root_step = self._plan
+        if engine == 'walk':
+            yield from self._iter_walk(root.root if hasattr(root, 'root') else root)
+            return
+        elif engine == 'native':
+            elem = root.root if hasattr(root, 'root') else root
+            if root_step is None:
+                pass
+            elif self._parts[0] == '//':
+                if match_element(elem, *root_step):
+                    yield elem  # the root is a descendant of the document
+            elif not match_element(elem, *root_step):
+                return
+
+            namespaces = None if not self.namespaces else \
+                {k: v for k, v in self.namespaces.items() if k}
+            yield from elem.iterfind(self.relative_path, namespaces)
+            return
+
         if hasattr(root, 'xpath_root'):
             context = XPathContext(root.xpath_root)
         else:
@@ -216,11 +457,49 @@ class ElementSelector:
                 raise XMLSchemaTypeError(msg)
             yield cast(ElementType, item.obj)
 
+    def _iter_walk(self, root: ElementType) -> Iterator[ElementType]:
+        steps = cast(tuple[PathStepType, ...], self.steps)
+        if not match_element(root, *steps[0]):
+            return
+        elif len(steps) == 1:
+            yield root
+            return
+
+        elements = [root]
+        for name_test, predicates in steps[1:-1]:
+            elements = [child for elem in elements for child in elem
+                        if match_element(child, name_test, predicates)]
+
+        name_test, predicates = steps[-1]
+        for elem in elements:
+            position = 0
+            for child in elem:
+                if not match_name(name_test, child.tag):
+                    continue
+
+                for pred in predicates:
+                    if not isinstance(pred, int):
+                        if not match_attribute(child, pred):
+                            break
+                    else:
+                        position += 1
+                        if position != pred:
+                            break
+                else:
+                    yield child
+
 
 class ElementPathSelector(ElementSelector):
     """
     An XPath selector that uses `xml.etree.ElementPath.iterfind()` for selecting elements.
     """
+    _match_root = False
+    _tag_positions = True
+
+    @cached_property
+    def engine(self) -> str:
+        return 'native'
+
     def iter_select(self, root: Union[ElementType, 'XMLResource']) -> Iterator[ElementType]:
         if hasattr(root, 'root'):
             yield from root.root.iterfind(self.relative_path, self.namespaces)